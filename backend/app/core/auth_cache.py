@@ -0,0 +1,154 @@
+"""
+Authenticated Principal Cache
+
+In-process LRU of resolved users keyed by JWT id or user id, so authenticated
+requests skip the database lookup until the entry expires or the user changes.
+"""
+
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event, inspect
+
+from ..models.database import User
+from .config import settings
+from .logging_utils import get_secure_logger
+
+
+logger = get_secure_logger(__name__)
+
+# Column attributes copied into each snapshot (relationships are never cached)
+_USER_COLUMNS = tuple(attr.key for attr in inspect(User).column_attrs)
+
+
+class PrincipalCache:
+    """TTL'd, size-bounded LRU of authenticated users"""
+
+    def __init__(self, ttl_seconds: float | None = None, max_entries: int | None = None):
+        self.ttl_seconds = (
+            settings.AUTH_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self.max_entries = (
+            settings.AUTH_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+
+        # key -> (expires_at, user_id, snapshot)
+        self._entries: OrderedDict[tuple[str, Any], tuple[float, int, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0 and self.max_entries > 0
+
+    def get(self, key: tuple[str, Any]) -> User | None:
+        """
+        Return a fresh detached copy of the cached user, or None on a miss
+
+        Args:
+            key: ("jti", token_id) or ("user", user_id)
+        """
+        if not self.enabled:
+            return None
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            snapshot = entry[2]
+
+        return User(**copy.deepcopy(snapshot))
+
+    def put(self, key: tuple[str, Any], user: User, expires_at: float | None = None) -> None:
+        """
+        Cache an active user under key
+
+        Args:
+            key: ("jti", token_id) or ("user", user_id)
+            user: Loaded User (only column values are kept)
+            expires_at: Unix time after which the entry must not be served
+                (the JWT exp claim); the TTL applies if it is sooner
+        """
+        if not self.enabled or not user.is_active:
+            return
+
+        ttl = self.ttl_seconds
+        if expires_at is not None:
+            ttl = min(ttl, expires_at - time.time())
+            if ttl <= 0:
+                return
+
+        snapshot = copy.deepcopy({name: getattr(user, name) for name in _USER_COLUMNS})
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, user.id, snapshot)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_user(self, user_id: int) -> int:
+        """
+        Drop every entry for a user (all of their tokens)
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key, entry in self._entries.items() if entry[1] == user_id]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        if keys:
+            logger.debug("Invalidated cached principal", user_id=user_id, entries=len(keys))
+        return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+        }
+
+
+_principal_cache: PrincipalCache | None = None
+
+
+def get_principal_cache() -> PrincipalCache:
+    """Get or create the shared principal cache"""
+    global _principal_cache
+    if _principal_cache is None:
+        _principal_cache = PrincipalCache()
+    return _principal_cache
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_on_write(mapper, connection, target: User) -> None:
+    """Updated, deactivated or deleted users must re-authenticate against the DB"""
+    if target.id is not None:
+        get_principal_cache().invalidate_user(target.id)
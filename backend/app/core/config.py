@@ -185,6 +185,168 @@ class Settings(BaseModel):
         description="Market scanner cache TTL in seconds (default: 3 minutes)"
     )
 
+    # Sector ETF performance (moderate TTL)
+    CACHE_TTL_SECTORS: int = Field(
+        default_factory=lambda: int(os.getenv("CACHE_TTL_SECTORS", "60")),
+        description="Sector performance cache TTL in seconds (default: 60s)"
+    )
+
+    # In-process L1 tier in front of Redis (see services/tiered_cache.py)
+    CACHE_L1_MAX_ENTRIES: int = Field(
+        default_factory=lambda: int(os.getenv("CACHE_L1_MAX_ENTRIES", "10000")),
+        description="Max entries in the in-process cache before LRU eviction (default: 10000)"
+    )
+    CACHE_STALE_RATIO: float = Field(
+        default_factory=lambda: float(os.getenv("CACHE_STALE_RATIO", "1.0")),
+        description="Stale-while-revalidate window as a multiple of each entry's TTL (default: 1.0)"
+    )
+
+    # Tag-set and generation-counter invalidation (see services/cache.py)
+    CACHE_INVALIDATION_BATCH_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("CACHE_INVALIDATION_BATCH_SIZE", "500")),
+        description="Keys scanned and unlinked per Redis invalidation batch (default: 500)"
+    )
+    CACHE_GENERATION_SYNC_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("CACHE_GENERATION_SYNC_SECONDS", "1.0")),
+        description="How often a process re-reads namespace generations from Redis (default: 1.0s)"
+    )
+
+    # Concurrent news aggregation deadlines
+    NEWS_PROVIDER_TIMEOUT_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("NEWS_PROVIDER_TIMEOUT_SECONDS", "4.0")),
+        description="Deadline for each news provider call (default: 4s)"
+    )
+    NEWS_AGGREGATE_BUDGET_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("NEWS_AGGREGATE_BUDGET_SECONDS", "5.0")),
+        description="Time to wait for news providers before returning partial results (default: 5s)"
+    )
+
+    # Streaming tick write-behind (latest ticks batched to Redis)
+    STREAM_CACHE_FLUSH_MS: int = Field(
+        default_factory=lambda: int(os.getenv("STREAM_CACHE_FLUSH_MS", "100")),
+        description="Interval between batched Redis flushes of stream ticks (default: 100ms)"
+    )
+
+    # Columnar OHLCV bar store (memory-mapped daily bars, shared by all consumers)
+    BAR_STORE_DIR: str = Field(
+        default_factory=lambda: os.getenv("BAR_STORE_DIR", "data/bars"),
+        description="Directory for the on-disk bar store (default: data/bars)"
+    )
+    BAR_STORE_MAX_SERIES: int = Field(
+        default_factory=lambda: int(os.getenv("BAR_STORE_MAX_SERIES", "256")),
+        description="(symbol, interval) series kept open in memory (default: 256)"
+    )
+
+    # Strategy selector training dataset (memoized window backtests)
+    ML_DATASET_CACHE_DIR: str = Field(
+        default_factory=lambda: os.getenv("ML_DATASET_CACHE_DIR", "data/ml_dataset_cache"),
+        description="Directory for memoized window backtests (default: data/ml_dataset_cache)"
+    )
+    ML_DATASET_WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("ML_DATASET_WORKERS", str(os.cpu_count() or 2))),
+        description="Worker processes for training-window backtests (default: CPU count)"
+    )
+
+    # Market regime service (warm-loaded model + per-symbol feature cache)
+    REGIME_WARM_START: bool = Field(
+        default_factory=lambda: os.getenv("REGIME_WARM_START", "true").lower() == "true",
+        description="Load (or train and persist) the regime model in the background at startup"
+    )
+    REGIME_FEATURE_CACHE_MAX_ENTRIES: int = Field(
+        default_factory=lambda: int(os.getenv("REGIME_FEATURE_CACHE_MAX_ENTRIES", "256")),
+        description="(symbol, lookback) regime feature frames kept in memory (default: 256)"
+    )
+    REGIME_FEATURE_REFRESH_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("REGIME_FEATURE_REFRESH_SECONDS", "60")),
+        description="Seconds cached regime features are served before re-reading bars (default: 60)"
+    )
+
+    # Per-article news sentiment (content-hash store + model call batching)
+    SENTIMENT_STORE_MAX_ENTRIES: int = Field(
+        default_factory=lambda: int(os.getenv("SENTIMENT_STORE_MAX_ENTRIES", "20000")),
+        description="Article sentiment results kept in memory (default: 20000)"
+    )
+    SENTIMENT_STORE_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("SENTIMENT_STORE_TTL_SECONDS", "604800")),
+        description="Redis TTL for article sentiment results (default: 7 days)"
+    )
+    SENTIMENT_BATCH_MAX_ARTICLES: int = Field(
+        default_factory=lambda: int(os.getenv("SENTIMENT_BATCH_MAX_ARTICLES", "20")),
+        description="Articles scored per model call (default: 20)"
+    )
+    SENTIMENT_BATCH_WAIT_MS: int = Field(
+        default_factory=lambda: int(os.getenv("SENTIMENT_BATCH_WAIT_MS", "25")),
+        description="How long queued articles wait for a fuller batch (default: 25ms)"
+    )
+
+    # Batched ML trade signals (/api/sentiment/signals/batch)
+    ML_SIGNAL_BATCH_MAX_SYMBOLS: int = Field(
+        default_factory=lambda: int(os.getenv("ML_SIGNAL_BATCH_MAX_SYMBOLS", "50")),
+        description="Maximum symbols per batch signal request (default: 50)"
+    )
+    ML_SIGNAL_NEWS_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("ML_SIGNAL_NEWS_CONCURRENCY", "8")),
+        description="News fetches in flight during a batch signal request (default: 8)"
+    )
+
+    # Portfolio risk snapshot (shared by positions / greeks / P&L endpoints)
+    PORTFOLIO_RISK_TTL_SECONDS: float = Field(
+        default_factory=lambda: float(os.getenv("PORTFOLIO_RISK_TTL_SECONDS", "5")),
+        description="Seconds an unchanged positions/Greeks/P&L snapshot is reused (default: 5)"
+    )
+
+    # Telemetry ingestion (bounded event buffer + batched JSONL segment writer)
+    TELEMETRY_BUFFER_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("TELEMETRY_BUFFER_SIZE", "50000")),
+        description="Most recent telemetry events kept in memory for queries (default: 50000)"
+    )
+    TELEMETRY_FLUSH_INTERVAL_MS: int = Field(
+        default_factory=lambda: int(os.getenv("TELEMETRY_FLUSH_INTERVAL_MS", "500")),
+        description="How long the writer collects events before one file append (default: 500ms)"
+    )
+    TELEMETRY_SEGMENT_MAX_BYTES: int = Field(
+        default_factory=lambda: int(os.getenv("TELEMETRY_SEGMENT_MAX_BYTES", "67108864")),
+        description="JSONL segment size that triggers rotation (default: 64MB)"
+    )
+    TELEMETRY_SEGMENT_KEEP: int = Field(
+        default_factory=lambda: int(os.getenv("TELEMETRY_SEGMENT_KEEP", "10")),
+        description="Rotated JSONL segments kept on disk; 0 keeps all (default: 10)"
+    )
+    TELEMETRY_WRITER_MAX_PENDING: int = Field(
+        default_factory=lambda: int(os.getenv("TELEMETRY_WRITER_MAX_PENDING", "1000")),
+        description="Event batches the writer queues before dropping new ones (default: 1000)"
+    )
+
+    # Authenticated principal cache (skips the per-request user lookup)
+    AUTH_CACHE_TTL_SECONDS: int = Field(
+        default_factory=lambda: int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60")),
+        description="Seconds a resolved user is served from memory; 0 disables (default: 60)"
+    )
+    AUTH_CACHE_MAX_ENTRIES: int = Field(
+        default_factory=lambda: int(os.getenv("AUTH_CACHE_MAX_ENTRIES", "4096")),
+        description="Cached principals (tokens/users) kept in memory (default: 4096)"
+    )
+
+    # Scheduler execution history and approval queue (SQLite, see services/scheduler_store.py)
+    SCHEDULER_DB_PATH: str = Field(
+        default_factory=lambda: os.getenv("SCHEDULER_DB_PATH", "data/scheduler/scheduler.db"),
+        description="Scheduler history SQLite file (default: data/scheduler/scheduler.db)"
+    )
+    SCHEDULER_HISTORY_RETENTION_DAYS: int = Field(
+        default_factory=lambda: int(os.getenv("SCHEDULER_HISTORY_RETENTION_DAYS", "90")),
+        description="Days of execution and decided-approval history kept; 0 keeps all (default: 90)"
+    )
+
+    # Scheduled strategy runs (in-process, see services/strategy_runner.py)
+    STRATEGY_RUNNER_WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("STRATEGY_RUNNER_WORKERS", "2")),
+        description="Worker threads per market for scheduled strategy runs (default: 2)"
+    )
+    STRATEGY_RUNNER_MAX_QUEUE: int = Field(
+        default_factory=lambda: int(os.getenv("STRATEGY_RUNNER_MAX_QUEUE", "16")),
+        description="Strategy runs waiting per market before new ones are rejected (default: 16)"
+    )
+
     @field_validator("API_TOKEN")
     @classmethod
     def validate_api_token(cls, v: str) -> str:
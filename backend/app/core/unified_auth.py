@@ -17,6 +17,7 @@ from sqlalchemy.orm import Session
 
 from ..db.session import get_db
 from ..models.database import User
+from .auth_cache import get_principal_cache
 from .config import settings
 from .jwt import decode_token
 from .logging_utils import get_secure_logger, redact_auth_header, format_user_for_logging
@@ -81,6 +82,68 @@ def get_auth_mode(authorization: str | None) -> str:
     return AuthMode.JWT
 
 
+MVP_USER_ID = 1
+
+
+def get_user_by_id(db: Session, user_id: int) -> User | None:
+    """
+    Load a user, serving repeat lookups from the principal cache
+
+    Args:
+        db: Database session (only used on a cache miss)
+        user_id: User primary key
+
+    Returns:
+        Detached User, or None if no such user exists
+    """
+    cache = get_principal_cache()
+    user = cache.get(("user", user_id))
+    if user is not None:
+        return user
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if user is None:
+        return None
+
+    # CRITICAL: Detach user from session to prevent connection leak
+    # This is essential for SSE streams that hold user objects for extended periods
+    db.expunge(user)
+    cache.put(("user", user_id), user)
+    return user
+
+
+def get_mvp_fallback_user(db: Session) -> User:
+    """
+    Get or create the single-user MVP account (user_id=1)
+
+    Args:
+        db: Database session (only used on a cache miss)
+
+    Returns:
+        Detached MVP User
+    """
+    user = get_user_by_id(db, MVP_USER_ID)
+    if user is not None:
+        return user
+
+    # Create MVP user if doesn't exist
+    user = User(
+        id=MVP_USER_ID,
+        email="mvp@paiid.local",
+        password_hash="",  # No password for MVP user (uses API token only)
+        full_name="MVP User",
+        role="owner",
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    db.refresh(user)
+    db.expunge(user)
+    get_principal_cache().put(("user", MVP_USER_ID), user)
+    logger.info("Created MVP user", user_id=MVP_USER_ID)
+    return user
+
+
 def get_current_user_unified(
     db: Session = Depends(get_db),
     authorization: str | None = Header(None, alias="Authorization", convert_underscores=False),
@@ -89,6 +152,8 @@ def get_current_user_unified(
     Unified authentication that handles both API token and JWT
 
     This is the MAIN authentication dependency to use in your endpoints.
+    Users are served from the principal cache, so a warm request never
+    touches the database (see app/core/auth_cache.py).
 
     Args:
         authorization: Authorization header
@@ -109,27 +174,7 @@ def get_current_user_unified(
 
     # CASE 1: Simple API Token (service-to-service or frontend proxy)
     if auth_mode == AuthMode.API_TOKEN:
-        # Get or create MVP user (user_id=1)
-        user = db.query(User).filter(User.id == 1).first()
-
-        if not user:
-            # Create MVP user if doesn't exist
-            user = User(
-                id=1,
-                email="mvp@paiid.local",
-                password_hash="",  # No password for MVP user (uses API token only)
-                full_name="MVP User",
-                role="owner",
-                is_active=True,
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            logger.info("Created MVP user", user_id=1)
-
-        # CRITICAL: Detach user from session to prevent connection leak
-        # This is essential for SSE streams that hold user objects for extended periods
-        db.expunge(user)
+        user = get_mvp_fallback_user(db)
 
         logger.debug(
             "API token auth successful",
@@ -150,7 +195,7 @@ def get_current_user_unified(
         token = authorization.split(" ", 1)[1]
 
         try:
-            # Decode and validate JWT
+            # Decode and validate JWT (signature and expiry are checked every time)
             payload = decode_token(token)
 
             # Verify token type
@@ -173,6 +218,16 @@ def get_current_user_unified(
                     detail="Token missing user identifier",
                 )
 
+            cache = get_principal_cache()
+            jti = payload.get("jti")
+            user = cache.get(("jti", jti)) if jti else None
+            if user is not None:
+                logger.debug(
+                    "JWT auth successful (cached)",
+                    user=format_user_for_logging(user)
+                )
+                return user
+
             # Fetch user from database
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
@@ -195,6 +250,8 @@ def get_current_user_unified(
             # CRITICAL: Detach user from session to prevent connection leak
             # This is essential for SSE streams that hold user objects for extended periods
             db.expunge(user)
+            if jti:
+                cache.put(("jti", jti), user, expires_at=payload.get("exp"))
 
             logger.debug(
                 "JWT auth successful",
@@ -217,27 +274,7 @@ def get_current_user_unified(
 
     # CASE 3: MVP Fallback (no auth header or unrecognized)
     if auth_mode == AuthMode.MVP_FALLBACK:
-        # Get or create MVP user (user_id=1)
-        user = db.query(User).filter(User.id == 1).first()
-
-        if not user:
-            # Create MVP user if doesn't exist
-            user = User(
-                id=1,
-                email="mvp@paiid.local",
-                password_hash="",  # No password for MVP user (uses API token only)
-                full_name="MVP User",
-                role="owner",
-                is_active=True,
-            )
-            db.add(user)
-            db.commit()
-            db.refresh(user)
-            logger.info("Created MVP user for fallback auth", user_id=1)
-
-        # CRITICAL: Detach user from session to prevent connection leak
-        # This is essential for SSE streams that hold user objects for extended periods
-        db.expunge(user)
+        user = get_mvp_fallback_user(db)
 
         logger.debug(
             "MVP fallback auth successful",
@@ -236,25 +236,22 @@ Intelligent caching is implemented for market data to optimize performance:
 # Set custom OpenAPI schema
 app.openapi = custom_openapi
 
-# Add Request ID middleware early for correlation
-from starlette.middleware.gzip import GZipMiddleware
-
-from .middleware.kill_switch import KillSwitchMiddleware
-from .middleware.request_id import RequestIDMiddleware
-from .middleware.security import CSRFProtectionMiddleware, set_csrf_middleware
-
-
-app.add_middleware(RequestIDMiddleware)
-app.add_middleware(KillSwitchMiddleware)
-
-# Add CSRF protection middleware (Batch 2C: Security Hardening)
+# Request middleware: one pure-ASGI pipeline instead of stacked
+# BaseHTTPMiddleware layers (see middleware/pipeline.py)
+from .middleware.cache_control import CacheControlStage  # noqa: E402
+from .middleware.kill_switch import KillSwitchStage  # noqa: E402
+from .middleware.metrics import MetricsStage  # noqa: E402
+from .middleware.pipeline import MiddlewarePipeline  # noqa: E402
+from .middleware.request_id import RequestIDStage  # noqa: E402
+from .middleware.security import CSRFProtectionStage, set_csrf_middleware  # noqa: E402
+from .middleware.security_headers import SecurityHeadersStage  # noqa: E402
+
+
+# CSRF protection (Batch 2C: Security Hardening)
 # Disable CSRF validation in test mode (TestClient doesn't maintain state)
-# IMPORTANT: Create a single instance and reuse it to avoid state inconsistencies
-csrf_middleware_instance = CSRFProtectionMiddleware(app, testing_mode=settings.TESTING)
-set_csrf_middleware(csrf_middleware_instance)
-# Add the SAME instance to the middleware stack (don't create a new one)
-app.add_middleware(
-    CSRFProtectionMiddleware,
+# IMPORTANT: The pipeline runs this same instance, so tokens issued by
+# /api/auth/csrf-token are the ones it validates
+csrf_stage = CSRFProtectionStage(
     exempt_paths=[
         "/api/health",
         "/api/monitor/health",
@@ -273,6 +270,7 @@ app.add_middleware(
     ],
     testing_mode=settings.TESTING,
 )
+set_csrf_middleware(csrf_stage)
 if settings.TESTING:
     print(
         "[TEST MODE] CSRF protection middleware enabled (validation disabled for tests)",
@@ -281,8 +279,20 @@ if settings.TESTING:
 else:
     print("[OK] CSRF protection middleware enabled", flush=True)
 
-# Add GZIP compression for responses >1KB (reduces bandwidth by ~70%)
-app.add_middleware(GZipMiddleware, minimum_size=1000)
+# Stages, outermost first (same order the stacked middleware ran in)
+middleware_stages = [
+    SecurityHeadersStage(),
+    MetricsStage(),
+    CacheControlStage(),  # Cache-Control headers for SWR support (Phase 2: Performance)
+]
+if settings.SENTRY_DSN:
+    from .middleware.sentry import SentryContextStage
+
+    middleware_stages.append(SentryContextStage())
+middleware_stages += [csrf_stage, KillSwitchStage(), RequestIDStage()]
+
+# GZIP compression for responses >1KB (reduces bandwidth by ~70%)
+app.add_middleware(MiddlewarePipeline, stages=middleware_stages, gzip_minimum_size=1000)
 print("[OK] GZIP compression enabled for responses >1KB", flush=True)
 
 # Configure rate limiting (Phase 3: Bulletproof Reliability)
@@ -528,6 +538,26 @@ async def startup_event():
     except Exception as e:
         print(f"[ERROR] Failed to initialize scheduler: {e!s}", flush=True)
 
+    # Import the JSON-era equity history into the snapshot store (one-shot)
+    try:
+        from .services.equity_tracker import get_equity_tracker
+
+        migrated = get_equity_tracker().migrate_legacy_history()
+        if migrated:
+            print(f"[OK] Migrated {migrated} equity snapshots", flush=True)
+    except Exception as e:
+        print(f"[WARNING] Equity history migration failed: {e!s}", flush=True)
+
+    # Load the persisted regime model (or train one) without blocking startup
+    if settings.REGIME_WARM_START:
+        try:
+            from .ml.regime_service import get_regime_service
+
+            if get_regime_service().start_warmup():
+                print("[OK] Regime model warm-up started (running in background)", flush=True)
+        except Exception as e:
+            print(f"[WARNING] Regime model warm-up failed to start: {e!s}", flush=True)
+
     # ⚠️ ARCHITECTURE NOTE: Tradier provides ALL market data (quotes, streaming, analysis)
     # Alpaca is used ONLY for paper trade execution (orders, positions, account)
     # Future: Tradier will also handle live trading post-MVP
@@ -628,6 +658,31 @@ async def shutdown_event():
     except Exception as e:
         logger.error(f"[ERROR] Tradier shutdown error: {e}")
 
+    # Close pooled async Tradier connections
+    try:
+        from .services.tradier_client import close_async_tradier_client
+
+        await close_async_tradier_client()
+    except Exception as e:
+        logger.error(f"[ERROR] Async Tradier client shutdown error: {e}")
+
+    # Close pooled news provider connections
+    try:
+        from .routers.news import news_aggregator
+
+        if news_aggregator is not None:
+            await news_aggregator.aclose()
+    except Exception as e:
+        logger.error(f"[ERROR] News aggregator shutdown error: {e}")
+
+    # Flush buffered telemetry to disk
+    try:
+        from .services.telemetry_service import close_telemetry_service
+
+        close_telemetry_service()
+    except Exception as e:
+        logger.error(f"[ERROR] Telemetry writer shutdown error: {e}")
+
     # Remove PID file
     try:
         project_root = Path(__file__).parent.parent.parent
@@ -651,23 +706,6 @@ async def shutdown_event():
     logger.info("=" * 70)
 
 
-# Add Sentry context middleware if Sentry is enabled
-if settings.SENTRY_DSN:
-    from .middleware.sentry import SentryContextMiddleware
-
-    app.add_middleware(SentryContextMiddleware)
-
-# Add Cache-Control headers for SWR support (Phase 2: Performance)
-from .middleware.cache_control import CacheControlMiddleware
-from .middleware.metrics import metrics_middleware
-from .middleware.security_headers import SecurityHeadersMiddleware
-
-
-app.add_middleware(CacheControlMiddleware)
-app.middleware("http")(metrics_middleware)
-app.add_middleware(SecurityHeadersMiddleware)
-
-
 def _parse_allowed_origins() -> list[str]:
     origins_env = os.getenv("ALLOWED_ORIGINS", "")
     origins = [o.strip() for o in origins_env.split(",") if o.strip()]
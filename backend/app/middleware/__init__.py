@@ -1,21 +1,33 @@
 # Middleware package
 
-from .cache_control import CacheControlMiddleware
+from .cache_control import CacheControlStage
+from .kill_switch import KillSwitchStage
+from .metrics import MetricsStage
+from .pipeline import HTTPStage, MiddlewarePipeline, RequestContext
 from .rate_limit import custom_rate_limit_exceeded_handler, limiter
+from .request_id import RequestIDStage
 from .security import (
-    CSRFProtectionMiddleware,
+    CSRFProtectionStage,
     generate_csrf_token_endpoint,
     get_csrf_middleware,
     set_csrf_middleware,
 )
-from .sentry import SentryContextMiddleware
+from .security_headers import SecurityHeadersStage
+from .sentry import SentryContextStage
 from .validation import *
 
 
 __all__ = [
-    "CacheControlMiddleware",
-    "SentryContextMiddleware",
-    "CSRFProtectionMiddleware",
+    "MiddlewarePipeline",
+    "HTTPStage",
+    "RequestContext",
+    "CacheControlStage",
+    "KillSwitchStage",
+    "MetricsStage",
+    "RequestIDStage",
+    "SecurityHeadersStage",
+    "SentryContextStage",
+    "CSRFProtectionStage",
     "custom_rate_limit_exceeded_handler",
     "limiter",
     "get_csrf_middleware",
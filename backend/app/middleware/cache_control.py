@@ -1,19 +1,17 @@
 """
-Cache-Control Middleware
+Cache-Control Stage
 
 Adds intelligent cache headers to API responses to support SWR (stale-while-revalidate) caching.
 
 Phase 2: Performance Optimization
 """
 
-from collections.abc import Callable
+from starlette.datastructures import MutableHeaders
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
+from .pipeline import HTTPStage, RequestContext
 
 
-class CacheControlMiddleware(BaseHTTPMiddleware):
+class CacheControlStage(HTTPStage):
     """
     Add Cache-Control headers to API responses based on endpoint patterns
 
@@ -22,39 +20,38 @@ class CacheControlMiddleware(BaseHTTPMiddleware):
     - Market Data: max-age=10s, stale-while-revalidate=60s (medium frequency)
     - News: max-age=300s, stale-while-revalidate=600s (infrequent updates)
     - Static Data: max-age=3600s (1 hour, rarely changes)
-    """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Process request
-        response = await call_next(request)
+    Event streams (SSE) are left untouched.
+    """
 
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
         # Only add cache headers to GET requests with 200 OK responses
-        if request.method != "GET" or response.status_code != 200:
-            return response
+        if ctx.method != "GET" or ctx.status_code != 200:
+            return
+        if headers.get("content-type", "").startswith("text/event-stream"):
+            return
 
-        path = request.url.path
+        path = ctx.path
 
         # High-frequency data (positions, account, orders)
         if any(endpoint in path for endpoint in ["/positions", "/account", "/orders/history"]):
-            response.headers["Cache-Control"] = "public, max-age=5, stale-while-revalidate=10"
+            headers["Cache-Control"] = "public, max-age=5, stale-while-revalidate=10"
 
         # Medium-frequency data (market quotes, indices)
         elif any(endpoint in path for endpoint in ["/quotes", "/market/indices", "/analytics"]):
-            response.headers["Cache-Control"] = "public, max-age=10, stale-while-revalidate=60"
+            headers["Cache-Control"] = "public, max-age=10, stale-while-revalidate=60"
 
         # Low-frequency data (news, company data)
         elif any(endpoint in path for endpoint in ["/news", "/company"]):
-            response.headers["Cache-Control"] = "public, max-age=300, stale-while-revalidate=600"
+            headers["Cache-Control"] = "public, max-age=300, stale-while-revalidate=600"
 
         # Static data (strategies, preferences, templates)
         elif any(endpoint in path for endpoint in ["/strategies/templates", "/users/preferences"]):
-            response.headers["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=7200"
+            headers["Cache-Control"] = "public, max-age=3600, stale-while-revalidate=7200"
 
         # Default: moderate caching
         else:
-            response.headers["Cache-Control"] = "public, max-age=30, stale-while-revalidate=60"
+            headers["Cache-Control"] = "public, max-age=30, stale-while-revalidate=60"
 
         # Add ETag support for conditional requests
-        response.headers["Vary"] = "Authorization"
-
-        return response
+        headers["Vary"] = "Authorization"
@@ -1,30 +1,28 @@
 """
-Kill Switch Middleware
+Kill Switch Stage
 
 Blocks mutating HTTP methods when the global kill switch is active.
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import JSONResponse
 
 # Import the module, not the function, to support monkeypatching in tests
 from ..core import kill_switch
+from .pipeline import HTTPStage, RequestContext
 
 
-class KillSwitchMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app):
-        super().__init__(app)
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
 
-    async def dispatch(self, request: Request, call_next):
-        if request.method in {"POST", "PUT", "PATCH", "DELETE"}:
-            # Call is_killed() via module to support monkeypatching
-            if kill_switch.is_killed():
-                return JSONResponse(
-                    status_code=423,
-                    content={
-                        "error": "trading halted",
-                        "message": "Kill switch active - mutations are disabled",
-                    },
-                )
-        return await call_next(request)
+
+class KillSwitchStage(HTTPStage):
+    def on_request(self, ctx: RequestContext) -> JSONResponse | None:
+        # Call is_killed() via module to support monkeypatching
+        if ctx.method in MUTATING_METHODS and kill_switch.is_killed():
+            return JSONResponse(
+                status_code=423,
+                content={
+                    "error": "trading halted",
+                    "message": "Kill switch active - mutations are disabled",
+                },
+            )
+        return None
@@ -1,32 +1,26 @@
 """
-Middleware to track request metrics
+Pipeline stage to track request metrics
 """
 
-import time
-
-from fastapi import Request
+from starlette.datastructures import MutableHeaders
 
 from app.services.health_monitor import health_monitor
 
+from .pipeline import HTTPStage, RequestContext
+
 
-async def metrics_middleware(request: Request, call_next):
+class MetricsStage(HTTPStage):
     """Track request metrics"""
-    start_time = time.time()
 
-    try:
-        response = await call_next(request)
-        response_time = time.time() - start_time
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        response_time = ctx.elapsed()
 
         # Record metrics
-        is_error = response.status_code >= 400
-        health_monitor.record_request(response_time, is_error)
+        health_monitor.record_request(response_time, ctx.status_code >= 400)
 
         # Add metrics headers
-        response.headers["X-Response-Time"] = f"{response_time:.3f}s"
-
-        return response
+        headers["X-Response-Time"] = f"{response_time:.3f}s"
 
-    except Exception:
-        response_time = time.time() - start_time
-        health_monitor.record_request(response_time, is_error=True)
-        raise
+    def on_error(self, ctx: RequestContext, exc: BaseException) -> None:
+        if ctx.status_code is None:
+            health_monitor.record_request(ctx.elapsed(), is_error=True)
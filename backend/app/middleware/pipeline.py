@@ -0,0 +1,187 @@
+"""
+Single ASGI Middleware Pipeline
+
+Runs the per-request middleware concerns as stages of one pure ASGI
+middleware, with gzip built into the send path (SSE is never compressed).
+"""
+
+import time
+import zlib
+from collections.abc import Sequence
+from typing import Any
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class RequestContext:
+    """Per-request state shared by the stages"""
+
+    __slots__ = ("headers", "method", "path", "scope", "start", "state", "status_code")
+
+    def __init__(self, scope: Scope):
+        self.scope = scope
+        self.method: str = scope["method"]
+        self.path: str = scope["path"]
+        self.headers = Headers(scope=scope)
+        self.start = time.perf_counter()
+        self.status_code: int | None = None
+        # Scratch space for stages (e.g. a Sentry scope to close on completion)
+        self.state: dict[str, Any] = {}
+
+    @property
+    def request_state(self) -> dict[str, Any]:
+        """Backing dict of starlette's request.state"""
+        return self.scope.setdefault("state", {})
+
+    def elapsed(self) -> float:
+        """Seconds since the request entered the pipeline"""
+        return time.perf_counter() - self.start
+
+
+class HTTPStage:
+    """One pipeline behaviour; override only the hooks it needs"""
+
+    def on_request(self, ctx: RequestContext) -> Response | None:
+        """Inspect the request; return a Response to short-circuit"""
+        return None
+
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        """Adjust response headers before they are sent"""
+
+    def on_error(self, ctx: RequestContext, exc: BaseException) -> None:
+        """The downstream app raised"""
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        """Request finished (always called for stages whose on_request ran)"""
+
+
+class MiddlewarePipeline:
+    """Pure ASGI middleware running HTTPStage hooks around the app"""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        stages: Sequence[HTTPStage] = (),
+        gzip_minimum_size: int | None = None,
+        gzip_level: int = 9,
+    ):
+        """
+        Args:
+            app: Downstream ASGI app
+            stages: Stages, outermost first
+            gzip_minimum_size: Compress bodies at least this large (None disables)
+            gzip_level: zlib compression level
+        """
+        self.app = app
+        self.stages = list(stages)
+        self.gzip_minimum_size = gzip_minimum_size
+        self.gzip_level = gzip_level
+
+    def get_stage(self, stage_type: type) -> HTTPStage | None:
+        """First stage of the given type"""
+        for stage in self.stages:
+            if isinstance(stage, stage_type):
+                return stage
+        return None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        ctx = RequestContext(scope)
+        active = self.stages
+        entered = 0
+        try:
+            for stage in self.stages:
+                response = stage.on_request(ctx)
+                entered += 1
+                if response is not None:
+                    # Only the stages outside this one see its response
+                    active = self.stages[: entered - 1]
+                    app: ASGIApp = response
+                    break
+            else:
+                app = self.app
+
+            try:
+                await app(scope, receive, self._wrap_send(ctx, active, send))
+            except BaseException as exc:
+                for stage in reversed(active):
+                    stage.on_error(ctx, exc)
+                raise
+        finally:
+            for stage in reversed(self.stages[:entered]):
+                stage.on_complete(ctx)
+
+    def _wrap_send(self, ctx: RequestContext, active: list[HTTPStage], send: Send) -> Send:
+        compress = self.gzip_minimum_size is not None and "gzip" in ctx.headers.get(
+            "accept-encoding", ""
+        )
+        minimum_size = self.gzip_minimum_size or 0
+        level = self.gzip_level
+
+        pending_start: Message | None = None
+        compressor: Any = None
+        passthrough = not compress
+
+        async def pipeline_send(message: Message) -> None:
+            nonlocal pending_start, compressor, passthrough
+            message_type = message["type"]
+
+            if message_type == "http.response.start":
+                ctx.status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                for stage in reversed(active):
+                    stage.on_response(ctx, headers)
+                if passthrough or not _compressible(headers):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Decide once the first body chunk shows the size
+                    pending_start = message
+                return
+
+            if message_type != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if pending_start is not None:
+                start, pending_start = pending_start, None
+                if not more_body and len(body) < minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                headers = MutableHeaders(scope=start)
+                headers["Content-Encoding"] = "gzip"
+                headers.add_vary_header("Accept-Encoding")
+                compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+                if more_body:
+                    del headers["Content-Length"]
+                    data = compressor.compress(body)
+                else:
+                    data = compressor.compress(body) + compressor.flush()
+                    headers["Content-Length"] = str(len(data))
+                await send(start)
+                await send({"type": "http.response.body", "body": data, "more_body": more_body})
+                return
+
+            data = compressor.compress(body)
+            if not more_body:
+                data += compressor.flush()
+            await send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+        return pipeline_send
+
+
+def _compressible(headers: MutableHeaders) -> bool:
+    return "content-encoding" not in headers and not headers.get(
+        "content-type", ""
+    ).startswith("text/event-stream")
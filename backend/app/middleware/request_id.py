@@ -1,27 +1,33 @@
 """
-Request ID Middleware
+Request ID Stage
 
 Assigns and propagates a request correlation ID for tracing across logs.
 Uses X-Request-ID header if provided; otherwise generates a UUID4.
 """
 
+import logging
 import uuid
-from collections.abc import Callable
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 
+from ..core.logging_utils import set_correlation_id
+from .pipeline import HTTPStage, RequestContext
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    def __init__(self, app, header_name: str = "X-Request-ID"):
-        super().__init__(app)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestIDStage(HTTPStage):
+    def __init__(self, header_name: str = "X-Request-ID"):
         self.header_name = header_name
 
-    async def dispatch(self, request: Request, call_next: Callable):
-        request_id = request.headers.get(self.header_name) or str(uuid.uuid4())
+    def on_request(self, ctx: RequestContext) -> None:
+        request_id = ctx.headers.get(self.header_name) or str(uuid.uuid4())
         # Attach to request.state for handlers/logging
-        request.state.request_id = request_id
-        response = await call_next(request)
+        ctx.request_state["request_id"] = request_id
+        set_correlation_id(request_id)
+        logger.debug(f"[{request_id}] {ctx.method} {ctx.path}")
+
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
         # Return header to client
-        response.headers[self.header_name] = request_id
-        return response
+        headers[self.header_name] = ctx.request_state["request_id"]
@@ -1,5 +1,5 @@
 """
-CSRF Protection and XSS Security Middleware
+CSRF Protection and XSS Security Stage
 
 Implements comprehensive CSRF token validation and XSS protection for state-changing operations.
 """
@@ -9,16 +9,18 @@ import secrets
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from fastapi import Request, Response, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Response, status
+from starlette.datastructures import MutableHeaders
+
+from .pipeline import HTTPStage, RequestContext
 
 
 logger = logging.getLogger(__name__)
 
 
-class CSRFProtectionMiddleware(BaseHTTPMiddleware):
+class CSRFProtectionStage(HTTPStage):
     """
-    CSRF Protection Middleware
+    CSRF Protection Stage
 
     Validates CSRF tokens for state-changing HTTP methods (POST, PUT, DELETE, PATCH).
     Skips validation for safe methods (GET, HEAD, OPTIONS) and health check endpoints.
@@ -29,8 +31,7 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
     - Tokens expire after 1 hour
     """
 
-    def __init__(self, app, exempt_paths: list[str] | None = None, testing_mode: bool = False):
-        super().__init__(app)
+    def __init__(self, exempt_paths: list[str] | None = None, testing_mode: bool = False):
         # Testing mode disables CSRF validation (TestClient doesn't maintain state)
         self.testing_mode = testing_mode
 
@@ -136,31 +137,30 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         if expired_tokens:
             logger.info(f"[CSRF] Cleaned up {len(expired_tokens)} expired tokens")
 
-    async def dispatch(self, request: Request, call_next) -> Response:
+    def on_request(self, ctx: RequestContext) -> Response | None:
         """
-        Process request and validate CSRF token for state-changing operations
+        Validate the CSRF token for state-changing operations
         """
         # Skip CSRF validation in testing mode (TestClient doesn't maintain state)
         if self.testing_mode:
-            response = await call_next(request)
-            self._add_security_headers(response)
-            return response
+            ctx.state["csrf_headers"] = True
+            return None
 
         # Skip CSRF validation for safe methods
-        if self._is_safe_method(request.method):
-            return await call_next(request)
+        if self._is_safe_method(ctx.method):
+            return None
 
         # Skip CSRF validation for exempt paths
-        if self._is_exempt_path(request.url.path):
-            logger.debug(f"[CSRF] Skipping validation for exempt path: {request.url.path}")
-            return await call_next(request)
+        if self._is_exempt_path(ctx.path):
+            logger.debug(f"[CSRF] Skipping validation for exempt path: {ctx.path}")
+            return None
 
         # Extract CSRF token from headers
-        csrf_token = request.headers.get("X-CSRF-Token")
+        csrf_token = ctx.headers.get("X-CSRF-Token")
 
         if not csrf_token:
             logger.warning(
-                f"[CSRF] Blocked request to {request.url.path}: Missing X-CSRF-Token header"
+                f"[CSRF] Blocked request to {ctx.path}: Missing X-CSRF-Token header"
             )
             return Response(
                 content='{"detail": "CSRF token missing. Include X-CSRF-Token header."}',
@@ -169,12 +169,12 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
             )
 
         # Extract user ID from request state (set by auth middleware)
-        user_id = getattr(request.state, "user_id", None)
+        user_id = ctx.request_state.get("user_id")
 
         # Validate token
         if not self.validate_csrf_token(csrf_token, user_id):
             logger.warning(
-                f"[CSRF] Blocked request to {request.url.path}: Invalid or expired token"
+                f"[CSRF] Blocked request to {ctx.path}: Invalid or expired token"
             )
             return Response(
                 content='{"detail": "Invalid or expired CSRF token."}',
@@ -183,17 +183,18 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
             )
 
         # Token is valid - proceed with request
-        logger.debug(f"[CSRF] Token validated for {request.method} {request.url.path}")
-        response = await call_next(request)
-
-        # Add security headers to response
-        self._add_security_headers(response)
+        logger.debug(f"[CSRF] Token validated for {ctx.method} {ctx.path}")
+        ctx.state["csrf_headers"] = True
+        return None
 
-        return response
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        # Add security headers to validated (and testing-mode) responses
+        if ctx.state.get("csrf_headers"):
+            self._add_security_headers(headers)
 
-    def _add_security_headers(self, response: Response):
+    def _add_security_headers(self, headers: MutableHeaders):
         """
-        Add comprehensive security headers to response
+        Add comprehensive security headers to response headers
 
         These headers provide defense-in-depth against various attacks:
         - XSS attacks
@@ -202,27 +203,27 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         - Information leakage
         """
         # Prevent MIME type sniffing
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
+        headers.setdefault("X-Content-Type-Options", "nosniff")
 
         # Prevent clickjacking attacks
-        response.headers.setdefault("X-Frame-Options", "DENY")
+        headers.setdefault("X-Frame-Options", "DENY")
 
         # Legacy XSS protection (modern browsers use CSP instead)
-        response.headers.setdefault("X-XSS-Protection", "1; mode=block")
+        headers.setdefault("X-XSS-Protection", "1; mode=block")
 
         # Enforce HTTPS connections (only meaningful over HTTPS)
         # max-age=31536000 = 1 year
-        response.headers.setdefault(
+        headers.setdefault(
             "Strict-Transport-Security",
             "max-age=31536000; includeSubDomains; preload"
         )
 
         # Control referrer information leakage
-        response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
+        headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
 
         # Permissions Policy (formerly Feature Policy)
         # Disable dangerous features like camera, microphone, geolocation
-        response.headers.setdefault(
+        headers.setdefault(
             "Permissions-Policy",
             "camera=(), microphone=(), geolocation=(), payment=()"
         )
@@ -242,26 +243,26 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
             "object-src 'none'",  # Block plugins (Flash, Java, etc.)
             "upgrade-insecure-requests",  # Upgrade HTTP to HTTPS automatically
         ]
-        response.headers.setdefault(
+        headers.setdefault(
             "Content-Security-Policy",
             "; ".join(csp_directives)
         )
 
 
 # Global middleware instance for token generation
-_csrf_middleware_instance: CSRFProtectionMiddleware | None = None
+_csrf_middleware_instance: CSRFProtectionStage | None = None
 
 
-def get_csrf_middleware() -> CSRFProtectionMiddleware:
-    """Get the global CSRF middleware instance"""
+def get_csrf_middleware() -> CSRFProtectionStage:
+    """Get the global CSRF stage instance"""
     global _csrf_middleware_instance
     if not _csrf_middleware_instance:
         raise RuntimeError("CSRF middleware not initialized")
     return _csrf_middleware_instance
 
 
-def set_csrf_middleware(middleware: CSRFProtectionMiddleware):
-    """Set the global CSRF middleware instance"""
+def set_csrf_middleware(middleware: CSRFProtectionStage):
+    """Set the global CSRF stage instance (the same one the pipeline runs)"""
     global _csrf_middleware_instance
     _csrf_middleware_instance = middleware
 
@@ -1,17 +1,18 @@
 """
-Security Headers Middleware
+Security Headers Stage
 
 Adds comprehensive security headers (CSP, HSTS, X-Frame-Options, etc.) to all responses.
-This middleware provides defense-in-depth against XSS, clickjacking, and other attacks.
+This stage provides defense-in-depth against XSS, clickjacking, and other attacks.
 """
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import MutableHeaders
 
+from .pipeline import HTTPStage, RequestContext
 
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
+
+class SecurityHeadersStage(HTTPStage):
     """
-    Security Headers Middleware
+    Security Headers Stage
 
     Adds essential security headers to all HTTP responses:
     - Content Security Policy (CSP) - Primary XSS defense
@@ -23,34 +24,29 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     - Permissions-Policy - Disable dangerous browser features
     """
 
-    def __init__(self, app):
-        super().__init__(app)
-
-    async def dispatch(self, request: Request, call_next):
-        response = await call_next(request)
-
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
         # Prevent MIME type sniffing
-        response.headers.setdefault("X-Content-Type-Options", "nosniff")
+        headers.setdefault("X-Content-Type-Options", "nosniff")
 
         # Prevent clickjacking attacks
-        response.headers.setdefault("X-Frame-Options", "DENY")
+        headers.setdefault("X-Frame-Options", "DENY")
 
         # Control referrer information leakage
-        response.headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
+        headers.setdefault("Referrer-Policy", "strict-origin-when-cross-origin")
 
         # Legacy XSS protection (modern browsers use CSP instead)
-        response.headers.setdefault("X-XSS-Protection", "1; mode=block")
+        headers.setdefault("X-XSS-Protection", "1; mode=block")
 
         # Enforce HTTPS connections (only meaningful over HTTPS)
         # max-age=31536000 = 1 year (increased from 180 days for better security)
-        response.headers.setdefault(
+        headers.setdefault(
             "Strict-Transport-Security",
             "max-age=31536000; includeSubDomains; preload"
         )
 
         # Permissions Policy (formerly Feature Policy)
         # Disable dangerous features like camera, microphone, geolocation, payment
-        response.headers.setdefault(
+        headers.setdefault(
             "Permissions-Policy",
             "camera=(), microphone=(), geolocation=(), payment=()"
         )
@@ -70,9 +66,7 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
             "object-src 'none'",  # Block plugins (Flash, Java, etc.)
             "upgrade-insecure-requests",  # Upgrade HTTP to HTTPS automatically
         ]
-        response.headers.setdefault(
+        headers.setdefault(
             "Content-Security-Policy",
             "; ".join(csp_directives)
         )
-
-        return response
@@ -1,98 +1,94 @@
 """
-Sentry Error Context Middleware
+Sentry Error Context Stage
 
 Adds custom context and breadcrumbs to Sentry error reports for better debugging.
 """
 
-import time
-from collections.abc import Callable
-
 import sentry_sdk
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.requests import Request
+
+from .pipeline import HTTPStage, RequestContext
 
 
-class SentryContextMiddleware(BaseHTTPMiddleware):
+class SentryContextStage(HTTPStage):
     """
     Adds request context to Sentry error reports
     """
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        # Add request context to Sentry
-        with sentry_sdk.push_scope() as scope:
-            # Add request metadata
-            scope.set_context(
-                "request",
-                {
-                    "method": request.method,
-                    "url": str(request.url),
-                    "path": request.url.path,
-                    "query_params": dict(request.query_params),
-                    "client_host": request.client.host if request.client else None,
-                },
-            )
-
-            # Add custom tags for filtering in Sentry
-            scope.set_tag("endpoint", request.url.path)
-            scope.set_tag("method", request.method)
-
-            # Add breadcrumb for request
-            sentry_sdk.add_breadcrumb(
-                category="request",
-                message=f"{request.method} {request.url.path}",
-                level="info",
-            )
-
-            # Time the request
-            start_time = time.time()
-
-            try:
-                response = await call_next(request)
-
-                # Add response status to context
-                scope.set_context(
-                    "response",
-                    {
-                        "status_code": response.status_code,
-                        "duration_ms": round((time.time() - start_time) * 1000, 2),
-                    },
-                )
-
-                # Add breadcrumb for response
-                sentry_sdk.add_breadcrumb(
-                    category="response",
-                    message=f"Status {response.status_code}",
-                    level="info" if response.status_code < 400 else "warning",
-                    data={"duration_ms": round((time.time() - start_time) * 1000, 2)},
-                )
-
-                return response
-
-            except Exception as exc:
-                # Add error context
-                scope.set_context(
-                    "error",
-                    {
-                        "type": type(exc).__name__,
-                        "message": str(exc),
-                        "duration_ms": round((time.time() - start_time) * 1000, 2),
-                    },
-                )
-
-                # Add breadcrumb for error
-                sentry_sdk.add_breadcrumb(
-                    category="error",
-                    message=f"Exception: {type(exc).__name__}",
-                    level="error",
-                    data={"error_message": str(exc)},
-                )
-
-                # Capture exception in Sentry
-                sentry_sdk.capture_exception(exc)
-
-                # Re-raise to let FastAPI handle it
-                raise
+    def on_request(self, ctx: RequestContext) -> None:
+        # Add request context to Sentry (scope is popped in on_complete)
+        scope_cm = sentry_sdk.push_scope()
+        scope = scope_cm.__enter__()
+        ctx.state["sentry_scope"] = (scope_cm, scope)
+
+        request = Request(ctx.scope)
+
+        # Add request metadata
+        scope.set_context(
+            "request",
+            {
+                "method": request.method,
+                "url": str(request.url),
+                "path": request.url.path,
+                "query_params": dict(request.query_params),
+                "client_host": request.client.host if request.client else None,
+            },
+        )
+
+        # Add custom tags for filtering in Sentry
+        scope.set_tag("endpoint", ctx.path)
+        scope.set_tag("method", ctx.method)
+
+        # Add breadcrumb for request
+        sentry_sdk.add_breadcrumb(
+            category="request",
+            message=f"{ctx.method} {ctx.path}",
+            level="info",
+        )
+
+    def on_response(self, ctx: RequestContext, headers: MutableHeaders) -> None:
+        _, scope = ctx.state["sentry_scope"]
+        duration_ms = round(ctx.elapsed() * 1000, 2)
+
+        # Add response status to context
+        scope.set_context(
+            "response",
+            {"status_code": ctx.status_code, "duration_ms": duration_ms},
+        )
+
+        # Add breadcrumb for response
+        sentry_sdk.add_breadcrumb(
+            category="response",
+            message=f"Status {ctx.status_code}",
+            level="info" if ctx.status_code < 400 else "warning",
+            data={"duration_ms": duration_ms},
+        )
+
+    def on_error(self, ctx: RequestContext, exc: BaseException) -> None:
+        _, scope = ctx.state["sentry_scope"]
+        duration_ms = round(ctx.elapsed() * 1000, 2)
+
+        # Add error context
+        scope.set_context(
+            "error",
+            {"type": type(exc).__name__, "message": str(exc), "duration_ms": duration_ms},
+        )
+
+        # Add breadcrumb for error
+        sentry_sdk.add_breadcrumb(
+            category="error",
+            message=f"Exception: {type(exc).__name__}",
+            level="error",
+            data={"error_message": str(exc)},
+        )
+
+        # Capture exception in Sentry (FastAPI still handles it)
+        sentry_sdk.capture_exception(exc)
+
+    def on_complete(self, ctx: RequestContext) -> None:
+        scope_cm, _ = ctx.state.pop("sentry_scope")
+        scope_cm.__exit__(None, None, None)
 
 
 def capture_trading_event(event_type: str, symbol: str | None = None, **kwargs):
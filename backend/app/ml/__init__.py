@@ -11,6 +11,7 @@ from .data_pipeline import MLDataPipeline, get_data_pipeline
 from .feature_engineering import FeatureEngineer
 from .market_regime import MarketRegimeDetector, get_regime_detector
 from .pattern_recognition import PatternDetector, get_pattern_detector
+from .regime_service import RegimeService, get_regime_service
 from .strategy_selector import StrategySelector, get_strategy_selector
 
 
@@ -19,9 +20,11 @@ __all__ = [
     "MLDataPipeline",
     "MarketRegimeDetector",
     "PatternDetector",
+    "RegimeService",
     "StrategySelector",
     "get_data_pipeline",
     "get_pattern_detector",
     "get_regime_detector",
+    "get_regime_service",
     "get_strategy_selector",
 ]
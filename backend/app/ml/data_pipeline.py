@@ -12,6 +12,7 @@ import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
+from ..services.bar_store import STORED_INTERVALS, get_bar_store
 from ..services.tradier_client import get_tradier_client
 from .feature_engineering import FeatureEngineer
 
@@ -61,12 +62,27 @@ class MLDataPipeline:
                 f"Fetching historical data for {symbol} ({start_date.date()} to {end_date.date()})"
             )
 
+            # Daily bars come straight from the shared bar store's columns
+            if interval in STORED_INTERVALS:
+                series = get_bar_store().get_series(
+                    self.tradier_client, symbol, interval, start_date, end_date
+                )
+                if len(series) == 0:
+                    logger.warning(f"No historical data returned for {symbol}")
+                    return pd.DataFrame()
+                df = series.to_frame()
+                logger.info(
+                    f"✅ Fetched {len(df)} data points for {symbol} "
+                    f"({df.index[0].date()} to {df.index[-1].date()})"
+                )
+                return df
+
             # Fetch from Tradier
-            data = self.tradier_client.get_historical_quotes(
+            data = self.tradier_client.get_historical_bars(
                 symbol=symbol,
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d"),
                 interval=interval,
+                start_date=start_date.strftime("%Y-%m-%d"),
+                end_date=end_date.strftime("%Y-%m-%d"),
             )
 
             if not data or len(data) == 0:
@@ -107,23 +123,31 @@ class MLDataPipeline:
             logger.error(f"❌ Failed to fetch historical data for {symbol}: {e}")
             return pd.DataFrame()
 
-    def prepare_features(self, symbol: str, lookback_days: int = 730) -> pd.DataFrame | None:
+    def fetch_lookback(self, symbol: str, lookback_days: int) -> pd.DataFrame:
+        """Daily OHLCV bars for the last lookback_days (empty DataFrame if none)"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=lookback_days)
+        return self.fetch_historical_data(symbol, start_date, end_date)
+
+    def prepare_features(
+        self,
+        symbol: str,
+        lookback_days: int = 730,
+        bars: pd.DataFrame | None = None,
+    ) -> pd.DataFrame | None:
         """
         Fetch data and extract features for a symbol
 
         Args:
             symbol: Stock symbol
             lookback_days: Days of history to fetch (default: 2 years)
+            bars: Already fetched OHLCV bars for the same range (skips the fetch)
 
         Returns:
             DataFrame with features, or None if failed
         """
         try:
-            # Fetch historical data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
-
-            df = self.fetch_historical_data(symbol, start_date, end_date)
+            df = bars if bars is not None else self.fetch_lookback(symbol, lookback_days)
 
             if df.empty:
                 return None
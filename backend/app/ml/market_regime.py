@@ -269,43 +269,13 @@ class MarketRegimeDetector:
                     "error": "Feature extraction failed",
                 }
 
-            # Get latest features
-            latest_features = regime_features.iloc[-1:].values
-
-            # Normalize
-            latest_scaled = self.scaler.transform(latest_features)
-
-            # Predict cluster
-            cluster_id = self.kmeans.predict(latest_scaled)[0]
-
-            # Get regime name
-            regime = self.regime_labels.get(cluster_id, "unknown")
-
-            # Calculate confidence (inverse distance to cluster center)
-            distances = self.kmeans.transform(latest_scaled)[0]
-            min_distance = distances[cluster_id]
-            max_distance = distances.max()
-
-            # Confidence: closer to center = higher confidence
-            confidence = 1.0 - (min_distance / (max_distance + 1e-10))
-
-            # Get feature summary
-            feature_summary = {
-                "trend_direction": float(regime_features["trend_direction"].iloc[-1]),
-                "trend_strength": float(regime_features["trend_strength"].iloc[-1]),
-                "volatility": float(regime_features["volatility"].iloc[-1]),
-                "rsi": float(regime_features["rsi"].iloc[-1]),
-                "volume_trend": float(regime_features["volume_trend"].iloc[-1]),
-            }
+            prediction = self.classify_latest(regime_features.iloc[-1:].values)
+            regime = prediction["regime"]
+            confidence = prediction["confidence"]
 
             logger.info(f"✅ Market regime for {symbol}: {regime} (confidence: {confidence:.2f})")
 
-            return {
-                "regime": regime,
-                "confidence": float(confidence),
-                "features": feature_summary,
-                "cluster_id": int(cluster_id),
-            }
+            return {**prediction, "features": regime_feature_summary(regime_features)}
 
         except Exception as e:
             logger.error(f"❌ Market regime prediction failed for {symbol}: {e}")
@@ -315,6 +285,68 @@ class MarketRegimeDetector:
                 "error": str(e),
             }
 
+    def classify_latest(self, latest_features: np.ndarray) -> dict[str, str | float | int]:
+        """
+        Classify one row of regime features with the fitted model
+
+        Args:
+            latest_features: Array of shape (1, n_features) in extract_regime_features order
+
+        Returns:
+            Dictionary with regime, confidence and cluster_id
+        """
+        latest_scaled = self.scaler.transform(latest_features)
+        cluster_id = self.kmeans.predict(latest_scaled)[0]
+        regime = self.regime_labels.get(cluster_id, "unknown")
+
+        # Confidence: closer to center = higher confidence
+        distances = self.kmeans.transform(latest_scaled)[0]
+        confidence = 1.0 - (distances[cluster_id] / (distances.max() + 1e-10))
+
+        return {
+            "regime": regime,
+            "confidence": float(confidence),
+            "cluster_id": int(cluster_id),
+        }
+
+    def predict_at(self, features_df: pd.DataFrame, timestamps: pd.Index) -> list[str]:
+        """
+        Label the regime at many points of one symbol's history in a single pass
+
+        Regime features are extracted once for the whole frame; each timestamp
+        takes the latest feature row at or before it.
+
+        Args:
+            features_df: DataFrame with OHLC data and technical indicators
+            timestamps: Points in time to label (e.g. the last bar of each window)
+
+        Returns:
+            Regime name per timestamp ("unknown" where no features are available)
+        """
+        labels = np.full(len(timestamps), "unknown", dtype=object)
+        try:
+            if not self.is_fitted:
+                logger.warning("Model not trained yet, training on SPY first...")
+                self.train()
+            if not self.is_fitted:
+                return labels.tolist()
+
+            regime_features = self.extract_regime_features(features_df)
+            if regime_features.empty:
+                return labels.tolist()
+
+            rows = regime_features.index.get_indexer(pd.Index(timestamps), method="pad")
+            valid = rows >= 0
+            if valid.any():
+                scaled = self.scaler.transform(regime_features.iloc[rows[valid]])
+                clusters = self.kmeans.predict(scaled)
+                labels[valid] = [self.regime_labels.get(int(c), "unknown") for c in clusters]
+
+        except Exception as e:
+            logger.error(f"❌ Batch regime labelling failed: {e}")
+
+        return labels.tolist()
+
     def get_recommended_strategies(self, regime: str) -> list[str]:
         """
         Get recommended strategy types for a given market regime
@@ -346,6 +378,25 @@ class MarketRegimeDetector:
 
         return recommendations.get(regime, [])
 
+    def get_state(self) -> dict:
+        """Fitted model state (what save_model writes and ModelPersistence stores)"""
+        return {
+            "kmeans": self.kmeans,
+            "scaler": self.scaler,
+            "regime_labels": self.regime_labels,
+            "n_clusters": self.n_clusters,
+            "is_fitted": self.is_fitted,
+        }
+
+    def set_state(self, model_data: dict) -> None:
+        """Restore state from get_state(); the model reports fitted only once complete"""
+        self.is_fitted = False
+        self.kmeans = model_data["kmeans"]
+        self.scaler = model_data["scaler"]
+        self.regime_labels = model_data["regime_labels"]
+        self.n_clusters = model_data["n_clusters"]
+        self.is_fitted = model_data["is_fitted"]
+
     def save_model(self, filepath: str) -> bool:
         """
         Save trained model to disk
@@ -357,15 +408,7 @@ class MarketRegimeDetector:
             True if successful, False otherwise
         """
         try:
-            model_data = {
-                "kmeans": self.kmeans,
-                "scaler": self.scaler,
-                "regime_labels": self.regime_labels,
-                "n_clusters": self.n_clusters,
-                "is_fitted": self.is_fitted,
-            }
-
-            joblib.dump(model_data, filepath)
+            joblib.dump(self.get_state(), filepath)
             logger.info(f"✅ Model saved to {filepath}")
             return True
 
@@ -384,13 +427,7 @@ class MarketRegimeDetector:
             True if successful, False otherwise
         """
         try:
-            model_data = joblib.load(filepath)
-
-            self.kmeans = model_data["kmeans"]
-            self.scaler = model_data["scaler"]
-            self.regime_labels = model_data["regime_labels"]
-            self.n_clusters = model_data["n_clusters"]
-            self.is_fitted = model_data["is_fitted"]
+            self.set_state(joblib.load(filepath))
 
             logger.info(f"✅ Model loaded from {filepath}")
             return True
@@ -400,6 +437,18 @@ class MarketRegimeDetector:
             return False
 
 
+def regime_feature_summary(regime_features: pd.DataFrame) -> dict[str, float]:
+    """Latest values of the regime features reported with a prediction"""
+    latest = regime_features.iloc[-1]
+    return {
+        "trend_direction": float(latest["trend_direction"]),
+        "trend_strength": float(latest["trend_strength"]),
+        "volatility": float(latest["volatility"]),
+        "rsi": float(latest["rsi"]),
+        "volume_trend": float(latest["volume_trend"]),
+    }
+
+
 # Singleton instance
 _regime_detector = None
 
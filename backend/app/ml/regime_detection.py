@@ -783,3 +783,15 @@ class AdvancedRegimeDetector:
             risk_level="medium",
             recommended_strategies=["Conservative strategies", "Risk management"],
         )
+
+
+# Singleton instance (the RandomForest/IsolationForest models are built once and shared)
+_advanced_regime_detector = None
+
+
+def get_advanced_regime_detector() -> AdvancedRegimeDetector:
+    """Get or create advanced regime detector singleton"""
+    global _advanced_regime_detector
+    if _advanced_regime_detector is None:
+        _advanced_regime_detector = AdvancedRegimeDetector()
+    return _advanced_regime_detector
@@ -0,0 +1,316 @@
+"""
+Market Regime Service
+Serves regime predictions from a warm, persisted model and caches regime
+features per (symbol, lookback) until the last bar changes
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import settings
+from ..services.model_persistence import get_model_persistence
+from .data_pipeline import get_data_pipeline
+from .market_regime import MarketRegimeDetector, get_regime_detector, regime_feature_summary
+
+
+logger = logging.getLogger(__name__)
+
+MODEL_ID = "regime_detector"
+MODEL_VERSION = "1.0.0"
+
+# Training data used when no persisted model exists
+DEFAULT_TRAIN_SYMBOL = "SPY"
+DEFAULT_TRAIN_LOOKBACK_DAYS = 730
+
+BAR_FINGERPRINT_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class _FeaturesUnavailableError(Exception):
+    """No regime features could be built for a symbol"""
+
+
+@dataclass
+class _FeatureEntry:
+    fingerprint: tuple
+    frame: pd.DataFrame  # regime features, one row per bar
+    latest: np.ndarray  # last row of frame, shape (1, n_features)
+    summary: dict[str, float]
+    checked_at: float
+
+
+class RegimeService:
+    """Warm regime model plus a per-(symbol, lookback) regime feature cache"""
+
+    def __init__(
+        self,
+        detector: MarketRegimeDetector | None = None,
+        pipeline: Any = None,
+        persistence: Any = None,
+        max_entries: int | None = None,
+        refresh_seconds: float | None = None,
+    ):
+        """
+        Args:
+            detector: Detector to serve (default: the shared detector)
+            pipeline: ML data pipeline (default: the shared pipeline, created on first use)
+            persistence: ModelPersistence (default: the shared service, created on first use)
+            max_entries: Cached feature frames (default: REGIME_FEATURE_CACHE_MAX_ENTRIES)
+            refresh_seconds: How long a cached frame is served before the bars are
+                re-checked (default: REGIME_FEATURE_REFRESH_SECONDS)
+        """
+        self.detector = detector or get_regime_detector()
+        self._pipeline = pipeline
+        self._persistence = persistence
+        self.max_entries = max_entries or settings.REGIME_FEATURE_CACHE_MAX_ENTRIES
+        self.refresh_seconds = (
+            refresh_seconds
+            if refresh_seconds is not None
+            else settings.REGIME_FEATURE_REFRESH_SECONDS
+        )
+
+        self._features: OrderedDict[tuple[str, int], _FeatureEntry] = OrderedDict()
+        self._lock = threading.Lock()
+        self._model_lock = threading.Lock()
+        self._warmup: threading.Thread | None = None
+
+        # Fitted model served to predict(); only ever replaced whole, never refit
+        self._model: MarketRegimeDetector | None = None
+        if self.detector.is_fitted:
+            self._publish(self.detector.get_state())
+
+        self.model_source: str | None = None  # "persisted" or "trained"
+        self._hits = 0
+        self._rechecks = 0
+        self._builds = 0
+        self._hit_ms_total = 0.0
+
+    @property
+    def pipeline(self):
+        if self._pipeline is None:
+            self._pipeline = get_data_pipeline()
+        return self._pipeline
+
+    @property
+    def persistence(self):
+        if self._persistence is None:
+            self._persistence = get_model_persistence()
+        return self._persistence
+
+    # ========================
+    # Model
+    # ========================
+
+    def start_warmup(self) -> bool:
+        """
+        Load or train the model in a background thread
+
+        Returns:
+            False if the model is already fitted or a warm-up is running
+        """
+        if self._model is not None or (self._warmup is not None and self._warmup.is_alive()):
+            return False
+        self._warmup = threading.Thread(
+            target=self.ensure_model, name="regime-warmup", daemon=True
+        )
+        self._warmup.start()
+        return True
+
+    def ensure_model(self) -> bool:
+        """Make the detector usable: persisted model first, training as a fallback"""
+        with self._model_lock:
+            if self._model is not None:
+                return True
+            if self._load_persisted():
+                return True
+            return self._train_locked(DEFAULT_TRAIN_SYMBOL, DEFAULT_TRAIN_LOOKBACK_DAYS)
+
+    def train(
+        self,
+        symbol: str = DEFAULT_TRAIN_SYMBOL,
+        lookback_days: int = DEFAULT_TRAIN_LOOKBACK_DAYS,
+    ) -> bool:
+        """Retrain the detector and persist it"""
+        with self._model_lock:
+            return self._train_locked(symbol, lookback_days)
+
+    def _train_locked(self, symbol: str, lookback_days: int) -> bool:
+        # Fit a new detector so predictions keep using the current one meanwhile
+        detector = MarketRegimeDetector(n_clusters=self.detector.n_clusters)
+        if not detector.train(symbol, lookback_days):
+            return False
+        self._publish(detector.get_state())
+        self.model_source = "trained"
+        try:
+            self.persistence.save_model(
+                detector.get_state(),
+                MODEL_ID,
+                version=MODEL_VERSION,
+                metadata={
+                    "symbol": symbol,
+                    "lookback_days": lookback_days,
+                    "regime_labels": {str(k): v for k, v in detector.regime_labels.items()},
+                },
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Regime model trained but not persisted: {e}")
+        return True
+
+    def _load_persisted(self) -> bool:
+        if not self.persistence.list_models(MODEL_ID):
+            return False
+        try:
+            bundle = self.persistence.load_model(MODEL_ID)
+            self._publish(bundle["model"])
+        except Exception as e:
+            logger.warning(f"⚠️ Persisted regime model unusable, retraining: {e}")
+            return False
+        self.model_source = "persisted"
+        logger.info(f"✅ Regime model loaded (saved {bundle.get('saved_at', 'unknown')})")
+        return True
+
+    def _publish(self, state: dict) -> None:
+        """Serve a fitted state; the shared detector is updated to match"""
+        model = MarketRegimeDetector(n_clusters=state["n_clusters"])
+        model.set_state(state)
+        if not model.is_fitted:
+            raise ValueError("Regime model state is not fitted")
+        self._model = model
+        self.detector.set_state(state)
+
+    # ========================
+    # Prediction
+    # ========================
+
+    def predict(self, symbol: str, lookback_days: int = 90) -> dict[str, Any]:
+        """
+        Current regime for a symbol
+
+        Returns:
+            Same dictionary as MarketRegimeDetector.predict (regime, confidence,
+            features, cluster_id; regime "unknown" with an error on failure)
+        """
+        start = time.perf_counter()
+        try:
+            if self._model is None and not self.ensure_model():
+                return {"regime": "unknown", "confidence": 0.0, "error": "Regime model not trained"}
+            model = self._model  # read once: a retrain swaps in a new detector
+
+            entry, cached = self._features_for(symbol, lookback_days)
+            result = {
+                **model.classify_latest(entry.latest),
+                "features": dict(entry.summary),
+            }
+            if cached:
+                with self._lock:
+                    self._hit_ms_total += (time.perf_counter() - start) * 1000
+            return result
+
+        except _FeaturesUnavailableError as e:
+            return {"regime": "unknown", "confidence": 0.0, "error": str(e)}
+        except Exception as e:
+            logger.error(f"❌ Market regime prediction failed for {symbol}: {e}")
+            return {"regime": "unknown", "confidence": 0.0, "error": str(e)}
+
+    def invalidate(self, symbol: str | None = None) -> int:
+        """Drop cached feature frames for one symbol, or all of them"""
+        with self._lock:
+            keys = [k for k in self._features if symbol is None or k[0] == symbol.upper()]
+            for key in keys:
+                del self._features[key]
+        return len(keys)
+
+    def get_stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "model_ready": self._model is not None,
+                "model_source": self.model_source,
+                "warming_up": self._warmup is not None and self._warmup.is_alive(),
+                "feature_entries": len(self._features),
+                "max_entries": self.max_entries,
+                "refresh_seconds": self.refresh_seconds,
+                "hits": self._hits,
+                "rechecks": self._rechecks,
+                "builds": self._builds,
+                "avg_hit_ms": round(self._hit_ms_total / self._hits, 3) if self._hits else 0.0,
+            }
+
+    # ========================
+    # Feature cache
+    # ========================
+
+    def _features_for(self, symbol: str, lookback_days: int) -> tuple[_FeatureEntry, bool]:
+        """Cached entry for (symbol, lookback_days), rebuilt when the last bar changed"""
+        key = (symbol.upper(), lookback_days)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._features.get(key)
+            if entry is not None and now - entry.checked_at < self.refresh_seconds:
+                self._features.move_to_end(key)
+                self._hits += 1
+                return entry, True
+
+        bars = self.pipeline.fetch_lookback(symbol, lookback_days)
+        if bars is None or bars.empty:
+            raise _FeaturesUnavailableError("No data available")
+        fingerprint = _bar_fingerprint(bars)
+
+        if entry is not None and entry.fingerprint == fingerprint:
+            entry.checked_at = now
+            self._store(key, entry)
+            with self._lock:
+                self._rechecks += 1
+            return entry, False
+
+        features_df = self.pipeline.prepare_features(symbol, lookback_days, bars=bars)
+        if features_df is None or features_df.empty:
+            raise _FeaturesUnavailableError("No data available")
+        regime_features = self.detector.extract_regime_features(features_df)
+        if regime_features.empty:
+            raise _FeaturesUnavailableError("Feature extraction failed")
+
+        entry = _FeatureEntry(
+            fingerprint=fingerprint,
+            frame=regime_features,
+            latest=regime_features.iloc[-1:].values,
+            summary=regime_feature_summary(regime_features),
+            checked_at=now,
+        )
+        self._store(key, entry)
+        with self._lock:
+            self._builds += 1
+        return entry, False
+
+    def _store(self, key: tuple[str, int], entry: _FeatureEntry) -> None:
+        with self._lock:
+            self._features[key] = entry
+            self._features.move_to_end(key)
+            while len(self._features) > self.max_entries:
+                self._features.popitem(last=False)
+
+
+def _bar_fingerprint(bars: pd.DataFrame) -> tuple:
+    """Identity of a bar range: its length, last timestamp and last OHLCV values"""
+    last = bars.iloc[-1]
+    return (
+        len(bars),
+        pd.Timestamp(bars.index[-1]),
+        *(float(last[column]) for column in BAR_FINGERPRINT_COLUMNS if column in bars.columns),
+    )
+
+
+_regime_service: RegimeService | None = None
+
+
+def get_regime_service() -> RegimeService:
+    """Get or create the shared regime service"""
+    global _regime_service
+    if _regime_service is None:
+        _regime_service = RegimeService()
+    return _regime_service
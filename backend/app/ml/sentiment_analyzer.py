@@ -1,20 +1,42 @@
 """
 Sentiment Analysis Service using Anthropic Claude
 Analyzes market news and social media sentiment for trading insights
+
+News is scored per article through the shared SentimentStore and
+SentimentBatcher (see sentiment_store.py), then aggregated per symbol.
 """
 
+import asyncio
 import logging
+import re
 from datetime import UTC, datetime
 
 import anthropic
 from pydantic import BaseModel
 
 from ..core.config import get_settings
+from .sentiment_store import (
+    ArticleSentiment,
+    SentimentBatcher,
+    SentimentStore,
+    article_key,
+    article_text,
+    get_sentiment_store,
+)
 
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+# Articles per symbol analysis
+MAX_ARTICLES = 10
+
+# One line per article in batch responses:
+# ARTICLE <n> | <SENTIMENT> | <score> | <confidence> | <reasoning>
+_ARTICLE_LINE = re.compile(
+    r"^ARTICLE\s+(\d+)\s*\|\s*(\w+)\s*\|\s*([-+]?[\d.]+)\s*\|\s*([\d.]+)\s*\|\s*(.*)$"
+)
+
 
 class SentimentScore(BaseModel):
     """Sentiment analysis result"""
@@ -31,9 +53,22 @@ class SentimentScore(BaseModel):
 class SentimentAnalyzer:
     """Analyzes market sentiment using Anthropic Claude"""
 
-    def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+    def __init__(
+        self,
+        client: anthropic.AsyncAnthropic | None = None,
+        store: SentimentStore | None = None,
+        batcher: SentimentBatcher | None = None,
+    ):
+        """
+        Args:
+            client: Async Anthropic client (default: one built from ANTHROPIC_API_KEY)
+            store: Article sentiment store (default: the shared store)
+            batcher: Article micro-batcher (default: one calling this analyzer's model)
+        """
+        self.client = client or anthropic.AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
         self.model = "claude-3-5-sonnet-20241022"
+        self.store = store or get_sentiment_store()
+        self.batcher = batcher or SentimentBatcher(self._score_article_batch)
 
     async def analyze_text(
         self, symbol: str, text: str, source: str = "news"
@@ -52,7 +87,7 @@ class SentimentAnalyzer:
         try:
             prompt = self._build_sentiment_prompt(symbol, text)
 
-            message = self.client.messages.create(
+            message = await self.client.messages.create(
                 model=self.model,
                 max_tokens=1024,
                 messages=[{"role": "user", "content": prompt}],
@@ -99,33 +134,159 @@ class SentimentAnalyzer:
                 source="news",
             )
 
-        # Combine all news into one analysis for efficiency
-        combined_text = self._combine_news_articles(news_articles)
-
+        articles = news_articles[:MAX_ARTICLES]
         try:
-            prompt = self._build_batch_sentiment_prompt(symbol, combined_text)
-
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2048,
-                messages=[{"role": "user", "content": prompt}],
+            results = await self.score_articles(articles)
+        except Exception as e:
+            logger.error(f"Batch sentiment analysis error for {symbol}: {e}")
+            return SentimentScore(
+                symbol=symbol,
+                sentiment="neutral",
+                score=0.0,
+                confidence=0.0,
+                reasoning=f"Batch analysis failed: {e!s}",
+                timestamp=datetime.now(UTC),
+                source="news",
             )
 
-            response_text = message.content[0].text
-            return self._parse_sentiment_response(symbol, response_text, "news")
+        return self._aggregate_article_sentiment(symbol, results)
 
+    async def analyze_news_for_symbols(
+        self, news_by_symbol: dict[str, list[dict]]
+    ) -> dict[str, SentimentScore]:
+        """
+        Aggregate news sentiment for many symbols with one scoring pass
+
+        Every symbol's articles are scored together (an article shared by
+        several symbols is scored once), then aggregated per symbol.
+        Symbols without news are omitted.
+        """
+        per_symbol = {
+            symbol: articles[:MAX_ARTICLES]
+            for symbol, articles in news_by_symbol.items()
+            if articles
+        }
+        if not per_symbol:
+            return {}
+
+        unique = {article_key(a): a for articles in per_symbol.values() for a in articles}
+        try:
+            scored = await self.score_articles(list(unique.values()))
         except Exception as e:
-            logger.error(f"Batch sentiment analysis error for {symbol}: {e}")
+            logger.error(f"Batch sentiment analysis error for {len(per_symbol)} symbols: {e}")
+            return {
+                symbol: SentimentScore(
+                    symbol=symbol,
+                    sentiment="neutral",
+                    score=0.0,
+                    confidence=0.0,
+                    reasoning=f"Batch analysis failed: {e!s}",
+                    timestamp=datetime.now(UTC),
+                    source="news",
+                )
+                for symbol in per_symbol
+            }
+
+        results = dict(zip(unique, scored, strict=True))
+        return {
+            symbol: self._aggregate_article_sentiment(
+                symbol, [results[article_key(a)] for a in articles]
+            )
+            for symbol, articles in per_symbol.items()
+        }
+
+    async def score_articles(self, articles: list[dict]) -> list[ArticleSentiment | None]:
+        """
+        Sentiment for each article, scoring only articles never seen before
+
+        Stored results are reused; the rest go through the micro-batcher,
+        which may share a model call with other in-flight requests.
+
+        Returns:
+            One result per article (None if the model skipped it)
+        """
+        keys = [article_key(article) for article in articles]
+        found = await self.store.get_many(keys)
+
+        missing = {
+            key: article
+            for key, article in zip(keys, articles, strict=True)
+            if key not in found
+        }
+        if missing:
+            scored = await asyncio.gather(
+                *(self.batcher.score(key, article) for key, article in missing.items())
+            )
+            new_results = {
+                key: result
+                for key, result in zip(missing, scored, strict=True)
+                if result is not None
+            }
+            await self.store.put_many(new_results)
+            found.update(new_results)
+
+        return [found.get(key) for key in keys]
+
+    async def _score_article_batch(self, articles: list[dict]) -> list[ArticleSentiment | None]:
+        """Score a batch of articles in one model call (SentimentBatcher callback)"""
+        prompt = self._build_article_batch_prompt(articles)
+        message = await self.client.messages.create(
+            model=self.model,
+            max_tokens=256 + 128 * len(articles),
+            messages=[{"role": "user", "content": prompt}],
+        )
+        return self._parse_article_batch_response(message.content[0].text, len(articles))
+
+    def _aggregate_article_sentiment(
+        self, symbol: str, results: list[ArticleSentiment | None]
+    ) -> SentimentScore:
+        """Confidence-weighted symbol sentiment from per-article results"""
+        scored = [r for r in results if r is not None]
+        if not scored:
             return SentimentScore(
                 symbol=symbol,
                 sentiment="neutral",
                 score=0.0,
                 confidence=0.0,
-                reasoning=f"Batch analysis failed: {e!s}",
+                reasoning="No articles could be scored",
                 timestamp=datetime.now(UTC),
                 source="news",
             )
 
+        total_weight = sum(r.confidence for r in scored)
+        if total_weight > 0:
+            score = sum(r.score * r.confidence for r in scored) / total_weight
+        else:
+            score = sum(r.score for r in scored) / len(scored)
+        score = max(-1.0, min(1.0, score))
+
+        if score > 0.2:
+            sentiment = "bullish"
+        elif score < -0.2:
+            sentiment = "bearish"
+        else:
+            sentiment = "neutral"
+
+        counts = dict.fromkeys(("bullish", "bearish", "neutral"), 0)
+        for r in scored:
+            counts[r.sentiment] += 1
+        # Lead with the most decisive article's reasoning
+        lead = max(scored, key=lambda r: abs(r.score) * r.confidence)
+        reasoning = (
+            f"{len(scored)} articles: {counts['bullish']} bullish, "
+            f"{counts['bearish']} bearish, {counts['neutral']} neutral. {lead.reasoning}"
+        )
+
+        return SentimentScore(
+            symbol=symbol,
+            sentiment=sentiment,
+            score=score,
+            confidence=total_weight / len(scored),
+            reasoning=reasoning,
+            timestamp=datetime.now(UTC),
+            source="news",
+        )
+
     def _build_sentiment_prompt(self, symbol: str, text: str) -> str:
         """Build prompt for sentiment analysis"""
         return f"""Analyze the market sentiment for {symbol} based on this text:
@@ -146,25 +307,63 @@ REASONING: [your reasoning here]
 
 Be objective and focus on actionable market indicators."""
 
-    def _build_batch_sentiment_prompt(self, symbol: str, combined_text: str) -> str:
-        """Build prompt for batch news analysis"""
-        return f"""Analyze the overall market sentiment for {symbol} based on these recent news articles:
+    def _build_article_batch_prompt(self, articles: list[dict]) -> str:
+        """Build prompt scoring each article independently"""
+        blocks = []
+        for i, article in enumerate(articles, 1):
+            title, content = article_text(article)
+            source = article.get("source", "Unknown")
+            blocks.append(f"[{i}] ({source}) Title: {title}")
+            if content:
+                blocks.append(f"Content: {content}...")
+            blocks.append("")
+        combined_text = "\n".join(blocks)
+        count = len(articles)
 
-{combined_text}
+        return f"""Score the market sentiment of each of these {count} news articles independently:
 
-Synthesize all the information and provide:
-1. Overall market sentiment (BULLISH, BEARISH, or NEUTRAL)
-2. Aggregate sentiment score from -1.0 (very bearish) to +1.0 (very bullish)
+{combined_text}
+For each article give:
+1. Sentiment (BULLISH, BEARISH, or NEUTRAL) for the companies it covers
+2. Sentiment score from -1.0 (very bearish) to +1.0 (very bullish)
 3. Confidence level from 0.0 to 1.0
-4. Key themes and reasoning (3-4 sentences)
-
-Format your response EXACTLY as:
-SENTIMENT: [BULLISH|BEARISH|NEUTRAL]
-SCORE: [number between -1.0 and 1.0]
-CONFIDENCE: [number between 0.0 and 1.0]
-REASONING: [your synthesized analysis here]
+4. One-sentence reasoning
+
+Respond with EXACTLY one line per article, in order, formatted as:
+ARTICLE [number] | [BULLISH|BEARISH|NEUTRAL] | [score] | [confidence] | [reasoning]
+
+Focus on actionable market impact."""
+
+    def _parse_article_batch_response(
+        self, response: str, count: int
+    ) -> list[ArticleSentiment | None]:
+        """Parse per-article lines; articles the model skipped come back as None"""
+        results: list[ArticleSentiment | None] = [None] * count
+        for line in response.strip().split("\n"):
+            match = _ARTICLE_LINE.match(line.strip())
+            if not match:
+                continue
+            number, sentiment, score, confidence, reasoning = match.groups()
+            index = int(number) - 1
+            if not 0 <= index < count:
+                continue
+
+            sentiment = sentiment.lower()
+            if sentiment not in ["bullish", "bearish", "neutral"]:
+                sentiment = "neutral"
+            try:
+                score_value = max(-1.0, min(1.0, float(score)))
+                confidence_value = max(0.0, min(1.0, float(confidence)))
+            except ValueError:
+                continue
 
-Focus on the most recent and impactful information."""
+            results[index] = ArticleSentiment(
+                sentiment=sentiment,
+                score=score_value,
+                confidence=confidence_value,
+                reasoning=reasoning.strip() or "No reasoning provided",
+            )
+        return results
 
     def _parse_sentiment_response(
         self, symbol: str, response: str, source: str
@@ -226,22 +425,6 @@ Focus on the most recent and impactful information."""
                 source=source,
             )
 
-    def _combine_news_articles(self, articles: list[dict]) -> str:
-        """Combine multiple news articles into one text"""
-        combined = []
-        for i, article in enumerate(articles[:10], 1):  # Limit to 10 articles
-            title = article.get("title", "")
-            content = article.get("content", article.get("summary", ""))
-            source = article.get("source", "Unknown")
-
-            combined.append(f"Article {i} ({source}):")
-            combined.append(f"Title: {title}")
-            if content:
-                combined.append(f"Content: {content[:500]}...")  # Limit length
-            combined.append("")
-
-        return "\n".join(combined)
-
 
 # Global instance
 _sentiment_analyzer: SentimentAnalyzer | None = None
@@ -0,0 +1,276 @@
+"""
+Per-Article Sentiment Store and Micro-Batcher
+
+Caches sentiment scores per article content hash (in-process LRU plus Redis)
+and batches concurrent scoring requests into one model call.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass
+
+from ..core.config import settings
+from ..core.redis_client import get_redis
+
+
+logger = logging.getLogger(__name__)
+
+# Article text sent to the model (and hashed)
+MAX_CONTENT_CHARS = 500
+
+REDIS_PREFIX = "sentiment:article"
+
+
+@dataclass(frozen=True)
+class ArticleSentiment:
+    """Model sentiment for one article"""
+
+    sentiment: str  # 'bullish', 'bearish', 'neutral'
+    score: float  # -1.0 to +1.0
+    confidence: float  # 0.0 to 1.0
+    reasoning: str
+
+
+def article_text(article: dict) -> tuple[str, str]:
+    """(title, content) exactly as the model sees them"""
+    title = (article.get("title") or "").strip()
+    content = (article.get("content") or article.get("summary") or "").strip()
+    return title, content[:MAX_CONTENT_CHARS]
+
+
+def article_key(article: dict) -> str:
+    """Content hash identifying an article's sentiment"""
+    title, content = article_text(article)
+    return hashlib.sha256(f"{title}\n{content}".encode()).hexdigest()
+
+
+class SentimentStore:
+    """Article sentiment by content hash: in-process LRU over Redis"""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        ttl_seconds: int | None = None,
+        redis_factory: Callable[[], Awaitable] | None = get_redis,
+    ):
+        """
+        Args:
+            max_entries: In-process entries (default: SENTIMENT_STORE_MAX_ENTRIES)
+            ttl_seconds: Redis TTL (default: SENTIMENT_STORE_TTL_SECONDS)
+            redis_factory: Async factory for the Redis client; None keeps the
+                store in-process only
+        """
+        self.max_entries = (
+            settings.SENTIMENT_STORE_MAX_ENTRIES if max_entries is None else max_entries
+        )
+        self.ttl_seconds = (
+            settings.SENTIMENT_STORE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        )
+        self._redis_factory = redis_factory
+        self._entries: OrderedDict[str, ArticleSentiment] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    async def get_many(self, keys: list[str]) -> dict[str, ArticleSentiment]:
+        """Return the stored results for ``keys`` (missing keys are omitted)"""
+        found = {}
+        missing = []
+        with self._lock:
+            for key in keys:
+                result = self._entries.get(key)
+                if result is None:
+                    missing.append(key)
+                else:
+                    self._entries.move_to_end(key)
+                    found[key] = result
+            self.hits += len(found)
+
+        if missing:
+            from_redis = await self._redis_get_many(missing)
+            if from_redis:
+                self._remember(from_redis)
+                found.update(from_redis)
+            self.redis_hits += len(from_redis)
+            self.misses += len(missing) - len(from_redis)
+        return found
+
+    async def put_many(self, results: dict[str, ArticleSentiment]) -> None:
+        if not results:
+            return
+        self._remember(results)
+        redis = await self._redis()
+        if redis is None:
+            return
+        await asyncio.gather(
+            *(
+                redis.set(f"{REDIS_PREFIX}:{key}", json.dumps(asdict(result)), self.ttl_seconds)
+                for key, result in results.items()
+            )
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.hits + self.redis_hits + self.misses
+        return {
+            "entries": size,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.hits + self.redis_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+    def _remember(self, results: dict[str, ArticleSentiment]) -> None:
+        with self._lock:
+            for key, result in results.items():
+                self._entries[key] = result
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    async def _redis(self):
+        if self._redis_factory is None:
+            return None
+        try:
+            redis = await self._redis_factory()
+        except Exception as e:
+            logger.warning(f"⚠️ Sentiment store running without Redis: {e}")
+            return None
+        return redis if redis.is_connected() else None
+
+    async def _redis_get_many(self, keys: list[str]) -> dict[str, ArticleSentiment]:
+        redis = await self._redis()
+        if redis is None:
+            return {}
+        values = await asyncio.gather(*(redis.get(f"{REDIS_PREFIX}:{key}") for key in keys))
+        found = {}
+        for key, value in zip(keys, values, strict=True):
+            if value:
+                try:
+                    found[key] = ArticleSentiment(**json.loads(value))
+                except (TypeError, ValueError) as e:
+                    logger.warning(f"⚠️ Discarding unreadable sentiment entry {key}: {e}")
+        return found
+
+
+ScoreBatch = Callable[[list[dict]], Awaitable[list[ArticleSentiment | None]]]
+
+
+class SentimentBatcher:
+    """Coalesces concurrent article scoring requests into batched model calls"""
+
+    def __init__(
+        self,
+        score_batch: ScoreBatch,
+        max_batch: int | None = None,
+        max_wait_ms: int | None = None,
+    ):
+        """
+        Args:
+            score_batch: Scores a list of articles in one model call, returning
+                one result (or None if the model skipped it) per article
+            max_batch: Articles per model call (default: SENTIMENT_BATCH_MAX_ARTICLES)
+            max_wait_ms: How long the first queued article waits for company
+                (default: SENTIMENT_BATCH_WAIT_MS)
+        """
+        self.score_batch = score_batch
+        self.max_batch = max_batch or settings.SENTIMENT_BATCH_MAX_ARTICLES
+        wait_ms = settings.SENTIMENT_BATCH_WAIT_MS if max_wait_ms is None else max_wait_ms
+        self.max_wait = wait_ms / 1000
+
+        self._pending: dict[str, tuple[dict, asyncio.Future]] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        # Counters
+        self.batches = 0
+        self.articles_scored = 0
+        self.coalesced = 0
+
+    async def score(self, key: str, article: dict) -> ArticleSentiment | None:
+        """Score one article, sharing a model call with concurrent requests"""
+        future = self._inflight.get(key)
+        if future is None and key in self._pending:
+            future = self._pending[key][1]
+        if future is not None:
+            self.coalesced += 1
+        else:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._pending[key] = (article, future)
+            if len(self._pending) >= self.max_batch:
+                self._flush()
+            elif self._flush_handle is None:
+                self._flush_handle = loop.call_later(self.max_wait, self._flush)
+        # One caller giving up must not cancel the batch for the others
+        return await asyncio.shield(future)
+
+    def get_stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "articles_scored": self.articles_scored,
+            "coalesced": self.coalesced,
+            "avg_batch_size": (
+                round(self.articles_scored / self.batches, 2) if self.batches else 0.0
+            ),
+        }
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+        for key, (_, future) in batch.items():
+            self._inflight[key] = future
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: dict[str, tuple[dict, asyncio.Future]]) -> None:
+        keys = list(batch)
+        self.batches += 1
+        self.articles_scored += len(keys)
+        try:
+            results = await self.score_batch([batch[key][0] for key in keys])
+            for key, result in zip(keys, results, strict=True):
+                future = batch[key][1]
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            logger.error(f"Sentiment batch of {len(keys)} articles failed: {e}")
+            for key in keys:
+                future = batch[key][1]
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            for key in keys:
+                self._inflight.pop(key, None)
+
+
+# Global instance
+_sentiment_store: SentimentStore | None = None
+
+
+def get_sentiment_store() -> SentimentStore:
+    """Get or create the shared article sentiment store"""
+    global _sentiment_store
+    if _sentiment_store is None:
+        _sentiment_store = SentimentStore()
+    return _sentiment_store
@@ -0,0 +1,219 @@
+"""
+Batched ML Trade Signal Pipeline
+
+Builds trade signals for a watchlist with one bulk quote call, concurrent
+news fetches and a single sentiment pass, recording per-stage timings.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any
+
+import pandas as pd
+
+from ..core.config import settings
+from ..services.news.news_aggregator import get_news_aggregator
+from ..services.signal_pipeline import SignalPipeline
+from ..services.tradier_client import get_async_tradier_client, get_tradier_client
+from .sentiment_analyzer import SentimentAnalyzer, SentimentScore, get_sentiment_analyzer
+from .signal_generator import SignalGenerator, TradeSignal, get_signal_generator
+
+
+logger = logging.getLogger(__name__)
+
+# Days of company news scored per symbol
+NEWS_DAYS_BACK = 7
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+def bars_to_frame(symbol: str, bars: list[dict]) -> pd.DataFrame:
+    """Daily bar records -> date-indexed OHLCV DataFrame (SignalPipeline compute)"""
+    if not bars:
+        return pd.DataFrame()
+    df = pd.DataFrame(bars)
+    df["date"] = pd.to_datetime(df["date"])
+    df = df.set_index("date").sort_index()
+    for col in OHLCV_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df[OHLCV_COLUMNS].dropna()
+
+
+class BatchSignalPipeline:
+    """Trade signals for a watchlist: bulk prices, concurrent news, one sentiment pass"""
+
+    def __init__(
+        self,
+        client: Any | None = None,
+        news_source: Any | None = None,
+        sentiment_analyzer: SentimentAnalyzer | None = None,
+        signal_generator: SignalGenerator | None = None,
+        news_concurrency: int | None = None,
+        quote_client: Any | None = None,
+    ):
+        """
+        Args:
+            client: Tradier client (default: shared client)
+            news_source: Object with async aget_company_news(symbol, days_back)
+                (default: shared NewsAggregator; no news if none is configured)
+            sentiment_analyzer: Sentiment analyzer (default: shared analyzer)
+            signal_generator: Signal generator (default: shared generator)
+            news_concurrency: News fetches in flight (default: ML_SIGNAL_NEWS_CONCURRENCY)
+            quote_client: Async Tradier client for the bulk quote call
+                (default: shared async client unless ``client`` is given)
+        """
+        self.client = client or get_tradier_client()
+        if quote_client is None and client is None:
+            quote_client = get_async_tradier_client()
+        self.quote_client = quote_client
+        self.news_source = news_source
+        self.sentiment_analyzer = sentiment_analyzer or get_sentiment_analyzer()
+        self.signal_generator = signal_generator or get_signal_generator()
+        self.news_concurrency = news_concurrency or settings.ML_SIGNAL_NEWS_CONCURRENCY
+        self.stage_timings: dict[str, float] = {}
+        self.symbol_timings: dict[str, dict[str, float]] = {}
+
+    async def run(
+        self,
+        symbols: list[str],
+        lookback_days: int = 30,
+        include_sentiment: bool = True,
+    ) -> dict[str, TradeSignal]:
+        """
+        Generate signals for every symbol
+
+        Symbols without price history are skipped. A failed news fetch or
+        sentiment pass degrades to a technical-only signal.
+
+        Returns:
+            Dict of symbol -> TradeSignal, in input order
+        """
+        start = time.perf_counter()
+        symbols = list(dict.fromkeys(symbols))
+        self.stage_timings = {}
+        self.symbol_timings = {symbol: {} for symbol in symbols}
+
+        async def no_news() -> dict[str, list[dict]]:
+            return {}
+
+        (quotes, frames), news = await asyncio.gather(
+            self._fetch_prices(symbols, lookback_days),
+            self.fetch_news(symbols) if include_sentiment else no_news(),
+        )
+
+        priced = [symbol for symbol in symbols if not frames.get(symbol, pd.DataFrame()).empty]
+        for symbol in set(symbols) - set(priced):
+            logger.warning(f"No price data for {symbol}, skipping")
+
+        stage_start = time.perf_counter()
+        sentiments = await self.sentiment_analyzer.analyze_news_for_symbols(
+            {symbol: news.get(symbol, []) for symbol in priced}
+        )
+        self.stage_timings["sentiment_ms"] = _elapsed_ms(stage_start)
+
+        stage_start = time.perf_counter()
+        signals = await asyncio.gather(
+            *(
+                self._build_signal(
+                    symbol, frames[symbol], sentiments.get(symbol), quotes.get(symbol)
+                )
+                for symbol in priced
+            )
+        )
+        self.stage_timings["signals_ms"] = _elapsed_ms(stage_start)
+        self.stage_timings["total_ms"] = _elapsed_ms(start)
+
+        logger.info(
+            f"✅ Generated {len(priced)}/{len(symbols)} signals in "
+            f"{self.stage_timings['total_ms']:.0f}ms"
+        )
+        return dict(zip(priced, signals, strict=True))
+
+    async def fetch_news(self, symbols: list[str]) -> dict[str, list[dict]]:
+        """Company news for every symbol, fetched concurrently"""
+        stage_start = time.perf_counter()
+        news_source = self.news_source
+        if news_source is None:
+            try:
+                news_source = get_news_aggregator()
+            except Exception as e:
+                logger.warning(f"⚠️ News unavailable for signals: {e}")
+                self.stage_timings["news_ms"] = _elapsed_ms(stage_start)
+                return {}
+
+        semaphore = asyncio.Semaphore(self.news_concurrency)
+
+        async def fetch(symbol: str) -> list[dict]:
+            async with semaphore:
+                fetch_start = time.perf_counter()
+                try:
+                    result = await news_source.aget_company_news(symbol, NEWS_DAYS_BACK)
+                    return result.articles
+                except Exception as e:
+                    logger.error(f"❌ News fetch failed for {symbol}: {e!s}")
+                    return []
+                finally:
+                    self.symbol_timings.setdefault(symbol, {})["news_ms"] = _elapsed_ms(
+                        fetch_start
+                    )
+
+        articles = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        self.stage_timings["news_ms"] = _elapsed_ms(stage_start)
+        return dict(zip(symbols, articles, strict=True))
+
+    def get_timings(self) -> dict[str, Any]:
+        """Stage wall-clock timings (ms) plus the per-symbol breakdown"""
+        return {**self.stage_timings, "symbols": self.symbol_timings}
+
+    async def _fetch_prices(
+        self, symbols: list[str], lookback_days: int
+    ) -> tuple[dict[str, float], dict[str, pd.DataFrame]]:
+        stage_start = time.perf_counter()
+        prices = SignalPipeline(self.client, quote_client=self.quote_client)
+
+        async def quotes() -> dict[str, dict]:
+            try:
+                return await prices.fetch_quotes(symbols)
+            except Exception as e:
+                logger.error(f"❌ Bulk quote fetch failed: {e!s}")
+                return {}
+
+        quote_map, frames = await asyncio.gather(
+            quotes(), prices.run(symbols, history_days=lookback_days, compute=bars_to_frame)
+        )
+
+        for symbol, timing in prices.timings.items():
+            self.symbol_timings.setdefault(symbol, {})["bars_ms"] = timing.get("bars_ms", 0.0)
+        self.stage_timings["quotes_ms"] = prices.quotes_ms
+        self.stage_timings["prices_ms"] = _elapsed_ms(stage_start)
+
+        last_prices = {}
+        for symbol, quote in quote_map.items():
+            try:
+                last_prices[symbol] = float(quote["last"])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return last_prices, frames
+
+    async def _build_signal(
+        self,
+        symbol: str,
+        frame: pd.DataFrame,
+        sentiment: SentimentScore | None,
+        current_price: float | None,
+    ) -> TradeSignal:
+        signal_start = time.perf_counter()
+        try:
+            return await asyncio.to_thread(
+                self.signal_generator.build_signal, symbol, frame, sentiment, current_price
+            )
+        except Exception as e:
+            logger.error(f"Error generating signal for {symbol}: {e}")
+            return self.signal_generator._create_hold_signal(symbol, str(e))
+        finally:
+            self.symbol_timings[symbol]["signal_ms"] = _elapsed_ms(signal_start)
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
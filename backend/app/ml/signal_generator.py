@@ -11,7 +11,7 @@ import pandas as pd
 from pydantic import BaseModel
 
 from .feature_engineering import FeatureEngineer
-from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_analyzer import SentimentScore, get_sentiment_analyzer
 
 
 logger = logging.getLogger(__name__)
@@ -66,7 +66,7 @@ class SignalGenerator:
             sentiment_weight: Weight for sentiment score (0-1)
             technical_weight: Weight for technical score (0-1)
         """
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = get_sentiment_analyzer()
         self.feature_engineer = FeatureEngineer()
         self.sentiment_weight = sentiment_weight
         self.technical_weight = technical_weight
@@ -89,67 +89,94 @@ class SignalGenerator:
             TradeSignal with recommendation
         """
         try:
-            # 1. Calculate technical indicators
-            technical_score, indicators = self._calculate_technical_score(price_data)
-
-            # 2. Get sentiment score
-            sentiment_score = 0.0
-            sentiment_reasoning = "No sentiment data available"
-
+            sentiment = None
             if news_articles:
-                sentiment_result = await self.sentiment_analyzer.analyze_news_batch(
+                sentiment = await self.sentiment_analyzer.analyze_news_batch(
                     symbol, news_articles
                 )
-                sentiment_score = sentiment_result.score
-                sentiment_reasoning = sentiment_result.reasoning
-
-            # 3. Combine scores
-            combined_score = (
-                technical_score * self.technical_weight
-                + sentiment_score * self.sentiment_weight
-            )
-
-            # 4. Generate signal
-            signal, strength, confidence = self._determine_signal(
-                combined_score, technical_score, sentiment_score
-            )
-
-            # 5. Calculate targets
-            current_price = float(price_data["close"].iloc[-1])
-            target_price, stop_loss = self._calculate_targets(
-                current_price, signal, strength, indicators
-            )
-
-            # 6. Generate reasoning
-            reasoning = self._generate_reasoning(
-                signal,
-                technical_score,
-                sentiment_score,
-                indicators,
-                sentiment_reasoning,
-            )
-
-            return TradeSignal(
-                symbol=symbol,
-                signal=signal,
-                strength=strength,
-                confidence=confidence,
-                price=current_price,
-                target_price=target_price,
-                stop_loss=stop_loss,
-                reasoning=reasoning,
-                technical_score=technical_score,
-                sentiment_score=sentiment_score,
-                combined_score=combined_score,
-                timestamp=datetime.now(UTC),
-                indicators=indicators,
-            )
+            return self.build_signal(symbol, price_data, sentiment)
 
         except Exception as e:
             logger.error(f"Error generating signal for {symbol}: {e}")
             # Return HOLD signal on error
             return self._create_hold_signal(symbol, str(e))
 
+    def build_signal(
+        self,
+        symbol: str,
+        price_data: pd.DataFrame,
+        sentiment: SentimentScore | None = None,
+        current_price: float | None = None,
+    ) -> TradeSignal:
+        """
+        Build a trade signal from price history and an already-scored sentiment
+
+        CPU-only (no I/O), so batch callers can score sentiment for many
+        symbols at once and run this in a worker thread.
+
+        Args:
+            symbol: Stock/asset symbol
+            price_data: Historical price DataFrame (OHLCV)
+            sentiment: Aggregated news sentiment (None = no sentiment data)
+            current_price: Latest quote (default: last close in price_data)
+
+        Raises:
+            Exception: On unusable price data (generate_signal turns this into HOLD)
+        """
+        # 1. Calculate technical indicators
+        technical_score, indicators = self._calculate_technical_score(price_data)
+
+        # 2. Get sentiment score
+        sentiment_score = 0.0
+        sentiment_reasoning = "No sentiment data available"
+
+        if sentiment is not None:
+            sentiment_score = sentiment.score
+            sentiment_reasoning = sentiment.reasoning
+
+        # 3. Combine scores
+        combined_score = (
+            technical_score * self.technical_weight
+            + sentiment_score * self.sentiment_weight
+        )
+
+        # 4. Generate signal
+        signal, strength, confidence = self._determine_signal(
+            combined_score, technical_score, sentiment_score
+        )
+
+        # 5. Calculate targets
+        if current_price is None:
+            current_price = float(price_data["close"].iloc[-1])
+        target_price, stop_loss = self._calculate_targets(
+            current_price, signal, strength, indicators
+        )
+
+        # 6. Generate reasoning
+        reasoning = self._generate_reasoning(
+            signal,
+            technical_score,
+            sentiment_score,
+            indicators,
+            sentiment_reasoning,
+        )
+
+        return TradeSignal(
+            symbol=symbol,
+            signal=signal,
+            strength=strength,
+            confidence=confidence,
+            price=current_price,
+            target_price=target_price,
+            stop_loss=stop_loss,
+            reasoning=reasoning,
+            technical_score=technical_score,
+            sentiment_score=sentiment_score,
+            combined_score=combined_score,
+            timestamp=datetime.now(UTC),
+            indicators=indicators,
+        )
+
     def _calculate_technical_score(
         self, df: pd.DataFrame
     ) -> tuple[float, dict[str, float]]:
@@ -159,18 +186,21 @@ class SignalGenerator:
         Returns:
             (score, indicators_dict)
         """
-        # Calculate indicators
-        df_with_indicators = self.feature_engineer.add_technical_indicators(df)
+        # Calculate indicators (too little history leaves the raw bars, so
+        # the defaults below apply)
+        df_with_indicators = self.feature_engineer.extract_features(df)
+        if df_with_indicators.empty:
+            df_with_indicators = df
 
         # Extract latest values
         latest = df_with_indicators.iloc[-1]
 
         indicators = {
-            "rsi": float(latest.get("rsi_14", 50)),
+            "rsi": float(latest.get("rsi", 50)),
             "macd": float(latest.get("macd", 0)),
             "macd_signal": float(latest.get("macd_signal", 0)),
             "bb_position": float(
-                latest.get("bb_position", 0)
+                latest.get("price_vs_bb", 0.5)
             ),  # Position within Bollinger Bands
             "sma_20": float(latest.get("sma_20", latest["close"])),
             "sma_50": float(latest.get("sma_50", latest["close"])),
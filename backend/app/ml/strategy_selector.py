@@ -17,10 +17,9 @@ from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import LabelEncoder, StandardScaler
 
-from ..services.backtesting_engine import BacktestingEngine
-from ..services.strategy_templates import get_all_strategy_templates
 from .data_pipeline import get_data_pipeline
-from .market_regime import get_regime_detector
+from .regime_service import get_regime_service
+from .training_dataset import TrainingDatasetBuilder
 
 
 logger = logging.getLogger(__name__)
@@ -78,89 +77,14 @@ class StrategySelector:
                 f"{lookback_days} days lookback..."
             )
 
-            pipeline = get_data_pipeline()
-            regime_detector = get_regime_detector()
-            backtest_engine = BacktestingEngine()
-
-            # Get all available strategies
-            strategies = get_all_strategy_templates()
-            if not strategies:
-                logger.error("No strategy templates available")
-                return None
-
-            strategy_ids = list(strategies.keys())
-            logger.info(f"Training with {len(strategy_ids)} strategies: {strategy_ids}")
-
-            all_samples = []
-
-            # For each symbol, create multiple time windows and backtest
-            for symbol in symbols:
-                logger.info(f"Processing {symbol}...")
-
-                # Fetch historical data
-                features_df = pipeline.prepare_features(symbol, lookback_days=lookback_days)
-
-                if features_df is None or len(features_df) < 100:
-                    logger.warning(f"Insufficient data for {symbol}, skipping")
-                    continue
-
-                # Create sliding windows (e.g., 60-day windows with 20-day stride)
-                window_size = 60
-                stride = 20
-
-                for start_idx in range(0, len(features_df) - window_size, stride):
-                    end_idx = start_idx + window_size
-                    window_data = features_df.iloc[start_idx:end_idx]
-
-                    # Extract market features for this window
-                    window_features = self._extract_window_features(window_data)
-
-                    # Detect market regime for this window
-                    regime_result = regime_detector.predict(symbol, lookback_days=window_size)
-                    window_features["regime"] = regime_result.get("regime", "unknown")
-
-                    # Backtest each strategy on this window
-                    strategy_results = {}
-
-                    for strategy_id, _strategy_template in strategies.items():
-                        try:
-                            # Run backtest
-                            result = backtest_engine.run_backtest(
-                                symbol=symbol,
-                                strategy_id=strategy_id,
-                                start_date=window_data.index[0],
-                                end_date=window_data.index[-1],
-                            )
-
-                            if result and result.total_return is not None:
-                                # Calculate strategy score (Sharpe ratio weighted by win rate)
-                                sharpe = result.sharpe_ratio or 0.0
-                                win_rate = result.win_rate or 0.0
-                                score = sharpe * (1 + win_rate)
-
-                                strategy_results[strategy_id] = {
-                                    "score": score,
-                                    "return": result.total_return,
-                                    "sharpe": sharpe,
-                                    "win_rate": win_rate,
-                                }
-                        except Exception as e:
-                            logger.debug(f"Backtest failed for {strategy_id} on {symbol}: {e}")
-                            continue
-
-                    # Find best performing strategy for this window
-                    if strategy_results:
-                        best_strategy = max(strategy_results.items(), key=lambda x: x[1]["score"])[
-                            0
-                        ]
-
-                        # Create training sample
-                        sample = {
-                            **window_features,
-                            "best_strategy": best_strategy,
-                            "symbol": symbol,
-                        }
-                        all_samples.append(sample)
+            # Each symbol is featurized once; window backtests run in a process
+            # pool and are memoized on disk (see training_dataset.py)
+            builder = TrainingDatasetBuilder()
+            all_samples = builder.build(
+                symbols,
+                lookback_days=lookback_days,
+                extract_features=self._extract_window_features,
+            )
 
             if not all_samples:
                 logger.error("No training samples created")
@@ -188,7 +112,6 @@ class StrategySelector:
 
             # Add regime as categorical feature
             regime_dummies = pd.get_dummies(df["regime"], prefix="regime")
-            feature_cols.extend(regime_dummies.columns)
 
             # ruff: noqa: N806  # X and y follow ML convention
             X = pd.concat([df[feature_cols], regime_dummies], axis=1)
@@ -368,9 +291,8 @@ class StrategySelector:
             # Extract window features
             window_features = self._extract_window_features(features_df)
 
-            # Get current regime
-            regime_detector = get_regime_detector()
-            regime_result = regime_detector.predict(symbol, lookback_days)
+            # Get current regime (served from the regime service's feature cache)
+            regime_result = get_regime_service().predict(symbol, lookback_days)
             current_regime = regime_result.get("regime", "unknown")
 
             # Create regime dummies
@@ -0,0 +1,328 @@
+"""
+Strategy Selector Training Dataset Builder
+
+Builds the (window features, best strategy) samples the StrategySelector is
+trained on, backtesting windows in a process pool with on-disk memoization.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..core.config import settings
+from ..services.backtesting_engine import StrategyRules
+from ..services.strategy_templates import get_all_strategy_templates
+from ..services.vectorized_backtest import VectorizedBacktestingEngine
+from .data_pipeline import get_data_pipeline
+from .market_regime import get_regime_detector
+
+
+logger = logging.getLogger(__name__)
+
+# Sliding windows: 60 trading days, a new window every 20
+WINDOW_SIZE = 60
+WINDOW_STRIDE = 20
+
+# Business-day origin the window buckets are counted from
+WINDOW_EPOCH = np.datetime64("2000-01-03", "D")
+
+# Minimum feature rows before a symbol is used
+MIN_ROWS = 100
+
+OHLCV_COLUMNS = ("open", "high", "low", "close", "volume")
+
+ProgressCallback = Callable[[int, int], None]
+
+
+def window_starts(index: pd.DatetimeIndex, window_size: int, stride: int) -> np.ndarray:
+    """
+    Row positions where windows start
+
+    Rows are grouped into ``stride``-business-day buckets counted from
+    WINDOW_EPOCH, and each bucket's first row starts a window, so window
+    boundaries do not move when the history is extended or shifted.
+    """
+    if len(index) < window_size:
+        return np.empty(0, dtype=np.int64)
+    days = index.values.astype("datetime64[D]")
+    buckets = np.busday_count(WINDOW_EPOCH, days) // stride
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    # History that begins mid-bucket would give a window no other run shares
+    if np.busday_count(WINDOW_EPOCH, days[0]) % stride:
+        starts = starts[1:]
+    return starts[starts + window_size <= len(index)]
+
+
+def run_window_backtest(task: tuple[str, str, list[dict], dict]) -> tuple[str, dict | None]:
+    """
+    Backtest one strategy on one window (module-level so process pools can pickle it)
+
+    Args:
+        task: (memo key, symbol, OHLCV bars, strategy template config)
+
+    Returns:
+        (memo key, score dict) or (memo key, None) if the backtest failed
+    """
+    key, symbol, prices, config = task
+    rules = StrategyRules(
+        entry_rules=config.get("entry_rules", []),
+        exit_rules=config.get("exit_rules", []),
+        position_size_percent=config.get("position_size_percent", 10.0),
+        max_positions=config.get("max_positions", 1),
+    )
+    try:
+        result = VectorizedBacktestingEngine().execute_backtest(symbol, prices, rules)
+    except Exception as e:
+        logger.debug(f"Window backtest failed for {symbol}: {e}")
+        return key, None
+
+    if result.total_return is None:
+        return key, None
+
+    # Strategy score: Sharpe ratio weighted by win rate
+    sharpe = result.sharpe_ratio or 0.0
+    win_rate = result.win_rate or 0.0
+    return key, {
+        "score": sharpe * (1 + win_rate),
+        "return": result.total_return,
+        "sharpe": sharpe,
+        "win_rate": win_rate,
+    }
+
+
+class BacktestMemo:
+    """On-disk memo of window backtest results, one JSON file per symbol"""
+
+    def __init__(self, root: str | Path | None = None):
+        self.root = Path(root or settings.ML_DATASET_CACHE_DIR)
+        self._entries: dict[str, dict[str, dict | None]] = {}
+        self._dirty: set[str] = set()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(strategy_id: str, config: dict, prices: list[dict]) -> str:
+        payload = json.dumps([strategy_id, config, prices], sort_keys=True, default=str)
+        return hashlib.sha1(payload.encode(), usedforsecurity=False).hexdigest()
+
+    def lookup(self, symbol: str, key: str) -> tuple[bool, dict | None]:
+        """Return (found, result) for a memoized backtest"""
+        result = self._load(symbol).get(key)
+        return result is not None, result
+
+    def store(self, symbol: str, key: str, result: dict | None) -> None:
+        """Memoize a backtest result; failures (None) are not kept"""
+        if result is None:
+            return
+        with self._lock:
+            self._load(symbol)[key] = result
+            self._dirty.add(symbol)
+
+    def flush(self) -> None:
+        """Write symbols with new results (atomic replace per file)"""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            for symbol in dirty:
+                try:
+                    self.root.mkdir(parents=True, exist_ok=True)
+                    path = self.root / f"{symbol}.json"
+                    tmp = path.with_suffix(".json.tmp")
+                    tmp.write_text(json.dumps(self._entries[symbol]))
+                    os.replace(tmp, path)
+                except OSError as e:
+                    logger.warning(f"⚠️ Backtest memo write failed for {symbol}: {e}")
+
+    def _load(self, symbol: str) -> dict[str, dict | None]:
+        entries = self._entries.get(symbol)
+        if entries is None:
+            try:
+                entries = json.loads((self.root / f"{symbol}.json").read_text())
+            except FileNotFoundError:
+                entries = {}
+            except Exception as e:
+                logger.warning(f"⚠️ Discarding unreadable backtest memo for {symbol}: {e}")
+                entries = {}
+            self._entries[symbol] = entries
+        return entries
+
+
+class TrainingDatasetBuilder:
+    """Builds strategy-selector training samples from memoized window backtests"""
+
+    def __init__(
+        self,
+        memo: BacktestMemo | None = None,
+        executor: Executor | None = None,
+        max_workers: int | None = None,
+        window_size: int = WINDOW_SIZE,
+        stride: int = WINDOW_STRIDE,
+    ):
+        """
+        Args:
+            memo: Backtest memo (default: on-disk memo under ML_DATASET_CACHE_DIR)
+            executor: Executor for backtests (default: a ProcessPoolExecutor per build)
+            max_workers: Worker processes when no executor is given (default: ML_DATASET_WORKERS)
+            window_size: Bars per window
+            stride: Business days between window starts
+        """
+        self.memo = memo or BacktestMemo()
+        self.executor = executor
+        self.max_workers = max_workers or settings.ML_DATASET_WORKERS
+        self.window_size = window_size
+        self.stride = stride
+        self.stats: dict[str, int] = {}
+
+    def build(
+        self,
+        symbols: list[str],
+        lookback_days: int = 365,
+        extract_features: Callable[[pd.DataFrame], dict[str, float]] | None = None,
+        progress: ProgressCallback | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Build one sample per (symbol, window) labelled with its best strategy
+
+        Args:
+            symbols: Symbols to build windows from
+            lookback_days: Days of history per symbol
+            extract_features: Window DataFrame -> summary features
+            progress: Called with (completed, total) as backtests finish
+
+        Returns:
+            List of sample dicts (window features, "regime", "best_strategy", "symbol")
+        """
+        templates = get_all_strategy_templates()
+        if not templates:
+            logger.error("No strategy templates available")
+            return []
+
+        self.stats = {
+            "symbols": 0,
+            "windows": 0,
+            "backtests_run": 0,
+            "backtests_cached": 0,
+        }
+        frames = self._prepare_symbols(symbols, lookback_days)
+        regime_detector = get_regime_detector()
+
+        windows = []  # (symbol, window DataFrame, regime, {strategy_id: memo key})
+        tasks = []
+        for symbol, features_df in frames.items():
+            starts = window_starts(features_df.index, self.window_size, self.stride)
+            if len(starts) == 0:
+                continue
+            self.stats["symbols"] += 1
+
+            ends = features_df.index[starts + self.window_size - 1]
+            regimes = regime_detector.predict_at(features_df, ends)
+            bars = _bar_records(features_df)
+
+            for start, regime in zip(starts, regimes, strict=True):
+                prices = bars[start : start + self.window_size]
+                keys = {}
+                for template in templates:
+                    key = BacktestMemo.key(template.id, template.config, prices)
+                    keys[template.id] = key
+                    found, _ = self.memo.lookup(symbol, key)
+                    if found:
+                        self.stats["backtests_cached"] += 1
+                    else:
+                        tasks.append((key, symbol, prices, template.config))
+                window = features_df.iloc[start : start + self.window_size]
+                windows.append((symbol, window, regime, keys))
+        self.stats["windows"] = len(windows)
+
+        self._run_backtests(tasks, progress)
+
+        samples = []
+        for symbol, window, regime, keys in windows:
+            results = {}
+            for strategy_id, key in keys.items():
+                _, result = self.memo.lookup(symbol, key)
+                if result is not None:
+                    results[strategy_id] = result
+            if not results:
+                continue
+
+            best_strategy = max(results.items(), key=lambda x: x[1]["score"])[0]
+            features = extract_features(window) if extract_features else {}
+            samples.append(
+                {
+                    **features,
+                    "regime": regime,
+                    "best_strategy": best_strategy,
+                    "symbol": symbol,
+                }
+            )
+
+        logger.info(
+            f"✅ Built {len(samples)} training samples from {self.stats['windows']} windows "
+            f"({self.stats['backtests_run']} backtests run, "
+            f"{self.stats['backtests_cached']} from memo)"
+        )
+        return samples
+
+    def _prepare_symbols(self, symbols: list[str], lookback_days: int) -> dict[str, pd.DataFrame]:
+        """Fetch and featurize every symbol once, concurrently"""
+        pipeline = get_data_pipeline()
+        frames = {}
+        with ThreadPoolExecutor(max_workers=min(8, max(1, len(symbols)))) as pool:
+            futures = {
+                pool.submit(pipeline.prepare_features, symbol, lookback_days): symbol
+                for symbol in symbols
+            }
+            for future in as_completed(futures):
+                symbol = futures[future]
+                features_df = future.result()
+                if features_df is None or len(features_df) < MIN_ROWS:
+                    logger.warning(f"Insufficient data for {symbol}, skipping")
+                    continue
+                frames[symbol] = features_df
+        # Keep the caller's symbol order
+        return {symbol: frames[symbol] for symbol in symbols if symbol in frames}
+
+    def _run_backtests(self, tasks: list[tuple], progress: ProgressCallback | None) -> None:
+        total = len(tasks)
+        if total == 0:
+            return
+
+        logger.info(f"Running {total} window backtests...")
+        executor = self.executor or ProcessPoolExecutor(max_workers=self.max_workers)
+        symbols = {task[0]: task[1] for task in tasks}
+        report_every = max(1, total // 10)
+        try:
+            futures = [executor.submit(run_window_backtest, task) for task in tasks]
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    key, result = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ Window backtest worker failed: {e}")
+                else:
+                    self.memo.store(symbols[key], key, result)
+                self.stats["backtests_run"] += 1
+                if progress:
+                    progress(done, total)
+                if done % report_every == 0 or done == total:
+                    logger.info(f"Window backtests: {done}/{total}")
+        finally:
+            if self.executor is None:
+                executor.shutdown()
+            self.memo.flush()
+
+
+def _bar_records(features_df: pd.DataFrame) -> list[dict[str, Any]]:
+    """OHLCV rows in the backtesting engine's bar format"""
+    dates = features_df.index.strftime("%Y-%m-%d").tolist()
+    columns = [features_df[name].astype(float).tolist() for name in OHLCV_COLUMNS]
+    return [
+        {"date": d, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+        for d, o, h, lo, c, v in zip(dates, *columns, strict=True)
+    ]
@@ -19,14 +19,20 @@ from ..core.unified_auth import get_current_user_unified
 from ..core.validators import InputSanitizer
 from ..db.session import get_db
 from ..models.database import User
+from ..services.bar_store import get_historical_bars
+from ..services.signal_pipeline import SignalPipeline
 from ..services.technical_indicators import TechnicalIndicators
-from ..services.tradier_client import get_tradier_client
+from ..services.tradier_client import get_async_tradier_client, get_tradier_client
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
+# Calendar days of daily history (extra days cover weekends/holidays)
+SIGNAL_HISTORY_DAYS = 250  # ~200 sessions for technical signals
+MOMENTUM_HISTORY_DAYS = 300  # 200-day SMA plus volatility's last 50 sessions
+
 
 class TradeData(BaseModel):
     """Pre-filled trade execution data for 1-click trading"""
@@ -82,6 +88,7 @@ class RecommendationsResponse(BaseModel):
     portfolioAnalysis: PortfolioAnalysis | None = None
     generated_at: str
     model_version: str = "v1.0.0"
+    timings: dict | None = None  # Per-symbol pipeline timing breakdown (ms)
 
 
 @router.get("/recommendations", response_model=RecommendationsResponse)
@@ -122,142 +129,146 @@ async def get_recommendations(current_user: User = Depends(get_current_user_unif
         # Randomly select 5 stocks for recommendations
         selected_symbols = random.sample(stock_symbols, min(5, len(stock_symbols)))
 
-        # Fetch real prices and generate real signals from Tradier
-        client = get_tradier_client()
-        quotes_response = client.get_quotes(selected_symbols)
-
-        recommendations = []
-
-        if "quotes" in quotes_response and "quote" in quotes_response["quotes"]:
-            quotes = quotes_response["quotes"]["quote"]
-            # Normalize to list
-            if isinstance(quotes, dict):
-                quotes = [quotes]
-
-            # Create quote lookup
-            quote_map = {q.get("symbol"): q for q in quotes if q.get("symbol")}
-
-            for symbol in selected_symbols:
-                quote = quote_map.get(symbol)
-
-                if not quote or "last" not in quote:
-                    logger.warning(f"No price data for {symbol}, skipping")
-                    continue
+        # Fetch real prices (one bulk call) and history for all symbols concurrently
+        pipeline = SignalPipeline(
+            get_tradier_client(), quote_client=get_async_tradier_client()
+        )
+        quote_map = await pipeline.fetch_quotes(selected_symbols)
 
-                current_price = float(quote["last"])
-                change_percent = float(quote.get("change_percentage", 0))
-                current_volume = int(quote.get("volume", 0))
+        priced_symbols = {}
+        for symbol in selected_symbols:
+            quote = quote_map.get(symbol)
 
-                # Fetch historical data for momentum and volume analysis
-                momentum_data = await _calculate_momentum_analysis(
-                    symbol, current_price, current_volume
-                )
+            if not quote or "last" not in quote:
+                logger.warning(f"No price data for {symbol}, skipping")
+                continue
 
-                # Calculate volatility analysis (ATR, BB width)
-                volatility_data = await _calculate_volatility_analysis(
-                    symbol, current_price
-                )
+            priced_symbols[symbol] = (
+                float(quote["last"]),
+                float(quote.get("change_percentage", 0)),
+                int(quote.get("volume", 0)),
+            )
 
-                # Map symbol to sector and find sector performance
-                symbol_sector = _map_symbol_to_sector(symbol)
-                sector_perf = None
-                if sector_performance_data and "sectors" in sector_performance_data:
-                    # Find this symbol's sector in the performance data
-                    for sec in sector_performance_data["sectors"]:
-                        if sec.get("name") == symbol_sector:
-                            sector_perf = {
-                                "name": sec["name"],
-                                "changePercent": sec.get("changePercent", 0),
-                                "rank": sec.get("rank", 0),
-                                "isLeader": sec["name"]
-                                == sector_performance_data.get("leader"),
-                                "isLaggard": sec["name"]
-                                == sector_performance_data.get("laggard"),
-                            }
-                            break
-
-                # Calculate entry price (slightly below current for limit orders)
-                entry_price = round(current_price * 0.995, 2)  # 0.5% below current
-                stop_loss = round(current_price * 0.95, 2)  # 5% stop loss
-                take_profit = round(current_price * 1.10, 2)  # 10% target
-
-                # Generate action based on momentum analysis + price movement
-                action, confidence, target_price, risk, reason = (
-                    _generate_signal_from_momentum(
-                        symbol,
-                        current_price,
-                        change_percent,
-                        momentum_data,
-                        entry_price,
-                        take_profit,
-                    )
-                )
+        def analyze(symbol: str, bars: list[dict]) -> tuple[dict, dict]:
+            current_price, _, current_volume = priced_symbols[symbol]
+            # Momentum/volume (SMA 20/50/200) and volatility (ATR, BB width)
+            # share one history fetch per symbol
+            return (
+                _calculate_momentum_analysis(symbol, current_price, current_volume, bars),
+                _calculate_volatility_analysis(symbol, current_price, bars),
+            )
 
-                # Adjust stop loss and take profit for SELL signals
-                if action == "SELL":
-                    stop_loss = round(current_price * 1.05, 2)
-                    take_profit = round(current_price * 0.90, 2)
+        analyses = await pipeline.run(
+            list(priced_symbols), history_days=MOMENTUM_HISTORY_DAYS, compute=analyze
+        )
 
-                # Calculate AI score (1-10) based on confidence, risk, momentum, and volume
-                score = _calculate_enhanced_score(
-                    confidence, risk, change_percent, momentum_data
-                )
+        recommendations = []
 
-                # Generate detailed explanation
-                explanation = _generate_recommendation_explanation(
+        for symbol, (current_price, change_percent, _) in priced_symbols.items():
+            if symbol not in analyses:
+                continue
+            momentum_data, volatility_data = analyses[symbol]
+
+            # Map symbol to sector and find sector performance
+            symbol_sector = _map_symbol_to_sector(symbol)
+            sector_perf = None
+            if sector_performance_data and "sectors" in sector_performance_data:
+                # Find this symbol's sector in the performance data
+                for sec in sector_performance_data["sectors"]:
+                    if sec.get("name") == symbol_sector:
+                        sector_perf = {
+                            "name": sec["name"],
+                            "changePercent": sec.get("changePercent", 0),
+                            "rank": sec.get("rank", 0),
+                            "isLeader": sec["name"]
+                            == sector_performance_data.get("leader"),
+                            "isLaggard": sec["name"]
+                            == sector_performance_data.get("laggard"),
+                        }
+                        break
+
+            # Calculate entry price (slightly below current for limit orders)
+            entry_price = round(current_price * 0.995, 2)  # 0.5% below current
+            stop_loss = round(current_price * 0.95, 2)  # 5% stop loss
+            take_profit = round(current_price * 1.10, 2)  # 10% target
+
+            # Generate action based on momentum analysis + price movement
+            action, confidence, target_price, risk, reason = (
+                _generate_signal_from_momentum(
                     symbol,
-                    action,
                     current_price,
                     change_percent,
                     momentum_data,
-                    confidence,
-                    risk,
+                    entry_price,
+                    take_profit,
                 )
+            )
 
-                # Analyze portfolio fit
-                portfolio_fit = _analyze_portfolio_fit(symbol, action, portfolio_data)
+            # Adjust stop loss and take profit for SELL signals
+            if action == "SELL":
+                stop_loss = round(current_price * 1.05, 2)
+                take_profit = round(current_price * 0.90, 2)
 
-                # Calculate suggested position size (% of portfolio)
-                suggested_qty = _calculate_position_size(
-                    current_price, portfolio_data, risk
-                )
+            # Calculate AI score (1-10) based on confidence, risk, momentum, and volume
+            score = _calculate_enhanced_score(
+                confidence, risk, change_percent, momentum_data
+            )
 
-                # Create trade data for 1-click execution
-                trade_data = None
-                if action in ["BUY", "SELL"]:
-                    trade_data = TradeData(
-                        symbol=symbol,
-                        side="buy" if action == "BUY" else "sell",
-                        quantity=suggested_qty,
-                        orderType="limit",
-                        entryPrice=entry_price,
-                        stopLoss=stop_loss,
-                        takeProfit=take_profit,
-                    )
+            # Generate detailed explanation
+            explanation = _generate_recommendation_explanation(
+                symbol,
+                action,
+                current_price,
+                change_percent,
+                momentum_data,
+                confidence,
+                risk,
+            )
 
-                recommendations.append(
-                    Recommendation(
-                        symbol=symbol,
-                        action=action,
-                        confidence=round(confidence, 1),
-                        score=score,
-                        reason=reason,
-                        targetPrice=target_price,
-                        currentPrice=current_price,
-                        timeframe="1-2 weeks" if action != "HOLD" else "Wait",
-                        risk=risk,
-                        entryPrice=entry_price if action != "HOLD" else None,
-                        stopLoss=stop_loss if action != "HOLD" else None,
-                        takeProfit=take_profit if action != "HOLD" else None,
-                        tradeData=trade_data,
-                        portfolioFit=portfolio_fit,
-                        momentum=momentum_data,
-                        volatility=volatility_data,
-                        sector=symbol_sector,
-                        sectorPerformance=sector_perf,
-                        explanation=explanation,
-                    )
+            # Analyze portfolio fit
+            portfolio_fit = _analyze_portfolio_fit(symbol, action, portfolio_data)
+
+            # Calculate suggested position size (% of portfolio)
+            suggested_qty = _calculate_position_size(
+                current_price, portfolio_data, risk
+            )
+
+            # Create trade data for 1-click execution
+            trade_data = None
+            if action in ["BUY", "SELL"]:
+                trade_data = TradeData(
+                    symbol=symbol,
+                    side="buy" if action == "BUY" else "sell",
+                    quantity=suggested_qty,
+                    orderType="limit",
+                    entryPrice=entry_price,
+                    stopLoss=stop_loss,
+                    takeProfit=take_profit,
+                )
+
+            recommendations.append(
+                Recommendation(
+                    symbol=symbol,
+                    action=action,
+                    confidence=round(confidence, 1),
+                    score=score,
+                    reason=reason,
+                    targetPrice=target_price,
+                    currentPrice=current_price,
+                    timeframe="1-2 weeks" if action != "HOLD" else "Wait",
+                    risk=risk,
+                    entryPrice=entry_price if action != "HOLD" else None,
+                    stopLoss=stop_loss if action != "HOLD" else None,
+                    takeProfit=take_profit if action != "HOLD" else None,
+                    tradeData=trade_data,
+                    portfolioFit=portfolio_fit,
+                    momentum=momentum_data,
+                    volatility=volatility_data,
+                    sector=symbol_sector,
+                    sectorPerformance=sector_perf,
+                    explanation=explanation,
                 )
+            )
 
         # Sort by score (highest first)
         recommendations.sort(key=lambda x: x.score, reverse=True)
@@ -276,6 +287,7 @@ async def get_recommendations(current_user: User = Depends(get_current_user_unif
             portfolioAnalysis=portfolio_analysis,
             generated_at=datetime.now(UTC).isoformat() + "Z",
             model_version="v2.0.0-portfolio-aware",
+            timings=pipeline.get_timings(),
         )
 
     except Exception as e:
@@ -381,21 +393,22 @@ async def get_ml_signals(
         ]  # Limit to 10
 
         recommendations = []
+        timings = None
+
+        if use_technical:
+            # Fetch history for all symbols concurrently; indicators run off the event loop
+            pipeline = SignalPipeline(get_tradier_client())
+            signals = await pipeline.run(
+                symbol_list,
+                history_days=SIGNAL_HISTORY_DAYS,
+                compute=_generate_technical_signal,
+            )
+            timings = pipeline.get_timings()
 
-        for symbol in symbol_list:
-            try:
-                if use_technical:
-                    # Generate real signal using technical indicators
-                    signal = await _generate_technical_signal(symbol)
-                    if signal and signal.confidence >= min_confidence:
-                        recommendations.append(signal)
-                else:
-                    # Fall back to mock data
-                    pass
-
-            except Exception as e:
-                logger.error(f"Error generating signal for {symbol}: {e!s}")
-                continue
+            for symbol in symbol_list:
+                signal = signals.get(symbol)
+                if signal and signal.confidence >= min_confidence:
+                    recommendations.append(signal)
 
         # Return empty recommendations if none met criteria (no mock fallback)
         if not recommendations:
@@ -409,6 +422,7 @@ async def get_ml_signals(
             recommendations=recommendations[:5],  # Return top 5
             generated_at=datetime.now(UTC).isoformat() + "Z",
             model_version="v2.0.0-technical",
+            timings=timings,
         )
 
     except Exception as e:
@@ -416,29 +430,17 @@ async def get_ml_signals(
         raise HTTPException(status_code=500, detail=str(e))
 
 
-async def _generate_technical_signal(symbol: str) -> Recommendation | None:
+def _generate_technical_signal(symbol: str, bars: list[dict]) -> Recommendation | None:
     """
     Generate signal using real technical analysis from Tradier historical data
 
+    Args:
+        symbol: Stock symbol
+        bars: Daily bars covering SIGNAL_HISTORY_DAYS (fetched by SignalPipeline)
+
     Returns None if data unavailable or signal doesn't meet criteria
     """
     try:
-        # Fetch real historical data from Tradier
-        from datetime import timedelta
-
-        client = get_tradier_client()
-
-        # Get 200 days of historical data
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=250)  # Extra days for weekends/holidays
-
-        bars = client.get_historical_bars(
-            symbol=symbol,
-            interval="daily",
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d"),
-        )
-
         if not bars or len(bars) < 50:
             logger.warning(
                 f"Insufficient historical data for {symbol} (got {len(bars)} bars)"
@@ -465,10 +467,15 @@ async def _generate_technical_signal(symbol: str) -> Recommendation | None:
         else:
             risk = "High"
 
+        # Score from confidence, risk and the latest daily move
+        change_percent = (prices[-1] / prices[-2] - 1) * 100 if prices[-2] else 0.0
+        score = _calculate_recommendation_score(signal_data["confidence"], risk, change_percent)
+
         recommendation = Recommendation(
             symbol=signal_data["symbol"],
             action=signal_data["action"],
             confidence=signal_data["confidence"],
+            score=score,
             reason=reasons_text,
             currentPrice=signal_data["current_price"],
             targetPrice=signal_data["take_profit"],
@@ -549,7 +556,8 @@ async def analyze_symbol(
         end_date = datetime.now()
         start_date = end_date - timedelta(days=250)
 
-        bars = client.get_historical_bars(
+        bars = get_historical_bars(
+            client,
             symbol=symbol,
             interval="daily",
             start_date=start_date.strftime("%Y-%m-%d"),
@@ -918,12 +926,15 @@ def _generate_portfolio_analysis(
 # ====== PHASE 3.A: ENHANCED MOMENTUM & VOLUME ANALYSIS ======
 
 
-async def _calculate_momentum_analysis(
-    symbol: str, current_price: float, current_volume: int
+def _calculate_momentum_analysis(
+    symbol: str, current_price: float, current_volume: int, bars: list[dict]
 ) -> dict:
     """
     Calculate momentum and volume analysis using historical data
 
+    Args:
+        bars: Daily bars covering MOMENTUM_HISTORY_DAYS (fetched by SignalPipeline)
+
     Returns:
     {
         "sma_20": float,
@@ -939,21 +950,6 @@ async def _calculate_momentum_analysis(
     }
     """
     try:
-        from datetime import timedelta
-
-        client = get_tradier_client()
-
-        # Get 250 days of historical data (extra for weekends/holidays)
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=300)
-
-        bars = client.get_historical_bars(
-            symbol=symbol,
-            interval="daily",
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d"),
-        )
-
         if not bars or len(bars) < 200:
             logger.warning(
                 f"⚠️ Insufficient data for momentum analysis: {symbol} ({len(bars) if bars else 0} bars)"
@@ -1203,10 +1199,13 @@ async def _fetch_sector_performance() -> dict:
         return {"sectors": [], "leader": "Unknown", "laggard": "Unknown"}
 
 
-async def _calculate_volatility_analysis(symbol: str, current_price: float) -> dict:
+def _calculate_volatility_analysis(symbol: str, current_price: float, bars: list[dict]) -> dict:
     """
     Calculate volatility analysis using ATR and Bollinger Band width
 
+    Args:
+        bars: Daily bars, at least the last 50 sessions (uses the momentum history)
+
     Returns:
     {
         "atr": float,  # Average True Range (absolute $)
@@ -1217,21 +1216,6 @@ async def _calculate_volatility_analysis(symbol: str, current_price: float) -> d
     }
     """
     try:
-        from datetime import timedelta
-
-        client = get_tradier_client()
-
-        # Get 60 days of OHLC data for ATR calculation
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=80)  # Extra for weekends
-
-        bars = client.get_historical_bars(
-            symbol=symbol,
-            interval="daily",
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d"),
-        )
-
         if not bars or len(bars) < 50:
             logger.warning(f"⚠️ Insufficient data for volatility analysis: {symbol}")
             return {
@@ -1590,7 +1574,8 @@ async def get_recommended_templates(
             end_date = datetime.now()
             start_date = end_date - timedelta(days=30)
 
-            bars = client.get_historical_bars(
+            bars = get_historical_bars(
+                client,
                 symbol="SPY",
                 interval="daily",
                 start_date=start_date.strftime("%Y-%m-%d"),
@@ -14,6 +14,7 @@ from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr, Field, field_validator
 from sqlalchemy.orm import Session
 
+from ..core.auth_cache import get_principal_cache
 from ..core.jwt import (
     create_token_pair,
     decode_token,
@@ -258,6 +259,9 @@ async def logout(
     db.add(activity)
     db.commit()
 
+    # Drop cached principals so the user's tokens are re-checked against the DB
+    get_principal_cache().invalidate_user(current_user.id)
+
     logger.info(f"✅ User logged out: {current_user.email}")
 
     return None  # 204 No Content
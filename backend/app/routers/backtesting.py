@@ -5,7 +5,7 @@ Endpoints for running strategy backtests and retrieving results.
 """
 
 import logging
-from typing import Any, ClassVar
+from typing import Any, ClassVar, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
@@ -14,6 +14,7 @@ from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
 from ..services.backtesting_engine import BacktestingEngine, StrategyRules
 from ..services.historical_data import HistoricalDataService
+from ..services.vectorized_backtest import VectorizedBacktestingEngine
 from ..utils.query_profiler import profile_endpoint
 
 
@@ -37,6 +38,10 @@ class BacktestRequest(BaseModel):
         10.0, ge=1, le=100, description="Position size % of portfolio"
     )
     max_positions: int = Field(1, ge=1, le=10, description="Max concurrent positions")
+    engine: Literal["vectorized", "loop"] = Field(
+        "vectorized",
+        description="Execution engine: columnar 'vectorized' (default) or bar-by-bar 'loop'",
+    )
 
     class Config:
         json_schema_extra: ClassVar[dict[str, Any]] = {
@@ -75,7 +80,7 @@ async def run_backtest(
 
     This endpoint:
     1. Fetches historical OHLCV data for the symbol
-    2. Simulates strategy execution bar-by-bar
+    2. Simulates strategy execution (vectorized by default, or bar-by-bar with engine="loop")
     3. Calculates performance metrics
     4. Returns detailed results including equity curve and trade history
 
@@ -132,8 +137,13 @@ async def run_backtest(
         )
 
         # Run backtest
-        logger.info(f"Running backtest for {request.symbol} with {len(prices)} bars")
-        engine = BacktestingEngine(initial_capital=request.initial_capital)
+        logger.info(
+            f"Running {request.engine} backtest for {request.symbol} with {len(prices)} bars"
+        )
+        engine_cls = (
+            VectorizedBacktestingEngine if request.engine == "vectorized" else BacktestingEngine
+        )
+        engine = engine_cls(initial_capital=request.initial_capital)
         result = engine.execute_backtest(symbol=request.symbol, prices=prices, strategy=strategy)
 
         # Convert dataclass to dict
@@ -10,6 +10,7 @@ Provides comprehensive health monitoring for PaiiD Trading Platform:
 
 import os
 from datetime import UTC, datetime
+from typing import Any
 
 import httpx
 from fastapi import APIRouter, Depends, HTTPException
@@ -17,6 +18,7 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from ..core.auth_cache import get_principal_cache
 from ..core.config import settings
 from ..core.unified_auth import get_current_user_unified
 from ..db.session import engine
@@ -54,6 +56,7 @@ class DetailedHealthResponse(BaseModel):
     time: str
     uptime_seconds: float
     dependencies: dict[str, DependencyStatus]
+    auth_cache: dict[str, Any] | None = None
     version: str = "1.0.0"
 
 
@@ -81,6 +84,8 @@ async def detailed_health_check(current_user: User = Depends(get_current_user_un
     - Database (if configured)
     - Cache (if configured)
 
+    Also reports auth principal cache hit/miss metrics.
+
     Requires authentication.
     """
     import logging
@@ -119,6 +124,7 @@ async def detailed_health_check(current_user: User = Depends(get_current_user_un
             time=datetime.now(UTC).isoformat(),
             uptime_seconds=uptime,
             dependencies=dependencies,
+            auth_cache=get_principal_cache().get_stats(),
         )
     except Exception as e:
         logger.error(f"Detailed health check failed: {e}", exc_info=True)
@@ -17,6 +17,7 @@ from ..core.config import settings
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
 from ..services.cache import CacheService, get_cache
+from ..services.tiered_cache import TieredCache, get_tiered_cache
 
 
 # Minimal load log
@@ -414,7 +415,7 @@ async def get_major_indices(
 @router.get("/market/sectors")
 async def get_sector_performance(
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ) -> dict:
     """
     Get performance of major market sectors using real Tradier data
@@ -423,14 +424,7 @@ async def get_sector_performance(
     """
     # using top-level datetime (UTC-aware timestamps below)
 
-    # Check cache first (60s TTL)
-    cache_key = "market:sectors"
-    cached = cache.get(cache_key)
-    if cached:
-        print("[Sector Performance] ✅ Cache HIT")
-        return {**cached, "cached": True}
-
-    try:
+    def load_sectors() -> dict:
         # Define sector ETFs
         sector_etfs = [
             {"name": "Technology", "symbol": "XLK"},
@@ -459,60 +453,62 @@ async def get_sector_performance(
             timeout=5,  # Add timeout for reliability
         )
 
-        sectors = []
-
-        if resp.status_code == 200:
-            data = resp.json()
-            quotes = data.get("quotes", {}).get("quote", [])
-            if isinstance(quotes, dict):
-                quotes = [quotes]
-
-            # Create quote lookup
-            quote_map = {q.get("symbol"): q for q in quotes if q.get("symbol")}
-
-            # Build sector list with real data
-            for sector in sector_etfs:
-                quote = quote_map.get(sector["symbol"])
-                if quote and "change_percentage" in quote:
-                    change_percent = float(quote.get("change_percentage", 0))
-                    sectors.append(
-                        {
-                            "name": sector["name"],
-                            "symbol": sector["symbol"],
-                            "changePercent": round(change_percent, 2),
-                            "last": float(quote.get("last", 0)),
-                        }
-                    )
-
-            # Sort by performance (descending)
-            sectors.sort(key=lambda x: x["changePercent"], reverse=True)
+        if resp.status_code != 200:
+            raise Exception(f"Tradier API returned status {resp.status_code}")
 
-            # Add ranks
-            for idx, sector in enumerate(sectors):
-                sector["rank"] = idx + 1
+        sectors = []
+        data = resp.json()
+        quotes = data.get("quotes", {}).get("quote", [])
+        if isinstance(quotes, dict):
+            quotes = [quotes]
+
+        # Create quote lookup
+        quote_map = {q.get("symbol"): q for q in quotes if q.get("symbol")}
+
+        # Build sector list with real data
+        for sector in sector_etfs:
+            quote = quote_map.get(sector["symbol"])
+            if quote and "change_percentage" in quote:
+                change_percent = float(quote.get("change_percentage", 0))
+                sectors.append(
+                    {
+                        "name": sector["name"],
+                        "symbol": sector["symbol"],
+                        "changePercent": round(change_percent, 2),
+                        "last": float(quote.get("last", 0)),
+                    }
+                )
 
-            # Identify leader and laggard
-            leader = sectors[0]["name"] if sectors else "Unknown"
-            laggard = sectors[-1]["name"] if sectors else "Unknown"
+        # Sort by performance (descending)
+        sectors.sort(key=lambda x: x["changePercent"], reverse=True)
 
-            result = {
-                "sectors": sectors,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "leader": leader,
-                "laggard": laggard,
-                "source": "tradier",
-            }
+        # Add ranks
+        for idx, sector in enumerate(sectors):
+            sector["rank"] = idx + 1
 
-            # Cache for 60 seconds
-            cache.set(cache_key, result, ttl=60)
+        # Identify leader and laggard
+        leader = sectors[0]["name"] if sectors else "Unknown"
+        laggard = sectors[-1]["name"] if sectors else "Unknown"
 
-            print(
-                f"[Sector Performance] ✅ Fetched {len(sectors)} real sector ETFs from Tradier"
-            )
-            return result
+        print(
+            f"[Sector Performance] ✅ Fetched {len(sectors)} real sector ETFs from Tradier"
+        )
+        return {
+            "sectors": sectors,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "leader": leader,
+            "laggard": laggard,
+            "source": "tradier",
+        }
 
-        else:
-            raise Exception(f"Tradier API returned status {resp.status_code}")
+    try:
+        lookup = await cache.fetch(
+            "market", "sectors", load_sectors, ttl=settings.CACHE_TTL_SECTORS
+        )
+        if lookup.cached:
+            print(f"[Sector Performance] ✅ Cache HIT ({lookup.source})")
+            return {**lookup.value, "cached": True}
+        return lookup.value
 
     except Exception as e:
         print(f"[Sector Performance] ❌ Error fetching from Tradier: {e}")
@@ -6,6 +6,7 @@ This module uses Tradier API for ALL market data.
 Alpaca is ONLY used for paper trading execution (see orders.py).
 """
 
+import asyncio
 import logging
 from datetime import UTC, datetime, timedelta
 
@@ -15,8 +16,14 @@ from ..core.config import get_settings
 from ..core.readiness_registry import get_readiness_registry
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
-from ..services.cache import CacheService, get_cache
-from ..services.tradier_client import ProviderHTTPError, get_tradier_client
+from ..services.bar_store import get_bar_store, get_historical_bars
+from ..services.cache import CacheService, get_cache, namespace_tag, symbol_tag
+from ..services.tiered_cache import TieredCache, get_tiered_cache
+from ..services.tradier_client import (
+    ProviderHTTPError,
+    get_async_tradier_client,
+    get_tradier_client,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -44,7 +51,7 @@ router = APIRouter(dependencies=[Depends(_check_tradier_readiness)])
 async def get_quote(
     symbol: str = Path(..., min_length=1, max_length=10, description="Stock symbol"),
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """Get real-time quote for a symbol using Tradier (cached with configurable TTL)
 
@@ -58,7 +65,8 @@ async def get_quote(
         try:
             end_date = datetime.now(UTC)
             start_date = end_date - timedelta(days=7)
-            bars = client.get_historical_bars(
+            bars = get_historical_bars(
+                client,
                 symbol=sym,
                 interval="daily",
                 start_date=start_date.strftime("%Y-%m-%d"),
@@ -106,33 +114,37 @@ async def get_quote(
 
         return result
 
-    # Check cache first (using configurable TTL)
-    cache_key = f"quote:{symbol.upper()}"
-    cached_quote = cache.get(cache_key)
-    if cached_quote:
-        logger.info(
-            f"✅ Cache HIT for quote {symbol} (TTL: {settings.CACHE_TTL_QUOTE}s)"
-        )
-        cached_quote["cached"] = True
-        return cached_quote
+    symbol_upper = symbol.upper()
 
-    try:
-        client = get_tradier_client()
-        quotes_data = client.get_quotes([symbol])
+    async def load_quote() -> dict:
+        try:
+            quotes_data = await get_async_tradier_client().get_quotes([symbol])
+        except ProviderHTTPError as e:
+            if e.status_code in (400, 404):
+                # Fallback on upstream not found
+                fb = await asyncio.to_thread(
+                    _fallback_quote_from_history, symbol, get_tradier_client()
+                )
+                if fb:
+                    logger.info(
+                        f"🟡 Fallback quote (historical) used for {symbol} after provider 404"
+                    )
+                    return fb
+            raise
 
-        if not quotes_data or symbol.upper() not in quotes_data:
+        if not quotes_data or symbol_upper not in quotes_data:
             # Fallback to historical last close to avoid 404
-            fb = _fallback_quote_from_history(symbol, client)
+            fb = await asyncio.to_thread(
+                _fallback_quote_from_history, symbol, get_tradier_client()
+            )
             if fb:
-                cache.set(cache_key, fb, ttl=settings.CACHE_TTL_QUOTE)
                 logger.info(f"🟡 Fallback quote (historical) used for {symbol}")
                 return fb
             raise HTTPException(status_code=404, detail=f"No quote found for {symbol}")
 
-        quote = quotes_data[symbol.upper()]
-
-        result = {
-            "symbol": symbol.upper(),
+        quote = quotes_data[symbol_upper]
+        return {
+            "symbol": symbol_upper,
             "bid": float(quote.get("bid", 0)),
             "ask": float(quote.get("ask", 0)),
             "last": float(quote.get("last", 0)),
@@ -141,23 +153,27 @@ async def get_quote(
             "cached": False,
         }
 
-        # Cache with configurable TTL from settings
-        cache.set(cache_key, result, ttl=settings.CACHE_TTL_QUOTE)
+    try:
+        # Two-tier cache (configurable TTL); concurrent misses share one Tradier call
+        lookup = await cache.fetch(
+            "quote",
+            symbol_upper,
+            load_quote,
+            ttl=settings.CACHE_TTL_QUOTE,
+            tags=(symbol_tag(symbol_upper),),
+        )
+        if lookup.cached:
+            logger.info(
+                f"✅ Cache HIT ({lookup.source}) for quote {symbol} "
+                f"(TTL: {settings.CACHE_TTL_QUOTE}s)"
+            )
+            return {**lookup.value, "cached": True}
         logger.info(f"💾 Cached quote {symbol} (TTL: {settings.CACHE_TTL_QUOTE}s)")
-        return result
+        return lookup.value
     except HTTPException:
         raise
     except ProviderHTTPError as e:
         if e.status_code in (400, 404):
-            # Fallback on upstream not found
-            client = get_tradier_client()
-            fb = _fallback_quote_from_history(symbol, client)
-            if fb:
-                cache.set(cache_key, fb, ttl=settings.CACHE_TTL_QUOTE)
-                logger.info(
-                    f"🟡 Fallback quote (historical) used for {symbol} after provider 404"
-                )
-                return fb
             raise HTTPException(
                 status_code=404, detail=f"Upstream not found: {symbol}"
             ) from e
@@ -170,8 +186,8 @@ async def get_quote(
         raise HTTPException(status_code=502, detail="Upstream error") from e
     except Exception as e:
         logger.error(f"❌ Tradier quote request failed for {symbol}: {e!s}")
-        # Last resort: return cached (if any) rather than 500
-        cached_last = cache.get(cache_key)
+        # Last resort: return cached (if any, even expired) rather than 500
+        cached_last = cache.peek("quote", symbol_upper)
         if cached_last:
             logger.warning(f"Returning cached quote for {symbol} due to error")
             return {**cached_last, "cached": True}
@@ -186,7 +202,7 @@ async def get_quotes(
         ..., min_length=1, max_length=200, description="Comma-separated symbols"
     ),
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """Get quotes for multiple symbols (comma-separated) using Tradier with intelligent caching
 
@@ -222,30 +238,26 @@ async def get_quotes(
     try:
         symbol_list = [s.strip().upper() for s in symbols.split(",")]
         result = {}
-        cache_misses = []
-        cache_hits = 0
 
-        # Check cache for each symbol individually
-        for symbol in symbol_list:
-            cache_key = f"quote:{symbol}"
-            cached = cache.get(cache_key)
-            if cached:
-                # Extract the quote data (removing meta fields like 'cached')
-                result[symbol] = {
-                    "bid": cached.get("bid"),
-                    "ask": cached.get("ask"),
-                    "last": cached.get("last"),
-                    "timestamp": cached.get("timestamp"),
-                }
-                cache_hits += 1
-            else:
-                cache_misses.append(symbol)
+        # One L1 pass plus one pipelined Redis round trip for all symbols
+        symbol_tags = {sym: (symbol_tag(sym),) for sym in symbol_list}
+        cached_quotes = await cache.get_many("quote", symbol_list, tags=symbol_tags)
+        for symbol, cached in cached_quotes.items():
+            # Extract the quote data (removing meta fields like 'cached')
+            result[symbol] = {
+                "bid": cached.get("bid"),
+                "ask": cached.get("ask"),
+                "last": cached.get("last"),
+                "timestamp": cached.get("timestamp"),
+            }
+        cache_hits = len(cached_quotes)
+        cache_misses = [sym for sym in symbol_list if sym not in cached_quotes]
 
         # Fetch cache misses from API in batch
         if cache_misses:
-            client = get_tradier_client()
-            quotes_data = client.get_quotes(cache_misses)
+            quotes_data = await get_async_tradier_client().get_quotes(cache_misses)
 
+            fetched = {}
             for symbol in cache_misses:
                 if symbol in quotes_data:
                     q = quotes_data[symbol]
@@ -258,10 +270,10 @@ async def get_quotes(
                     result[symbol] = quote
 
                     # Cache individual quote with metadata
-                    cache_entry = {**quote, "symbol": symbol, "cached": False}
-                    cache.set(
-                        f"quote:{symbol}", cache_entry, ttl=settings.CACHE_TTL_QUOTE
-                    )
+                    fetched[symbol] = {**quote, "symbol": symbol, "cached": False}
+            await cache.set_many(
+                "quote", fetched, ttl=settings.CACHE_TTL_QUOTE, tags=symbol_tags
+            )
 
         logger.info(
             f"✅ Retrieved {len(result)} quotes "
@@ -295,7 +307,7 @@ async def get_bars(
     ),
     limit: int = Query(100, ge=1, le=1000, description="Number of bars to return"),
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """Get historical price bars using Tradier with intelligent caching
 
@@ -304,19 +316,7 @@ async def get_bars(
     # Get settings for cache TTL
     settings = get_settings()
 
-    # Create cache key based on symbol, timeframe, and limit
-    cache_key = f"bars:{symbol.upper()}:{timeframe}:{limit}"
-
-    # Check cache first
-    cached_bars = cache.get(cache_key)
-    if cached_bars:
-        logger.info(
-            f"✅ Cache HIT for bars {symbol} {timeframe} "
-            f"(TTL: {settings.CACHE_TTL_HISTORICAL_BARS}s)"
-        )
-        return {**cached_bars, "cached": True}
-
-    try:
+    def load_bars() -> dict:
         client = get_tradier_client()
 
         # Map timeframe to Tradier intervals
@@ -344,7 +344,8 @@ async def get_bars(
         else:  # daily, weekly, monthly
             start_date = end_date - timedelta(days=limit * 2)  # Approximate
 
-        bars_data = client.get_historical_bars(
+        bars_data = get_historical_bars(
+            client,
             symbol=symbol,
             interval=interval,
             start_date=start_date.strftime("%Y-%m-%d"),
@@ -364,15 +365,29 @@ async def get_bars(
                 }
             )
 
-        response = {"symbol": symbol.upper(), "bars": result, "cached": False}
+        return {"symbol": symbol.upper(), "bars": result, "cached": False}
+
+    try:
+        # Long TTL since historical data doesn't change
+        lookup = await cache.fetch(
+            "bars",
+            f"{symbol.upper()}:{timeframe}:{limit}",
+            load_bars,
+            ttl=settings.CACHE_TTL_HISTORICAL_BARS,
+            tags=(symbol_tag(symbol),),
+        )
+        if lookup.cached:
+            logger.info(
+                f"✅ Cache HIT ({lookup.source}) for bars {symbol} {timeframe} "
+                f"(TTL: {settings.CACHE_TTL_HISTORICAL_BARS}s)"
+            )
+            return {**lookup.value, "cached": True}
 
-        # Cache with long TTL since historical data doesn't change
-        cache.set(cache_key, response, ttl=settings.CACHE_TTL_HISTORICAL_BARS)
         logger.info(
-            f"✅ Retrieved {len(result)} bars for {symbol} from Tradier "
+            f"✅ Retrieved {len(lookup.value['bars'])} bars for {symbol} from Tradier "
             f"(cached for {settings.CACHE_TTL_HISTORICAL_BARS}s)"
         )
-        return response
+        return lookup.value
     except ProviderHTTPError as e:
         if e.status_code in (400, 404):
             raise HTTPException(
@@ -395,7 +410,7 @@ async def get_bars(
 @router.get("/market/scanner/under4")
 async def scan_under_4(
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """Scan for stocks under $4 with volume using Tradier with caching
 
@@ -405,16 +420,7 @@ async def scan_under_4(
     # Get settings for cache TTL
     settings = get_settings()
 
-    # Check cache first
-    cache_key = "scanner:under4"
-    cached_results = cache.get(cache_key)
-    if cached_results:
-        logger.info(
-            f"✅ Cache HIT for scanner under $4 (TTL: {settings.CACHE_TTL_SCANNER}s)"
-        )
-        return {**cached_results, "cached": True}
-
-    try:
+    def load_scanner() -> dict:
         # Pre-defined list of liquid stocks that trade near/under $4
         candidates = [
             "SOFI",
@@ -459,15 +465,24 @@ async def scan_under_4(
         # Sort by price ascending
         results.sort(key=lambda x: x["price"])
 
-        response = {"candidates": results, "count": len(results), "cached": False}
+        return {"candidates": results, "count": len(results), "cached": False}
+
+    try:
+        lookup = await cache.fetch(
+            "scanner", "under4", load_scanner, ttl=settings.CACHE_TTL_SCANNER
+        )
+        if lookup.cached:
+            logger.info(
+                f"✅ Cache HIT ({lookup.source}) for scanner under $4 "
+                f"(TTL: {settings.CACHE_TTL_SCANNER}s)"
+            )
+            return {**lookup.value, "cached": True}
 
-        # Cache scanner results
-        cache.set(cache_key, response, ttl=settings.CACHE_TTL_SCANNER)
         logger.info(
-            f"✅ Scanner found {len(results)} stocks under $4 from Tradier "
+            f"✅ Scanner found {lookup.value['count']} stocks under $4 from Tradier "
             f"(cached for {settings.CACHE_TTL_SCANNER}s)"
         )
-        return response
+        return lookup.value
     except Exception as e:
         logger.error(f"❌ Tradier scanner request failed: {e!s}")
         raise HTTPException(
@@ -499,6 +514,8 @@ async def get_cache_stats(
         "cache_misses": health_monitor.cache_misses,
         "total_requests": total_cache_ops,
         "hit_rate_percent": hit_rate,
+        "bar_store": get_bar_store().get_stats(),
+        "tiered": get_tiered_cache().get_stats(),
         "timestamp": datetime.now(UTC).isoformat(),
     }
 
@@ -602,7 +619,8 @@ async def get_historical_data(
         interval = interval_map.get(timeframe, "daily")
 
         # Fetch historical data from Tradier
-        bars_data = client.get_historical_bars(
+        bars_data = get_historical_bars(
+            client,
             symbol=symbol,
             interval=interval,
             start_date=start_date.strftime("%Y-%m-%d"),
@@ -633,7 +651,12 @@ async def get_historical_data(
         }
 
         # Cache with long TTL (historical data doesn't change)
-        cache.set(cache_key, response, ttl=settings.CACHE_TTL_HISTORICAL_BARS)
+        cache.set(
+            cache_key,
+            response,
+            ttl=settings.CACHE_TTL_HISTORICAL_BARS,
+            tags=(namespace_tag("historical"), symbol_tag(symbol)),
+        )
         logger.info(
             f"✅ Retrieved {len(result_bars)} historical bars for {symbol} from Tradier "
             f"(cached for {settings.CACHE_TTL_HISTORICAL_BARS}s)"
@@ -662,33 +685,44 @@ async def get_historical_data(
 
 @router.post("/market/cache/clear")
 async def clear_market_cache(
+    symbol: str | None = Query(
+        None, description="Only clear data cached for this symbol (all market caches if omitted)"
+    ),
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """
     Clear all market data caches
 
     Invalidates all cached quotes, bars, scanner results, etc.
     Use this to force fresh data from Tradier API.
-    """
-    # Clear all market-related cache patterns
-    patterns_cleared = 0
 
-    patterns = [
-        "quote:*",
-        "bars:*",
-        "scanner:*",
-        "historical:*",
-    ]
+    Invalidation goes through tag sets and namespace generations, never a
+    Redis KEYS scan over the whole keyspace.
+    """
+    if symbol:
+        entries_cleared = await cache.invalidate_tags(symbol_tag(symbol))
+        logger.info(f"🧹 Cleared {entries_cleared} cache entries for {symbol.upper()}")
+        return {
+            "success": True,
+            "symbol": symbol.upper(),
+            "entries_cleared": entries_cleared,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
 
-    for pattern in patterns:
-        count = cache.clear_pattern(pattern)
-        patterns_cleared += count
+    # Tiered-cache namespaces flush by generation; historical bars are
+    # written straight to Redis and purged by their namespace tag
+    namespaces = ["quote", "bars", "scanner"]
+    entries_cleared = 0
+    for namespace in namespaces:
+        entries_cleared += await cache.flush_namespace(namespace)
+    entries_cleared += await cache.invalidate_tags(namespace_tag("historical"))
 
-    logger.info(f"🧹 Cleared {patterns_cleared} market cache entries")
+    logger.info(f"🧹 Cleared {entries_cleared} market cache entries")
 
     return {
         "success": True,
-        "entries_cleared": patterns_cleared,
+        "entries_cleared": entries_cleared,
+        "namespaces_flushed": [*namespaces, "historical"],
         "timestamp": datetime.now(UTC).isoformat(),
     }
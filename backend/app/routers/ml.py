@@ -7,6 +7,7 @@ Endpoints for ML-powered features:
 - Pattern recognition
 """
 
+import asyncio
 import logging
 from datetime import datetime
 from typing import Any
@@ -14,7 +15,12 @@ from typing import Any
 import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 
-from ..ml import get_pattern_detector, get_regime_detector, get_strategy_selector
+from ..ml import (
+    get_pattern_detector,
+    get_regime_detector,
+    get_regime_service,
+    get_strategy_selector,
+)
 
 
 logger = logging.getLogger(__name__)
@@ -42,10 +48,10 @@ async def get_market_regime(
     try:
         logger.info(f"Market regime detection requested for {symbol}")
 
-        detector = get_regime_detector()
-
-        # Predict regime
-        result = detector.predict(symbol, lookback_days)
+        # Predict regime (warm model, cached features); a cold model or a
+        # feature rebuild blocks, so keep it off the event loop
+        service = get_regime_service()
+        result = await asyncio.to_thread(service.predict, symbol, lookback_days)
 
         if result.get("regime") == "unknown":
             raise HTTPException(
@@ -55,7 +61,7 @@ async def get_market_regime(
 
         # Get recommended strategies
         regime = result["regime"]
-        recommended_strategies = detector.get_recommended_strategies(regime)
+        recommended_strategies = service.detector.get_recommended_strategies(regime)
 
         return {
             "symbol": symbol,
@@ -100,9 +106,9 @@ async def train_regime_detector(
     try:
         logger.info(f"Training regime detector on {symbol} ({lookback_days} days)...")
 
-        detector = get_regime_detector()
-
-        success = detector.train(symbol, lookback_days)
+        # Trains and persists, so restarts load this model instead of retraining
+        service = get_regime_service()
+        success = await asyncio.to_thread(service.train, symbol, lookback_days)
 
         if not success:
             raise HTTPException(status_code=500, detail="Training failed - check logs for details")
@@ -110,7 +116,7 @@ async def train_regime_detector(
         return {
             "success": True,
             "message": f"Regime detector trained successfully on {symbol}",
-            "regime_labels": detector.regime_labels,
+            "regime_labels": service.detector.regime_labels,
             "training_data": {
                 "symbol": symbol,
                 "lookback_days": lookback_days,
@@ -144,6 +150,7 @@ async def ml_health_check() -> dict[str, Any]:
             "regime_detector_ready": detector.is_fitted,
             "regime_labels": detector.regime_labels if detector.is_fitted else {},
             "n_clusters": detector.n_clusters,
+            "regime_service": get_regime_service().get_stats(),
         }
 
     except Exception as e:
@@ -181,24 +188,25 @@ async def recommend_strategy(
         selector = get_strategy_selector()
 
         # Get recommendations
-        recommendations = selector.recommend(symbol, lookback_days, top_n)
+        recommendations = await asyncio.to_thread(selector.recommend, symbol, lookback_days, top_n)
 
         if not recommendations:
             # Fallback to regime-based recommendations if ML fails
             logger.warning(f"ML recommendation failed for {symbol}, using regime-based fallback")
-            detector = get_regime_detector()
-            regime_result = detector.predict(symbol, lookback_days)
+            service = get_regime_service()
+            regime_result = await asyncio.to_thread(service.predict, symbol, lookback_days)
             regime = regime_result.get("regime", "unknown")
 
-            fallback_strategies = detector.get_recommended_strategies(regime)
+            fallback_strategies = service.detector.get_recommended_strategies(regime)
             recommendations = [
                 {"strategy_id": s, "probability": 0.5, "confidence": 0.5}
                 for s in fallback_strategies[:top_n]
             ]
 
         # Get current market regime for context
-        detector = get_regime_detector()
-        regime_result = detector.predict(symbol, lookback_days)
+        regime_result = await asyncio.to_thread(
+            get_regime_service().predict, symbol, lookback_days
+        )
 
         return {
             "symbol": symbol,
@@ -15,10 +15,11 @@ from pydantic import BaseModel
 from ..core.config import settings
 from ..core.redis_client import get_redis
 from ..core.unified_auth import get_current_user_unified
-from ..ml.data_pipeline import MLDataPipeline
 from ..ml.sentiment_analyzer import get_sentiment_analyzer
-from ..ml.signal_generator import SignalType, get_signal_generator
+from ..ml.signal_batch import BatchSignalPipeline
+from ..ml.signal_generator import SignalType, TradeSignal, get_signal_generator
 from ..models.database import User
+from ..services.news.news_aggregator import get_news_aggregator
 
 
 logger = logging.getLogger(__name__)
@@ -67,6 +68,32 @@ class SignalResponse(BaseModel):
     timestamp: datetime
 
 
+class BatchSignalsResponse(BaseModel):
+    """Batch trade signal response"""
+
+    data: list[SignalResponse]
+    count: int
+    timings: dict | None = None  # Per-stage and per-symbol pipeline timing (ms)
+    timestamp: str
+
+
+def _signal_response(signal: TradeSignal) -> SignalResponse:
+    return SignalResponse(
+        symbol=signal.symbol,
+        signal=signal.signal,
+        strength=signal.strength.value,
+        confidence=signal.confidence,
+        price=signal.price,
+        target_price=signal.target_price,
+        stop_loss=signal.stop_loss,
+        reasoning=signal.reasoning,
+        technical_score=signal.technical_score,
+        sentiment_score=signal.sentiment_score,
+        combined_score=signal.combined_score,
+        timestamp=signal.timestamp,
+    )
+
+
 # Endpoints
 @router.get("/sentiment/{symbol}", response_model=SentimentResponse)
 async def get_sentiment(
@@ -89,7 +116,7 @@ async def get_sentiment(
             include_news=include_news,
             lookback_days=lookback_days,
         )
-        redis = get_redis()
+        redis = await get_redis()
 
         cached = await redis.get(cache_key)
         if cached:
@@ -102,16 +129,17 @@ async def get_sentiment(
 
         logger.info(f"Cache MISS for sentiment: {symbol}")
         sentiment_analyzer = get_sentiment_analyzer()
-        data_pipeline = MLDataPipeline()
 
         if include_news:
-            # Fetch recent news
-            end_date = datetime.now(UTC)
-            start_date = end_date - timedelta(days=lookback_days)
-
-            news_articles = await data_pipeline.fetch_news(
-                symbol=symbol, start_date=start_date, end_date=end_date
-            )
+            # Fetch recent news (no configured provider scores as "no news")
+            try:
+                aggregator = get_news_aggregator()
+            except ValueError as e:
+                logger.warning(f"⚠️ News unavailable for sentiment: {e}")
+                news_articles = []
+            else:
+                news = await aggregator.aget_company_news(symbol, lookback_days)
+                news_articles = news.articles
 
             if news_articles:
                 # Analyze news sentiment
@@ -196,7 +224,7 @@ async def get_trade_signal(
             include_sentiment=include_sentiment,
             lookback_days=lookback_days,
         )
-        redis = get_redis()
+        redis = await get_redis()
 
         cached = await redis.get(cache_key)
         if cached:
@@ -208,54 +236,17 @@ async def get_trade_signal(
             }
 
         logger.info(f"Cache MISS for signal: {symbol}")
-        signal_generator = get_signal_generator()
-        data_pipeline = MLDataPipeline()
-
-        # Fetch price data
-        end_date = datetime.now(UTC)
-        start_date = end_date - timedelta(days=lookback_days)
-
-        price_data = await data_pipeline.fetch_market_data(
-            symbol=symbol,
-            start_date=start_date,
-            end_date=end_date,
-            interval="1d",
+        signals = await BatchSignalPipeline().run(
+            [symbol], lookback_days=lookback_days, include_sentiment=include_sentiment
         )
 
-        if price_data.empty:
+        if symbol not in signals:
             raise HTTPException(
                 status_code=404,
                 detail=f"No price data available for {symbol}",
             )
 
-        # Fetch news if requested
-        news_articles = []
-        if include_sentiment:
-            news_articles = await data_pipeline.fetch_news(
-                symbol=symbol,
-                start_date=end_date - timedelta(days=7),
-                end_date=end_date,
-            )
-
-        # Generate signal
-        signal = await signal_generator.generate_signal(
-            symbol=symbol, price_data=price_data, news_articles=news_articles
-        )
-
-        response = SignalResponse(
-            symbol=signal.symbol,
-            signal=signal.signal,
-            strength=signal.strength.value,
-            confidence=signal.confidence,
-            price=signal.price,
-            target_price=signal.target_price,
-            stop_loss=signal.stop_loss,
-            reasoning=signal.reasoning,
-            technical_score=signal.technical_score,
-            sentiment_score=signal.sentiment_score,
-            combined_score=signal.combined_score,
-            timestamp=signal.timestamp,
-        )
+        response = _signal_response(signals[symbol])
 
         # Cache the result for 5 minutes
         await redis.setex(
@@ -277,7 +268,7 @@ async def get_trade_signal(
         ) from e
 
 
-@router.post("/signals/batch", response_model=list[SignalResponse])
+@router.post("/signals/batch", response_model=BatchSignalsResponse)
 async def get_batch_signals(
     symbols: list[str],
     include_sentiment: bool = Query(True, description="Include sentiment analysis"),
@@ -287,81 +278,34 @@ async def get_batch_signals(
     """
     Get trade signals for multiple symbols
 
-    Batch endpoint for analyzing multiple stocks at once.
-    Limited to 10 symbols per request.
+    Batch endpoint for analyzing a watchlist at once. Prices come from one
+    bulk fetch, news is fetched concurrently and all articles are scored in
+    one sentiment pass, so latency stays close to a single symbol's.
+    Limited to ML_SIGNAL_BATCH_MAX_SYMBOLS symbols per request.
     """
-    if len(symbols) > 10:
+    max_symbols = settings.ML_SIGNAL_BATCH_MAX_SYMBOLS
+    if len(symbols) > max_symbols:
         raise HTTPException(
             status_code=400,
-            detail="Maximum 10 symbols allowed per batch request",
+            detail=f"Maximum {max_symbols} symbols allowed per batch request",
         )
 
-    signal_generator = get_signal_generator()
-    data_pipeline = MLDataPipeline()
-    end_date = datetime.now(UTC)
-    start_date = end_date - timedelta(days=lookback_days)
+    pipeline = BatchSignalPipeline()
+    signals = await pipeline.run(
+        symbols, lookback_days=lookback_days, include_sentiment=include_sentiment
+    )
 
-    results = []
-    for symbol in symbols:
-        try:
-            # Fetch price data
-            price_data = await data_pipeline.fetch_market_data(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                interval="1d",
-            )
-
-            if price_data.empty:
-                logger.warning(f"No price data for {symbol}, skipping")
-                continue
-
-            # Fetch news if requested
-            news_articles = []
-            if include_sentiment:
-                news_articles = await data_pipeline.fetch_news(
-                    symbol=symbol,
-                    start_date=end_date - timedelta(days=7),
-                    end_date=end_date,
-                )
-
-            # Generate signal
-            signal = await signal_generator.generate_signal(
-                symbol=symbol,
-                price_data=price_data,
-                news_articles=news_articles,
-            )
-
-            results.append(
-                SignalResponse(
-                    symbol=signal.symbol,
-                    signal=signal.signal,
-                    strength=signal.strength.value,
-                    confidence=signal.confidence,
-                    price=signal.price,
-                    target_price=signal.target_price,
-                    stop_loss=signal.stop_loss,
-                    reasoning=signal.reasoning,
-                    technical_score=signal.technical_score,
-                    sentiment_score=signal.sentiment_score,
-                    combined_score=signal.combined_score,
-                    timestamp=signal.timestamp,
-                )
-            )
-
-        except Exception as e:
-            logger.error(f"Error generating signal for {symbol}: {e}")
-            # Continue with other symbols
-
-    if not results:
+    if not signals:
         raise HTTPException(
             status_code=404,
             detail="No signals could be generated for the provided symbols",
         )
 
+    results = [_signal_response(signal).model_dump() for signal in signals.values()]
     return {
-        "data": [r.model_dump() if hasattr(r, "model_dump") else r for r in results],
+        "data": results,
         "count": len(results),
+        "timings": pipeline.get_timings(),
         "timestamp": datetime.now(UTC).isoformat(),
     }
 
@@ -371,7 +315,7 @@ async def ml_sentiment_health_check():
     """Check ML sentiment service health"""
     try:
         # Verify ML services can be instantiated
-        get_sentiment_analyzer()
+        sentiment_analyzer = get_sentiment_analyzer()
         get_signal_generator()
 
         return {
@@ -382,6 +326,8 @@ async def ml_sentiment_health_check():
                     "signal_generator": "ready",
                     "anthropic_configured": bool(settings.ANTHROPIC_API_KEY),
                 },
+                "sentiment_store": sentiment_analyzer.store.get_stats(),
+                "sentiment_batcher": sentiment_analyzer.batcher.get_stats(),
             },
             "timestamp": datetime.now(UTC).isoformat(),
         }
@@ -18,10 +18,10 @@ news_cache = None
 registry = get_readiness_registry()
 
 try:
-    from app.services.news.news_aggregator import NewsAggregator
+    from app.services.news.news_aggregator import get_news_aggregator
     from app.services.news.news_cache import get_news_cache
 
-    news_aggregator = NewsAggregator()
+    news_aggregator = get_news_aggregator()
     news_cache = get_news_cache()
     registry.register("news", available=True)
     logger.info("News aggregator initialized with available providers")
@@ -79,14 +79,15 @@ async def get_company_news(
                     "cached": True,
                 }
 
-        # Fetch fresh data
-        articles = news_aggregator.get_company_news(symbol, days_back)
+        # Fetch fresh data (all providers concurrently, bounded by the news budget)
+        result = await news_aggregator.aget_company_news(symbol, days_back)
 
         # Apply filters to fresh data
-        filtered = _apply_filters(articles, sentiment, provider)
+        filtered = _apply_filters(result.articles, sentiment, provider)
 
-        # Cache the filtered results (cache key includes filters for uniqueness)
-        if news_cache:
+        # Cache the filtered results (cache key includes filters for uniqueness);
+        # partial results are not cached so the next request retries slow providers
+        if news_cache and not result.partial:
             news_cache.set(
                 "company",
                 filtered,
@@ -102,6 +103,8 @@ async def get_company_news(
                 "articles": filtered,
                 "sources": [p.get_provider_name() for p in news_aggregator.providers],
                 "cached": False,
+                "partial": result.partial,
+                "provider_status": result.provider_status,
             },
             "count": len(filtered),
             "timestamp": datetime.now().isoformat(),
@@ -164,13 +167,14 @@ async def get_market_news(
                 }
 
         # Fetch fresh data (fetch more to allow for filtering)
-        articles = news_aggregator.get_market_news(category, limit * 2)
+        result = await news_aggregator.aget_market_news(category, limit * 2)
 
         # Apply filters to fresh data
-        filtered = _apply_filters(articles, sentiment, provider)
+        filtered = _apply_filters(result.articles, sentiment, provider)
 
-        # Cache the filtered results (cache key includes filters for uniqueness)
-        if news_cache:
+        # Cache the filtered results (cache key includes filters for uniqueness);
+        # partial results are not cached so the next request retries slow providers
+        if news_cache and not result.partial:
             news_cache.set(
                 "market",
                 filtered,
@@ -186,6 +190,8 @@ async def get_market_news(
                 "articles": filtered[:limit],
                 "sources": [p.get_provider_name() for p in news_aggregator.providers],
                 "cached": False,
+                "partial": result.partial,
+                "provider_status": result.provider_status,
             },
             "count": len(filtered[:limit]),
             "timestamp": datetime.now().isoformat(),
@@ -277,7 +283,8 @@ async def get_market_sentiment(
         )
 
     try:
-        articles = news_aggregator.get_market_news(category, 200)
+        result = await news_aggregator.aget_market_news(category, 200)
+        articles = result.articles
 
         # Calculate sentiment stats
         sentiments = {"bullish": 0, "bearish": 0, "neutral": 0}
@@ -323,6 +330,7 @@ async def get_market_sentiment(
                     if avg_score < -0.15
                     else "neutral"
                 ),
+                "partial": result.partial,
             },
             "timestamp": datetime.now().isoformat(),
         }
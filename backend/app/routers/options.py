@@ -10,8 +10,8 @@ Phase 1 Implementation:
 - Multi-leg order support
 """
 
-import asyncio
 import logging
+import math
 from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -21,13 +21,22 @@ from ..core.config import get_settings
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
 from ..services.alpaca_options import get_alpaca_options_client
-from ..services.cache import CacheService, get_cache
-from ..services.tradier_client import ProviderHTTPError, get_tradier_client
+from ..services.cache import CacheService, get_cache, namespace_tag, symbol_tag
+from ..services.options_greeks import GREEKS_DTYPE, GreeksCalculator, days_to_expiry_in_years
+from ..services.tiered_cache import TieredCache, get_tiered_cache
+from ..services.tradier_client import (
+    ProviderHTTPError,
+    get_async_tradier_client,
+    get_tradier_client,
+)
 
 
 router = APIRouter(prefix="/options", tags=["options"])
 logger = logging.getLogger(__name__)
 
+# Shared Black-Scholes calculator for chain-wide Greeks
+_greeks_calculator = GreeksCalculator(risk_free_rate=0.05)
+
 
 # ============================================================================
 # TRADIER CLIENT HELPER
@@ -39,6 +48,11 @@ def _get_tradier_client():
     return get_tradier_client()
 
 
+def _get_async_tradier_client():
+    """Get async Tradier client instance"""
+    return get_async_tradier_client()
+
+
 # ============================================================================
 # REQUEST/RESPONSE MODELS
 # ============================================================================
@@ -89,6 +103,114 @@ class ExpirationDate(BaseModel):
     days_to_expiry: int
 
 
+# ============================================================================
+# GREEKS HELPERS
+# ============================================================================
+
+
+def _contract_mid(contract: OptionContract) -> float | None:
+    """Market price used for IV: bid/ask mid, falling back to last trade"""
+    if contract.bid and contract.ask and contract.bid > 0 and contract.ask > 0:
+        return (contract.bid + contract.ask) / 2
+    if contract.last_price and contract.last_price > 0:
+        return contract.last_price
+    return None
+
+
+def _years_to_expiration(contracts: list[OptionContract]) -> dict[str, float]:
+    """Map each contract expiration (YYYY-MM-DD) to time to expiry in years"""
+    years_by_expiration = {}
+    for exp in {c.expiration_date for c in contracts}:
+        try:
+            years_by_expiration[exp] = days_to_expiry_in_years(
+                datetime.strptime(exp, "%Y-%m-%d").replace(tzinfo=UTC)
+            )
+        except ValueError:
+            logger.warning(f"⚠️ Unparseable expiration {exp!r}, skipping Greeks fill")
+    return years_by_expiration
+
+
+def _fill_missing_iv(contracts: list[OptionContract], underlying_price: float) -> int:
+    """
+    Solve implied volatility from market prices for contracts without one
+
+    Uses the vectorized IV solver over the whole chain (no provider calls).
+    Contracts whose solve does not converge keep implied_volatility=None.
+    European Black-Scholes is used, so early-exercise premium on American
+    puts shows up as slightly higher IV.
+
+    Returns:
+        Number of contracts filled
+    """
+    candidates = [
+        (c, mid)
+        for c in contracts
+        if not c.implied_volatility and (mid := _contract_mid(c)) is not None
+    ]
+    if not candidates:
+        return 0
+
+    years_by_expiration = _years_to_expiration([c for c, _ in candidates])
+    candidates = [(c, mid) for c, mid in candidates if c.expiration_date in years_by_expiration]
+    if not candidates:
+        return 0
+
+    solved = _greeks_calculator.implied_volatility_batch(
+        option_prices=[mid for _, mid in candidates],
+        spot_prices=underlying_price,
+        strike_prices=[c.strike_price for c, _ in candidates],
+        times_to_expiry=[years_by_expiration[c.expiration_date] for c, _ in candidates],
+        option_types=[c.option_type for c, _ in candidates],
+    )
+
+    filled = 0
+    for (contract, _), iv, converged in zip(
+        candidates,
+        solved["implied_volatility"].tolist(),
+        solved["converged"].tolist(),
+        strict=True,
+    ):
+        if converged:
+            contract.implied_volatility = iv
+            filled += 1
+    return filled
+
+
+def _fill_missing_greeks(contracts: list[OptionContract], underlying_price: float) -> int:
+    """
+    Fill in Greeks for contracts that have an IV but no provider Greeks
+
+    All such contracts are priced with a single call to the vectorized
+    Black-Scholes batch API instead of one scalar calculation per strike.
+
+    Returns:
+        Number of contracts filled
+    """
+    missing = [c for c in contracts if c.delta is None and c.implied_volatility]
+    if not missing:
+        return 0
+
+    years_by_expiration = _years_to_expiration(missing)
+    missing = [c for c in missing if c.expiration_date in years_by_expiration]
+    if not missing:
+        return 0
+
+    greeks = _greeks_calculator.calculate_greeks_batch(
+        spot_prices=underlying_price,
+        strike_prices=[c.strike_price for c in missing],
+        times_to_expiry=[years_by_expiration[c.expiration_date] for c in missing],
+        volatilities=[c.implied_volatility for c in missing],
+        option_types=[c.option_type for c in missing],
+    )
+
+    for contract, row in zip(missing, greeks.tolist(), strict=True):
+        values = dict(zip(GREEKS_DTYPE.names, row, strict=True))
+        for field in ("delta", "gamma", "theta", "vega", "rho"):
+            if math.isfinite(values[field]):
+                setattr(contract, field, values[field])
+    return len(missing)
+
+
 # ============================================================================
 # ENDPOINTS
 # ============================================================================
@@ -105,7 +227,7 @@ async def get_options_chain(
         description="Expiration date (YYYY-MM-DD). If not provided, uses nearest expiration.",
     ),
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """
     Get options chain for a symbol with Greeks (with intelligent caching)
@@ -179,11 +301,11 @@ async def get_options_chain(
             }
 
         # Initialize Tradier client for real API calls
-        client = _get_tradier_client()
+        client = _get_async_tradier_client()
 
         # If no expiration provided, get the nearest one
         if not expiration:
-            exp_data = await asyncio.to_thread(client.get_option_expirations, symbol)
+            exp_data = await client.get_option_expirations(symbol)
             expirations = exp_data.get("expirations", {}).get("date", [])
             if not expirations:
                 raise HTTPException(
@@ -193,21 +315,28 @@ async def get_options_chain(
                 expirations[0] if isinstance(expirations, list) else expirations
             )
 
-        # Check cache first (configurable TTL for options chains)
-        cache_key = f"options:{symbol}:{expiration}"
-        chain_data = cache.get(cache_key)
-        if chain_data:
+        # Two-tier cache (configurable TTL); concurrent misses share one Tradier call
+        cache_key = f"{symbol}:{expiration}"
+
+        async def load_chain() -> dict:
+            return await client.get_option_chains(symbol, expiration)
+
+        lookup = await cache.fetch(
+            "options",
+            cache_key,
+            load_chain,
+            ttl=settings.CACHE_TTL_OPTIONS_CHAIN,
+            tags=(symbol_tag(symbol),),
+        )
+        chain_data = lookup.value
+        if lookup.cached:
             logger.info(
-                f"✅ CACHE HIT: {cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)"
+                f"✅ CACHE HIT ({lookup.source}): options:{cache_key} "
+                f"(TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)"
             )
         else:
-            logger.info(f"❌ CACHE MISS: {cache_key} - Fetching from Tradier API")
-            chain_data = await asyncio.to_thread(
-                client.get_option_chains, symbol, expiration
-            )
-            cache.set(cache_key, chain_data, ttl=settings.CACHE_TTL_OPTIONS_CHAIN)
             logger.info(
-                f"💾 CACHED: {cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)"
+                f"💾 CACHED: options:{cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)"
             )
 
         # Parse Tradier response
@@ -242,12 +371,24 @@ async def get_options_chain(
                 "timestamp": datetime.now().isoformat(),
             }
 
+        # Fetch underlying price from Tradier for complete data
+        underlying_price = None
+        try:
+            quote = await client.get_quote(symbol)
+            if quote and "last" in quote:
+                underlying_price = float(quote["last"])
+                logger.info(
+                    f"📈 Underlying price for {symbol}: ${underlying_price:.2f}"
+                )
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to fetch underlying price for {symbol}: {e}")
+
         # Separate calls and puts, parse Greeks
         calls = []
         puts = []
 
         for opt in option_list:
-            greeks = opt.get("greeks", {})
+            greeks = opt.get("greeks") or {}
 
             contract = OptionContract(
                 symbol=opt.get("symbol", ""),
@@ -273,17 +414,11 @@ async def get_options_chain(
             else:
                 puts.append(contract)
 
-        # Fetch underlying price from Tradier for complete data
-        underlying_price = None
-        try:
-            quote = client.get_quote(symbol)
-            if quote and "last" in quote:
-                underlying_price = float(quote["last"])
-                logger.info(
-                    f"📈 Underlying price for {symbol}: ${underlying_price:.2f}"
-                )
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to fetch underlying price for {symbol}: {e}")
+        # Tradier omits IV/Greeks for some contracts (e.g. sandbox, illiquid strikes):
+        # solve IV from market mids, then price Greeks, each in one vectorized pass
+        if underlying_price:
+            _fill_missing_iv(calls + puts, underlying_price)
+            _fill_missing_greeks(calls + puts, underlying_price)
 
         chain_response = OptionsChainResponse(
             symbol=symbol,
@@ -346,6 +481,7 @@ def get_expiration_dates(
 
     # Check cache first
     cache_key = f"options_expiry:{symbol.upper()}"
+    cache_tags = (namespace_tag("options_expiry"), symbol_tag(symbol))
     cached_data = cache.get(cache_key)
     if cached_data:
         logger.info(
@@ -394,7 +530,9 @@ def get_expiration_dates(
             }
 
             # Cache fixture results
-            cache.set(cache_key, result, ttl=settings.CACHE_TTL_OPTIONS_EXPIRY)
+            cache.set(
+                cache_key, result, ttl=settings.CACHE_TTL_OPTIONS_EXPIRY, tags=cache_tags
+            )
             return result
 
         # Get Tradier client instance
@@ -433,7 +571,9 @@ def get_expiration_dates(
         }
 
         # Cache expiration dates
-        cache.set(cache_key, response, ttl=settings.CACHE_TTL_OPTIONS_EXPIRY)
+        cache.set(
+            cache_key, response, ttl=settings.CACHE_TTL_OPTIONS_EXPIRY, tags=cache_tags
+        )
         logger.info(
             f"💾 Cached expiration dates for {symbol} (TTL: {settings.CACHE_TTL_OPTIONS_EXPIRY}s)"
         )
@@ -615,7 +755,7 @@ async def get_option_contract(
 @router.post("/cache/clear")
 async def clear_options_cache(
     current_user: User = Depends(get_current_user_unified),
-    cache: CacheService = Depends(get_cache),
+    cache: TieredCache = Depends(get_tiered_cache),
 ):
     """
     Clear all options data caches
@@ -623,27 +763,20 @@ async def clear_options_cache(
     Invalidates all cached options chains and expiration dates.
     Use this to force fresh data from Tradier API.
     """
-    # Clear all options-related cache patterns
-    patterns_cleared = 0
-
-    patterns = [
-        "options:*",  # Options chains
-        "options_expiry:*",  # Expiration dates
-    ]
-
     try:
-        for pattern in patterns:
-            count = cache.clear_pattern(pattern)
-            patterns_cleared += count
+        # Chains live in the tiered "options" namespace (one generation bump);
+        # expiration dates are written straight to Redis and purged by tag
+        entries_cleared = await cache.flush_namespace("options")
+        entries_cleared += await cache.invalidate_tags(namespace_tag("options_expiry"))
 
         logger.info(
             "Cleared options cache entries",
-            extra={"patterns_cleared": patterns_cleared},
+            extra={"entries_cleared": entries_cleared},
         )
 
         return {
             "success": True,
-            "entries_cleared": patterns_cleared,
+            "entries_cleared": entries_cleared,
             "timestamp": datetime.now(UTC).isoformat(),
         }
     except Exception as e:
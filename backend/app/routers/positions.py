@@ -2,15 +2,21 @@
 Position Management API
 """
 
+import asyncio
 import logging
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
+from ..services.portfolio_stress import (
+    DEFAULT_DAYS_FORWARD,
+    DEFAULT_IV_SHOCKS,
+    StressGrid,
+    stress_portfolio,
+)
 from ..services.position_tracker import (
-    PortfolioGreeks,
     Position,
     PositionTrackerService,
 )
@@ -77,7 +83,7 @@ async def get_positions(current_user: User = Depends(get_current_user_unified)):
         raise HTTPException(status_code=500, detail="Failed to fetch positions") from e
 
 
-@router.get("/greeks", response_model=PortfolioGreeks)
+@router.get("/greeks")
 async def get_portfolio_greeks(current_user: User = Depends(get_current_user_unified)):
     """Get aggregate portfolio Greeks"""
     try:
@@ -96,6 +102,65 @@ async def get_portfolio_greeks(current_user: User = Depends(get_current_user_uni
         ) from e
 
 
+@router.get("/pnl")
+async def get_portfolio_pnl(current_user: User = Depends(get_current_user_unified)):
+    """Get aggregate unrealized P&L of open option positions"""
+    try:
+        service = PositionTrackerService()
+        pnl = await service.get_portfolio_pnl()
+        return {
+            "data": pnl.model_dump() if hasattr(pnl, "model_dump") else pnl,
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to get portfolio P&L", exc_info=e)
+        raise HTTPException(
+            status_code=500, detail="Failed to fetch portfolio P&L"
+        ) from e
+
+
+@router.get("/stress")
+async def get_portfolio_stress(
+    spot_range: float = Query(0.2, gt=0, lt=1, description="Max underlying move (0.2 = ±20%)"),
+    spot_step: float = Query(0.01, gt=0, description="Underlying move step"),
+    iv_shocks: list[float] = Query(
+        list(DEFAULT_IV_SHOCKS), description="Absolute IV shocks (0.05 = +5 vol points)"
+    ),
+    days_forward: list[int] = Query(list(DEFAULT_DAYS_FORWARD), description="Days forward"),
+    include_positions: bool = Query(True, description="Include per-position P&L matrices"),
+    current_user: User = Depends(get_current_user_unified),
+):
+    """Reprice the options book across spot moves x IV shocks x days forward
+
+    P&L matrices are indexed [days_forward][iv_shock][spot_move].
+    """
+    try:
+        grid = StressGrid.build(spot_range, spot_step, iv_shocks, days_forward)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+
+    try:
+        service = PositionTrackerService()
+        snapshot = await service.get_risk_snapshot()
+        # Repricing is CPU-bound; keep it off the event loop
+        result = await asyncio.to_thread(
+            stress_portfolio, snapshot, grid, include_positions=include_positions
+        )
+        return {
+            "data": result.model_dump(),
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Failed to run portfolio stress grid", exc_info=e)
+        raise HTTPException(
+            status_code=500, detail="Failed to run portfolio stress grid"
+        ) from e
+
+
 @router.post("/{position_id}/close")
 async def close_position(
     position_id: str,
@@ -8,12 +8,13 @@ import logging
 import uuid
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
-from ..scheduler import APPROVALS_DIR, EXECUTIONS_DIR, SCHEDULES_DIR, get_scheduler
+from ..scheduler import SCHEDULES_DIR, get_scheduler
+from ..services.scheduler_store import SchedulerStore, get_scheduler_store
 
 
 router = APIRouter(prefix="/scheduler", tags=["scheduler"])
@@ -137,48 +138,6 @@ def _load_all_schedules() -> list[dict]:
     return sorted(schedules, key=lambda x: x.get("created_at", ""), reverse=True)
 
 
-def _load_executions(limit: int = 20, schedule_id: str | None = None) -> list[dict]:
-    """Load execution history from files"""
-    executions = []
-    for exec_file in EXECUTIONS_DIR.glob("*.json"):
-        with open(exec_file) as f:
-            execution = json.load(f)
-            if schedule_id is None or execution["schedule_id"] == schedule_id:
-                executions.append(execution)
-
-    # Sort by started_at descending
-    executions = sorted(executions, key=lambda x: x.get("started_at", ""), reverse=True)
-    return executions[:limit]
-
-
-def _load_pending_approvals() -> list[dict]:
-    """Load pending approvals from files"""
-    approvals = []
-    now = datetime.now(UTC)
-
-    for approval_file in APPROVALS_DIR.glob("*.json"):
-        with open(approval_file) as f:
-            approval = json.load(f)
-            # Only include pending and not expired
-            if approval["status"] == "pending":
-                expires_at = datetime.fromisoformat(approval["expires_at"])
-                if expires_at > now:
-                    approvals.append(approval)
-
-    return sorted(approvals, key=lambda x: x.get("created_at", ""), reverse=True)
-
-
-def _update_approval(approval_id: str, updates: dict):
-    """Update approval file"""
-    approval_file = APPROVALS_DIR / f"{approval_id}.json"
-    if approval_file.exists():
-        with open(approval_file) as f:
-            approval = json.load(f)
-        approval.update(updates)
-        with open(approval_file, "w") as f:
-            json.dump(approval, f, indent=2)
-
-
 # ========================
 # Schedule Management
 # ========================
@@ -238,6 +197,10 @@ async def create_schedule(
     """Create a new schedule"""
     try:
         schedule_id = str(uuid.uuid4())
+        metadata = schedule_data.metadata or {}
+        if schedule_data.type == "strategy_run":
+            # Strategy runs execute in-process as the schedule's owner
+            metadata = {**metadata, "user_id": current_user.id}
         schedule = {
             "id": schedule_id,
             "name": schedule_data.name,
@@ -249,7 +212,7 @@ async def create_schedule(
             "status": "active" if schedule_data.enabled else "paused",
             "created_at": datetime.now(UTC).isoformat(),
             "last_run": None,
-            "metadata": schedule_data.metadata or {},
+            "metadata": metadata,
         }
 
         _save_schedule(schedule)
@@ -263,7 +226,7 @@ async def create_schedule(
                     cron_expression=schedule_data.cron_expression,
                     timezone=schedule_data.timezone,
                     requires_approval=schedule_data.requires_approval,
-                    metadata=schedule_data.metadata,
+                    metadata=metadata,
                 )
             except Exception as e:
                 _delete_schedule_file(schedule_id)
@@ -296,6 +259,11 @@ async def update_schedule(
             raise HTTPException(status_code=404, detail="Schedule not found")
 
         update_data = schedule_data.model_dump(exclude_unset=True)
+        if schedule["type"] == "strategy_run" and "metadata" in update_data:
+            update_data["metadata"] = {
+                **(update_data["metadata"] or {}),
+                "user_id": current_user.id,
+            }
         scheduler = get_scheduler()
 
         if "enabled" in update_data:
@@ -405,19 +373,28 @@ async def resume_all_schedules(current_user: User = Depends(get_current_user_uni
 # ========================
 
 
-@router.get("/executions", response_model=list[ExecutionResponse])
-async def list_executions(
-    limit: int = 20,
+@router.get("/executions")
+def list_executions(
+    limit: int = Query(20, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     schedule_id: str | None = None,
+    execution_status: str | None = Query(
+        None, alias="status", description="running, completed or failed"
+    ),
     current_user: User = Depends(get_current_user_unified),
+    store: SchedulerStore = Depends(get_scheduler_store),
 ):
-    """Get execution history"""
+    """Get execution history (newest first, paginated)"""
     try:
-        executions = _load_executions(limit, schedule_id)
+        executions, total = store.list_executions(
+            schedule_id=schedule_id, status=execution_status, limit=limit, offset=offset
+        )
         return {
             "data": executions,
             "count": len(executions),
+            "total": total,
             "limit": limit,
+            "offset": offset,
             "timestamp": datetime.now(UTC).isoformat(),
         }
     except Exception as e:
@@ -430,16 +407,22 @@ async def list_executions(
 # ========================
 
 
-@router.get("/pending-approvals", response_model=list[ApprovalResponse])
-async def list_pending_approvals(
+@router.get("/pending-approvals")
+def list_pending_approvals(
+    limit: int = Query(100, ge=1, le=500),
+    offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user_unified),
+    store: SchedulerStore = Depends(get_scheduler_store),
 ):
-    """Get all pending trade approvals"""
+    """Get pending, unexpired trade approvals (newest first, paginated)"""
     try:
-        approvals = _load_pending_approvals()
+        approvals, total = store.list_pending_approvals(limit=limit, offset=offset)
         return {
             "data": approvals,
             "count": len(approvals),
+            "total": total,
+            "limit": limit,
+            "offset": offset,
             "timestamp": datetime.now(UTC).isoformat(),
         }
     except Exception as e:
@@ -448,18 +431,17 @@ async def list_pending_approvals(
 
 
 @router.post("/approvals/{approval_id}/approve")
-async def approve_trade(
-    approval_id: str, current_user: User = Depends(get_current_user_unified)
+def approve_trade(
+    approval_id: str,
+    current_user: User = Depends(get_current_user_unified),
+    store: SchedulerStore = Depends(get_scheduler_store),
 ):
     """Approve a pending trade"""
     try:
-        approval_file = APPROVALS_DIR / f"{approval_id}.json"
-        if not approval_file.exists():
+        approval = store.get_approval(approval_id)
+        if approval is None:
             raise HTTPException(status_code=404, detail="Approval not found")
 
-        with open(approval_file) as f:
-            approval = json.load(f)
-
         if approval["status"] != "pending":
             raise HTTPException(status_code=400, detail="Approval already processed")
 
@@ -467,10 +449,11 @@ async def approve_trade(
         if expires_at < datetime.now(UTC):
             raise HTTPException(status_code=400, detail="Approval has expired")
 
-        _update_approval(
+        if not store.decide_approval(
             approval_id,
             {"status": "approved", "approved_at": datetime.now(UTC).isoformat()},
-        )
+        ):
+            raise HTTPException(status_code=400, detail="Approval already processed")
 
         return {
             "success": True,
@@ -485,31 +468,30 @@ async def approve_trade(
 
 
 @router.post("/approvals/{approval_id}/reject")
-async def reject_trade(
+def reject_trade(
     approval_id: str,
     decision: ApprovalDecision,
     current_user: User = Depends(get_current_user_unified),
+    store: SchedulerStore = Depends(get_scheduler_store),
 ):
     """Reject a pending trade"""
     try:
-        approval_file = APPROVALS_DIR / f"{approval_id}.json"
-        if not approval_file.exists():
+        approval = store.get_approval(approval_id)
+        if approval is None:
             raise HTTPException(status_code=404, detail="Approval not found")
 
-        with open(approval_file) as f:
-            approval = json.load(f)
-
         if approval["status"] != "pending":
             raise HTTPException(status_code=400, detail="Approval already processed")
 
-        _update_approval(
+        if not store.decide_approval(
             approval_id,
             {
                 "status": "rejected",
                 "approved_at": datetime.now(UTC).isoformat(),
                 "rejection_reason": decision.reason,
             },
-        )
+        ):
+            raise HTTPException(status_code=400, detail="Approval already processed")
 
         return {
             "success": True,
@@ -538,6 +520,7 @@ async def scheduler_status(current_user: User = Depends(get_current_user_unified
                 "running": scheduler.running,
                 "jobs_count": len(scheduler.scheduler.get_jobs()),
                 "status": "healthy" if scheduler.running else "stopped",
+                "strategy_runs": scheduler.strategy_runner.get_stats(),
             },
             "timestamp": datetime.now(UTC).isoformat(),
         }
@@ -23,6 +23,7 @@ from sse_starlette.sse import EventSourceResponse
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
 from ..services.cache import CacheService, get_cache
+from ..services.price_hub import get_price_hub
 from ..services.tradier_stream import get_tradier_stream
 
 
@@ -40,12 +41,13 @@ async def stream_prices(
     symbols: str = Query(
         ..., description="Comma-separated list of symbols (e.g., AAPL,MSFT,TSLA)"
     ),
-    cache: CacheService = Depends(get_cache),
 ):
     """
     Stream real-time price updates for specified symbols via Server-Sent Events
 
-    Uses Tradier WebSocket for live market data streaming.
+    Uses Tradier WebSocket for live market data streaming. Updates are pushed
+    from the in-process PriceHub as ticks arrive; only symbols whose price
+    changed are included in each event.
 
     Query Parameters:
         symbols: Comma-separated stock symbols (e.g., "AAPL,MSFT,TSLA")
@@ -76,47 +78,26 @@ async def stream_prices(
 
     async def price_generator() -> AsyncGenerator:
         """
-        Generate price updates from Redis cache with periodic heartbeats.
+        Push price updates from the PriceHub with periodic heartbeats.
 
         Sends:
-        - price_update: When price data changes (every 1s)
+        - price_update: As soon as any subscribed symbol's price changes
+          (bursts are coalesced to the latest value per symbol)
         - heartbeat: Every 15s to keep connection alive and detect timeouts
         """
+        subscription = get_price_hub().subscribe(symbol_list)
         last_heartbeat_time = time.time()
 
         try:
             while True:
-                current_time = time.time()
-                prices = {}
-
-                # Read latest prices from Redis cache
-                for symbol in symbol_list:
-                    # Try trade price first (more accurate)
-                    trade_data = cache.get(f"price:{symbol}")
-                    if trade_data:
-                        prices[symbol] = {
-                            "price": trade_data.get("price", 0),
-                            "timestamp": trade_data.get("timestamp"),
-                            "type": "trade",
-                            "size": trade_data.get("size", 0),
-                        }
-                    else:
-                        # Fall back to quote data (bid/ask)
-                        quote_data = cache.get(f"quote:{symbol}")
-                        if quote_data:
-                            prices[symbol] = {
-                                "price": quote_data.get("mid", 0),  # Use mid price
-                                "bid": quote_data.get("bid", 0),
-                                "ask": quote_data.get("ask", 0),
-                                "timestamp": quote_data.get("timestamp"),
-                                "type": "quote",
-                            }
+                wait = max(HEARTBEAT_INTERVAL - (time.time() - last_heartbeat_time), 0)
+                prices = await subscription.next_update(timeout=wait)
 
-                # Send price update if we have data
                 if prices:
                     yield {"event": "price_update", "data": json.dumps(prices)}
 
                 # Send periodic heartbeat (every HEARTBEAT_INTERVAL seconds)
+                current_time = time.time()
                 if current_time - last_heartbeat_time >= HEARTBEAT_INTERVAL:
                     yield {
                         "event": "heartbeat",
@@ -131,16 +112,15 @@ async def stream_prices(
                     last_heartbeat_time = current_time
                     logger.debug("💓 Heartbeat sent (prices stream)")
 
-                # Wait before next data check
-                await asyncio.sleep(DATA_CHECK_INTERVAL)
-
         except asyncio.CancelledError:
             logger.info(f"📡 Client disconnected from price stream: {symbol_list}")
-            # Cleanup not needed - Tradier stream continues for other clients
+            # Tradier stream continues for other clients; only drop this subscription
             raise
         except Exception as e:
             logger.error(f"❌ Error in price stream: {e}")
             yield {"event": "error", "data": json.dumps({"error": str(e)})}
+        finally:
+            subscription.close()
 
     return EventSourceResponse(price_generator())
 
@@ -365,7 +345,9 @@ async def stream_status(current_user: User = Depends(get_current_user_unified)):
             "streaming_available": bool,
             "provider": str,
             "active_symbols": ["AAPL", "MSFT", ...],
-            "stream_count": int
+            "stream_count": int,
+            "price_hub": {"subscribers": int, "published": int, ...},
+            "tick_writer": {"received": int, "coalesced": int, "flushed": int, ...}
         }
     """
     tradier_stream = get_tradier_stream()
@@ -376,4 +358,6 @@ async def stream_status(current_user: User = Depends(get_current_user_unified)):
         "provider": "Tradier WebSocket",
         "active_symbols": active_symbols,
         "stream_count": len(active_symbols),
+        "price_hub": get_price_hub().get_stats(),
+        "tick_writer": tradier_stream.ticks.get_stats(),
     }
@@ -86,7 +86,7 @@ async def get_telemetry_stats():
     try:
         telemetry_service = get_telemetry_service()
         stats = telemetry_service.get_statistics()
-        return stats.to_dict()
+        return {**stats.to_dict(), "ingestion": telemetry_service.get_stats()}
 
     except Exception as e:
         logger.error(
@@ -11,17 +11,22 @@ import uuid
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
-import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 
+from .core.config import settings
+from .core.jwt import decode_token
+from .core.unified_auth import MVP_USER_ID
+from .services.scheduler_store import SchedulerStore, get_scheduler_store
+from .services.strategy_runner import StrategyRunner, get_strategy_runner
+
 
 logger = logging.getLogger(__name__)
 
 # Data storage paths
 SCHEDULES_DIR = Path("data/schedules")
-EXECUTIONS_DIR = Path("data/executions")
-APPROVALS_DIR = Path("data/approvals")
+EXECUTIONS_DIR = Path("data/executions")  # legacy records + strategy-run payloads
+APPROVALS_DIR = Path("data/approvals")  # legacy records (imported into SchedulerStore)
 
 # Ensure directories exist
 SCHEDULES_DIR.mkdir(parents=True, exist_ok=True)
@@ -32,7 +37,13 @@ APPROVALS_DIR.mkdir(parents=True, exist_ok=True)
 class TradingScheduler:
     """Main scheduler service for automated trading operations"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        store: SchedulerStore | None = None,
+        strategy_runner: StrategyRunner | None = None,
+    ):
+        self.store = store or get_scheduler_store()
+        self.strategy_runner = strategy_runner or get_strategy_runner()
         self.scheduler = AsyncIOScheduler(
             job_defaults={
                 "coalesce": True,  # Combine missed runs
@@ -46,6 +57,10 @@ class TradingScheduler:
     def start(self):
         """Start the scheduler"""
         if not self.running:
+            try:
+                self.store.migrate_files(EXECUTIONS_DIR, APPROVALS_DIR)
+            except Exception as e:
+                logger.error(f"Failed to migrate scheduler history files: {e!s}")
             self.scheduler.start()
             self.running = True
             logger.info("Trading scheduler started")
@@ -58,6 +73,7 @@ class TradingScheduler:
         """Gracefully shutdown the scheduler"""
         if self.running:
             self.scheduler.shutdown(wait=True)
+            self.strategy_runner.shutdown()
             self.running = False
             logger.info("Trading scheduler stopped")
 
@@ -352,37 +368,34 @@ class TradingScheduler:
     async def _execute_strategy_run(
         self, schedule_id: str, requires_approval: bool, metadata: dict
     ):
-        """Invoke strategy automation via API."""
+        """Run a strategy in-process on the strategy runner's market pool"""
 
         execution_id = await self._create_execution_record(schedule_id, "strategy_run")
 
         strategy_type = metadata.get("strategy_type", "under4-multileg")
         dry_run = metadata.get("dry_run", True)
-        base_url = metadata.get("base_url") or os.getenv(
-            "PAIID_API_BASE", "http://127.0.0.1:8011"
-        )
-        token = metadata.get("token") or os.getenv("PAIID_API_TOKEN")
-
-        if not token:
-            await self._complete_execution(
-                execution_id,
-                "failed",
-                None,
-                "Missing API token for strategy execution",
-            )
-            return
 
         try:
-            async with httpx.AsyncClient(timeout=60) as client:
-                response = await client.post(
-                    f"{base_url.rstrip('/')}/api/strategies/run",
-                    headers={"Authorization": f"Bearer {token}"},
-                    json={"strategy_type": strategy_type, "dry_run": dry_run},
+            user_id = _strategy_user_id(metadata)
+            if user_id is None:
+                await self._complete_execution(
+                    execution_id,
+                    "failed",
+                    None,
+                    "Missing API token for strategy execution",
                 )
-                response.raise_for_status()
-                payload = response.json()
+                return
+
+            run = await self.strategy_runner.run(
+                user_id=user_id,
+                strategy_type=strategy_type,
+                dry_run=dry_run,
+            )
 
-            result_summary = f"Strategy {strategy_type} executed (dry_run={dry_run})"
+            result_summary = (
+                f"Strategy {strategy_type} executed (dry_run={dry_run}, "
+                f"{run.run_ms:.0f} ms{', coalesced' if run.coalesced else ''})"
+            )
             await self._complete_execution(
                 execution_id,
                 "completed",
@@ -392,7 +405,9 @@ class TradingScheduler:
 
             # Persist raw payload for audit
             execution_file = EXECUTIONS_DIR / f"{execution_id}.strategy.json"
-            execution_file.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+            execution_file.write_text(
+                json.dumps(run.payload, indent=2, default=str), encoding="utf-8"
+            )
 
         except Exception as exc:  # pragma: no cover - network/broker dependent
             logger.error("Strategy run failed for schedule %s: %s", schedule_id, exc)
@@ -410,7 +425,7 @@ class TradingScheduler:
     async def _create_execution_record(
         self, schedule_id: str, execution_type: str
     ) -> str:
-        """Create execution record in file storage"""
+        """Create execution record in the scheduler store"""
         execution_id = str(uuid.uuid4())
 
         # Load schedule info
@@ -433,9 +448,7 @@ class TradingScheduler:
             "error": None,
         }
 
-        with open(EXECUTIONS_DIR / f"{execution_id}.json", "w") as f:
-            json.dump(execution, f, indent=2)
-
+        self.store.create_execution(execution)
         return execution_id
 
     async def _complete_execution(
@@ -446,23 +459,7 @@ class TradingScheduler:
         error: str | None = None,
     ):
         """Update execution record with completion status"""
-        execution_file = EXECUTIONS_DIR / f"{execution_id}.json"
-
-        if execution_file.exists():
-            with open(execution_file) as f:
-                execution = json.load(f)
-
-            execution.update(
-                {
-                    "status": status,
-                    "completed_at": datetime.now(UTC).isoformat(),
-                    "result": result,
-                    "error": error,
-                }
-            )
-
-            with open(execution_file, "w") as f:
-                json.dump(execution, f, indent=2)
+        self.store.complete_execution(execution_id, status, result, error)
 
     async def _create_approval_requests(
         self, execution_id: str, recommendations: list, schedule_id: str
@@ -476,6 +473,7 @@ class TradingScheduler:
                 schedule = json.load(f)
                 schedule_name = schedule.get("name", "Unknown")
 
+        approvals = []
         for rec in recommendations:
             approval_id = str(uuid.uuid4())
             approval = {
@@ -499,9 +497,29 @@ class TradingScheduler:
                 "approved_by": None,
                 "rejection_reason": None,
             }
-
-            with open(APPROVALS_DIR / f"{approval_id}.json", "w") as f:
-                json.dump(approval, f, indent=2)
+            approvals.append(approval)
+
+        self.store.create_approvals(approvals)
+
+
+def _strategy_user_id(metadata: dict) -> int | None:
+    """
+    User a scheduled strategy runs as, or None if the schedule has no credentials
+
+    New schedules carry user_id. Older ones only stored the token the HTTP
+    call authenticated with (falling back to PAIID_API_TOKEN): a user JWT maps
+    to its subject and the shared API token to the MVP user, as
+    get_current_user_unified resolved them. Without either the run fails, as
+    the HTTP call did.
+    """
+    if metadata.get("user_id") is not None:
+        return int(metadata["user_id"])
+    token = metadata.get("token") or os.getenv("PAIID_API_TOKEN")
+    if not token:
+        return None
+    if token == settings.API_TOKEN:
+        return MVP_USER_ID
+    return int(decode_token(token)["sub"])
 
 
 # Global scheduler instance
@@ -88,6 +88,7 @@ class AlpacaOptionsClient:
             # Note: In production, fetch from Tradier for real-time price
             underlying_price = 100.0  # Placeholder - will integrate with Tradier
 
+            contracts = []
             for contract_symbol, contract_data in chain_data.items():
                 # Parse contract details from symbol
                 # Alpaca option format: {underlying}{YYMMDD}{C/P}{price}
@@ -105,20 +106,26 @@ class AlpacaOptionsClient:
                 if option_type and parsed["type"].lower() != option_type.lower():
                     continue
 
-                # Calculate Greeks
-                days_to_expiry = self._days_to_expiration(parsed["expiration"])
                 implied_vol = (
                     contract_data.get("implied_volatility", 0.3) or 0.3
                 )  # Default 30%
+                contracts.append((contract_symbol, contract_data, parsed, implied_vol))
+
+            # Calculate Greeks for the whole chain in one vectorized pass
+            greeks = self.greeks_calculator.calculate_greeks_batch(
+                option_types=[parsed["type"] for _, _, parsed, _ in contracts],
+                underlying_prices=underlying_price,
+                strike_prices=[parsed["strike"] for _, _, parsed, _ in contracts],
+                days_to_expiry=[
+                    self._days_to_expiration(parsed["expiration"])
+                    for _, _, parsed, _ in contracts
+                ],
+                implied_volatilities=[iv for _, _, _, iv in contracts],
+            )
 
-                greeks = self.greeks_calculator.calculate_greeks(
-                    option_type=parsed["type"],
-                    underlying_price=underlying_price,
-                    strike_price=parsed["strike"],
-                    days_to_expiry=days_to_expiry,
-                    implied_volatility=implied_vol,
-                )
-
+            for (contract_symbol, contract_data, parsed, implied_vol), row in zip(
+                contracts, greeks, strict=True
+            ):
                 # Build enriched contract object
                 enriched_contract = {
                     "option_symbol": contract_symbol,
@@ -132,10 +139,10 @@ class AlpacaOptionsClient:
                     "volume": int(contract_data.get("volume", 0) or 0),
                     "open_interest": int(contract_data.get("open_interest", 0) or 0),
                     "implied_volatility": implied_vol,
-                    "delta": greeks["delta"],
-                    "gamma": greeks["gamma"],
-                    "theta": greeks["theta"],
-                    "vega": greeks["vega"],
+                    "delta": float(row["delta"]),
+                    "gamma": float(row["gamma"]),
+                    "theta": float(row["theta"]),
+                    "vega": float(row["vega"]),
                     "in_the_money": self._is_itm(
                         parsed["type"], underlying_price, parsed["strike"]
                     ),
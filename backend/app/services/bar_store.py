@@ -0,0 +1,472 @@
+"""
+Columnar OHLCV Bar Store
+
+Keeps daily bars per (symbol, interval) as memory-mapped .npy columns under
+BAR_STORE_DIR and fetches only the date ranges not yet covered.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import portalocker
+
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Intervals kept in the store; anything else goes straight to the provider
+STORED_INTERVALS = frozenset({"daily"})
+
+COLUMNS = ("date", "open", "high", "low", "close", "volume")
+PRICE_COLUMNS = ("open", "high", "low", "close")
+
+ONE_DAY = np.timedelta64(1, "D")
+
+# Seconds to wait for another worker's write to the same series
+LOCK_TIMEOUT_SECONDS = 10
+
+
+class UnstorableBarsError(ValueError):
+    """Provider bars are missing a date or price column and cannot be stored"""
+
+
+@dataclass(frozen=True)
+class BarSeries:
+    """Column views over a date range of one (symbol, interval) series"""
+
+    symbol: str
+    interval: str
+    date: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.date)
+
+    def to_records(self) -> list[dict[str, Any]]:
+        """Bars in the TradierClient.get_historical_bars format"""
+        dates = np.datetime_as_string(self.date, unit="D").tolist()
+        columns = zip(
+            dates,
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+            strict=True,
+        )
+        return [
+            {"date": d, "open": o, "high": h, "low": lo, "close": c, "volume": v}
+            for d, o, h, lo, c, v in columns
+        ]
+
+    def to_frame(self):
+        """Date-indexed pandas DataFrame (copies the columns)"""
+        import pandas as pd
+
+        return pd.DataFrame(
+            {name: getattr(self, name) for name in COLUMNS[1:]},
+            index=pd.DatetimeIndex(self.date, name="date"),
+        )
+
+
+class _Series:
+    """Loaded columns plus fetched-range coverage for one series"""
+
+    def __init__(self, columns: dict[str, np.ndarray], coverage: list[tuple], version: str):
+        self.columns = columns
+        self.coverage = coverage  # sorted, merged [(start, end)] of datetime64[D], inclusive
+        self.version = version
+        self.lock = threading.Lock()
+
+    @classmethod
+    def empty(cls) -> "_Series":
+        columns = {name: np.empty(0, dtype=_dtype(name)) for name in COLUMNS}
+        return cls(columns, [], "")
+
+
+class BarStore:
+    """Disk-backed, gap-filling store of daily OHLCV bars"""
+
+    def __init__(self, root: str | Path | None = None, max_series: int | None = None):
+        self.root = Path(root or settings.BAR_STORE_DIR)
+        self.max_series = max_series or settings.BAR_STORE_MAX_SERIES
+
+        self._series: OrderedDict[tuple[str, str], _Series] = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.requests = 0
+        self.full_hits = 0
+        self.gap_fetches = 0
+        self.bars_fetched = 0
+        self.evictions = 0
+
+    def get_series(
+        self,
+        client: Any,
+        symbol: str,
+        interval: str,
+        start_date: str | date,
+        end_date: str | date | None = None,
+    ) -> BarSeries:
+        """
+        Return bars for [start_date, end_date], fetching only uncovered gaps
+
+        Args:
+            client: Provider with get_historical_bars(symbol, interval, start_date, end_date)
+            symbol: Stock symbol
+            interval: Bar interval (must be in STORED_INTERVALS)
+            start_date: First date (YYYY-MM-DD, date or datetime)
+            end_date: Last date (default: today); clipped to today
+
+        Returns:
+            BarSeries of read-only column views
+
+        Raises:
+            ValueError: If the interval is not stored
+            UnstorableBarsError: If the provider returned bars without a date or price
+            Exception: Provider errors from fetching a gap are propagated
+        """
+        if interval not in STORED_INTERVALS:
+            raise ValueError(f"Interval '{interval}' is not stored in the bar store")
+
+        symbol = symbol.upper()
+        today = np.datetime64(datetime.now(UTC).date(), "D")
+        start = _day(start_date)
+        end = min(_day(end_date) if end_date is not None else today, today)
+
+        series = self._get_or_load(symbol, interval)
+        with series.lock:
+            self.requests += 1
+            if start <= end:
+                gaps = _gaps(series.coverage, start, end)
+                if gaps:
+                    self._fill(client, symbol, interval, series, gaps, today)
+                else:
+                    self.full_hits += 1
+            columns = series.columns
+
+        lo = np.searchsorted(columns["date"], start, side="left")
+        hi = np.searchsorted(columns["date"], end, side="right")
+        return BarSeries(symbol, interval, **{name: columns[name][lo:hi] for name in COLUMNS})
+
+    def invalidate(self, symbol: str | None = None) -> int:
+        """
+        Drop stored series from memory and disk
+
+        Args:
+            symbol: Only drop this symbol's series (default: everything)
+
+        Returns:
+            Number of series directories removed
+        """
+        symbol = symbol.upper() if symbol else None
+        with self._lock:
+            for key in [k for k in self._series if symbol is None or k[0] == symbol]:
+                del self._series[key]
+
+        removed = 0
+        if self.root.exists():
+            for interval_dir in self.root.iterdir():
+                for series_dir in interval_dir.iterdir() if interval_dir.is_dir() else ():
+                    if symbol is None or series_dir.name == symbol:
+                        shutil.rmtree(series_dir, ignore_errors=True)
+                        removed += 1
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "full_hits": self.full_hits,
+            "gap_fetches": self.gap_fetches,
+            "bars_fetched": self.bars_fetched,
+            "series_in_memory": len(self._series),
+            "max_series": self.max_series,
+            "evictions": self.evictions,
+            "root": str(self.root),
+        }
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _get_or_load(self, symbol: str, interval: str) -> _Series:
+        key = (symbol, interval)
+        with self._lock:
+            series = self._series.get(key)
+            if series is not None:
+                self._series.move_to_end(key)
+                return series
+
+            series = self._load(symbol, interval)
+            self._series[key] = series
+            while len(self._series) > self.max_series:
+                self._series.popitem(last=False)
+                self.evictions += 1
+            return series
+
+    def _series_dir(self, symbol: str, interval: str) -> Path:
+        return self.root / interval / symbol
+
+    def _lock_path(self, symbol: str, interval: str) -> Path:
+        return self._series_dir(symbol, interval) / "meta.lock"
+
+    def _load(self, symbol: str, interval: str) -> _Series:
+        directory = self._series_dir(symbol, interval)
+        try:
+            meta = json.loads((directory / "meta.json").read_text())
+            columns = {
+                name: np.load(directory / f"{name}.{meta['version']}.npy", mmap_mode="r")
+                for name in COLUMNS
+            }
+        except FileNotFoundError:
+            return _Series.empty()
+        except Exception as e:
+            logger.warning(f"⚠️ Discarding unreadable bar series {symbol}/{interval}: {e}")
+            return _Series.empty()
+
+        coverage = [(np.datetime64(s, "D"), np.datetime64(e, "D")) for s, e in meta["coverage"]]
+        return _Series(columns, coverage, meta["version"])
+
+    def _fill(
+        self,
+        client: Any,
+        symbol: str,
+        interval: str,
+        series: _Series,
+        gaps: list[tuple],
+        today: np.datetime64,
+    ) -> None:
+        fetched = []
+        for gap_start, gap_end in gaps:
+            bars = client.get_historical_bars(
+                symbol=symbol,
+                interval=interval,
+                start_date=str(gap_start),
+                end_date=str(gap_end),
+            )
+            self.gap_fetches += 1
+            self.bars_fetched += len(bars or [])
+            fetched.append(_to_columns(bars or []))
+
+        columns = _merge(series.columns, fetched)
+
+        # Today's bar is still forming: never mark it as covered
+        coverage = list(series.coverage)
+        for gap_start, gap_end in gaps:
+            gap_end = min(gap_end, today - ONE_DAY)
+            if gap_start <= gap_end:
+                coverage.append((gap_start, gap_end))
+        coverage = _merge_ranges(coverage)
+
+        try:
+            self._series_dir(symbol, interval).mkdir(parents=True, exist_ok=True)
+            with portalocker.Lock(
+                self._lock_path(symbol, interval),
+                mode="a",
+                timeout=LOCK_TIMEOUT_SECONDS,
+                flags=portalocker.LOCK_EX,
+            ):
+                # Another worker may have written this series since it was loaded
+                on_disk = self._load(symbol, interval)
+                if on_disk.version and on_disk.version != series.version:
+                    columns = _merge(on_disk.columns, [columns])
+                    coverage = _merge_ranges([*on_disk.coverage, *coverage])
+                series.columns, series.version = self._persist(
+                    symbol, interval, columns, coverage
+                )
+        except (OSError, portalocker.LockException) as e:
+            logger.warning(f"⚠️ Bar store write failed for {symbol}/{interval}: {e}")
+            series.columns = columns
+        series.coverage = coverage
+
+    def _persist(
+        self,
+        symbol: str,
+        interval: str,
+        columns: dict[str, np.ndarray],
+        coverage: list[tuple],
+    ) -> tuple[dict[str, np.ndarray], str]:
+        """
+        Write a new column version, swap the manifest, and map the new files
+
+        Must hold the series file lock: every other column version in the
+        directory is removed, including ones orphaned by crashed writers.
+        """
+        directory = self._series_dir(symbol, interval)
+        version = uuid.uuid4().hex[:12]
+
+        for name in COLUMNS:
+            np.save(directory / f"{name}.{version}.npy", columns[name])
+
+        meta = {
+            "symbol": symbol,
+            "interval": interval,
+            "version": version,
+            "rows": len(columns["date"]),
+            "coverage": [[str(s), str(e)] for s, e in coverage],
+        }
+        tmp = directory / f"meta.{version}.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, directory / "meta.json")
+
+        # Open maps of older versions stay valid after unlink
+        current = {f"{name}.{version}.npy" for name in COLUMNS}
+        for path in directory.glob("*.npy"):
+            if path.name not in current:
+                try:
+                    path.unlink(missing_ok=True)
+                except OSError:
+                    pass
+
+        mapped = {
+            name: np.load(directory / f"{name}.{version}.npy", mmap_mode="r") for name in COLUMNS
+        }
+        return mapped, version
+
+
+def _dtype(column: str) -> np.dtype:
+    if column == "date":
+        return np.dtype("datetime64[D]")
+    if column == "volume":
+        return np.dtype(np.int64)
+    return np.dtype(np.float64)
+
+
+def _day(value: str | date | datetime) -> np.datetime64:
+    if isinstance(value, datetime):
+        value = value.date()
+    if isinstance(value, str):
+        value = value[:10]
+    return np.datetime64(value, "D")
+
+
+def _to_columns(bars: list[dict]) -> dict[str, np.ndarray]:
+    """Provider bar dicts -> column arrays"""
+    try:
+        return _parse_columns(bars)
+    except (KeyError, TypeError, ValueError) as e:
+        raise UnstorableBarsError(f"Unstorable provider bars: {e!r}") from e
+
+
+def _parse_columns(bars: list[dict]) -> dict[str, np.ndarray]:
+    columns = {
+        "date": np.array([str(bar["date"])[:10] for bar in bars], dtype="datetime64[D]"),
+        "volume": np.array([int(bar.get("volume") or 0) for bar in bars], dtype=np.int64),
+    }
+    for name in PRICE_COLUMNS:
+        columns[name] = np.array([float(bar[name]) for bar in bars], dtype=np.float64)
+    return columns
+
+
+def _merge(
+    existing: dict[str, np.ndarray], fetched: list[dict[str, np.ndarray]]
+) -> dict[str, np.ndarray]:
+    """Concatenate, sort by date and keep the newest copy of duplicate dates"""
+    parts = [existing, *fetched]
+    dates = np.concatenate([part["date"] for part in parts])
+    # Stable sort on reversed input keeps the last-fetched bar first for each date
+    order = np.argsort(dates[::-1], kind="stable")
+    order = len(dates) - 1 - order
+    sorted_dates = dates[order]
+    keep = np.ones(len(sorted_dates), dtype=bool)
+    keep[1:] = sorted_dates[1:] != sorted_dates[:-1]
+    order = order[keep]
+
+    return {
+        name: np.concatenate([part[name] for part in parts]).astype(_dtype(name))[order]
+        for name in COLUMNS
+    }
+
+
+def _merge_ranges(ranges: list[tuple]) -> list[tuple]:
+    """Merge overlapping or adjacent inclusive date ranges"""
+    merged: list[tuple] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _gaps(coverage: list[tuple], start: np.datetime64, end: np.datetime64) -> list[tuple]:
+    """Uncovered inclusive sub-ranges of [start, end]"""
+    gaps = []
+    cursor = start
+    for cov_start, cov_end in coverage:
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start - ONE_DAY))
+        cursor = max(cursor, cov_end + ONE_DAY)
+        if cursor > end:
+            break
+    if cursor <= end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+_bar_store: BarStore | None = None
+
+
+def get_bar_store() -> BarStore:
+    """Get or create the shared bar store"""
+    global _bar_store
+    if _bar_store is None:
+        _bar_store = BarStore()
+    return _bar_store
+
+
+def get_historical_bars(
+    client: Any,
+    symbol: str,
+    interval: str = "daily",
+    start_date: str | date | None = None,
+    end_date: str | date | None = None,
+) -> list[dict]:
+    """
+    Drop-in for client.get_historical_bars that serves stored intervals from the bar store
+
+    Falls back to the provider directly for unstored intervals, open-ended
+    ranges, bars the store cannot hold, and if the store itself fails.
+    """
+    if interval in STORED_INTERVALS and start_date is not None:
+        try:
+            return get_bar_store().get_series(
+                client, symbol, interval, start_date, end_date
+            ).to_records()
+        except OSError as e:
+            logger.warning(f"⚠️ Bar store unavailable, fetching {symbol} directly: {e}")
+        except UnstorableBarsError as e:
+            logger.debug(f"Passing {symbol} bars through uncached: {e}")
+
+    return client.get_historical_bars(
+        symbol=symbol,
+        interval=interval,
+        start_date=_iso(start_date),
+        end_date=_iso(end_date),
+    )
+
+
+def _iso(value: str | date | None) -> str | None:
+    if value is None or isinstance(value, str):
+        return value
+    return value.strftime("%Y-%m-%d")
@@ -6,6 +6,7 @@ Implements common cache operations with TTL support.
 """
 
 import json
+from collections.abc import Iterable, Iterator, Mapping
 from typing import Any
 
 import redis
@@ -14,6 +15,20 @@ from ..core.config import settings
 from .health_monitor import health_monitor
 
 
+TAG_KEY_PREFIX = "tag:"
+GENERATION_KEY_PREFIX = "cache:gen:"
+
+
+def namespace_tag(namespace: str) -> str:
+    """Tag carried by every key of a namespace (e.g. ns:bars)"""
+    return f"ns:{namespace}"
+
+
+def symbol_tag(symbol: str) -> str:
+    """Tag carried by every key holding data for a symbol (e.g. symbol:AAPL)"""
+    return f"symbol:{symbol.upper()}"
+
+
 class CacheService:
     """Redis cache service with graceful degradation"""
 
@@ -74,7 +89,41 @@ class CacheService:
             print(f"[WARNING] Cache GET error for key '{key}': {e}", flush=True)
             return None
 
-    def set(self, key: str, value: Any, ttl: int = 60) -> bool:
+    def get_many_with_ttl(self, keys: list[str]) -> dict[str, tuple[Any, int | None]]:
+        """
+        Get many values and their remaining TTLs in one pipelined round trip
+
+        Used by TieredCache to fill its in-process tier; hit/miss accounting
+        is left to the caller.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found key -> (value, remaining TTL in seconds or None)
+        """
+        if not self.available or not self.client or not keys:
+            return {}
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.get(key)
+                pipe.ttl(key)
+            replies = pipe.execute()
+        except Exception as e:
+            print(f"[WARNING] Cache GET_MANY error for {len(keys)} keys: {e}", flush=True)
+            return {}
+
+        found = {}
+        for key, value, ttl_value in zip(keys, replies[::2], replies[1::2], strict=True):
+            if value is not None:
+                found[key] = (json.loads(value), ttl_value if ttl_value >= 0 else None)
+        return found
+
+    def set(
+        self, key: str, value: Any, ttl: int = 60, tags: Iterable[str] = ()
+    ) -> bool:
         """
         Set value in cache with TTL
 
@@ -82,6 +131,7 @@ class CacheService:
             key: Cache key
             value: Value to cache (will be JSON serialized)
             ttl: Time to live in seconds (default: 60)
+            tags: Tags to index the key under for invalidate_tags()
 
         Returns:
             True if successful, False otherwise
@@ -91,12 +141,56 @@ class CacheService:
 
         try:
             serialized = json.dumps(value)
-            self.client.setex(key, ttl, serialized)
+            if not tags:
+                self.client.setex(key, ttl, serialized)
+                return True
+            pipe = self.client.pipeline(transaction=False)
+            pipe.setex(key, ttl, serialized)
+            _register_tags(pipe, {tag: [key] for tag in tags}, ttl)
+            pipe.execute()
             return True
         except Exception as e:
             print(f"[WARNING] Cache SET error for key '{key}': {e}", flush=True)
             return False
 
+    def set_many(
+        self,
+        items: dict[str, Any],
+        ttl: int = 60,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> bool:
+        """
+        Set many values with the same TTL in one pipelined round trip
+
+        Args:
+            items: Mapping of cache key -> value (values JSON serialized)
+            ttl: Time to live in seconds (default: 60)
+            tags: Mapping of cache key -> tags to index it under
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.available or not self.client:
+            return False
+        if not items:
+            return True
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, json.dumps(value))
+            if tags:
+                by_tag: dict[str, list[str]] = {}
+                for key, key_tags in tags.items():
+                    for tag in key_tags:
+                        by_tag.setdefault(tag, []).append(key)
+                _register_tags(pipe, by_tag, ttl)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[WARNING] Cache SET_MANY error for {len(items)} keys: {e}", flush=True)
+            return False
+
     def delete(self, key: str) -> bool:
         """
         Delete value from cache
@@ -137,12 +231,18 @@ class CacheService:
             print(f"[WARNING] Cache TTL error for key '{key}': {e}", flush=True)
             return None
 
-    def clear_pattern(self, pattern: str) -> int:
+    def clear_pattern(self, pattern: str, batch_size: int | None = None) -> int:
         """
         Clear all keys matching pattern
 
+        Walks the keyspace with incremental SCAN and unlinks matches in
+        pipelined batches, so Redis keeps serving other clients meanwhile.
+        Prefer invalidate_tags() where the keys are tagged.
+
         Args:
             pattern: Redis key pattern (e.g. "market:*")
+            batch_size: Keys per SCAN page / UNLINK batch
+                (default: CACHE_INVALIDATION_BATCH_SIZE)
 
         Returns:
             Number of keys deleted
@@ -150,11 +250,10 @@ class CacheService:
         if not self.available or not self.client:
             return 0
 
+        batch_size = batch_size or settings.CACHE_INVALIDATION_BATCH_SIZE
         try:
-            keys = self.client.keys(pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
+            batches = _chunks(self.client.scan_iter(match=pattern, count=batch_size), batch_size)
+            return sum(self.client.unlink(*batch) for batch in batches)
         except Exception as e:
             print(
                 f"[WARNING] Cache CLEAR_PATTERN error for pattern '{pattern}': {e}",
@@ -162,6 +261,103 @@ class CacheService:
             )
             return 0
 
+    def invalidate_tags(self, tags: Iterable[str], batch_size: int | None = None) -> int:
+        """
+        Delete every key registered under any of the tags, and the tag sets
+
+        Each tag set is read with SSCAN and its keys unlinked in pipelined
+        batches of batch_size, so cost is proportional to the tagged keys
+        rather than the keyspace and no single command blocks Redis.
+
+        Args:
+            tags: Tags passed to set()/set_many() (e.g. "symbol:AAPL")
+            batch_size: Keys per SSCAN page / UNLINK batch
+                (default: CACHE_INVALIDATION_BATCH_SIZE)
+
+        Returns:
+            Number of keys deleted (tag sets not counted)
+        """
+        if not self.available or not self.client:
+            return 0
+
+        batch_size = batch_size or settings.CACHE_INVALIDATION_BATCH_SIZE
+        deleted = 0
+        for tag in tags:
+            tag_key = TAG_KEY_PREFIX + tag
+            try:
+                for batch in _chunks(self.client.sscan_iter(tag_key, count=batch_size), batch_size):
+                    deleted += self.client.unlink(*batch)
+                self.client.unlink(tag_key)
+            except Exception as e:
+                print(f"[WARNING] Cache INVALIDATE_TAGS error for tag '{tag}': {e}", flush=True)
+        return deleted
+
+    def get_generations(self, namespaces: Iterable[str]) -> dict[str, int]:
+        """
+        Current generation of each namespace in one MGET (0 if never bumped)
+
+        Returns:
+            Mapping of namespace -> generation, empty if Redis is unavailable
+        """
+        namespaces = list(namespaces)
+        if not self.available or not self.client or not namespaces:
+            return {}
+
+        try:
+            values = self.client.mget([GENERATION_KEY_PREFIX + ns for ns in namespaces])
+        except Exception as e:
+            print(f"[WARNING] Cache GET_GENERATIONS error: {e}", flush=True)
+            return {}
+        return {ns: int(value or 0) for ns, value in zip(namespaces, values, strict=True)}
+
+    def bump_generation(self, namespace: str) -> int | None:
+        """
+        Start a new generation for a namespace - an O(1) flush of versioned keys
+
+        Keys written under the old generation are no longer read and expire by
+        their TTL. The namespace tag set indexed them, so it is dropped too.
+
+        Returns:
+            The new generation, or None if Redis is unavailable
+        """
+        if not self.available or not self.client:
+            return None
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            pipe.incr(GENERATION_KEY_PREFIX + namespace)
+            pipe.unlink(TAG_KEY_PREFIX + namespace_tag(namespace))
+            generation, _ = pipe.execute()
+            return int(generation)
+        except Exception as e:
+            print(f"[WARNING] Cache BUMP_GENERATION error for '{namespace}': {e}", flush=True)
+            return None
+
+
+def _register_tags(pipe, keys_by_tag: Mapping[str, list[str]], ttl: int) -> None:
+    """
+    Queue the SADD and EXPIREs for each tag set on a pipeline
+
+    NX gives a new set the TTL of its first key and GT only ever extends it
+    (Redis 7), so a tag set expires together with its longest-lived key.
+    """
+    for tag, keys in keys_by_tag.items():
+        tag_key = TAG_KEY_PREFIX + tag
+        pipe.sadd(tag_key, *keys)
+        pipe.expire(tag_key, ttl, nx=True)
+        pipe.expire(tag_key, ttl, gt=True)
+
+
+def _chunks(keys: Iterable[str], size: int) -> Iterator[list[str]]:
+    batch: list[str] = []
+    for key in keys:
+        batch.append(key)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
 
 # Global cache instance
 _cache_service: CacheService | None = None
@@ -20,9 +20,14 @@ from typing import Any
 
 import redis
 
+from .cache import _chunks
+
 
 logger = logging.getLogger(__name__)
 
+# Keys per SCAN page / UNLINK call in invalidate()
+INVALIDATE_BATCH_SIZE = 500
+
 
 class CacheStats:
     """Cache statistics tracker"""
@@ -295,9 +300,12 @@ class CacheService:
         # Invalidate in Redis
         if self.available and self.redis_client:
             try:
-                keys = self.redis_client.keys(pattern)
-                if keys:
-                    count = self.redis_client.delete(*keys)
+                # Incremental SCAN + batched UNLINK rather than KEYS, which
+                # blocks Redis for the whole keyspace walk
+                keys = self.redis_client.scan_iter(match=pattern, count=INVALIDATE_BATCH_SIZE)
+                for batch in _chunks(keys, INVALIDATE_BATCH_SIZE):
+                    count += self.redis_client.unlink(*batch)
+                if count:
                     logger.info(f"Invalidated {count} keys matching '{pattern}' in Redis")
             except Exception as e:
                 logger.error(f"Redis INVALIDATE error for pattern '{pattern}': {e}")
@@ -0,0 +1,277 @@
+"""
+Append-Only Equity Snapshot Store
+
+Appends equity snapshots as fixed-width binary records, serves time ranges
+from a memory map, and keeps running curve aggregates for O(1) metrics.
+"""
+
+import json
+import logging
+import os
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("ts", "<i8"),  # microseconds since the Unix epoch (UTC)
+        ("equity", "<f8"),
+        ("cash", "<f8"),
+        ("positions_value", "<f8"),
+        ("num_positions", "<i4"),
+    ]
+)
+
+RECORDS_FILE = "snapshots.bin"
+AGGREGATES_FILE = "aggregates.json"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+
+
+def to_micros(value: datetime | str) -> int:
+    """Timestamp -> epoch microseconds (naive datetimes are local time, ISO strings UTC)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+    if value.tzinfo is None:
+        return round(value.timestamp() * 1_000_000)
+    return (value - _EPOCH) // timedelta(microseconds=1)
+
+
+def from_micros(ts: int) -> str:
+    return (_EPOCH + timedelta(microseconds=int(ts))).isoformat()
+
+
+def _empty_aggregates() -> dict[str, Any]:
+    return {
+        "rows": 0,
+        "first_ts": None,
+        "last_ts": None,
+        "first_equity": 0.0,
+        "last_equity": 0.0,
+        "peak_equity": 0.0,
+        "max_drawdown": 0.0,
+        "up_steps": 0,
+        "down_steps": 0,
+        "return_count": 0,
+        "return_mean": 0.0,
+        "return_m2": 0.0,
+    }
+
+
+def _fold(aggregates: dict[str, Any], records: np.ndarray) -> None:
+    """Fold records (in time order, after those already folded) into the aggregates"""
+    for ts, equity in zip(records["ts"].tolist(), records["equity"].tolist(), strict=True):
+        if aggregates["rows"] == 0:
+            aggregates["first_ts"] = ts
+            aggregates["first_equity"] = equity
+            aggregates["peak_equity"] = equity
+        else:
+            prev = aggregates["last_equity"]
+            if equity > prev:
+                aggregates["up_steps"] += 1
+            elif equity < prev:
+                aggregates["down_steps"] += 1
+
+            step_return = (equity - prev) / prev if prev > 0 else 0.0
+            aggregates["return_count"] += 1
+            delta = step_return - aggregates["return_mean"]
+            aggregates["return_mean"] += delta / aggregates["return_count"]
+            aggregates["return_m2"] += delta * (step_return - aggregates["return_mean"])
+
+            peak = aggregates["peak_equity"] = max(aggregates["peak_equity"], equity)
+            drawdown = (peak - equity) / peak if peak > 0 else 0.0
+            aggregates["max_drawdown"] = max(aggregates["max_drawdown"], drawdown)
+
+        aggregates["rows"] += 1
+        aggregates["last_ts"] = ts
+        aggregates["last_equity"] = equity
+
+
+def window_metrics(equity: np.ndarray) -> dict[str, float]:
+    """Total return, max drawdown, up/down steps and step-return stats of one window"""
+    peak = np.maximum.accumulate(equity)
+    drawdown = np.divide(peak - equity, peak, out=np.zeros_like(equity), where=peak > 0)
+    prev, curr = equity[:-1], equity[1:]
+    returns = np.divide(curr - prev, prev, out=np.zeros_like(curr), where=prev > 0)
+    return {
+        "first_equity": float(equity[0]),
+        "last_equity": float(equity[-1]),
+        "max_drawdown": float(drawdown.max()),
+        "up_steps": int((curr > prev).sum()),
+        "down_steps": int((curr < prev).sum()),
+        "return_mean": float(returns.mean()) if len(returns) else 0.0,
+        "return_std": float(returns.std()) if len(returns) else 0.0,
+    }
+
+
+class EquitySnapshotStore:
+    """Append-only, time-indexed equity snapshots with running aggregates"""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.records_path = self.root / RECORDS_FILE
+        self.aggregates_path = self.root / AGGREGATES_FILE
+
+        self._lock = threading.Lock()
+        self._view: np.ndarray | None = None
+        self._aggregates = self._recover()
+
+    def __len__(self) -> int:
+        return self._aggregates["rows"]
+
+    def append(self, snapshot: dict) -> None:
+        """
+        Append one snapshot (dict with timestamp, equity, cash, positions_value,
+        num_positions)
+
+        Raises:
+            ValueError: If the snapshot is older than the newest stored one
+        """
+        self.extend([snapshot])
+
+    def extend(self, snapshots: list[dict]) -> None:
+        """Append snapshots in one write (they must be in time order)"""
+        records = _to_records(snapshots)
+        if len(records) == 0:
+            return
+        with self._lock:
+            last_ts = self._aggregates["last_ts"]
+            if np.any(np.diff(records["ts"]) < 0) or (
+                last_ts is not None and records["ts"][0] < last_ts
+            ):
+                raise ValueError("Equity snapshots must be appended in time order")
+
+            with open(self.records_path, "ab") as f:
+                f.write(records.tobytes())
+            self._view = None
+            _fold(self._aggregates, records)
+            self._write_aggregates()
+
+    def range(self, start: datetime | None = None, end: datetime | None = None) -> list[dict]:
+        """Snapshots with start <= timestamp <= end, oldest first"""
+        records = self.slice(start, end)
+        return [
+            {
+                "timestamp": from_micros(ts),
+                "equity": equity,
+                "cash": cash,
+                "positions_value": positions_value,
+                "num_positions": num_positions,
+            }
+            for ts, equity, cash, positions_value, num_positions in zip(
+                records["ts"].tolist(),
+                records["equity"].tolist(),
+                records["cash"].tolist(),
+                records["positions_value"].tolist(),
+                records["num_positions"].tolist(),
+                strict=True,
+            )
+        ]
+
+    def slice(self, start: datetime | None = None, end: datetime | None = None) -> np.ndarray:
+        """Record view for start <= timestamp <= end (binary search on the time index)"""
+        view = self._records()
+        ts = view["ts"]
+        lo = 0 if start is None else int(np.searchsorted(ts, to_micros(start), side="left"))
+        hi = len(ts) if end is None else int(np.searchsorted(ts, to_micros(end), side="right"))
+        return view[lo:hi]
+
+    def get_aggregates(self) -> dict[str, Any]:
+        """All-time running aggregates"""
+        with self._lock:
+            return dict(self._aggregates)
+
+    def migrate_json(self, json_path: str | Path) -> int:
+        """
+        One-shot import of a legacy JSON history file
+
+        Only runs into an empty store; the JSON file is renamed to
+        ``*.migrated`` afterwards so the import never repeats.
+
+        Returns:
+            Number of snapshots imported
+        """
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return 0
+        if len(self):
+            logger.warning(f"⚠️ Equity store not empty; leaving {json_path} unmigrated")
+            return 0
+
+        history = json.loads(json_path.read_text() or "[]")
+        history.sort(key=lambda s: to_micros(s["timestamp"]))
+        self.extend(history)
+        os.replace(json_path, json_path.with_name(json_path.name + ".migrated"))
+        logger.info(f"✅ Migrated {len(history)} equity snapshots from {json_path}")
+        return len(history)
+
+    # ------------------------------------------------------------------ #
+    # Internals
+    # ------------------------------------------------------------------ #
+
+    def _records(self) -> np.ndarray:
+        view = self._view
+        if view is None:
+            with self._lock:
+                rows = self._aggregates["rows"]
+                if rows == 0:
+                    view = np.empty(0, dtype=SNAPSHOT_DTYPE)
+                else:
+                    view = np.memmap(
+                        self.records_path, dtype=SNAPSHOT_DTYPE, mode="r", shape=(rows,)
+                    )
+                self._view = view
+        return view
+
+    def _recover(self) -> dict[str, Any]:
+        """Load aggregates, dropping a torn tail record and replaying unfolded ones"""
+        try:
+            aggregates = json.loads(self.aggregates_path.read_text())
+        except FileNotFoundError:
+            aggregates = _empty_aggregates()
+        except Exception as e:
+            logger.warning(f"⚠️ Rebuilding unreadable equity aggregates: {e}")
+            aggregates = _empty_aggregates()
+
+        size = self.records_path.stat().st_size if self.records_path.exists() else 0
+        rows, torn = divmod(size, SNAPSHOT_DTYPE.itemsize)
+        if torn:
+            logger.warning(f"⚠️ Truncating torn equity snapshot record ({torn} bytes)")
+            with open(self.records_path, "r+b") as f:
+                f.truncate(rows * SNAPSHOT_DTYPE.itemsize)
+
+        if aggregates["rows"] > rows:
+            aggregates = _empty_aggregates()
+        if aggregates["rows"] < rows:
+            records = np.fromfile(self.records_path, dtype=SNAPSHOT_DTYPE, count=rows)
+            _fold(aggregates, records[aggregates["rows"] :])
+            self._aggregates = aggregates
+            self._write_aggregates()
+        return aggregates
+
+    def _write_aggregates(self) -> None:
+        tmp = self.aggregates_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(self._aggregates))
+        os.replace(tmp, self.aggregates_path)
+
+
+def _to_records(snapshots: list[dict]) -> np.ndarray:
+    records = np.empty(len(snapshots), dtype=SNAPSHOT_DTYPE)
+    for i, s in enumerate(snapshots):
+        records[i] = (
+            to_micros(s["timestamp"]),
+            float(s.get("equity", 0)),
+            float(s.get("cash", 0)),
+            float(s.get("positions_value", 0)),
+            int(s.get("num_positions", 0)),
+        )
+    return records
@@ -2,15 +2,16 @@
 Equity Curve Tracking Service
 
 Tracks daily portfolio equity for historical performance analysis.
-Stores equity snapshots in JSON files for P&L Dashboard.
+Stores equity snapshots in an append-only, time-indexed store (see
+equity_store.py) for P&L Dashboard.
 """
 
-import json
 import logging
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 from ..services.tradier_client import get_tradier_client
+from .equity_store import EquitySnapshotStore, to_micros, window_metrics
 
 
 logger = logging.getLogger(__name__)
@@ -19,14 +20,33 @@ logger = logging.getLogger(__name__)
 EQUITY_DATA_DIR = Path("data/equity")
 EQUITY_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Legacy whole-file JSON history, imported into the store once at startup
 EQUITY_FILE = EQUITY_DATA_DIR / "equity_history.json"
 
 
 class EquityTracker:
     """Tracks daily equity snapshots for performance analysis"""
 
-    def __init__(self):
-        self.data_file = EQUITY_FILE
+    def __init__(self, store: EquitySnapshotStore | None = None):
+        """
+        Args:
+            store: Snapshot store (default: store under EQUITY_DATA_DIR)
+        """
+        # An empty store is falsy (__len__), so test for None explicitly
+        self.store = store if store is not None else EquitySnapshotStore(EQUITY_DATA_DIR)
+
+    def migrate_legacy_history(self, legacy_file: Path = EQUITY_FILE) -> int:
+        """
+        Import the JSON-era history into an empty store (run once at startup)
+
+        Returns:
+            Number of snapshots imported (0 if there was nothing to import or it failed)
+        """
+        try:
+            return self.store.migrate_json(legacy_file)
+        except Exception as e:
+            logger.error(f"❌ Failed to migrate equity history: {e!s}")
+            return 0
 
     def record_snapshot(self) -> dict:
         """
@@ -62,11 +82,7 @@ class EquityTracker:
             }
 
             # Append to history
-            history = self.load_history()
-            history.append(snapshot)
-
-            # Save updated history
-            self.save_history(history)
+            self.store.append(snapshot)
 
             logger.info(f"✅ Recorded equity snapshot: ${equity:.2f}")
             return snapshot
@@ -76,25 +92,8 @@ class EquityTracker:
             raise
 
     def load_history(self) -> list[dict]:
-        """Load equity history from file"""
-        try:
-            if self.data_file.exists():
-                with open(self.data_file) as f:
-                    return json.load(f)
-            return []
-        except Exception as e:
-            logger.error(f"❌ Failed to load equity history: {e!s}")
-            return []
-
-    def save_history(self, history: list[dict]):
-        """Save equity history to file"""
-        try:
-            with open(self.data_file, "w") as f:
-                json.dump(history, f, indent=2)
-            logger.info(f"✅ Saved equity history ({len(history)} snapshots)")
-        except Exception as e:
-            logger.error(f"❌ Failed to save equity history: {e!s}")
-            raise
+        """Load the full equity history"""
+        return self.get_history()
 
     def get_history(
         self, start_date: datetime | None = None, end_date: datetime | None = None
@@ -109,25 +108,11 @@ class EquityTracker:
         Returns:
             List of equity snapshots
         """
-        history = self.load_history()
-
-        if not start_date and not end_date:
-            return history
-
-        # Filter by date range
-        filtered = []
-        for snapshot in history:
-            snapshot_date = datetime.fromisoformat(snapshot["timestamp"])
-
-            if start_date and snapshot_date < start_date:
-                continue
-
-            if end_date and snapshot_date > end_date:
-                continue
-
-            filtered.append(snapshot)
-
-        return filtered
+        try:
+            return self.store.range(start_date, end_date)
+        except Exception as e:
+            logger.error(f"❌ Failed to load equity history: {e!s}")
+            return []
 
     def calculate_metrics(self, period_days: int = 30) -> dict:
         """
@@ -144,96 +129,63 @@ class EquityTracker:
                 - win_days
                 - loss_days
         """
-        history = self.load_history()
-
-        if not history:
-            return {
-                "total_return": 0,
-                "max_drawdown": 0,
-                "sharpe_ratio": 0,
-                "win_days": 0,
-                "loss_days": 0,
-            }
+        empty = {
+            "total_return": 0,
+            "max_drawdown": 0,
+            "sharpe_ratio": 0,
+            "win_days": 0,
+            "loss_days": 0,
+        }
 
         # Get snapshots within period
-        cutoff_date = datetime.now(UTC).timestamp() - (period_days * 86400)
-        recent_snapshots = [
-            s
-            for s in history
-            if datetime.fromisoformat(s["timestamp"]).timestamp() >= cutoff_date
-        ]
-
-        if len(recent_snapshots) < 2:
-            return {
-                "total_return": 0,
-                "max_drawdown": 0,
-                "sharpe_ratio": 0,
-                "win_days": 0,
-                "loss_days": 0,
+        cutoff = datetime.now(UTC) - timedelta(days=period_days)
+        aggregates = self.store.get_aggregates()
+        if aggregates["rows"] < 2:
+            return empty
+
+        if aggregates["first_ts"] >= to_micros(cutoff):
+            # Window covers the whole curve: use the running aggregates
+            count = aggregates["rows"]
+            variance = (
+                aggregates["return_m2"] / aggregates["return_count"]
+                if aggregates["return_count"]
+                else 0.0
+            )
+            metrics = {
+                "first_equity": aggregates["first_equity"],
+                "last_equity": aggregates["last_equity"],
+                "max_drawdown": aggregates["max_drawdown"],
+                "up_steps": aggregates["up_steps"],
+                "down_steps": aggregates["down_steps"],
+                "return_mean": aggregates["return_mean"],
+                "return_std": variance**0.5,
             }
+        else:
+            equity = self.store.slice(start=cutoff)["equity"]
+            count = len(equity)
+            if count < 2:
+                return empty
+            metrics = window_metrics(equity)
 
         # Calculate total return
-        start_equity = recent_snapshots[0]["equity"]
-        end_equity = recent_snapshots[-1]["equity"]
-        total_return = end_equity - start_equity
+        start_equity = metrics["first_equity"]
+        total_return = metrics["last_equity"] - start_equity
         total_return_pct = (
             (total_return / start_equity * 100) if start_equity > 0 else 0
         )
 
-        # Calculate max drawdown
-        peak = start_equity
-        max_dd = 0
-        for snapshot in recent_snapshots:
-            equity = snapshot["equity"]
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
-
-        # Count winning/losing days
-        win_days = 0
-        loss_days = 0
-        for i in range(1, len(recent_snapshots)):
-            prev_equity = recent_snapshots[i - 1]["equity"]
-            curr_equity = recent_snapshots[i]["equity"]
-            if curr_equity > prev_equity:
-                win_days += 1
-            elif curr_equity < prev_equity:
-                loss_days += 1
-
-        # Simplified Sharpe ratio
-        # Calculate daily returns
-        daily_returns = []
-        for i in range(1, len(recent_snapshots)):
-            prev_equity = recent_snapshots[i - 1]["equity"]
-            curr_equity = recent_snapshots[i]["equity"]
-            daily_return = (
-                (curr_equity - prev_equity) / prev_equity if prev_equity > 0 else 0
-            )
-            daily_returns.append(daily_return)
-
-        if daily_returns:
-            avg_return = sum(daily_returns) / len(daily_returns)
-            # Standard deviation
-            variance = sum((r - avg_return) ** 2 for r in daily_returns) / len(
-                daily_returns
-            )
-            std_dev = variance**0.5
-
-            # Sharpe ratio (assuming 0% risk-free rate)
-            sharpe = (avg_return / std_dev * (252**0.5)) if std_dev > 0 else 0
-        else:
-            sharpe = 0
+        # Simplified Sharpe ratio (assuming 0% risk-free rate)
+        std_dev = metrics["return_std"]
+        sharpe = (metrics["return_mean"] / std_dev * (252**0.5)) if std_dev > 0 else 0
 
         return {
             "total_return": round(total_return, 2),
             "total_return_percent": round(total_return_pct, 2),
-            "max_drawdown": round(max_dd * 100, 2),
+            "max_drawdown": round(metrics["max_drawdown"] * 100, 2),
             "sharpe_ratio": round(sharpe, 2),
-            "win_days": win_days,
-            "loss_days": loss_days,
-            "num_snapshots": len(recent_snapshots),
+            "win_days": metrics["up_steps"],
+            "loss_days": metrics["down_steps"],
+            "num_snapshots": count,
         }
 
 
@@ -5,6 +5,9 @@ Keeps the same class name and method signatures expected by callers while delega
 to the production implementation in options_greeks.
 """
 
+import numpy as np
+from numpy.typing import ArrayLike
+
 from .options_greeks import GreeksCalculator as _BSCalculator
 
 
@@ -37,6 +40,60 @@ class GreeksCalculator:
             "vega": float(greeks.vega),
         }
 
+    def calculate_greeks_batch(
+        self,
+        option_types: ArrayLike,
+        underlying_prices: ArrayLike,
+        strike_prices: ArrayLike,
+        days_to_expiry: ArrayLike,
+        implied_volatilities: ArrayLike,
+    ) -> np.ndarray:
+        """Vectorized calculate_greeks; returns an options_greeks.GREEKS_DTYPE array."""
+        time_to_expiry = np.maximum(0.0, np.asarray(days_to_expiry, dtype=np.float64) / 365.0)
+        return self._impl.calculate_greeks_batch(
+            spot_prices=underlying_prices,
+            strike_prices=strike_prices,
+            times_to_expiry=time_to_expiry,
+            volatilities=implied_volatilities,
+            option_types=option_types,
+        )
+
+    def price_batch(
+        self,
+        option_types: ArrayLike,
+        underlying_prices: ArrayLike,
+        strike_prices: ArrayLike,
+        days_to_expiry: ArrayLike,
+        implied_volatilities: ArrayLike,
+    ) -> np.ndarray:
+        """Vectorized Black-Scholes prices (no Greeks); inputs broadcast."""
+        time_to_expiry = np.maximum(0.0, np.asarray(days_to_expiry, dtype=np.float64) / 365.0)
+        return self._impl.price_batch(
+            spot_prices=underlying_prices,
+            strike_prices=strike_prices,
+            times_to_expiry=time_to_expiry,
+            volatilities=implied_volatilities,
+            option_types=option_types,
+        )
+
+    def implied_volatility_batch(
+        self,
+        option_prices: ArrayLike,
+        underlying_prices: ArrayLike,
+        strike_prices: ArrayLike,
+        days_to_expiry: ArrayLike,
+        option_types: ArrayLike,
+    ) -> np.ndarray:
+        """Vectorized implied volatility; returns an options_greeks.IV_DTYPE array."""
+        time_to_expiry = np.maximum(0.0, np.asarray(days_to_expiry, dtype=np.float64) / 365.0)
+        return self._impl.implied_volatility_batch(
+            option_prices=option_prices,
+            spot_prices=underlying_prices,
+            strike_prices=strike_prices,
+            times_to_expiry=time_to_expiry,
+            option_types=option_types,
+        )
+
     # Convenience helpers (not currently used by callers)
     def calculate_delta(
         self,
@@ -9,6 +9,8 @@ import logging
 from datetime import datetime
 from typing import Any
 
+from .bar_store import get_historical_bars
+
 
 logger = logging.getLogger(__name__)
 
@@ -52,9 +54,13 @@ class HistoricalDataService:
 
         logger.info(f"Fetching real market data for {symbol} from {start_date} to {end_date}")
 
-        # Call Tradier API (synchronous method, not async)
-        bars = self.tradier_client.get_historical_bars(
-            symbol=symbol, interval=interval, start_date=start_date, end_date=end_date
+        # Daily bars come from the shared bar store; only missing dates hit Tradier
+        bars = get_historical_bars(
+            self.tradier_client,
+            symbol=symbol,
+            interval=interval,
+            start_date=start_date,
+            end_date=end_date,
         )
 
         if not bars:
@@ -1,5 +1,6 @@
 import os
 
+import httpx
 import requests
 
 from .base_provider import BaseNewsProvider, NewsArticle
@@ -10,16 +11,12 @@ class AlphaVantageProvider(BaseNewsProvider):
         self.api_key = os.getenv("ALPHA_VANTAGE_API_KEY")
         if not self.api_key:
             raise ValueError("ALPHA_VANTAGE_API_KEY not set")
+        self.base_url = "https://www.alphavantage.co"
         self.provider_name = "alpha_vantage"
 
     def get_company_news(self, symbol: str, days_back: int = 7) -> list[NewsArticle]:
-        url = "https://www.alphavantage.co/query"
-        params = {
-            "function": "NEWS_SENTIMENT",
-            "tickers": symbol.upper(),
-            "apikey": self.api_key,
-            "limit": 50,
-        }
+        url = f"{self.base_url}/query"
+        params = self._company_params(symbol)
 
         try:
             response = requests.get(url, params=params, timeout=10)
@@ -35,13 +32,8 @@ class AlphaVantageProvider(BaseNewsProvider):
             return []
 
     def get_market_news(self, category: str = "general") -> list[NewsArticle]:
-        url = "https://www.alphavantage.co/query"
-        params = {
-            "function": "NEWS_SENTIMENT",
-            "apikey": self.api_key,
-            "limit": 50,
-            "topics": category,
-        }
+        url = f"{self.base_url}/query"
+        params = self._market_params(category)
 
         try:
             response = requests.get(url, params=params, timeout=10)
@@ -56,6 +48,42 @@ class AlphaVantageProvider(BaseNewsProvider):
             print(f"[ERROR] Alpha Vantage market news error: {e}")
             return []
 
+    async def aget_company_news(
+        self, client: httpx.AsyncClient, symbol: str, days_back: int = 7
+    ) -> list[NewsArticle]:
+        response = await client.get(f"{self.base_url}/query", params=self._company_params(symbol))
+        response.raise_for_status()
+        return self._parse_feed(response.json(), symbol)
+
+    async def aget_market_news(
+        self, client: httpx.AsyncClient, category: str = "general"
+    ) -> list[NewsArticle]:
+        response = await client.get(f"{self.base_url}/query", params=self._market_params(category))
+        response.raise_for_status()
+        return self._parse_feed(response.json())
+
+    def _company_params(self, symbol: str) -> dict:
+        return {
+            "function": "NEWS_SENTIMENT",
+            "tickers": symbol.upper(),
+            "apikey": self.api_key,
+            "limit": 50,
+        }
+
+    def _market_params(self, category: str) -> dict:
+        return {
+            "function": "NEWS_SENTIMENT",
+            "apikey": self.api_key,
+            "limit": 50,
+            "topics": category,
+        }
+
+    def _parse_feed(self, data: dict, symbol: str | None = None) -> list[NewsArticle]:
+        if "feed" not in data:
+            # Rate-limit notes come back as 200s without a feed
+            raise ValueError(f"Alpha Vantage: No feed data - {data.get('Note', 'Unknown error')}")
+        return [self._transform_article(article, symbol) for article in data["feed"]]
+
     def _transform_article(self, article: dict, symbol: str | None = None) -> NewsArticle:
         sentiment_score = float(article.get("overall_sentiment_score", 0))
 
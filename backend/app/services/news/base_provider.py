@@ -1,6 +1,9 @@
+import asyncio
 from abc import ABC, abstractmethod
 from typing import Any
 
+import httpx
+
 
 class NewsArticle:
     """Standardized news article format"""
@@ -50,3 +53,17 @@ class BaseNewsProvider(ABC):
     @abstractmethod
     def get_provider_name(self) -> str:
         pass
+
+    # Async variants used by NewsAggregator's concurrent mode. Unlike the sync
+    # methods they raise on failure so the aggregator's circuit breaker sees it.
+    # Providers without a native implementation run the sync call in a thread.
+
+    async def aget_company_news(
+        self, client: httpx.AsyncClient, symbol: str, days_back: int = 7
+    ) -> list[NewsArticle]:
+        return await asyncio.to_thread(self.get_company_news, symbol, days_back)
+
+    async def aget_market_news(
+        self, client: httpx.AsyncClient, category: str = "general"
+    ) -> list[NewsArticle]:
+        return await asyncio.to_thread(self.get_market_news, category)
@@ -0,0 +1,165 @@
+"""
+News Title Deduplication
+
+Groups near-duplicate article titles using MinHash/LSH candidate buckets,
+confirmed with the same SequenceMatcher > 0.85 check the aggregator uses.
+"""
+
+import re
+import zlib
+from collections import defaultdict
+from difflib import SequenceMatcher
+
+import numpy as np
+
+from .base_provider import NewsArticle
+
+
+# Titles above this SequenceMatcher ratio are the same story
+SIMILARITY_THRESHOLD = 0.85
+
+SHINGLE_SIZE = 3
+
+# 32 bands of 2 rows: a pair with shingle Jaccard J becomes a candidate with
+# probability 1 - (1 - J^2)^32 (~98% at J=0.35, ~1 - 1e-4 at J=0.5)
+LSH_BANDS = 32
+LSH_ROWS = 2
+
+# One independent hash per signature slot: the shingle's crc32 xor a random
+# 64-bit mask, scrambled by the splitmix64 finalizer. Each slot then orders
+# the shingles independently, which is what makes the per-slot minimum agree
+# with probability J (an affine hash that never wraps would be monotone in the
+# crc32 and pick the same shingle in every slot)
+_HASH_MASKS = np.random.default_rng(0x5EED).integers(
+    0, np.iinfo(np.uint64).max, size=LSH_BANDS * LSH_ROWS, dtype=np.uint64, endpoint=True
+)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+
+def normalize_title(title: str | None) -> str:
+    """Lowercase, fold punctuation to spaces and collapse whitespace"""
+    return _NON_ALNUM.sub(" ", (title or "").lower()).strip()
+
+
+def shingles(title: str | None) -> set[str]:
+    """Character shingles of the normalized title (short titles are one shingle)"""
+    text = normalize_title(title)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i : i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def minhash_signatures(titles: list[str | None]) -> np.ndarray:
+    """MinHash signature per title, shape (len(titles), LSH_BANDS * LSH_ROWS)"""
+    hashes = []
+    offsets = []
+    for title in titles:
+        offsets.append(len(hashes))
+        hashes.extend(zlib.crc32(s.encode()) for s in shingles(title))
+
+    values = np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+    starts = np.asarray(offsets, dtype=np.intp)
+    signatures = np.empty((len(titles), len(_HASH_MASKS)), dtype=np.uint64)
+    # One hash function at a time keeps memory at one pass over the shingles
+    for k, mask in enumerate(_HASH_MASKS):
+        signatures[:, k] = np.minimum.reduceat(_mix64(values ^ mask), starts)
+    return signatures
+
+
+def _mix64(z: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (uint64 multiplication wraps mod 2^64)"""
+    z = (z ^ (z >> np.uint64(30))) * _MIX_1
+    z = (z ^ (z >> np.uint64(27))) * _MIX_2
+    return z ^ (z >> np.uint64(31))
+
+
+def _char_counts(titles: list[str]) -> np.ndarray:
+    """Per-title character counts, shape (len(titles), distinct characters)"""
+    alphabet = {ch: k for k, ch in enumerate(sorted(set("".join(titles))))}
+    counts = np.zeros((len(titles), max(1, len(alphabet))), dtype=np.int32)
+    rows = np.repeat(np.arange(len(titles)), [len(title) for title in titles])
+    codes = np.fromiter(
+        (alphabet[ch] for title in titles for ch in title), dtype=np.intp, count=len(rows)
+    )
+    np.add.at(counts, (rows, codes), 1)
+    return counts
+
+
+def _quick_ratios(counts: np.ndarray, lengths: np.ndarray, i: int, js: np.ndarray) -> np.ndarray:
+    """SequenceMatcher(None, titles[i], titles[j]).quick_ratio() for every j in js"""
+    matches = np.minimum(counts[i], counts[js]).sum(axis=1)
+    total = lengths[i] + lengths[js]
+    # Two empty titles are identical (ratio 1.0), as in difflib
+    return np.where(total > 0, 2.0 * matches / np.maximum(total, 1), 1.0)
+
+
+def find_duplicate_groups(
+    titles: list[str | None], threshold: float = SIMILARITY_THRESHOLD
+) -> list[list[int]]:
+    """
+    Group title indices whose lowercased titles are more than ``threshold`` similar
+
+    Groups are formed greedily in input order: each title not yet grouped
+    claims every later ungrouped title similar to it. Groups and the indices
+    inside them are in input order.
+    """
+    if not titles:
+        return []
+
+    signatures = minhash_signatures(titles)
+    band_keys = signatures.reshape(len(titles), LSH_BANDS, LSH_ROWS)
+    # Fold each band's rows into one key (a collision only adds a candidate)
+    band_keys = band_keys[:, :, 0] * np.uint64(0x9E3779B97F4A7C15) ^ band_keys[:, :, 1]
+    band_keys = band_keys.tolist()
+
+    buckets: dict[tuple[int, int], list[int]] = defaultdict(list)
+    for i, keys in enumerate(band_keys):
+        for band, key in enumerate(keys):
+            buckets[(band, key)].append(i)
+
+    lowered = [(title or "").lower() for title in titles]
+    counts = _char_counts(lowered)
+    lengths = np.fromiter((len(title) for title in lowered), dtype=np.int64, count=len(titles))
+    used = [False] * len(titles)
+    groups = []
+    for i, keys in enumerate(band_keys):
+        if used[i]:
+            continue
+        used[i] = True
+        group = [i]
+
+        candidates = set()
+        for band, key in enumerate(keys):
+            members = buckets[(band, key)]
+            if len(members) > 1:
+                candidates.update(members)
+
+        js = np.array(sorted(j for j in candidates if j > i and not used[j]), dtype=np.intp)
+        if len(js):
+            # quick_ratio bounds ratio from above, so this only drops non-matches
+            js = js[_quick_ratios(counts, lengths, i, js) > threshold]
+        for j in js.tolist():
+            # Argument order matches the old loop
+            if SequenceMatcher(None, lowered[i], lowered[j]).ratio() > threshold:
+                group.append(j)
+                used[j] = True
+        groups.append(group)
+
+    return groups
+
+
+def deduplicate_articles(
+    articles: list[NewsArticle], threshold: float = SIMILARITY_THRESHOLD
+) -> list[NewsArticle]:
+    """Keep the strongest article of each near-duplicate group, in feed order"""
+    groups = find_duplicate_groups([article.title for article in articles], threshold)
+    return [
+        max(
+            (articles[i] for i in group),
+            key=lambda x: (abs(x.sentiment_score), len(x.summary), x.published_at),
+        )
+        for group in groups
+    ]
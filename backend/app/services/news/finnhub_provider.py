@@ -2,6 +2,7 @@ import os
 from datetime import datetime, timedelta
 
 import finnhub
+import httpx
 
 from .base_provider import BaseNewsProvider, NewsArticle
 
@@ -11,12 +12,13 @@ class FinnhubProvider(BaseNewsProvider):
         api_key = os.getenv("FINNHUB_API_KEY")
         if not api_key:
             raise ValueError("FINNHUB_API_KEY not set")
+        self.api_key = api_key
         self.client = finnhub.Client(api_key=api_key)
+        self.base_url = "https://finnhub.io/api/v1"
         self.provider_name = "finnhub"
 
     def get_company_news(self, symbol: str, days_back: int = 7) -> list[NewsArticle]:
-        to_date = datetime.now().strftime("%Y-%m-%d")
-        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        from_date, to_date = self._date_range(days_back)
 
         try:
             news = self.client.company_news(symbol.upper(), _from=from_date, to=to_date)
@@ -33,6 +35,31 @@ class FinnhubProvider(BaseNewsProvider):
             print(f"[ERROR] Finnhub market news error: {e}")
             return []
 
+    async def aget_company_news(
+        self, client: httpx.AsyncClient, symbol: str, days_back: int = 7
+    ) -> list[NewsArticle]:
+        # Same REST endpoint the finnhub SDK wraps
+        from_date, to_date = self._date_range(days_back)
+        params = {"symbol": symbol.upper(), "from": from_date, "to": to_date}
+        response = await client.get(
+            f"{self.base_url}/company-news", params={**params, "token": self.api_key}
+        )
+        response.raise_for_status()
+        return [self._transform_article(article, symbol) for article in response.json()]
+
+    async def aget_market_news(
+        self, client: httpx.AsyncClient, category: str = "general"
+    ) -> list[NewsArticle]:
+        params = {"category": category, "minId": 0, "token": self.api_key}
+        response = await client.get(f"{self.base_url}/news", params=params)
+        response.raise_for_status()
+        return [self._transform_article(article) for article in response.json()[:50]]
+
+    def _date_range(self, days_back: int) -> tuple[str, str]:
+        to_date = datetime.now().strftime("%Y-%m-%d")
+        from_date = (datetime.now() - timedelta(days=days_back)).strftime("%Y-%m-%d")
+        return from_date, to_date
+
     def _transform_article(self, article: dict, symbol: str | None = None) -> NewsArticle:
         return NewsArticle(
             id=f"finnhub_{article.get('id', hash(article['url']))}",
@@ -1,9 +1,11 @@
+import asyncio
 import logging
 from collections import defaultdict
-from datetime import datetime, timezone
-from difflib import SequenceMatcher
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timezone
 from typing import Any
 
+import httpx
 from tenacity import (
     before_sleep_log,
     retry,
@@ -12,8 +14,10 @@ from tenacity import (
     wait_exponential,
 )
 
+from ...core.config import settings
 from .alpha_vantage_provider import AlphaVantageProvider
 from .base_provider import NewsArticle
+from .deduplication import deduplicate_articles
 from .finnhub_provider import FinnhubProvider
 from .polygon_provider import PolygonProvider
 
@@ -101,11 +105,25 @@ class CircuitBreaker:
         }
 
 
+@dataclass
+class AggregatedNews:
+    """Result of a concurrent aggregation"""
+
+    articles: list[dict[str, Any]]
+    partial: bool  # True if any provider did not deliver (timeout, error, open circuit)
+    provider_status: dict[str, str] = field(default_factory=dict)  # ok/error/timeout/circuit_open
+
+
 class NewsAggregator:
     def __init__(self):
         self.providers = []
         self.circuit_breakers: dict[str, CircuitBreaker] = {}
 
+        # Concurrent mode: per-provider deadline overrides (seconds) and the
+        # pooled HTTP client shared by all providers
+        self.provider_timeouts: dict[str, float] = {}
+        self._http: httpx.AsyncClient | None = None
+
         # Try to initialize each provider (fail gracefully if API key missing)
         try:
             provider = FinnhubProvider()
@@ -232,6 +250,12 @@ class NewsAggregator:
             logger.warning(f"[NEWS] No articles found for {symbol} from any provider")
             return []
 
+        return self._finalize_company_news(symbol, all_articles)
+
+    def _finalize_company_news(
+        self, symbol: str, all_articles: list[NewsArticle]
+    ) -> list[dict[str, Any]]:
+        """Deduplicate, merge sentiment and sort company news newest first"""
         # Deduplicate
         deduplicated = self._deduplicate(all_articles)
 
@@ -243,7 +267,7 @@ class NewsAggregator:
 
         logger.info(
             f"[NEWS] {symbol}: {len(all_articles)} articles -> {len(aggregated)} unique "
-            f"(providers: {len([p for p in self.providers if self.circuit_breakers.get(p.get_provider_name(), CircuitBreaker()).state != 'OPEN'])} active)"
+            f"(providers: {self._active_provider_count()} active)"
         )
 
         return [article.to_dict() for article in aggregated]
@@ -278,6 +302,12 @@ class NewsAggregator:
             logger.warning("[NEWS] No market news found from any provider")
             return []
 
+        return self._finalize_market_news(all_articles, limit)
+
+    def _finalize_market_news(
+        self, all_articles: list[NewsArticle], limit: int
+    ) -> list[dict[str, Any]]:
+        """Deduplicate, merge sentiment and prioritize market news"""
         # Deduplicate
         deduplicated = self._deduplicate(all_articles)
 
@@ -287,7 +317,15 @@ class NewsAggregator:
         # Prioritize
         aggregated = self._prioritize(aggregated)
 
-        active_providers = len(
+        logger.info(
+            f"[NEWS] Market: {len(all_articles)} articles -> {len(aggregated)} unique "
+            f"(providers: {self._active_provider_count()}/{len(self.providers)} active)"
+        )
+
+        return [article.to_dict() for article in aggregated[:limit]]
+
+    def _active_provider_count(self) -> int:
+        return len(
             [
                 p
                 for p in self.providers
@@ -298,51 +336,161 @@ class NewsAggregator:
             ]
         )
 
-        logger.info(
-            f"[NEWS] Market: {len(all_articles)} articles -> {len(aggregated)} unique "
-            f"(providers: {active_providers}/{len(self.providers)} active)"
+    # ------------------------------------------------------------------ #
+    # Concurrent mode
+    # ------------------------------------------------------------------ #
+
+    async def aget_company_news(
+        self, symbol: str, days_back: int = 7, budget: float | None = None
+    ) -> AggregatedNews:
+        """
+        Aggregate company news from all providers concurrently.
+
+        Every provider is queried at once over a pooled connection, each with
+        its own deadline. Whatever has arrived when the global budget runs out
+        is returned, flagged as partial. Circuit breakers are checked and
+        updated exactly as in get_company_news (no retries in this mode).
+
+        Args:
+            symbol: Stock symbol (e.g., 'AAPL')
+            days_back: How many days of historical news to fetch
+            budget: Seconds to wait overall (default: NEWS_AGGREGATE_BUDGET_SECONDS)
+
+        Returns:
+            AggregatedNews with deduplicated articles and per-provider status
+        """
+        all_articles, status = await self._gather(
+            "aget_company_news", symbol, days_back, budget=budget
         )
+        partial = any(state != "ok" for state in status.values())
 
-        return [article.to_dict() for article in aggregated[:limit]]
+        if not all_articles:
+            logger.warning(f"[NEWS] No articles found for {symbol} from any provider")
+            return AggregatedNews([], partial, status)
 
-    def _deduplicate(self, articles: list[NewsArticle]) -> list[NewsArticle]:
-        """Remove duplicate articles based on title similarity"""
-        if not articles:
-            return []
+        # Title dedup is CPU-bound; keep it off the event loop
+        articles = await asyncio.to_thread(self._finalize_company_news, symbol, all_articles)
+        return AggregatedNews(articles, partial, status)
 
-        groups = []
-        used = set()
+    async def aget_market_news(
+        self, category: str = "general", limit: int = 50, budget: float | None = None
+    ) -> AggregatedNews:
+        """
+        Aggregate market news from all providers concurrently.
 
-        for i, article in enumerate(articles):
-            if i in used:
-                continue
+        Same deadline and partial-result semantics as aget_company_news.
+
+        Args:
+            category: News category (e.g., 'general', 'forex', 'crypto')
+            limit: Maximum number of articles to return
+            budget: Seconds to wait overall (default: NEWS_AGGREGATE_BUDGET_SECONDS)
 
-            group = [article]
-            used.add(i)
+        Returns:
+            AggregatedNews with prioritized articles and per-provider status
+        """
+        all_articles, status = await self._gather("aget_market_news", category, budget=budget)
+        partial = any(state != "ok" for state in status.values())
 
-            for j, other in enumerate(articles[i + 1 :], start=i + 1):
-                if j in used:
-                    continue
+        if not all_articles:
+            logger.warning("[NEWS] No market news found from any provider")
+            return AggregatedNews([], partial, status)
+
+        articles = await asyncio.to_thread(self._finalize_market_news, all_articles, limit)
+        return AggregatedNews(articles, partial, status)
+
+    async def aclose(self) -> None:
+        """Close pooled provider connections"""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                timeout=settings.NEWS_PROVIDER_TIMEOUT_SECONDS,
+            )
+        return self._http
+
+    async def _gather(
+        self, method_name: str, *args, budget: float | None = None
+    ) -> tuple[list[NewsArticle], dict[str, str]]:
+        """
+        Call method_name on every available provider at once
 
-                similarity = SequenceMatcher(
-                    None, article.title.lower(), other.title.lower()
-                ).ratio()
+        Returns:
+            (articles in provider order, {provider_name: status})
+        """
+        if budget is None:
+            budget = settings.NEWS_AGGREGATE_BUDGET_SECONDS
+        client = self._get_http_client()
 
-                if similarity > 0.85:
-                    group.append(other)
-                    used.add(j)
+        status: dict[str, str] = {}
+        tasks: dict[asyncio.Task, str] = {}
+        for provider in self.providers:
+            provider_name = provider.get_provider_name()
+            breaker = self.circuit_breakers.get(provider_name)
 
-            groups.append(group)
+            # Check circuit breaker
+            if breaker and not breaker.is_available():
+                logger.warning(
+                    f"[Circuit Breaker] {provider_name} circuit is OPEN - skipping"
+                )
+                status[provider_name] = "circuit_open"
+                continue
 
-        deduplicated = []
-        for group in groups:
-            best = max(
-                group,
-                key=lambda x: (abs(x.sentiment_score), len(x.summary), x.published_at),
+            deadline = self.provider_timeouts.get(
+                provider_name, settings.NEWS_PROVIDER_TIMEOUT_SECONDS
             )
-            deduplicated.append(best)
+            call = getattr(provider, method_name)(client, *args)
+            tasks[asyncio.ensure_future(asyncio.wait_for(call, deadline))] = provider_name
+
+        results: dict[str, list[NewsArticle]] = {}
+        if tasks:
+            done, pending = await asyncio.wait(tasks, timeout=budget)
+
+            # Out of budget: drop stragglers without penalizing their breakers
+            for task in pending:
+                task.cancel()
+                status[tasks[task]] = "timeout"
+                logger.warning(f"[NEWS] {tasks[task]} cut off by {budget}s aggregate budget")
+
+            for task in done:
+                provider_name = tasks[task]
+                breaker = self.circuit_breakers.get(provider_name)
+                try:
+                    articles = task.result()
+                except Exception as e:
+                    # Record failure in circuit breaker
+                    if breaker:
+                        breaker.record_failure()
+                    timed_out = isinstance(e, TimeoutError)
+                    status[provider_name] = "timeout" if timed_out else "error"
+                    logger.error(
+                        f"[ERROR] {provider_name} failed: "
+                        f"{'deadline exceeded' if timed_out else e} "
+                        f"(Circuit: {breaker.state if breaker else 'N/A'})"
+                    )
+                    continue
+
+                # Success - reset circuit breaker
+                if breaker:
+                    breaker.record_success()
+                status[provider_name] = "ok"
+                results[provider_name] = articles
+                logger.info(f"[OK] {provider_name}: {len(articles)} articles")
+
+        # Provider order keeps deduplication deterministic
+        all_articles = [
+            article
+            for provider in self.providers
+            for article in results.get(provider.get_provider_name(), [])
+        ]
+        return all_articles, status
 
-        return deduplicated
+    def _deduplicate(self, articles: list[NewsArticle]) -> list[NewsArticle]:
+        """Remove duplicate articles based on title similarity"""
+        return deduplicate_articles(articles)
 
     def _aggregate_sentiment(self, articles: list[NewsArticle]) -> list[NewsArticle]:
         """Average sentiment scores from multiple sources"""
@@ -374,17 +522,17 @@ class NewsAggregator:
 
     def _prioritize(self, articles: list[NewsArticle]) -> list[NewsArticle]:
         """Sort by importance"""
+        now = datetime.now(UTC)
 
         def priority_score(article: NewsArticle) -> float:
             score = 0.0
 
             try:
-                age_hours = (
-                    datetime.now(timezone.utc)
-                    - datetime.fromisoformat(
-                        article.published_at.replace("Z", "+00:00")
-                    )
-                ).total_seconds() / 3600
+                published = datetime.fromisoformat(article.published_at.replace("Z", "+00:00"))
+                if published.tzinfo is None:
+                    # Alpha Vantage stamps ("20240610T120000") carry no offset; they are UTC
+                    published = published.replace(tzinfo=UTC)
+                age_hours = (now - published).total_seconds() / 3600
                 score += max(0, 100 - age_hours)
             except (ValueError, AttributeError):
                 pass
@@ -447,3 +595,20 @@ class NewsAggregator:
         }
 
         return health_status
+
+
+# Global instance
+_news_aggregator: NewsAggregator | None = None
+
+
+def get_news_aggregator() -> NewsAggregator:
+    """
+    Get or create the shared news aggregator (one pooled HTTP client per process)
+
+    Raises:
+        ValueError: If no news provider is configured
+    """
+    global _news_aggregator
+    if _news_aggregator is None:
+        _news_aggregator = NewsAggregator()
+    return _news_aggregator
@@ -1,5 +1,6 @@
 import os
 
+import httpx
 import requests
 
 from .base_provider import BaseNewsProvider, NewsArticle
@@ -47,6 +48,27 @@ class PolygonProvider(BaseNewsProvider):
             print(f"[ERROR] Polygon market news error: {e}")
             return []
 
+    async def aget_company_news(
+        self, client: httpx.AsyncClient, symbol: str, days_back: int = 7
+    ) -> list[NewsArticle]:
+        params = {"ticker": symbol.upper(), "limit": 50, "apiKey": self.api_key}
+        response = await client.get(f"{self.base_url}/v2/reference/news", params=params)
+        response.raise_for_status()
+        return self._parse_results(response.json(), symbol)
+
+    async def aget_market_news(
+        self, client: httpx.AsyncClient, category: str = "general"
+    ) -> list[NewsArticle]:
+        params = {"limit": 50, "apiKey": self.api_key}
+        response = await client.get(f"{self.base_url}/v2/reference/news", params=params)
+        response.raise_for_status()
+        return self._parse_results(response.json())
+
+    def _parse_results(self, data: dict, symbol: str | None = None) -> list[NewsArticle]:
+        if data.get("status") != "OK":
+            raise ValueError(f"Polygon: {data.get('error', 'Unknown error')}")
+        return [self._transform_article(article, symbol) for article in data.get("results", [])]
+
     def _transform_article(self, article: dict, symbol: str | None = None) -> NewsArticle:
         return NewsArticle(
             id=f"polygon_{article['id']}",
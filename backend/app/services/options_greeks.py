@@ -9,13 +9,20 @@ Implements Black-Scholes-Merton model for calculating option Greeks:
 - Rho: Rate of change of option price with respect to interest rate
 
 Uses scipy for numerical calculations and supports both call and put options.
+Whole option chains can be priced in one NumPy pass with
+GreeksCalculator.calculate_greeks_batch(), or repriced (price only) across
+scenario grids with GreeksCalculator.price_batch().
 """
 
 import math
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal
 
+import numpy as np
+from numpy.typing import ArrayLike
+from scipy.special import ndtr
 from scipy.stats import norm
 
 
@@ -35,6 +42,33 @@ class OptionsGreeks:
     probability_itm: float  # Probability of finishing in-the-money
 
 
+# Record layout returned by GreeksCalculator.calculate_greeks_batch (one row per contract)
+GREEKS_DTYPE = np.dtype(
+    [
+        ("theoretical_price", np.float64),
+        ("delta", np.float64),
+        ("gamma", np.float64),
+        ("theta", np.float64),
+        ("vega", np.float64),
+        ("rho", np.float64),
+        ("intrinsic_value", np.float64),
+        ("extrinsic_value", np.float64),
+        ("probability_itm", np.float64),
+    ]
+)
+
+# Record layout returned by GreeksCalculator.implied_volatility_batch
+IV_DTYPE = np.dtype(
+    [
+        ("implied_volatility", np.float64),
+        ("converged", np.bool_),
+        ("iterations", np.int32),
+    ]
+)
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+
 class GreeksCalculator:
     """
     Black-Scholes-Merton Greeks calculator
@@ -132,6 +166,273 @@ class GreeksCalculator:
             probability_itm=prob_itm,
         )
 
+    def calculate_greeks_batch(
+        self,
+        spot_prices: ArrayLike,
+        strike_prices: ArrayLike,
+        times_to_expiry: ArrayLike,  # in years
+        volatilities: ArrayLike,  # implied volatility (annualized)
+        option_types: ArrayLike | Sequence[str],
+        dividend_yields: ArrayLike = 0.0,
+    ) -> np.ndarray:
+        """
+        Calculate Greeks for many contracts in one vectorized pass
+
+        Same model and units as calculate_greeks (theta per day, vega and rho
+        per 1%). Inputs broadcast against each other, so a chain can pass one
+        spot price and expiry with arrays of strikes, IVs and types.
+
+        Args:
+            spot_prices: Underlying prices
+            strike_prices: Strike prices
+            times_to_expiry: Times to expiration in years (<= 0 means expired)
+            volatilities: Implied volatilities (e.g., 0.25 = 25% IV)
+            option_types: "call"/"put" strings, or booleans (True = call)
+            dividend_yields: Annual dividend yields (default 0)
+
+        Returns:
+            Structured array with GREEKS_DTYPE fields, e.g. ``result["delta"]``.
+            Live contracts with a non-positive spot, strike or volatility get NaN.
+        """
+        is_call = self._call_mask(option_types)
+        spot, strike, t, vol, q, is_call = np.broadcast_arrays(
+            np.asarray(spot_prices, dtype=np.float64),
+            np.asarray(strike_prices, dtype=np.float64),
+            np.asarray(times_to_expiry, dtype=np.float64),
+            np.asarray(volatilities, dtype=np.float64),
+            np.asarray(dividend_yields, dtype=np.float64),
+            is_call,
+        )
+        r = self.risk_free_rate
+
+        # Price expired contracts with a dummy horizon, then overwrite below
+        expired = t <= 0
+        live_t = np.where(expired, 1.0, t)
+        sqrt_t = np.sqrt(live_t)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d1 = (np.log(spot / strike) + (r - q + 0.5 * vol**2) * live_t) / (vol * sqrt_t)
+            d2 = d1 - vol * sqrt_t
+
+            # sign flips N(d) to N(-d) for puts: one formula serves both types
+            sign = np.where(is_call, 1.0, -1.0)
+            discount_factor = np.exp(-r * live_t)
+            dividend_discount = np.exp(-q * live_t)
+            cdf_d1 = ndtr(sign * d1)
+            cdf_d2 = ndtr(sign * d2)
+            pdf_d1 = np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI
+
+            spot_leg = spot * dividend_discount
+            strike_leg = strike * discount_factor
+
+            price = sign * (spot_leg * cdf_d1 - strike_leg * cdf_d2)
+            delta = sign * dividend_discount * cdf_d1
+            gamma = dividend_discount * pdf_d1 / (spot * vol * sqrt_t)
+            theta = (
+                -(spot_leg * pdf_d1 * vol) / (2 * sqrt_t)
+                - sign * r * strike_leg * cdf_d2
+                + sign * q * spot_leg * cdf_d1
+            ) / 365
+            vega = spot_leg * pdf_d1 * sqrt_t / 100
+            rho = sign * strike * live_t * discount_factor * cdf_d2 / 100
+
+        intrinsic = np.maximum(0.0, sign * (spot - strike))
+
+        result = np.empty(spot.shape, dtype=GREEKS_DTYPE)
+        result["intrinsic_value"] = intrinsic
+        result["theoretical_price"] = np.where(expired, intrinsic, price)
+        result["extrinsic_value"] = np.where(expired, 0.0, price - intrinsic)
+        result["delta"] = np.where(expired, np.where(intrinsic > 0, sign, 0.0), delta)
+        result["gamma"] = np.where(expired, 0.0, gamma)
+        result["theta"] = np.where(expired, 0.0, theta)
+        result["vega"] = np.where(expired, 0.0, vega)
+        result["rho"] = np.where(expired, 0.0, rho)
+        result["probability_itm"] = np.where(expired, (intrinsic > 0).astype(np.float64), cdf_d2)
+
+        invalid = ~expired & ((spot <= 0) | (strike <= 0) | (vol <= 0))
+        if invalid.any():
+            for field in GREEKS_DTYPE.names:
+                result[field][invalid] = np.nan
+        return result
+
+    def price_batch(
+        self,
+        spot_prices: ArrayLike,
+        strike_prices: ArrayLike,
+        times_to_expiry: ArrayLike,  # in years
+        volatilities: ArrayLike,
+        option_types: ArrayLike | Sequence[str],
+        dividend_yields: ArrayLike = 0.0,
+    ) -> np.ndarray:
+        """
+        Black-Scholes prices only, for repricing large scenario grids
+
+        Same broadcasting and expiry handling as calculate_greeks_batch
+        (expired contracts are worth intrinsic value) without computing the
+        Greeks. Returns a float64 array of the broadcast shape; live contracts
+        with a non-positive spot, strike or volatility get NaN.
+        """
+        is_call = self._call_mask(option_types)
+        spot, strike, t, vol, q, is_call = np.broadcast_arrays(
+            np.asarray(spot_prices, dtype=np.float64),
+            np.asarray(strike_prices, dtype=np.float64),
+            np.asarray(times_to_expiry, dtype=np.float64),
+            np.asarray(volatilities, dtype=np.float64),
+            np.asarray(dividend_yields, dtype=np.float64),
+            is_call,
+        )
+        sign = np.where(is_call, 1.0, -1.0)
+        expired = t <= 0
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price, _ = self._price_and_vega(
+                spot, strike, np.where(expired, 1.0, t), vol, q, sign
+            )
+            intrinsic = np.maximum(0.0, sign * (spot - strike))
+        price = np.where(expired, intrinsic, price)
+
+        invalid = ~expired & ((spot <= 0) | (strike <= 0) | (vol <= 0))
+        if invalid.any():
+            price[invalid] = np.nan
+        return price
+
+    def implied_volatility_batch(
+        self,
+        option_prices: ArrayLike,
+        spot_prices: ArrayLike,
+        strike_prices: ArrayLike,
+        times_to_expiry: ArrayLike,  # in years
+        option_types: ArrayLike | Sequence[str],
+        dividend_yields: ArrayLike = 0.0,
+        tolerance: float = 1e-8,
+        max_iterations: int = 100,
+        vol_bounds: tuple[float, float] = (1e-4, 5.0),
+    ) -> np.ndarray:
+        """
+        Solve Black-Scholes implied volatility for many contracts at once
+
+        Vectorized Newton-Raphson on vega, falling back to bisection for any
+        contract whose Newton step leaves its current bracket (deep ITM/OTM
+        strikes where vega vanishes). Every contract keeps its own bracket, so
+        the solver always converges for prices inside the no-arbitrage bounds.
+
+        Args:
+            option_prices: Market prices (e.g., bid/ask mids)
+            spot_prices: Underlying prices
+            strike_prices: Strike prices
+            times_to_expiry: Times to expiration in years
+            option_types: "call"/"put" strings, or booleans (True = call)
+            dividend_yields: Annual dividend yields (default 0)
+            tolerance: Absolute price error at which a contract has converged
+            max_iterations: Iteration cap for the whole batch
+            vol_bounds: Search range for volatility
+
+        Returns:
+            Structured array with IV_DTYPE fields. Contracts that are expired,
+            priced outside the no-arbitrage bounds or not converged have
+            ``converged=False`` and a NaN implied_volatility.
+        """
+        is_call = self._call_mask(option_types)
+        target, spot, strike, t, q, is_call = np.broadcast_arrays(
+            np.asarray(option_prices, dtype=np.float64),
+            np.asarray(spot_prices, dtype=np.float64),
+            np.asarray(strike_prices, dtype=np.float64),
+            np.asarray(times_to_expiry, dtype=np.float64),
+            np.asarray(dividend_yields, dtype=np.float64),
+            is_call,
+        )
+        result = np.zeros(target.shape, dtype=IV_DTYPE)
+        result["implied_volatility"] = np.nan
+
+        # No-arbitrage bounds: forward intrinsic < price < S*e^-qT (call) / K*e^-rT (put)
+        sign = np.where(is_call, 1.0, -1.0)
+        with np.errstate(invalid="ignore"):
+            spot_leg = spot * np.exp(-q * t)
+            strike_leg = strike * np.exp(-self.risk_free_rate * t)
+        lower = np.maximum(0.0, sign * (spot_leg - strike_leg))
+        upper = np.where(is_call, spot_leg, strike_leg)
+        solvable = (t > 0) & (spot > 0) & (strike > 0) & (target > lower) & (target < upper)
+
+        idx = np.flatnonzero(solvable)
+        if idx.size == 0:
+            return result
+
+        target, spot, strike = target.ravel()[idx], spot.ravel()[idx], strike.ravel()[idx]
+        t, q, sign = t.ravel()[idx], q.ravel()[idx], sign.ravel()[idx]
+
+        lo = np.full(idx.size, vol_bounds[0])
+        hi = np.full(idx.size, vol_bounds[1])
+        # Brenner-Subrahmanyam starting point (exact for ATM forwards)
+        vol = np.clip(np.sqrt(2 * math.pi / t) * target / spot, lo, hi)
+        converged = np.zeros(idx.size, dtype=bool)
+        iterations = np.zeros(idx.size, dtype=np.int32)
+
+        active = np.arange(idx.size)
+        for _ in range(max_iterations):
+            a_vol = vol[active]
+            price, vega = self._price_and_vega(
+                spot[active], strike[active], t[active], a_vol, q[active], sign[active]
+            )
+            diff = price - target[active]
+            iterations[active] += 1
+
+            done = np.abs(diff) < tolerance
+            converged[active[done]] = True
+
+            # Shrink each bracket around the root (price is increasing in vol)
+            too_high = diff > 0
+            hi[active] = np.where(too_high, a_vol, hi[active])
+            lo[active] = np.where(too_high, lo[active], a_vol)
+
+            with np.errstate(all="ignore"):
+                newton = a_vol - diff / vega
+            bisect = 0.5 * (lo[active] + hi[active])
+            in_bracket = (newton > lo[active]) & (newton < hi[active])
+            vol[active] = np.where(done, a_vol, np.where(in_bracket, newton, bisect))
+
+            # Bracket collapsed: price is flat in vol to machine precision
+            collapsed = (hi[active] - lo[active]) < tolerance * 1e-2
+            converged[active[collapsed & ~done]] = True
+
+            active = active[~(done | collapsed)]
+            if active.size == 0:
+                break
+
+        flat = result.ravel()
+        flat["implied_volatility"][idx] = np.where(converged, vol, np.nan)
+        flat["converged"][idx] = converged
+        flat["iterations"][idx] = iterations
+        return result
+
+    def _price_and_vega(
+        self,
+        spot: np.ndarray,
+        strike: np.ndarray,
+        t: np.ndarray,
+        vol: np.ndarray,
+        q: np.ndarray,
+        sign: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """Black-Scholes price and raw vega (per 1.0 vol) for the IV solver"""
+        sqrt_t = np.sqrt(t)
+        d1 = (np.log(spot / strike) + (self.risk_free_rate - q + 0.5 * vol**2) * t) / (
+            vol * sqrt_t
+        )
+        d2 = d1 - vol * sqrt_t
+        spot_leg = spot * np.exp(-q * t)
+        strike_leg = strike * np.exp(-self.risk_free_rate * t)
+        price = sign * (spot_leg * ndtr(sign * d1) - strike_leg * ndtr(sign * d2))
+        vega = spot_leg * np.exp(-0.5 * d1 * d1) * _INV_SQRT_2PI * sqrt_t
+        return price, vega
+
+    @staticmethod
+    def _call_mask(option_types: ArrayLike | Sequence[str]) -> np.ndarray:
+        """Convert option types ("call"/"put" or booleans) to a boolean call mask"""
+        types = np.asarray(option_types)
+        if types.dtype == np.bool_:
+            return types
+        return np.char.lower(types.astype(str)) == "call"
+
     def _calculate_d1(
         self,
         spot_price: float,
@@ -294,12 +595,12 @@ def days_to_expiry_in_years(expiry_date: datetime) -> float:
     Convert expiration date to time in years
 
     Args:
-        expiry_date: Option expiration date (datetime object)
+        expiry_date: Option expiration date (datetime object, naive or aware)
 
     Returns:
         Time to expiry in years (e.g., 30 days = 0.0822 years)
     """
-    now = datetime.now()
+    now = datetime.now(expiry_date.tzinfo)
     days_remaining = (expiry_date - now).total_seconds() / 86400
     return max(0, days_remaining / 365.0)
 
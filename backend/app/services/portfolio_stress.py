@@ -0,0 +1,179 @@
+"""
+Portfolio Stress Grid - Scenario P&L for the options book
+
+Reprices every open option leg of the shared PortfolioSnapshot across a grid
+of underlying moves x implied volatility shocks x days forward in one pass.
+"""
+
+import time
+from dataclasses import dataclass
+
+import numpy as np
+from pydantic import BaseModel
+
+from app.services.greeks import GreeksCalculator
+from app.services.position_tracker import CONTRACT_MULTIPLIER, PortfolioSnapshot
+
+
+# Upper bound on scenarios (spot moves x IV shocks x days) per request
+MAX_SCENARIOS = 20_000
+
+# Shocked volatility never drops below this
+MIN_VOLATILITY = 0.01
+
+DEFAULT_IV_SHOCKS = (-0.10, -0.05, 0.0, 0.05, 0.10)
+DEFAULT_DAYS_FORWARD = (0, 1, 7, 30)
+
+
+@dataclass(frozen=True)
+class StressGrid:
+    """Scenario axes"""
+
+    spot_moves: np.ndarray  # fractional underlying moves, e.g. -0.2 .. 0.2
+    iv_shocks: np.ndarray  # absolute vol points added to each leg's IV
+    days_forward: np.ndarray  # calendar days
+
+    @classmethod
+    def build(
+        cls,
+        spot_range: float = 0.2,
+        spot_step: float = 0.01,
+        iv_shocks: tuple[float, ...] | list[float] = DEFAULT_IV_SHOCKS,
+        days_forward: tuple[int, ...] | list[int] = DEFAULT_DAYS_FORWARD,
+    ) -> "StressGrid":
+        """
+        Symmetric spot grid (-spot_range .. +spot_range in spot_step increments)
+
+        Raises:
+            ValueError: If an axis is empty or invalid, or the grid exceeds MAX_SCENARIOS
+        """
+        if not 0 < spot_step <= spot_range < 1:
+            raise ValueError("Require 0 < spot_step <= spot_range < 1")
+        if not iv_shocks or not days_forward:
+            raise ValueError("iv_shocks and days_forward must not be empty")
+        if min(days_forward) < 0:
+            raise ValueError("days_forward must be non-negative")
+
+        steps = round(spot_range / spot_step)
+        grid = cls(
+            spot_moves=np.round(np.arange(-steps, steps + 1) * spot_step, 10),
+            iv_shocks=np.asarray(iv_shocks, dtype=np.float64),
+            days_forward=np.asarray(days_forward, dtype=np.float64),
+        )
+        if grid.size > MAX_SCENARIOS:
+            raise ValueError(f"Grid has {grid.size} scenarios (max {MAX_SCENARIOS})")
+        return grid
+
+    @property
+    def shape(self) -> tuple[int, int, int]:
+        return len(self.days_forward), len(self.iv_shocks), len(self.spot_moves)
+
+    @property
+    def size(self) -> int:
+        days, ivs, spots = self.shape
+        return days * ivs * spots
+
+
+class PositionStress(BaseModel):
+    option_symbol: str
+    qty: int
+    pnl: list[list[list[float]]]  # [days_forward][iv_shock][spot_move]
+
+
+class StressScenario(BaseModel):
+    pnl: float
+    spot_move: float
+    iv_shock: float
+    days_forward: int
+
+
+class StressResult(BaseModel):
+    spot_moves: list[float]
+    iv_shocks: list[float]
+    days_forward: list[int]
+    aggregate: list[list[list[float]]]  # [days_forward][iv_shock][spot_move]
+    positions: list[PositionStress]
+    worst_case: StressScenario | None
+    best_case: StressScenario | None
+    position_count: int
+    compute_ms: float
+
+
+def stress_pnl(
+    legs: np.ndarray,
+    grid: StressGrid,
+    greeks_calc: GreeksCalculator | None = None,
+) -> np.ndarray:
+    """
+    Scenario P&L per leg
+
+    Args:
+        legs: LEG_DTYPE rows (PortfolioSnapshot.legs)
+        grid: Scenario axes
+        greeks_calc: Pricer (default: 5% risk-free rate)
+
+    Returns:
+        Array of shape (legs, days_forward, iv_shocks, spot_moves)
+    """
+    calc = greeks_calc or GreeksCalculator(risk_free_rate=0.05)
+    if len(legs) == 0:
+        return np.zeros((0, *grid.shape))
+
+    # Axis layout: leg, days, iv, spot
+    is_call = legs["is_call"][:, None, None, None]
+    strike = legs["strike"][:, None, None, None]
+    spot = legs["spot"][:, None, None, None] * (1 + grid.spot_moves)
+    vol = np.maximum(
+        legs["implied_volatility"][:, None, None, None] + grid.iv_shocks[:, None],
+        MIN_VOLATILITY,
+    )
+    days = legs["days_to_expiry"][:, None, None, None] - grid.days_forward[:, None, None]
+
+    stressed = calc.price_batch(is_call, spot, strike, days, vol)
+    today = calc.price_batch(
+        legs["is_call"], legs["spot"], legs["strike"], legs["days_to_expiry"],
+        legs["implied_volatility"],
+    )
+    weight = legs["qty"] * CONTRACT_MULTIPLIER
+    pnl = (stressed - today[:, None, None, None]) * weight[:, None, None, None]
+    return np.nan_to_num(pnl, nan=0.0, posinf=0.0, neginf=0.0)
+
+
+def stress_portfolio(
+    snapshot: PortfolioSnapshot,
+    grid: StressGrid,
+    greeks_calc: GreeksCalculator | None = None,
+    include_positions: bool = True,
+) -> StressResult:
+    """Aggregate and per-position P&L matrices for a portfolio snapshot"""
+    start = time.perf_counter()
+    pnl = stress_pnl(snapshot.legs, grid, greeks_calc)
+    aggregate = pnl.sum(axis=0)
+    compute_ms = (time.perf_counter() - start) * 1000
+
+    return StressResult(
+        spot_moves=grid.spot_moves.tolist(),
+        iv_shocks=grid.iv_shocks.tolist(),
+        days_forward=grid.days_forward.astype(int).tolist(),
+        aggregate=aggregate.tolist(),
+        positions=[
+            PositionStress(option_symbol=p.option_symbol, qty=p.qty, pnl=pnl[i].tolist())
+            for i, p in enumerate(snapshot.positions)
+        ]
+        if include_positions
+        else [],
+        worst_case=_scenario(grid, aggregate, np.argmin) if len(snapshot.legs) else None,
+        best_case=_scenario(grid, aggregate, np.argmax) if len(snapshot.legs) else None,
+        position_count=len(snapshot.legs),
+        compute_ms=round(compute_ms, 3),
+    )
+
+
+def _scenario(grid: StressGrid, aggregate: np.ndarray, pick) -> StressScenario:
+    days_idx, iv_idx, spot_idx = np.unravel_index(pick(aggregate), aggregate.shape)
+    return StressScenario(
+        pnl=float(aggregate[days_idx, iv_idx, spot_idx]),
+        spot_move=float(grid.spot_moves[spot_idx]),
+        iv_shock=float(grid.iv_shocks[iv_idx]),
+        days_forward=int(grid.days_forward[days_idx]),
+    )
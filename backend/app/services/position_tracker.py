@@ -1,19 +1,60 @@
 """
 Position Tracking Service - Monitor open positions and calculate P&L
+
+Option legs are priced as one book by PortfolioRiskEngine:
+- One Alpaca positions call, then one bulk Tradier quote call for every
+  underlying and option symbol (instead of one quote request per leg)
+- Implied volatility and Greeks for all legs in one vectorized pass
+- The result is cached as a PortfolioSnapshot keyed by a digest of the
+  positions (symbol, qty, entry price); the positions, greeks and P&L
+  endpoints share it while positions are unchanged and it is younger than
+  PORTFOLIO_RISK_TTL_SECONDS, and concurrent refreshes share one fetch
 """
 
+import asyncio
+import hashlib
 import logging
-from datetime import datetime
+import re
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
 
+import numpy as np
 from pydantic import BaseModel
 
+from app.core.config import settings
 from app.services.alpaca_client import get_alpaca_client
 from app.services.greeks import GreeksCalculator
-from app.services.tradier_client import get_tradier_client
+from app.services.signal_pipeline import _quote_map
+from app.services.tradier_client import get_async_tradier_client
 
 
 logger = logging.getLogger(__name__)
 
+# Alpaca asset classes treated as option legs
+OPTION_ASSET_CLASSES = {"us_option", "option"}
+
+# Used when a leg's implied volatility cannot be solved from its quote
+DEFAULT_IV = 0.3
+
+CONTRACT_MULTIPLIER = 100
+
+# Per-leg pricing inputs carried on PortfolioSnapshot.legs
+LEG_DTYPE = np.dtype(
+    [
+        ("spot", np.float64),
+        ("strike", np.float64),
+        ("days_to_expiry", np.float64),
+        ("implied_volatility", np.float64),
+        ("is_call", np.bool_),
+        ("qty", np.float64),
+        ("price", np.float64),
+    ]
+)
+
+_OCC_PATTERN = re.compile(r"^(?P<root>.+?)(?P<date>\d{6})(?P<type>[CP])(?P<strike>\d{8})$")
+
 
 class PositionGreeks(BaseModel):
     delta: float
@@ -47,77 +88,303 @@ class PortfolioGreeks(BaseModel):
     position_count: int
 
 
+class PortfolioPnL(BaseModel):
+    total_unrealized_pl: float
+    total_unrealized_pl_percent: float
+    total_cost_basis: float
+    total_market_value: float
+    position_count: int
+
+
+class OptionContract(NamedTuple):
+    underlying: str
+    expiration: str  # YYYY-MM-DD
+    option_type: str  # "call" or "put"
+    strike: float
+
+
+def parse_occ_symbol(option_symbol: str) -> OptionContract:
+    """
+    Parse an OCC option symbol
+
+    OCC format: SPY250117C00590000 -> SPY, 2025-01-17, call, 590.0
+
+    Raises:
+        ValueError: If the symbol is not in OCC format
+    """
+    match = _OCC_PATTERN.match(option_symbol.replace(" ", ""))
+    if not match:
+        raise ValueError(f"Not an OCC option symbol: {option_symbol}")
+    date_part = match["date"]
+    return OptionContract(
+        underlying=match["root"],
+        expiration=f"20{date_part[:2]}-{date_part[2:4]}-{date_part[4:6]}",
+        option_type="call" if match["type"] == "C" else "put",
+        strike=int(match["strike"]) / 1000,
+    )
+
+
+def days_to_expiry(expiration: str) -> int:
+    """Calendar days until a YYYY-MM-DD expiration"""
+    expiry = datetime.strptime(expiration, "%Y-%m-%d").replace(tzinfo=UTC)
+    return (expiry - datetime.now(UTC)).days
+
+
+def positions_version(legs: list[dict]) -> str:
+    """Digest of the option book (changes when any leg opens, closes or resizes)"""
+    digest = hashlib.sha1(usedforsecurity=False)
+    for leg in sorted(legs, key=lambda p: p["symbol"]):
+        digest.update(f"{leg['symbol']}|{leg['qty']}|{leg['avg_entry_price']};".encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class PortfolioSnapshot:
+    """Positions, aggregate Greeks and P&L priced from one set of quotes"""
+
+    version: str
+    positions: list[Position]
+    greeks: PortfolioGreeks
+    pnl: PortfolioPnL
+    # One LEG_DTYPE row per entry of positions
+    legs: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=LEG_DTYPE))
+    created_at: float = field(default_factory=time.monotonic)
+
+    def age(self) -> float:
+        return time.monotonic() - self.created_at
+
+
+class PortfolioRiskEngine:
+    """Bulk-quoted, vectorized Greeks and P&L for the option book"""
+
+    def __init__(
+        self,
+        alpaca: Any | None = None,
+        tradier: Any | None = None,
+        greeks_calc: GreeksCalculator | None = None,
+        ttl_seconds: float | None = None,
+    ):
+        """
+        Args:
+            alpaca: Alpaca client (default: shared client)
+            tradier: Async Tradier client (default: shared async client)
+            greeks_calc: Greeks calculator (default: 5% risk-free rate)
+            ttl_seconds: Snapshot reuse window (default: PORTFOLIO_RISK_TTL_SECONDS)
+        """
+        self.alpaca = alpaca or get_alpaca_client()
+        self.tradier = tradier or get_async_tradier_client()
+        self.greeks_calc = greeks_calc or GreeksCalculator(risk_free_rate=0.05)
+        self.ttl = ttl_seconds if ttl_seconds is not None else settings.PORTFOLIO_RISK_TTL_SECONDS
+
+        self._snapshot: PortfolioSnapshot | None = None
+        self._refresh_task: asyncio.Task | None = None
+
+        # Counters
+        self.hits = 0
+        self.builds = 0
+        self.shared_refreshes = 0
+
+    async def get_snapshot(self, force: bool = False) -> PortfolioSnapshot:
+        """
+        Current snapshot, rebuilt when positions changed or it is older than the TTL
+
+        Concurrent callers share one in-flight refresh.
+        """
+        task = self._refresh_task
+        if task is not None and not task.done():
+            self.shared_refreshes += 1
+        else:
+            task = self._refresh_task = asyncio.get_running_loop().create_task(
+                self._refresh(force)
+            )
+        return await asyncio.shield(task)
+
+    def invalidate(self) -> None:
+        """Drop the cached snapshot (e.g. after submitting a closing order)"""
+        self._snapshot = None
+
+    def get_stats(self) -> dict[str, Any]:
+        snapshot = self._snapshot
+        return {
+            "hits": self.hits,
+            "builds": self.builds,
+            "shared_refreshes": self.shared_refreshes,
+            "version": snapshot.version if snapshot else None,
+            "age_seconds": round(snapshot.age(), 3) if snapshot else None,
+            "ttl_seconds": self.ttl,
+        }
+
+    async def _refresh(self, force: bool) -> PortfolioSnapshot:
+        raw_positions = await asyncio.to_thread(self.alpaca.get_positions)
+        legs = []
+        for pos in raw_positions:
+            if pos.get("asset_class") not in OPTION_ASSET_CLASSES:
+                continue
+            try:
+                legs.append((pos, parse_occ_symbol(pos["symbol"])))
+            except ValueError as e:
+                logger.warning(f"Skipping option position: {e}")
+
+        version = positions_version([pos for pos, _ in legs])
+        cached = self._snapshot
+        if not force and cached and cached.version == version and cached.age() < self.ttl:
+            self.hits += 1
+            return cached
+
+        symbols = sorted({c.underlying for _, c in legs} | {p["symbol"] for p, _ in legs})
+        quotes = {}
+        if legs:
+            quotes = _quote_map(await self.tradier.get_quotes(symbols))
+
+        snapshot = self.build_snapshot(version, legs, quotes)
+        self._snapshot = snapshot
+        self.builds += 1
+        return snapshot
+
+    def build_snapshot(
+        self,
+        version: str,
+        legs: list[tuple[dict, OptionContract]],
+        quotes: dict[str, dict],
+    ) -> PortfolioSnapshot:
+        """Price every leg from the bulk quotes in one vectorized pass"""
+        n = len(legs)
+        qty = np.array([float(p["qty"]) for p, _ in legs])
+        entry = np.array([float(p["avg_entry_price"]) for p, _ in legs])
+        strikes = np.array([c.strike for _, c in legs])
+        types = [c.option_type for _, c in legs]
+        dte = np.array([days_to_expiry(c.expiration) for _, c in legs], dtype=np.float64)
+        spot = np.array([_quote_price(quotes.get(c.underlying)) for _, c in legs])
+        option_price = np.array(
+            [_quote_price(quotes.get(p["symbol"]), float(p["current_price"])) for p, _ in legs]
+        )
+
+        if n:
+            iv = self.greeks_calc.implied_volatility_batch(
+                option_price, spot, strikes, dte, types
+            )["implied_volatility"]
+            iv = np.where(np.isfinite(iv), iv, DEFAULT_IV)
+            greeks = self.greeks_calc.calculate_greeks_batch(types, spot, strikes, dte, iv)
+            delta, gamma, theta, vega = (
+                np.nan_to_num(greeks[name]) for name in ("delta", "gamma", "theta", "vega")
+            )
+        else:
+            iv = delta = gamma = theta = vega = np.zeros(0)
+
+        # Pricing inputs kept for scenario repricing
+        leg_inputs = np.zeros(n, dtype=LEG_DTYPE)
+        leg_inputs["spot"] = spot
+        leg_inputs["strike"] = strikes
+        leg_inputs["days_to_expiry"] = dte
+        leg_inputs["implied_volatility"] = iv
+        leg_inputs["is_call"] = [t == "call" for t in types]
+        leg_inputs["qty"] = qty
+        leg_inputs["price"] = option_price
+
+        # P&L
+        unrealized_pl = (option_price - entry) * qty * CONTRACT_MULTIPLIER
+        cost_basis = entry * qty * CONTRACT_MULTIPLIER
+        unrealized_pl_percent = np.divide(
+            unrealized_pl * 100, cost_basis, out=np.zeros(n), where=cost_basis != 0
+        )
+
+        positions = [
+            Position(
+                id=pos["asset_id"],
+                symbol=contract.underlying,
+                option_symbol=pos["symbol"],
+                qty=int(qty[i]),
+                avg_entry_price=float(entry[i]),
+                current_price=float(option_price[i]),
+                unrealized_pl=float(unrealized_pl[i]),
+                unrealized_pl_percent=float(unrealized_pl_percent[i]),
+                market_value=float(pos["market_value"]),
+                cost_basis=float(cost_basis[i]),
+                greeks=PositionGreeks(
+                    delta=float(delta[i]),
+                    gamma=float(gamma[i]),
+                    theta=float(theta[i]),
+                    vega=float(vega[i]),
+                ),
+                expiration=contract.expiration,
+                days_to_expiry=int(dte[i]),
+                status="open",
+            )
+            for i, (pos, contract) in enumerate(legs)
+        ]
+
+        weights = np.trunc(qty)
+        total_cost_basis = float(cost_basis.sum())
+        total_unrealized_pl = float(unrealized_pl.sum())
+        return PortfolioSnapshot(
+            version=version,
+            positions=positions,
+            legs=leg_inputs,
+            greeks=PortfolioGreeks(
+                total_delta=float(delta @ weights),
+                total_gamma=float(gamma @ weights),
+                total_theta=float(theta @ weights),
+                total_vega=float(vega @ weights),
+                position_count=n,
+            ),
+            pnl=PortfolioPnL(
+                total_unrealized_pl=total_unrealized_pl,
+                total_unrealized_pl_percent=(
+                    total_unrealized_pl / total_cost_basis * 100 if total_cost_basis else 0
+                ),
+                total_cost_basis=total_cost_basis,
+                total_market_value=float(sum(float(p["market_value"]) for p, _ in legs)),
+                position_count=n,
+            ),
+        )
+
+
+def _quote_price(quote: dict | None, default: float = np.nan) -> float:
+    """Bid/ask mid when both sides are quoted, else last, else default"""
+    if not quote:
+        return default
+    bid, ask = quote.get("bid") or 0, quote.get("ask") or 0
+    if bid > 0 and ask > 0:
+        return (bid + ask) / 2
+    last = quote.get("last")
+    return float(last) if last else default
+
+
+_portfolio_risk_engine: PortfolioRiskEngine | None = None
+
+
+def get_portfolio_risk_engine() -> PortfolioRiskEngine:
+    """Get or create the shared portfolio risk engine"""
+    global _portfolio_risk_engine
+    if _portfolio_risk_engine is None:
+        _portfolio_risk_engine = PortfolioRiskEngine()
+    return _portfolio_risk_engine
+
+
 class PositionTrackerService:
-    def __init__(self):
-        self.alpaca = get_alpaca_client()
-        self.tradier = get_tradier_client()
-        self.greeks_calc = GreeksCalculator(risk_free_rate=0.05)
+    def __init__(self, risk_engine: PortfolioRiskEngine | None = None):
+        self.risk = risk_engine or get_portfolio_risk_engine()
+        self.alpaca = self.risk.alpaca
 
     async def get_open_positions(self) -> list[Position]:
         """Get all open option positions with real-time data"""
         try:
-            # Get positions from Alpaca
-            alpaca_positions = self.alpaca.get_positions()
-
-            positions = []
-            for pos in alpaca_positions:
-                # Only process options
-                if pos.asset_class != "option":
-                    continue
-
-                # Get current market data from Tradier (use underlying quote)
-                quote = self.tradier.get_quote(self._parse_underlying(pos.symbol))
-
-                # Calculate Greeks
-                greeks = self._calculate_position_greeks(pos, quote)
-
-                # Calculate P&L
-                current_price = quote.get("last", pos.current_price)
-                unrealized_pl = (current_price - pos.avg_entry_price) * pos.qty * 100
-                cost_basis = pos.avg_entry_price * pos.qty * 100
-                unrealized_pl_percent = (unrealized_pl / cost_basis) * 100 if cost_basis else 0
-
-                position = Position(
-                    id=pos.asset_id,
-                    symbol=self._parse_underlying(pos.symbol),
-                    option_symbol=pos.symbol,
-                    qty=int(pos.qty),
-                    avg_entry_price=float(pos.avg_entry_price),
-                    current_price=current_price,
-                    unrealized_pl=unrealized_pl,
-                    unrealized_pl_percent=unrealized_pl_percent,
-                    market_value=float(pos.market_value),
-                    cost_basis=cost_basis,
-                    greeks=greeks,
-                    expiration=self._parse_expiration(pos.symbol),
-                    days_to_expiry=self._calculate_dte(pos.symbol),
-                    status="open",
-                )
-
-                positions.append(position)
-
-            return positions
-
+            return (await self.risk.get_snapshot()).positions
         except Exception as e:
             logger.error(f"Failed to fetch positions: {e}")
             return []
 
     async def get_portfolio_greeks(self) -> PortfolioGreeks:
         """Calculate aggregate portfolio Greeks"""
-        positions = await self.get_open_positions()
-
-        total_delta = sum(p.greeks.delta * p.qty for p in positions)
-        total_gamma = sum(p.greeks.gamma * p.qty for p in positions)
-        total_theta = sum(p.greeks.theta * p.qty for p in positions)
-        total_vega = sum(p.greeks.vega * p.qty for p in positions)
-
-        return PortfolioGreeks(
-            total_delta=total_delta,
-            total_gamma=total_gamma,
-            total_theta=total_theta,
-            total_vega=total_vega,
-            position_count=len(positions),
-        )
+        return (await self.risk.get_snapshot()).greeks
+
+    async def get_portfolio_pnl(self) -> PortfolioPnL:
+        """Aggregate unrealized P&L of the option book"""
+        return (await self.risk.get_snapshot()).pnl
+
+    async def get_risk_snapshot(self) -> PortfolioSnapshot:
+        """Shared snapshot with per-leg pricing inputs (for scenario analysis)"""
+        return await self.risk.get_snapshot()
 
     async def close_position(self, position_id: str, limit_price: float | None = None) -> dict:
         """Close an open position"""
@@ -145,6 +412,7 @@ class PositionTrackerService:
             order = self.alpaca.submit_order(**order_data)
 
             logger.info(f"Closing order submitted: {order.id}")
+            self.risk.invalidate()
 
             return {
                 "status": "submitted",
@@ -157,67 +425,3 @@ class PositionTrackerService:
         except Exception as e:
             logger.error(f"Failed to close position: {e}")
             raise
-
-    def _calculate_position_greeks(self, position, quote) -> PositionGreeks:
-        """Calculate Greeks for a position"""
-        try:
-            # Parse option symbol
-            option_type, strike, _expiration = self._parse_option_symbol(position.symbol)
-
-            # Get underlying price
-            underlying_price = quote.get("underlying_price", 0)
-
-            # Calculate Greeks
-            days_to_expiry = self._calculate_dte(position.symbol)
-            iv = quote.get("greeks", {}).get("mid_iv", 0.3)
-
-            greeks = self.greeks_calc.calculate_greeks(
-                option_type=option_type,
-                underlying_price=underlying_price,
-                strike_price=strike,
-                days_to_expiry=days_to_expiry,
-                implied_volatility=iv,
-            )
-
-            return PositionGreeks(**greeks)
-
-        except Exception as e:
-            logger.warning(f"Failed to calculate Greeks: {e}")
-            return PositionGreeks(delta=0, gamma=0, theta=0, vega=0)
-
-    def _parse_underlying(self, option_symbol: str) -> str:
-        """Extract underlying symbol from option symbol"""
-        # OCC format: SPY250117C00590000
-        return option_symbol[: option_symbol.index(next(c for c in option_symbol if c.isdigit()))]
-
-    def _parse_expiration(self, option_symbol: str) -> str:
-        """Extract expiration date from option symbol"""
-        # OCC format: SPY250117C00590000 -> 2025-01-17
-        date_part = option_symbol[
-            option_symbol.index(
-                next(c for c in option_symbol if c.isdigit())
-            ) : option_symbol.index(next(c for c in option_symbol if c in "CP"))
-        ]
-        return f"20{date_part[:2]}-{date_part[2:4]}-{date_part[4:6]}"
-
-    def _parse_option_symbol(self, option_symbol: str):
-        """Parse option symbol into components"""
-        # Extract type
-        option_type = "call" if "C" in option_symbol else "put"
-
-        # Extract strike
-        strike_part = option_symbol[
-            option_symbol.index(next(c for c in option_symbol if c in "CP")) + 1 :
-        ]
-        strike = float(strike_part) / 1000
-
-        # Extract expiration
-        expiration = self._parse_expiration(option_symbol)
-
-        return option_type, strike, expiration
-
-    def _calculate_dte(self, option_symbol: str) -> int:
-        """Calculate days to expiration"""
-        expiration_str = self._parse_expiration(option_symbol)
-        expiration = datetime.strptime(expiration_str, "%Y-%m-%d")
-        return (expiration - datetime.now()).days
@@ -0,0 +1,306 @@
+"""
+In-Process Price Fan-Out Hub
+
+Pushes the latest price of each symbol to the /stream/prices clients watching
+it; a Redis pub/sub channel relays locally received ticks to other workers.
+"""
+
+import asyncio
+import json
+import logging
+import time
+import uuid
+from typing import Any
+
+from redis import asyncio as aioredis
+
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Trade prices older than this fall back to the quote mid (matches old cache TTL)
+TRADE_FRESHNESS_SECONDS = 5.0
+
+# Redis channel used to bridge ticks between worker processes
+BRIDGE_CHANNEL = "stream:prices"
+
+
+class PriceSubscription:
+    """A single client's view of the hub"""
+
+    def __init__(self, hub: "PriceHub", symbols: list[str]):
+        self.hub = hub
+        self.symbols = symbols
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._event = asyncio.Event()
+
+    def _offer(self, symbol: str, payload: dict[str, Any]) -> None:
+        """Coalesce an update into the pending buffer (latest value wins)"""
+        self._pending[symbol] = payload
+        self._event.set()
+
+    async def next_update(self, timeout: float) -> dict[str, dict[str, Any]]:
+        """
+        Wait for pending updates
+
+        Args:
+            timeout: Seconds to wait before returning an empty batch
+
+        Returns:
+            Dict of symbol -> latest price payload (empty on timeout)
+        """
+        if not self._pending:
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except TimeoutError:
+                return {}
+
+        updates, self._pending = self._pending, {}
+        self._event.clear()
+        return updates
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class PriceHub:
+    """Per-symbol fan-out of the latest price to subscribed clients"""
+
+    def __init__(self):
+        self._subscribers: dict[str, set[PriceSubscription]] = {}
+        self._trades: dict[str, tuple[float, dict[str, Any]]] = {}
+        self._quotes: dict[str, dict[str, Any]] = {}
+        self._latest: dict[str, dict[str, Any]] = {}
+
+        # Cross-worker bridge; last tick per (kind, symbol) from each side, so a
+        # tick both workers received from Tradier is applied and relayed once
+        self.worker_id = uuid.uuid4().hex
+        self._local_ticks: dict[tuple[str, str], str] = {}
+        self._relayed_ticks: dict[tuple[str, str], str] = {}
+        self._redis: Any | None = None
+        self._bridge_task: asyncio.Task | None = None
+
+        # Counters
+        self.published = 0
+        self.delivered = 0
+        self.unchanged = 0
+        self.duplicates = 0
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+
+    def subscribe(self, symbols: list[str]) -> PriceSubscription:
+        """
+        Subscribe to price updates for symbols
+
+        The subscription is primed with the latest known price of each symbol
+        so new clients render immediately.
+        """
+        subscription = PriceSubscription(self, symbols)
+        for symbol in symbols:
+            self._subscribers.setdefault(symbol, set()).add(subscription)
+            latest = self._latest.get(symbol)
+            if latest is not None:
+                subscription._offer(symbol, latest)
+        return subscription
+
+    def unsubscribe(self, subscription: PriceSubscription) -> None:
+        for symbol in subscription.symbols:
+            subscribers = self._subscribers.get(symbol)
+            if subscribers is None:
+                continue
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[symbol]
+
+    def subscriber_count(self, symbol: str | None = None) -> int:
+        if symbol is not None:
+            return len(self._subscribers.get(symbol, ()))
+        return len({sub for subs in self._subscribers.values() for sub in subs})
+
+    def get_latest(self, symbol: str) -> dict[str, Any] | None:
+        return self._latest.get(symbol)
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+
+    def publish(self, kind: str, data: dict[str, Any], bridge: bool = True) -> bool:
+        """
+        Publish a quote or trade tick
+
+        Args:
+            kind: "quote" or "trade"
+            data: Normalized tick (as cached by TradierStreamService)
+            bridge: True for ticks received locally, which are relayed to other
+                workers unless one of them already relayed the same tick;
+                False for ticks applied from the bridge
+
+        Returns:
+            True if subscribers were notified (price payload changed)
+        """
+        symbol = data.get("symbol")
+        if not symbol or kind not in ("quote", "trade"):
+            return False
+
+        tick = _tick_key(data)
+        if bridge:
+            if self._relayed_ticks.get((kind, symbol)) == tick:
+                self.duplicates += 1
+                return False
+            self._local_ticks[(kind, symbol)] = tick
+        else:
+            self._relayed_ticks[(kind, symbol)] = tick
+
+        self.published += 1
+        if kind == "trade":
+            self._trades[symbol] = (time.monotonic(), data)
+        else:
+            self._quotes[symbol] = data
+
+        if bridge and self._redis is not None:
+            self._bridge_publish(kind, data)
+
+        payload = self._price_payload(symbol)
+        if payload is None or payload == self._latest.get(symbol):
+            self.unchanged += 1
+            return False
+
+        self._latest[symbol] = payload
+        for subscription in self._subscribers.get(symbol, ()):
+            subscription._offer(symbol, payload)
+            self.delivered += 1
+        return True
+
+    def _price_payload(self, symbol: str) -> dict[str, Any] | None:
+        """Build the SSE price payload, preferring a fresh trade over the quote mid"""
+        trade = self._trades.get(symbol)
+        if trade and time.monotonic() - trade[0] < TRADE_FRESHNESS_SECONDS:
+            trade_data = trade[1]
+            return {
+                "price": trade_data.get("price", 0),
+                "timestamp": trade_data.get("timestamp"),
+                "type": "trade",
+                "size": trade_data.get("size", 0),
+            }
+
+        quote_data = self._quotes.get(symbol)
+        if quote_data:
+            return {
+                "price": quote_data.get("mid", 0),
+                "bid": quote_data.get("bid", 0),
+                "ask": quote_data.get("ask", 0),
+                "timestamp": quote_data.get("timestamp"),
+                "type": "quote",
+            }
+        return None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "symbols": len(self._subscribers),
+            "subscribers": self.subscriber_count(),
+            "published": self.published,
+            "delivered": self.delivered,
+            "unchanged": self.unchanged,
+            "duplicates": self.duplicates,
+            "bridge_connected": self._redis is not None,
+        }
+
+    # ------------------------------------------------------------------
+    # Cross-worker Redis bridge
+    # ------------------------------------------------------------------
+
+    def _bridge_publish(self, kind: str, data: dict[str, Any]) -> None:
+        message = json.dumps({"origin": self.worker_id, "kind": kind, "data": data})
+        task = asyncio.get_running_loop().create_task(
+            self._redis.publish(BRIDGE_CHANNEL, message)
+        )
+        task.add_done_callback(_log_bridge_error)
+
+    async def start_bridge(self, redis_url: str | None = None) -> bool:
+        """
+        Connect the Redis pub/sub bridge (no-op when Redis is not configured)
+
+        Returns:
+            True if the bridge is running
+        """
+        redis_url = redis_url or settings.REDIS_URL
+        if not redis_url or self._bridge_task is not None:
+            return self._bridge_task is not None
+
+        try:
+            client = aioredis.from_url(
+                redis_url, decode_responses=True, socket_connect_timeout=2
+            )
+            await client.ping()
+        except Exception as e:
+            logger.warning(f"⚠️ Price hub Redis bridge unavailable: {e}")
+            return False
+
+        self._redis = client
+        self._bridge_task = asyncio.create_task(self._bridge_listen(client))
+        logger.info("✅ Price hub Redis bridge started")
+        return True
+
+    async def _bridge_listen(self, client: Any) -> None:
+        pubsub = client.pubsub()
+        await pubsub.subscribe(BRIDGE_CHANNEL)
+        try:
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                try:
+                    envelope = json.loads(message["data"])
+                except (TypeError, ValueError):
+                    continue
+                if envelope.get("origin") == self.worker_id:
+                    continue
+                kind, data = envelope.get("kind", ""), envelope.get("data") or {}
+                seen = (kind, data.get("symbol"))
+                tick = _tick_key(data)
+                if tick in (self._local_ticks.get(seen), self._relayed_ticks.get(seen)):
+                    self.duplicates += 1
+                    continue
+                self.publish(kind, data, bridge=False)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Price hub bridge listener stopped: {e}")
+        finally:
+            await pubsub.aclose()
+
+    async def stop_bridge(self) -> None:
+        if self._bridge_task:
+            self._bridge_task.cancel()
+            try:
+                await self._bridge_task
+            except asyncio.CancelledError:
+                pass
+            self._bridge_task = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+
+
+def _tick_key(data: dict[str, Any]) -> str:
+    """Tick identity across workers: its fields minus the local receive timestamp"""
+    return json.dumps({k: v for k, v in data.items() if k != "timestamp"}, sort_keys=True)
+
+
+def _log_bridge_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning(f"⚠️ Price hub bridge publish failed: {task.exception()}")
+
+
+# Singleton instance
+_price_hub: PriceHub | None = None
+
+
+def get_price_hub() -> PriceHub:
+    """Get singleton price hub"""
+    global _price_hub
+    if _price_hub is None:
+        _price_hub = PriceHub()
+    return _price_hub
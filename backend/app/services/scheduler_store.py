@@ -0,0 +1,423 @@
+"""
+Scheduler Execution and Approval Store
+
+Keeps scheduler execution history and trade approvals in one SQLite database
+(WAL), with indexed, paginated queries and once-only approval decisions.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_COLUMNS = (
+    "id",
+    "schedule_id",
+    "schedule_name",
+    "execution_type",
+    "status",
+    "started_at",
+    "completed_at",
+    "result",
+    "error",
+)
+
+APPROVAL_COLUMNS = (
+    "id",
+    "execution_id",
+    "schedule_id",
+    "schedule_name",
+    "trade_type",
+    "symbol",
+    "quantity",
+    "estimated_price",
+    "estimated_value",
+    "reason",
+    "risk_score",
+    "ai_confidence",
+    "supporting_data",
+    "status",
+    "created_at",
+    "expires_at",
+    "approved_at",
+    "approved_by",
+    "rejection_reason",
+)
+
+# Approval fields a decision may change
+APPROVAL_DECISION_FIELDS = frozenset({"status", "approved_at", "approved_by", "rejection_reason"})
+
+# Pending, unexpired approvals (newest first) and their count
+PENDING_APPROVALS_SQL = (
+    "SELECT * FROM approvals WHERE status = 'pending' AND expires_at > ?"
+    " ORDER BY created_at DESC LIMIT ? OFFSET ?"
+)
+PENDING_APPROVALS_COUNT_SQL = (
+    "SELECT COUNT(*) FROM approvals WHERE status = 'pending' AND expires_at > ?"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS executions (
+    id TEXT PRIMARY KEY,
+    schedule_id TEXT NOT NULL,
+    schedule_name TEXT,
+    execution_type TEXT,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    completed_at TEXT,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_executions_started ON executions (started_at);
+CREATE INDEX IF NOT EXISTS ix_executions_schedule ON executions (schedule_id, started_at);
+CREATE INDEX IF NOT EXISTS ix_executions_status ON executions (status, started_at);
+
+CREATE TABLE IF NOT EXISTS approvals (
+    id TEXT PRIMARY KEY,
+    execution_id TEXT,
+    schedule_id TEXT,
+    schedule_name TEXT,
+    trade_type TEXT,
+    symbol TEXT,
+    quantity INTEGER,
+    estimated_price REAL,
+    estimated_value REAL,
+    reason TEXT,
+    risk_score INTEGER,
+    ai_confidence REAL,
+    supporting_data TEXT,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    expires_at TEXT NOT NULL,
+    approved_at TEXT,
+    approved_by TEXT,
+    rejection_reason TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_approvals_status ON approvals (status, expires_at);
+CREATE INDEX IF NOT EXISTS ix_approvals_created ON approvals (created_at);
+CREATE INDEX IF NOT EXISTS ix_approvals_execution ON approvals (execution_id);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _utc_now_iso() -> str:
+    return datetime.now(UTC).isoformat()
+
+
+class SchedulerStore:
+    """SQLite-backed execution history and approval queue"""
+
+    def __init__(self, path: str | Path, retention_days: int | None = None):
+        """
+        Args:
+            path: Database file (parent directories are created)
+            retention_days: Drop executions and decided approvals older than
+                this on open; 0 keeps everything
+                (default: SCHEDULER_HISTORY_RETENTION_DAYS)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.retention_days = (
+            retention_days
+            if retention_days is not None
+            else settings.SCHEDULER_HISTORY_RETENTION_DAYS
+        )
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, timeout=5.0)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+        if self.retention_days:
+            self.prune(datetime.now(UTC) - timedelta(days=self.retention_days))
+
+    # ========================
+    # Executions
+    # ========================
+
+    def create_execution(self, execution: dict[str, Any]) -> None:
+        """Insert a new execution record"""
+        self._insert("executions", EXECUTION_COLUMNS, [execution])
+
+    def complete_execution(
+        self,
+        execution_id: str,
+        status: str,
+        result: str | None,
+        error: str | None = None,
+    ) -> bool:
+        """
+        Mark an execution finished
+
+        Returns:
+            False if the execution does not exist
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "UPDATE executions SET status = ?, completed_at = ?, result = ?, error = ? "
+                "WHERE id = ?",
+                (status, _utc_now_iso(), result, error, execution_id),
+            )
+        return cursor.rowcount > 0
+
+    def get_execution(self, execution_id: str) -> dict[str, Any] | None:
+        rows = self._query("SELECT * FROM executions WHERE id = ?", (execution_id,))
+        return dict(rows[0]) if rows else None
+
+    def list_executions(
+        self,
+        schedule_id: str | None = None,
+        status: str | None = None,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Executions newest first, optionally for one schedule and/or status
+
+        Returns:
+            (page of execution dicts, total matching executions)
+        """
+        # Column names come from _where's keyword arguments; values are bound
+        where, params = _where(schedule_id=schedule_id, status=status)
+        rows = self._query(
+            f"SELECT * FROM executions{where} ORDER BY started_at DESC LIMIT ? OFFSET ?",  # noqa: S608
+            (*params, limit, offset),
+        )
+        count_sql = f"SELECT COUNT(*) FROM executions{where}"  # noqa: S608
+        total = self._query(count_sql, params)[0][0]
+        return [dict(row) for row in rows], total
+
+    # ========================
+    # Approvals
+    # ========================
+
+    def create_approvals(self, approvals: list[dict[str, Any]]) -> None:
+        """Insert approval requests in one transaction"""
+        self._insert("approvals", APPROVAL_COLUMNS, [_encode_approval(a) for a in approvals])
+
+    def get_approval(self, approval_id: str) -> dict[str, Any] | None:
+        rows = self._query("SELECT * FROM approvals WHERE id = ?", (approval_id,))
+        return _decode_approval(rows[0]) if rows else None
+
+    def decide_approval(self, approval_id: str, changes: dict[str, Any]) -> bool:
+        """
+        Apply a decision to a still-pending approval
+
+        Args:
+            approval_id: Approval to update
+            changes: New values for status, approved_at, approved_by and/or
+                rejection_reason
+
+        Returns:
+            False if the approval does not exist or was already decided
+        """
+        unknown = set(changes) - APPROVAL_DECISION_FIELDS
+        if unknown:
+            raise ValueError(f"Not approval decision fields: {sorted(unknown)}")
+
+        # Columns are whitelisted by APPROVAL_DECISION_FIELDS above; values are bound
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                f"UPDATE approvals SET {assignments} WHERE id = ? AND status = 'pending'",  # noqa: S608
+                (*changes.values(), approval_id),
+            )
+        return cursor.rowcount > 0
+
+    def list_pending_approvals(
+        self,
+        now: datetime | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Pending, unexpired approvals newest first
+
+        Returns:
+            (page of approval dicts, total pending)
+        """
+        now_iso = (now or datetime.now(UTC)).isoformat()
+        rows = self._query(
+            PENDING_APPROVALS_SQL,
+            (now_iso, -1 if limit is None else limit, offset),
+        )
+        total = self._query(PENDING_APPROVALS_COUNT_SQL, (now_iso,))[0][0]
+        return [_decode_approval(row) for row in rows], total
+
+    # ========================
+    # Maintenance
+    # ========================
+
+    def prune(self, before: datetime) -> int:
+        """
+        Delete executions started, and decided or expired approvals created,
+        before a cutoff
+
+        Returns:
+            Rows deleted
+        """
+        cutoff = before.isoformat()
+        with self._lock, self._conn:
+            executions = self._conn.execute(
+                "DELETE FROM executions WHERE started_at < ?", (cutoff,)
+            ).rowcount
+            approvals = self._conn.execute(
+                "DELETE FROM approvals WHERE created_at < ? "
+                "AND (status != 'pending' OR expires_at < ?)",
+                (cutoff, _utc_now_iso()),
+            ).rowcount
+        if executions or approvals:
+            logger.info(f"🧹 Pruned {executions} executions and {approvals} approvals")
+        return executions + approvals
+
+    def migrate_files(
+        self,
+        executions_dir: str | Path,
+        approvals_dir: str | Path,
+        batch_size: int = 1000,
+    ) -> dict[str, int]:
+        """
+        Import the legacy one-file-per-record JSON stores once
+
+        Files are parsed in batches and inserted with INSERT OR IGNORE, so an
+        interrupted import can simply be rerun. Unreadable files are skipped
+        and counted. The files themselves are left in place.
+
+        Returns:
+            Counts of imported executions, approvals and skipped files
+            (all 0 if the import already ran)
+        """
+        counts = {"executions": 0, "approvals": 0, "skipped": 0}
+        if self._query("SELECT value FROM meta WHERE key = 'files_migrated_at'"):
+            return counts
+
+        sources = (
+            ("executions", Path(executions_dir), EXECUTION_COLUMNS, lambda r: r),
+            ("approvals", Path(approvals_dir), APPROVAL_COLUMNS, _encode_approval),
+        )
+        for table, directory, columns, encode in sources:
+            if not directory.is_dir():
+                continue
+            batch: list[dict[str, Any]] = []
+            # "{id}.json" only: "{id}.strategy.json" files are strategy-run payloads
+            for record_file in directory.glob("*.json"):
+                if record_file.name.count(".") > 1:
+                    continue
+                try:
+                    record = json.loads(record_file.read_text(encoding="utf-8"))
+                    batch.append(encode(record))
+                except (OSError, ValueError) as e:
+                    counts["skipped"] += 1
+                    logger.warning(f"⚠️ Skipping unreadable {record_file}: {e}")
+                    continue
+                if len(batch) >= batch_size:
+                    counts[table] += self._insert(table, columns, batch, ignore=True)
+                    batch = []
+            if batch:
+                counts[table] += self._insert(table, columns, batch, ignore=True)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('files_migrated_at', ?)",
+                (_utc_now_iso(),),
+            )
+        if counts["executions"] or counts["approvals"]:
+            logger.info(
+                f"✅ Migrated {counts['executions']} executions and "
+                f"{counts['approvals']} approvals from JSON files"
+            )
+        return counts
+
+    def get_stats(self) -> dict[str, Any]:
+        executions = {
+            row["status"]: row["n"]
+            for row in self._query(
+                "SELECT status, COUNT(*) AS n FROM executions GROUP BY status"
+            )
+        }
+        approvals = {
+            row["status"]: row["n"]
+            for row in self._query(
+                "SELECT status, COUNT(*) AS n FROM approvals GROUP BY status"
+            )
+        }
+        return {
+            "path": str(self.path),
+            "executions": executions,
+            "approvals": approvals,
+            "retention_days": self.retention_days,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ========================
+    # Internals
+    # ========================
+
+    def _insert(
+        self,
+        table: str,
+        columns: tuple[str, ...],
+        records: list[dict[str, Any]],
+        ignore: bool = False,
+    ) -> int:
+        verb = "INSERT OR IGNORE" if ignore else "INSERT"
+        sql = (
+            f"{verb} INTO {table} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)})"
+        )
+        rows = [tuple(record.get(column) for column in columns) for record in records]
+        with self._lock, self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(sql, rows)
+            return self._conn.total_changes - before
+
+    def _query(self, sql: str, params: tuple = ()) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+def _where(**filters: Any) -> tuple[str, tuple]:
+    """WHERE clause over the non-None equality filters"""
+    active = {column: value for column, value in filters.items() if value is not None}
+    if not active:
+        return "", ()
+    clause = " AND ".join(f"{column} = ?" for column in active)
+    return f" WHERE {clause}", tuple(active.values())
+
+
+def _encode_approval(approval: dict[str, Any]) -> dict[str, Any]:
+    return {**approval, "supporting_data": json.dumps(approval.get("supporting_data") or {})}
+
+
+def _decode_approval(row: sqlite3.Row) -> dict[str, Any]:
+    approval = dict(row)
+    approval["supporting_data"] = json.loads(approval["supporting_data"] or "{}")
+    return approval
+
+
+_scheduler_store: SchedulerStore | None = None
+
+
+def get_scheduler_store() -> SchedulerStore:
+    """Get or create the shared scheduler store"""
+    global _scheduler_store
+    if _scheduler_store is None:
+        _scheduler_store = SchedulerStore(settings.SCHEDULER_DB_PATH)
+    return _scheduler_store
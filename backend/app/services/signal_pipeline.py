@@ -0,0 +1,153 @@
+"""
+Batched Multi-Symbol Signal Pipeline
+
+Fetches quotes and daily-bar history for many symbols concurrently and runs
+indicator computation in an executor, recording per-symbol timings.
+"""
+
+import asyncio
+import logging
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, TypeVar
+
+from .bar_store import get_historical_bars
+
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Upper bound on simultaneous history requests per pipeline run
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Shared pool for indicator computation
+_compute_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="signal-compute")
+
+
+class SignalPipeline:
+    """Concurrent quote/history fetch and indicator computation for many symbols"""
+
+    def __init__(
+        self,
+        client: Any,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        executor: Executor | None = None,
+        quote_client: Any | None = None,
+    ):
+        """
+        Args:
+            client: Tradier client (sync API: get_quotes, get_historical_bars)
+            max_concurrency: Maximum history requests in flight at once
+            executor: Executor for compute functions (default: shared thread pool)
+            quote_client: Async Tradier client for the bulk quote call
+                (default: run ``client.get_quotes`` in a worker thread)
+        """
+        self.client = client
+        self.quote_client = quote_client
+        self.max_concurrency = max_concurrency
+        self.executor = executor or _compute_executor
+        self.timings: dict[str, dict[str, float]] = {}
+        self.quotes_ms = 0.0
+
+    async def fetch_quotes(self, symbols: list[str]) -> dict[str, dict]:
+        """
+        Fetch quotes for all symbols in one bulk call
+
+        Returns:
+            Dict of symbol -> Tradier quote (symbols without a quote are omitted)
+        """
+        start = time.perf_counter()
+        try:
+            if self.quote_client is not None:
+                response = await self.quote_client.get_quotes(symbols)
+            else:
+                response = await asyncio.to_thread(self.client.get_quotes, symbols)
+        finally:
+            self.quotes_ms = _elapsed_ms(start)
+        return _quote_map(response)
+
+    async def run(
+        self,
+        symbols: list[str],
+        history_days: int,
+        compute: Callable[[str, list[dict]], T],
+    ) -> dict[str, T]:
+        """
+        Fetch daily bars for every symbol and apply ``compute(symbol, bars)``
+
+        History fetch failures are logged and passed to ``compute`` as an
+        empty bar list, so compute functions keep their own "insufficient
+        data" fallbacks. Compute failures drop the symbol from the result.
+
+        Args:
+            symbols: Symbols to process
+            history_days: Calendar days of daily history to fetch
+            compute: Function of (symbol, bars) run in the executor
+
+        Returns:
+            Dict of symbol -> compute result, in input order
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=history_days)
+
+        async def process(symbol: str) -> tuple[str, T | None, bool]:
+            timing = self.timings.setdefault(symbol, {})
+            start = time.perf_counter()
+
+            async with semaphore:
+                bars_start = time.perf_counter()
+                try:
+                    bars = await asyncio.to_thread(
+                        get_historical_bars,
+                        self.client,
+                        symbol=symbol,
+                        interval="daily",
+                        start_date=start_date.strftime("%Y-%m-%d"),
+                        end_date=end_date.strftime("%Y-%m-%d"),
+                    )
+                except Exception as e:
+                    logger.error(f"❌ History fetch failed for {symbol}: {e!s}")
+                    bars = []
+                timing["bars_ms"] = _elapsed_ms(bars_start)
+
+            compute_start = time.perf_counter()
+            try:
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(self.executor, compute, symbol, bars or [])
+                ok = True
+            except Exception as e:
+                logger.error(f"❌ Signal computation failed for {symbol}: {e!s}")
+                result, ok = None, False
+            timing["compute_ms"] = _elapsed_ms(compute_start)
+            timing["total_ms"] = _elapsed_ms(start)
+            return symbol, result, ok
+
+        outcomes = await asyncio.gather(*(process(symbol) for symbol in dict.fromkeys(symbols)))
+        return {symbol: result for symbol, result, ok in outcomes if ok}
+
+    def get_timings(self) -> dict[str, Any]:
+        """Per-symbol timing breakdown plus the shared bulk quote call"""
+        return {"quotes_ms": self.quotes_ms, "symbols": self.timings}
+
+
+def _elapsed_ms(start: float) -> float:
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def _quote_map(response: dict | None) -> dict[str, dict]:
+    """Normalize a Tradier /markets/quotes response to symbol -> quote"""
+    if not isinstance(response, dict):
+        return {}
+    container = response.get("quotes")
+    if not isinstance(container, dict):
+        return {}
+    quotes = container.get("quote") or []
+    if isinstance(quotes, dict):
+        quotes = [quotes]
+    if not isinstance(quotes, list):
+        return {}
+    return {q["symbol"]: q for q in quotes if isinstance(q, dict) and q.get("symbol")}
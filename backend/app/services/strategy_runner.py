@@ -0,0 +1,240 @@
+"""
+In-Process Strategy Runner
+
+Runs scheduled strategies through StrategyExecutionService in one bounded
+worker pool per market, coalescing duplicate in-flight runs.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Completed runs per market kept for latency percentiles
+LATENCY_WINDOW = 200
+
+
+class StrategyRunRejectedError(RuntimeError):
+    """Raised when a strategy run cannot be queued"""
+
+
+@dataclass
+class StrategyRun:
+    """Outcome of one strategy run"""
+
+    payload: dict[str, Any]
+    market: str
+    wait_ms: float
+    run_ms: float
+    coalesced: bool = False
+
+
+@dataclass
+class _MarketPool:
+    executor: ThreadPoolExecutor
+    lock: threading.Lock = field(default_factory=threading.Lock)
+    queued: int = 0
+    active: int = 0
+    completed: int = 0
+    failed: int = 0
+    rejected: int = 0
+    coalesced: int = 0
+    wait_ms: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+    run_ms: deque = field(default_factory=lambda: deque(maxlen=LATENCY_WINDOW))
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "queue_depth": self.queued,
+            "active": self.active,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "coalesced": self.coalesced,
+            "wait_ms": _latency_summary(self.wait_ms),
+            "run_ms": _latency_summary(self.run_ms),
+        }
+
+
+class StrategyRunner:
+    """Runs strategies in-process on bounded per-market worker pools"""
+
+    def __init__(
+        self,
+        service: Any,
+        markets: Mapping[str, str],
+        workers_per_market: int | None = None,
+        max_queue: int | None = None,
+    ):
+        """
+        Args:
+            service: StrategyExecutionService (or anything with the same
+                execute_strategy_dry_run / execute_strategy_live methods)
+            markets: Strategy type -> market key; other types are rejected
+            workers_per_market: Threads per market pool
+                (default: STRATEGY_RUNNER_WORKERS)
+            max_queue: Runs allowed to wait per market
+                (default: STRATEGY_RUNNER_MAX_QUEUE)
+        """
+        self.service = service
+        self.markets = dict(markets)
+        self.workers_per_market = workers_per_market or settings.STRATEGY_RUNNER_WORKERS
+        self.max_queue = max_queue if max_queue is not None else settings.STRATEGY_RUNNER_MAX_QUEUE
+        self._pools: dict[str, _MarketPool] = {}
+        self._inflight: dict[tuple[int, str, bool], asyncio.Task] = {}
+
+    async def run(self, user_id: int, strategy_type: str, dry_run: bool = True) -> StrategyRun:
+        """
+        Run a strategy for a user, joining an identical run already in flight
+
+        Raises:
+            StrategyRunRejectedError: Unknown strategy type or the market queue is full
+            Exception: Whatever the strategy service raised
+        """
+        if strategy_type not in self.markets:
+            raise StrategyRunRejectedError(f"Unknown strategy type: {strategy_type}")
+
+        key = (user_id, strategy_type, dry_run)
+        task = self._inflight.get(key)
+        if task is not None:
+            pool = self._pool(self.markets[strategy_type])
+            pool.coalesced += 1
+            run = await asyncio.shield(task)
+            return StrategyRun(run.payload, run.market, run.wait_ms, run.run_ms, coalesced=True)
+
+        pool = self._pool(self.markets[strategy_type])
+        if pool.queued >= self.max_queue:
+            pool.rejected += 1
+            raise StrategyRunRejectedError(
+                f"Strategy queue for {self.markets[strategy_type]} is full "
+                f"({pool.queued} runs waiting)"
+            )
+        with pool.lock:
+            pool.queued += 1
+
+        task = asyncio.get_running_loop().create_task(
+            self._execute(pool, self.markets[strategy_type], user_id, strategy_type, dry_run)
+        )
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._finish(key, t))
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "workers_per_market": self.workers_per_market,
+            "max_queue": self.max_queue,
+            "inflight": len(self._inflight),
+            "markets": {market: pool.stats() for market, pool in self._pools.items()},
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop all market pools (queued runs are cancelled)"""
+        for pool in self._pools.values():
+            pool.executor.shutdown(wait=wait, cancel_futures=True)
+        self._pools.clear()
+
+    # ========================
+    # Internals
+    # ========================
+
+    def _pool(self, market: str) -> _MarketPool:
+        pool = self._pools.get(market)
+        if pool is None:
+            pool = _MarketPool(
+                ThreadPoolExecutor(
+                    max_workers=self.workers_per_market,
+                    thread_name_prefix=f"strategy-{market}",
+                )
+            )
+            self._pools[market] = pool
+        return pool
+
+    async def _execute(
+        self,
+        pool: _MarketPool,
+        market: str,
+        user_id: int,
+        strategy_type: str,
+        dry_run: bool,
+    ) -> StrategyRun:
+        execute = (
+            self.service.execute_strategy_dry_run if dry_run else self.service.execute_strategy_live
+        )
+        timing: dict[str, float] = {}
+        submitted = time.perf_counter()
+
+        def work() -> dict[str, Any]:
+            started = time.perf_counter()
+            with pool.lock:
+                pool.queued -= 1
+                pool.active += 1
+            timing["wait_ms"] = (started - submitted) * 1000
+            try:
+                return execute(user_id=user_id, strategy_type=strategy_type)
+            finally:
+                timing["run_ms"] = (time.perf_counter() - started) * 1000
+                with pool.lock:
+                    pool.active -= 1
+
+        try:
+            future = asyncio.get_running_loop().run_in_executor(pool.executor, work)
+        except RuntimeError:
+            with pool.lock:
+                pool.queued -= 1
+            raise
+
+        try:
+            payload = await future
+        except BaseException:
+            pool.failed += 1
+            raise
+        finally:
+            if "run_ms" in timing:
+                pool.wait_ms.append(timing["wait_ms"])
+                pool.run_ms.append(timing["run_ms"])
+
+        pool.completed += 1
+        return StrategyRun(payload, market, round(timing["wait_ms"], 2), round(timing["run_ms"], 2))
+
+    def _finish(self, key: tuple[int, str, bool], task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"⚠️ Strategy run {key[1]} failed: {task.exception()}")
+
+
+def _latency_summary(samples: deque) -> dict[str, float]:
+    if not samples:
+        return {"last": 0.0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "last": round(samples[-1], 2),
+        "p50": round(ordered[len(ordered) // 2], 2),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+_strategy_runner: StrategyRunner | None = None
+
+
+def get_strategy_runner() -> StrategyRunner:
+    """Get or create the shared strategy runner"""
+    global _strategy_runner
+    if _strategy_runner is None:
+        from .strategy_execution_service import (
+            MARKET_BY_STRATEGY,
+            get_strategy_execution_service,
+        )
+
+        _strategy_runner = StrategyRunner(get_strategy_execution_service(), MARKET_BY_STRATEGY)
+    return _strategy_runner
@@ -0,0 +1,317 @@
+"""
+Streaming Technical Indicator Kernels
+
+Stateful, incremental versions of the indicators in TechnicalIndicators.
+Each kernel consumes one bar at a time via ``update()`` in O(1) (work on read
+is bounded by the indicator window, never by history length) and can be
+primed from history with ``seed()``:
+
+    rsi = RSI(14).seed(closes)
+    for bar in stream:
+        value = rsi.update(bar["close"])
+
+The batch functions in TechnicalIndicators are built on these kernels, so
+the streaming pipeline, the backtester and /ai/signals share one
+implementation instead of recomputing from scratch per request.
+"""
+
+from collections import deque
+from collections.abc import Iterable
+from typing import Literal
+
+
+Smoothing = Literal["wilder", "simple"]
+
+
+class EMA:
+    """Exponential Moving Average seeded with the SMA of the first ``period`` prices"""
+
+    def __init__(self, period: int):
+        if period <= 0:
+            raise ValueError("EMA period must be positive")
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.count = 0
+        self._sum = 0.0
+        self._ema: float | None = None
+
+    def update(self, price: float) -> float:
+        """Add a price and return the current EMA"""
+        self._push(price)
+        return self.value
+
+    def _push(self, price: float) -> None:
+        self.count += 1
+        if self._ema is None:
+            self._sum += price
+            if self.count == self.period:
+                self._ema = self._sum / self.period
+        else:
+            self._ema = (price * self.multiplier) + (self._ema * (1 - self.multiplier))
+
+    def seed(self, prices: Iterable[float]) -> "EMA":
+        for price in prices:
+            self._push(price)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self._ema is not None
+
+    @property
+    def value(self) -> float:
+        """Current EMA (mean of prices seen so far until ``period`` prices arrive)"""
+        if self._ema is not None:
+            return self._ema
+        return self._sum / self.count if self.count else 0.0
+
+
+class RSI:
+    """
+    Relative Strength Index
+
+    ``smoothing="wilder"`` (default) uses Wilder's recursive averages.
+    ``smoothing="simple"`` averages the last ``period`` gains/losses, matching
+    the historical TechnicalIndicators.calculate_rsi output.
+    """
+
+    def __init__(self, period: int = 14, smoothing: Smoothing = "wilder"):
+        if period <= 0:
+            raise ValueError("RSI period must be positive")
+        self.period = period
+        self.smoothing = smoothing
+        self.count = 0  # number of price changes seen
+        self._prev: float | None = None
+        self._gains: deque[float] = deque(maxlen=period)
+        self._losses: deque[float] = deque(maxlen=period)
+        self._avg_gain = 0.0
+        self._avg_loss = 0.0
+
+    def update(self, price: float) -> float | None:
+        """Add a closing price and return the current RSI (None until ready)"""
+        self._push(price)
+        return self.value
+
+    def _push(self, price: float) -> None:
+        prev, self._prev = self._prev, price
+        if prev is None:
+            return
+
+        change = price - prev
+        gain = change if change > 0 else 0.0
+        loss = -change if change < 0 else 0.0
+        self.count += 1
+
+        if self.smoothing == "simple":
+            self._gains.append(gain)
+            self._losses.append(loss)
+        elif self.count <= self.period:
+            self._avg_gain += gain
+            self._avg_loss += loss
+            if self.count == self.period:
+                self._avg_gain /= self.period
+                self._avg_loss /= self.period
+        else:
+            self._avg_gain = (self._avg_gain * (self.period - 1) + gain) / self.period
+            self._avg_loss = (self._avg_loss * (self.period - 1) + loss) / self.period
+
+    def seed(self, prices: Iterable[float]) -> "RSI":
+        for price in prices:
+            self._push(price)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    @property
+    def value(self) -> float | None:
+        if not self.ready:
+            return None
+
+        if self.smoothing == "simple":
+            avg_gain = sum(self._gains) / self.period
+            avg_loss = sum(self._losses) / self.period
+        else:
+            avg_gain, avg_loss = self._avg_gain, self._avg_loss
+
+        if avg_loss == 0:
+            return 100.0
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class MACD:
+    """MACD line, signal line and histogram"""
+
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.count = 0
+        self._fast = EMA(fast_period)
+        self._slow = EMA(slow_period)
+        self._signal = EMA(signal_period)
+        self._macd: float | None = None
+
+    def update(self, price: float) -> dict[str, float] | None:
+        """Add a closing price and return macd/signal/histogram (None until ready)"""
+        self._push(price)
+        return self.value
+
+    def _push(self, price: float) -> None:
+        self.count += 1
+        self._fast._push(price)
+        self._slow._push(price)
+        if self.count > self.slow_period:
+            self._macd = self._fast.value - self._slow.value
+            self._signal._push(self._macd)
+
+    def seed(self, prices: Iterable[float]) -> "MACD":
+        for price in prices:
+            self._push(price)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.slow_period + self.signal_period
+
+    @property
+    def value(self) -> dict[str, float] | None:
+        if not self.ready or self._macd is None:
+            return None
+        signal = self._signal.value
+        return {"macd": self._macd, "signal": signal, "histogram": self._macd - signal}
+
+
+class BollingerBands:
+    """Bollinger Bands over a rolling window of closing prices"""
+
+    def __init__(self, period: int = 20, std_dev: float = 2.0):
+        if period <= 0:
+            raise ValueError("Bollinger period must be positive")
+        self.period = period
+        self.std_dev = std_dev
+        self._window: deque[float] = deque(maxlen=period)
+
+    def update(self, price: float) -> dict[str, float] | None:
+        """Add a closing price and return upper/middle/lower (None until ready)"""
+        self._window.append(price)
+        return self.value
+
+    def seed(self, prices: Iterable[float]) -> "BollingerBands":
+        self._window.extend(prices)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return len(self._window) == self.period
+
+    @property
+    def value(self) -> dict[str, float] | None:
+        if not self.ready:
+            return None
+        sma = sum(self._window) / self.period
+        variance = sum((p - sma) ** 2 for p in self._window) / self.period
+        std = variance**0.5
+        return {
+            "upper": sma + (self.std_dev * std),
+            "middle": sma,
+            "lower": sma - (self.std_dev * std),
+        }
+
+
+class ATR:
+    """
+    Average True Range
+
+    ``smoothing="wilder"`` (default) uses Wilder's recursive average.
+    ``smoothing="simple"`` averages the last ``period`` true ranges, matching
+    the historical TechnicalIndicators.calculate_atr output.
+    """
+
+    def __init__(self, period: int = 14, smoothing: Smoothing = "wilder"):
+        if period <= 0:
+            raise ValueError("ATR period must be positive")
+        self.period = period
+        self.smoothing = smoothing
+        self.count = 0  # number of true ranges seen
+        self._prev_close: float | None = None
+        self._ranges: deque[float] = deque(maxlen=period)
+        self._atr = 0.0
+
+    def update(self, high: float, low: float, close: float) -> float | None:
+        """Add a bar and return the current ATR (None until the first true range)"""
+        self._push(high, low, close)
+        return self.value
+
+    def _push(self, high: float, low: float, close: float) -> None:
+        prev_close, self._prev_close = self._prev_close, close
+        if prev_close is None:
+            return
+
+        tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        self.count += 1
+
+        if self.smoothing == "simple":
+            self._ranges.append(tr)
+        elif self.count <= self.period:
+            self._atr += tr
+            if self.count == self.period:
+                self._atr /= self.period
+        else:
+            self._atr = (self._atr * (self.period - 1) + tr) / self.period
+
+    def seed(
+        self, highs: Iterable[float], lows: Iterable[float], closes: Iterable[float]
+    ) -> "ATR":
+        for high, low, close in zip(highs, lows, closes, strict=False):
+            self._push(high, low, close)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.period
+
+    @property
+    def value(self) -> float | None:
+        if self.count == 0:
+            return None
+        if self.smoothing == "simple":
+            return sum(self._ranges) / len(self._ranges)
+        if self.count < self.period:
+            return self._atr / self.count
+        return self._atr
+
+
+class OBV:
+    """On-Balance Volume"""
+
+    def __init__(self):
+        self.count = 0
+        self._prev_close: float | None = None
+        self._obv = 0.0
+
+    def update(self, close: float, volume: float) -> float:
+        """Add a bar and return the running OBV"""
+        self.count += 1
+        if self._prev_close is not None:
+            if close > self._prev_close:
+                self._obv += volume
+            elif close < self._prev_close:
+                self._obv -= volume
+        self._prev_close = close
+        return self._obv
+
+    def seed(self, closes: Iterable[float], volumes: Iterable[float]) -> "OBV":
+        for close, volume in zip(closes, volumes, strict=False):
+            self.update(close, volume)
+        return self
+
+    @property
+    def ready(self) -> bool:
+        return self.count > 0
+
+    @property
+    def value(self) -> float:
+        return self._obv
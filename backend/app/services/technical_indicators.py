@@ -7,11 +7,16 @@ Calculates common technical indicators for trading signals:
 - Bollinger Bands
 - Moving Averages (SMA, EMA)
 - Volume indicators
+
+Batch calculations are thin wrappers over the incremental kernels in
+streaming_indicators, so a single pass over the prices is all that is needed.
 """
 
 import logging
 from typing import Any
 
+from .streaming_indicators import ATR, EMA, MACD, OBV, RSI, BollingerBands
+
 
 logger = logging.getLogger(__name__)
 
@@ -34,22 +39,8 @@ class TechnicalIndicators:
         if len(prices) < period + 1:
             return 50.0  # Neutral default
 
-        # Calculate price changes
-        changes = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
-
-        # Separate gains and losses
-        gains = [max(change, 0) for change in changes]
-        losses = [abs(min(change, 0)) for change in changes]
-
-        # Calculate average gain and loss
-        avg_gain = sum(gains[-period:]) / period
-        avg_loss = sum(losses[-period:]) / period
-
-        if avg_loss == 0:
-            return 100.0
-
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        # Simple averages over the last `period` gains/losses (not Wilder smoothing)
+        rsi = RSI(period, smoothing="simple").seed(prices).value
 
         return round(rsi, 2)
 
@@ -66,22 +57,11 @@ class TechnicalIndicators:
         if len(prices) < slow_period + signal_period:
             return {"macd": 0.0, "signal": 0.0, "histogram": 0.0}
 
-        # Calculate MACD line for each bar (need historical values for signal line EMA)
-        macd_values = []
-        for i in range(slow_period, len(prices)):
-            fast_ema = TechnicalIndicators._calculate_ema(prices[: i + 1], fast_period)
-            slow_ema = TechnicalIndicators._calculate_ema(prices[: i + 1], slow_period)
-            macd_values.append(fast_ema - slow_ema)
-
-        # Calculate signal line as EMA of MACD line
-        if len(macd_values) >= signal_period:
-            signal_line = TechnicalIndicators._calculate_ema(macd_values, signal_period)
-        else:
-            # Fallback if insufficient data
-            signal_line = sum(macd_values) / len(macd_values) if macd_values else 0.0
-
-        macd_line = macd_values[-1] if macd_values else 0.0
-        histogram = macd_line - signal_line
+        # Single pass: fast/slow EMAs and the signal EMA are updated bar by bar
+        macd = MACD(fast_period, slow_period, signal_period).seed(prices).value
+        macd_line = macd["macd"]
+        signal_line = macd["signal"]
+        histogram = macd["histogram"]
 
         return {
             "macd": round(macd_line, 4),
@@ -103,17 +83,8 @@ class TechnicalIndicators:
             current = prices[-1] if prices else 100.0
             return {"upper": current * 1.02, "middle": current, "lower": current * 0.98}
 
-        recent_prices = prices[-period:]
-
-        # Calculate SMA (middle band)
-        sma = sum(recent_prices) / period
-
-        # Calculate standard deviation
-        variance = sum((p - sma) ** 2 for p in recent_prices) / period
-        std = variance**0.5
-
-        upper = sma + (std_dev * std)
-        lower = sma - (std_dev * std)
+        bands = BollingerBands(period, std_dev).seed(prices).value
+        upper, sma, lower = bands["upper"], bands["middle"], bands["lower"]
 
         return {"upper": round(upper, 2), "middle": round(sma, 2), "lower": round(lower, 2)}
 
@@ -161,24 +132,25 @@ class TechnicalIndicators:
                 return round(highs[-1] - lows[-1], 2)
             return 0.0
 
-        # Calculate True Range for each bar
-        true_ranges = []
-        for i in range(1, len(closes)):
-            high = highs[i]
-            low = lows[i]
-            prev_close = closes[i - 1]
+        # True Range = max(high-low, abs(high-prev_close), abs(low-prev_close)),
+        # averaged over the last `period` bars
+        atr = ATR(period, smoothing="simple").seed(highs, lows, closes).value or 0.0
+
+        return round(atr, 2)
 
-            # True Range = max(high-low, abs(high-prev_close), abs(low-prev_close))
-            tr = max(high - low, abs(high - prev_close), abs(low - prev_close))
-            true_ranges.append(tr)
+    @staticmethod
+    def calculate_obv(closes: list[float], volumes: list[float]) -> float:
+        """
+        Calculate On-Balance Volume
 
-        # ATR is simple moving average of True Range
-        if len(true_ranges) >= period:
-            atr = sum(true_ranges[-period:]) / period
-        else:
-            atr = sum(true_ranges) / len(true_ranges) if true_ranges else 0.0
+        Args:
+            closes: List of closing prices
+            volumes: List of volumes (same length as closes)
 
-        return round(atr, 2)
+        Returns:
+            Cumulative OBV (volume added on up closes, subtracted on down closes)
+        """
+        return OBV().seed(closes, volumes).value
 
     @staticmethod
     def calculate_moving_averages(prices: list[float]) -> dict[str, float]:
@@ -207,18 +179,7 @@ class TechnicalIndicators:
     @staticmethod
     def _calculate_ema(prices: list[float], period: int) -> float:
         """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return sum(prices) / len(prices) if prices else 0.0
-
-        # Use SMA as initial EMA
-        sma = sum(prices[:period]) / period
-        multiplier = 2 / (period + 1)
-
-        ema = sma
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
-
-        return ema
+        return EMA(period).seed(prices).value
 
     @staticmethod
     def analyze_trend(prices: list[float]) -> dict[str, Any]:
@@ -5,17 +5,30 @@ This service handles storage, retrieval, and analysis of user interaction events
 """
 
 import json
-from datetime import datetime
+import queue
+import threading
+import time
+from collections import Counter, deque
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 from pydantic import BaseModel
 
+from ..core.config import settings
 from ..core.logging_utils import get_secure_logger
 
 
 logger = get_secure_logger(__name__)
 
+# Event fields with a secondary index (query filters)
+INDEXED_FIELDS = ("userId", "component", "action", "userRole")
+
+# Upper bound on events written by one file append
+MAX_WRITE_BATCH = 10_000
+
+_STOP = object()
+
 
 class TelemetryEvent(BaseModel):
     """Telemetry event model"""
@@ -60,22 +73,187 @@ class TelemetryStats:
         }
 
 
+class TelemetrySegmentWriter:
+    """Background JSONL writer: batched appends with size-based segment rotation"""
+
+    def __init__(
+        self,
+        path: str | Path,
+        flush_interval_ms: int | None = None,
+        segment_max_bytes: int | None = None,
+        keep_segments: int | None = None,
+        max_pending: int | None = None,
+    ):
+        """
+        Args:
+            path: Active JSONL file; rotated segments are written next to it
+            flush_interval_ms: Batch collection window (default: TELEMETRY_FLUSH_INTERVAL_MS)
+            segment_max_bytes: Rotation size (default: TELEMETRY_SEGMENT_MAX_BYTES)
+            keep_segments: Rotated segments kept, 0 keeps all (default: TELEMETRY_SEGMENT_KEEP)
+            max_pending: Queued batches before drops (default: TELEMETRY_WRITER_MAX_PENDING)
+        """
+        self.path = Path(path)
+        self.flush_interval = (
+            flush_interval_ms
+            if flush_interval_ms is not None
+            else settings.TELEMETRY_FLUSH_INTERVAL_MS
+        ) / 1000
+        self.segment_max_bytes = segment_max_bytes or settings.TELEMETRY_SEGMENT_MAX_BYTES
+        self.keep_segments = (
+            keep_segments if keep_segments is not None else settings.TELEMETRY_SEGMENT_KEEP
+        )
+
+        self._queue: queue.Queue = queue.Queue(
+            maxsize=max_pending or settings.TELEMETRY_WRITER_MAX_PENDING
+        )
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._size: int | None = None
+
+        # Counters
+        self.written = 0
+        self.writes = 0
+        self.rotations = 0
+        self.dropped = 0
+        self.write_errors = 0
+
+    def submit(self, events: list[dict[str, Any]]) -> bool:
+        """Queue events for the next batched write (never blocks)"""
+        if not events:
+            return True
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(events)
+            return True
+        except queue.Full:
+            self.dropped += len(events)
+            logger.warning("Telemetry writer queue full, dropping events", count=len(events))
+            return False
+
+    def flush(self) -> None:
+        """Block until every queued event has been written"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Write out pending events and stop the writer thread"""
+        thread = self._thread
+        if thread is None:
+            return
+        self._queue.put(_STOP)
+        thread.join(timeout)
+        self._thread = None
+
+    def segments(self) -> list[Path]:
+        """Rotated segments, oldest first"""
+        return sorted(self.path.parent.glob(f"{self.path.stem}.*{self.path.suffix}"))
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "written": self.written,
+            "writes": self.writes,
+            "rotations": self.rotations,
+            "dropped": self.dropped,
+            "write_errors": self.write_errors,
+            "pending_batches": self._queue.qsize(),
+            "flush_interval_ms": int(self.flush_interval * 1000),
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="telemetry-writer", daemon=True
+                    )
+                    self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            taken, stop = 1, item is _STOP
+            batch: list[dict[str, Any]] = [] if stop else list(item)
+
+            # Collect whatever else arrives within the flush window
+            deadline = time.monotonic() + self.flush_interval
+            while not stop and len(batch) < MAX_WRITE_BATCH:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                taken += 1
+                if item is _STOP:
+                    stop = True
+                else:
+                    batch.extend(item)
+
+            try:
+                if batch:
+                    self._write(batch)
+            except Exception as e:
+                self.write_errors += 1
+                logger.error(
+                    "Failed to persist telemetry events to file",
+                    error_type=type(e).__name__,
+                    error_msg=str(e),
+                )
+            finally:
+                for _ in range(taken):
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, batch: list[dict[str, Any]]) -> None:
+        data = "".join(json.dumps(event) + "\n" for event in batch).encode()
+        if self._size is None:
+            self._size = self.path.stat().st_size if self.path.exists() else 0
+        with open(self.path, "ab") as f:
+            f.write(data)
+        self._size += len(data)
+        self.written += len(batch)
+        self.writes += 1
+        if self._size >= self.segment_max_bytes:
+            self._rotate()
+
+    def _rotate(self) -> None:
+        stamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S%f")
+        self.path.rename(self.path.with_name(f"{self.path.stem}.{stamp}{self.path.suffix}"))
+        self._size = 0
+        self.rotations += 1
+        if self.keep_segments > 0:
+            for old in self.segments()[: -self.keep_segments]:
+                old.unlink(missing_ok=True)
+
+
 class TelemetryService:
     """Service for tracking and analyzing user interaction events"""
 
-    def __init__(self, log_file: str = "telemetry_events.jsonl"):
+    def __init__(
+        self,
+        log_file: str = "telemetry_events.jsonl",
+        max_events: int | None = None,
+        writer: TelemetrySegmentWriter | None = None,
+    ):
         """
         Initialize telemetry service
 
         Args:
             log_file: Path to JSONL file for event persistence
+            max_events: Events kept in memory (default: TELEMETRY_BUFFER_SIZE)
+            writer: Background file writer (default: writer for log_file)
         """
         self.log_file = Path(log_file)
-        self.events: list[dict[str, Any]] = []
+        self.max_events = max_events or settings.TELEMETRY_BUFFER_SIZE
+        self.writer = writer or TelemetrySegmentWriter(self.log_file)
+
+        self._lock = threading.Lock()
+        self._reset()
+        self.received = 0
+        self.evicted = 0
 
     def log_events(self, events: list[TelemetryEvent]) -> int:
         """
-        Store telemetry events in memory and persist to file
+        Store telemetry events in memory and queue them for persistence
 
         Args:
             events: List of telemetry events to log
@@ -83,25 +261,15 @@ class TelemetryService:
         Returns:
             Number of events successfully logged
         """
-        count = 0
-        for event in events:
-            event_dict = event.model_dump()
-            self.events.append(event_dict)
-            count += 1
-
-        # Persist to file for durability
-        try:
-            with open(self.log_file, "a") as f:
-                for event in events:
-                    f.write(json.dumps(event.model_dump()) + "\n")
-        except OSError as e:
-            logger.error(
-                "Failed to persist telemetry events to file",
-                error_type=type(e).__name__,
-                error_msg=str(e),
-            )
+        event_dicts = [event.model_dump() for event in events]
+        with self._lock:
+            for event_dict in event_dicts:
+                self._insert(event_dict)
+            self.received += len(event_dicts)
 
-        return count
+        # Persisted by the background writer for durability
+        self.writer.submit(event_dicts)
+        return len(event_dicts)
 
     def get_events(
         self,
@@ -122,85 +290,75 @@ class TelemetryService:
             user_role: Filter by user role
 
         Returns:
-            List of filtered events, sorted by timestamp (newest first)
+            List of filtered events, newest first
         """
-        filtered_events = self.events
-
-        # Apply filters
-        if user_id:
-            filtered_events = [e for e in filtered_events if e.get("userId") == user_id]
-        if component:
-            filtered_events = [
-                e for e in filtered_events if e.get("component") == component
-            ]
-        if action:
-            filtered_events = [e for e in filtered_events if e.get("action") == action]
-        if user_role:
-            filtered_events = [
-                e for e in filtered_events if e.get("userRole") == user_role
-            ]
-
-        # Sort by timestamp (newest first)
-        filtered_events.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-
-        return filtered_events[:limit]
+        filters = {
+            field: value
+            for field, value in zip(
+                INDEXED_FIELDS, (user_id, component, action, user_role), strict=True
+            )
+            if value
+        }
+        if limit <= 0:
+            return []
+
+        with self._lock:
+            if filters:
+                postings = [self._index[field].get(value) for field, value in filters.items()]
+                if any(seqs is None for seqs in postings):
+                    return []
+                candidates = reversed(min(postings, key=len))
+            else:
+                candidates = reversed(range(self._head, self._next_seq))
+
+            results = []
+            for seq in candidates:
+                event = self._events[seq]
+                if all(event.get(field) == value for field, value in filters.items()):
+                    results.append(event)
+                    if len(results) >= limit:
+                        break
+            return results
 
     def get_statistics(self) -> TelemetryStats:
         """
-        Calculate aggregate statistics from telemetry data
+        Aggregate statistics over the buffered events
 
         Returns:
             TelemetryStats object with aggregated metrics
         """
-        if not self.events:
-            return TelemetryStats(
-                total_events=0,
-                unique_users=0,
-                unique_sessions=0,
-                top_components=[],
-                top_actions=[],
-                users_by_role={},
-            )
-
-        # Calculate unique counts
-        unique_users = {e.get("userId") for e in self.events}
-        unique_sessions = {e.get("sessionId") for e in self.events}
-
-        # Count by component
-        component_counts: dict[str, int] = {}
-        for event in self.events:
-            comp = event.get("component", "Unknown")
-            component_counts[comp] = component_counts.get(comp, 0) + 1
-
-        # Count by action
-        action_counts: dict[str, int] = {}
-        for event in self.events:
-            action = event.get("action", "Unknown")
-            action_counts[action] = action_counts.get(action, 0) + 1
-
-        # Count by role
-        role_counts: dict[str, int] = {}
-        for event in self.events:
-            role = event.get("userRole", "unknown")
-            role_counts[role] = role_counts.get(role, 0) + 1
+        with self._lock:
+            counts = {
+                field: {value: len(seqs) for value, seqs in self._index[field].items()}
+                for field in ("component", "action", "userRole")
+            }
+            total_events = len(self._events)
+            unique_users = len(self._index["userId"])
+            unique_sessions = len(self._sessions)
 
         # Get top 10 for each category
-        top_components = sorted(
-            component_counts.items(), key=lambda x: x[1], reverse=True
-        )[:10]
-        top_actions = sorted(action_counts.items(), key=lambda x: x[1], reverse=True)[
-            :10
-        ]
+        top_components = Counter(counts["component"]).most_common(10)
+        top_actions = Counter(counts["action"]).most_common(10)
 
         return TelemetryStats(
-            total_events=len(self.events),
-            unique_users=len(unique_users),
-            unique_sessions=len(unique_sessions),
+            total_events=total_events,
+            unique_users=unique_users,
+            unique_sessions=unique_sessions,
             top_components=[{"component": c, "count": n} for c, n in top_components],
             top_actions=[{"action": a, "count": n} for a, n in top_actions],
-            users_by_role=role_counts,
+            users_by_role=counts["userRole"],
         )
 
+    def get_stats(self) -> dict[str, Any]:
+        """Buffer and writer counters"""
+        return {
+            "buffered": len(self._events),
+            "max_events": self.max_events,
+            "received": self.received,
+            "evicted": self.evicted,
+            "writer": self.writer.get_stats(),
+        }
+
     def clear_events(self) -> int:
         """
         Clear all telemetry events from memory
@@ -211,24 +369,70 @@ class TelemetryService:
         Note:
             This does NOT delete the persisted file, only the in-memory cache
         """
-        count = len(self.events)
-        self.events = []
+        with self._lock:
+            count = len(self._events)
+            self._reset()
         logger.info("Cleared telemetry events", count=count)
         return count
 
     def export_events(self) -> dict:
         """
-        Export all telemetry events as a dictionary
+        Export all buffered telemetry events as a dictionary
 
         Returns:
             Dictionary with events, export timestamp, and total count
         """
+        with self._lock:
+            events = list(self._events.values())
         return {
-            "events": self.events,
+            "events": events,
             "exported_at": datetime.now().isoformat(),
-            "total": len(self.events),
+            "total": len(events),
         }
 
+    def close(self) -> None:
+        """Flush queued events to disk and stop the writer"""
+        self.writer.close()
+
+    # ------------------------------------------------------------------ #
+    # Ring buffer
+    # ------------------------------------------------------------------ #
+
+    def _reset(self) -> None:
+        self._events: dict[int, dict[str, Any]] = {}
+        self._head = 0
+        self._next_seq = 0
+        self._index: dict[str, dict[str, deque[int]]] = {field: {} for field in INDEXED_FIELDS}
+        self._sessions: Counter = Counter()
+
+    def _insert(self, event: dict[str, Any]) -> None:
+        if len(self._events) >= self.max_events:
+            self._evict_oldest()
+
+        seq = self._next_seq
+        self._next_seq += 1
+        self._events[seq] = event
+        for field in INDEXED_FIELDS:
+            self._index[field].setdefault(event.get(field), deque()).append(seq)
+        self._sessions[event.get("sessionId")] += 1
+
+    def _evict_oldest(self) -> None:
+        # Sequence numbers are appended in order, so the globally oldest event
+        # is also at the head of each of its posting lists
+        event = self._events.pop(self._head)
+        self._head += 1
+        self.evicted += 1
+        for field in INDEXED_FIELDS:
+            postings = self._index[field]
+            value = event.get(field)
+            postings[value].popleft()
+            if not postings[value]:
+                del postings[value]
+        session = event.get("sessionId")
+        self._sessions[session] -= 1
+        if self._sessions[session] <= 0:
+            del self._sessions[session]
+
 
 # Singleton instance
 _telemetry_service: TelemetryService | None = None
@@ -240,3 +444,9 @@ def get_telemetry_service() -> TelemetryService:
     if _telemetry_service is None:
         _telemetry_service = TelemetryService()
     return _telemetry_service
+
+
+def close_telemetry_service() -> None:
+    """Flush pending telemetry to disk and stop the writer thread"""
+    if _telemetry_service is not None:
+        _telemetry_service.close()
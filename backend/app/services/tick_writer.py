@@ -0,0 +1,142 @@
+"""
+Coalesced Write-Behind for Stream Ticks
+
+Keeps the latest quote/trade/summary tick per symbol in memory and writes the
+changed entries to Redis in one pipelined batch every STREAM_CACHE_FLUSH_MS.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from ..core.config import settings
+from .cache import CacheService, get_cache, namespace_tag, symbol_tag
+
+
+logger = logging.getLogger(__name__)
+
+# Message type -> Redis key prefix (same keys the per-message writes used)
+KEY_PREFIXES = {
+    "quote": "quote",
+    "trade": "price",
+    "summary": "summary",
+}
+
+# Stream ticks are only useful while fresh
+TICK_TTL_SECONDS = 5
+
+# Longest pause between flush attempts while Redis writes keep failing
+MAX_FLUSH_BACKOFF_SECONDS = 5
+
+
+class TickWriteBehind:
+    """Latest-tick table with periodic batched flushes to Redis"""
+
+    def __init__(
+        self,
+        cache: CacheService | None = None,
+        flush_interval_ms: int | None = None,
+        ttl: int = TICK_TTL_SECONDS,
+    ):
+        self.cache = cache or get_cache()
+        self.flush_interval = (flush_interval_ms or settings.STREAM_CACHE_FLUSH_MS) / 1000
+        self.ttl = ttl
+
+        self._latest: dict[tuple[str, str], dict[str, Any]] = {}
+        self._dirty: set[tuple[str, str]] = set()
+        self._flush_task: asyncio.Task | None = None
+        self._failures = 0
+
+        # Counters
+        self.received = 0
+        self.coalesced = 0
+        self.flushed = 0
+        self.flushes = 0
+        self.flush_errors = 0
+
+    def record(self, msg_type: str, symbol: str, data: dict[str, Any]) -> None:
+        """Store the latest tick for (symbol, msg_type) and mark it for flushing"""
+        key = (symbol, msg_type)
+        self.received += 1
+        if key in self._dirty:
+            self.coalesced += 1
+        else:
+            self._dirty.add(key)
+        self._latest[key] = data
+
+    def get_latest(self, symbol: str, msg_type: str) -> dict[str, Any] | None:
+        return self._latest.get((symbol, msg_type))
+
+    async def flush(self) -> int:
+        """
+        Write all dirty entries to Redis in one pipelined batch
+
+        Entries stay pending while the cache is unavailable or the write fails,
+        so the next flush retries them with their latest values.
+
+        Returns:
+            Number of entries written
+        """
+        if not self._dirty or not self.cache.available:
+            return 0
+
+        dirty, self._dirty = self._dirty, set()
+        batch = {}
+        tags = {}
+        for symbol, msg_type in dirty:
+            prefix = KEY_PREFIXES[msg_type]
+            key = f"{prefix}:{symbol}"
+            batch[key] = self._latest[(symbol, msg_type)]
+            tags[key] = (namespace_tag(prefix), symbol_tag(symbol))
+
+        ok = await asyncio.to_thread(self.cache.set_many, batch, self.ttl, tags)
+        self.flushes += 1
+        if not ok:
+            self.flush_errors += 1
+            self._failures += 1
+            self._dirty |= dirty
+            return 0
+        self._failures = 0
+        self.flushed += len(batch)
+        return len(batch)
+
+    async def _flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_delay())
+            try:
+                await self.flush()
+            except Exception as e:
+                self.flush_errors += 1
+                logger.error(f"❌ Tick flush failed: {e}")
+
+    def _flush_delay(self) -> float:
+        """Flush interval, doubled per consecutive failed write (capped)"""
+        backoff = self.flush_interval * 2 ** min(self._failures, 10)
+        return min(backoff, max(self.flush_interval, MAX_FLUSH_BACKOFF_SECONDS))
+
+    def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_periodically())
+
+    async def stop(self) -> None:
+        """Stop the flusher and write out anything still pending"""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "received": self.received,
+            "coalesced": self.coalesced,
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "flush_errors": self.flush_errors,
+            "pending": len(self._dirty),
+            "consecutive_failures": self._failures,
+            "flush_interval_ms": int(self.flush_interval * 1000),
+        }
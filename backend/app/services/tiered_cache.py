@@ -0,0 +1,562 @@
+"""
+Two-Tier Cache - In-process L1 in front of Redis L2 with single-flight loads
+
+Serves hits from an in-process LRU, falls back to Redis, and coalesces
+concurrent misses into one loader call. L1 hands out the stored objects, so
+callers copy before modifying.
+"""
+
+import asyncio
+import fnmatch
+import inspect
+import logging
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, NamedTuple
+
+from ..core.config import settings
+from .cache import CacheService, get_cache, namespace_tag
+from .health_monitor import health_monitor
+
+
+logger = logging.getLogger(__name__)
+
+# An async function, or a plain callable that is run in a worker thread
+Loader = Callable[[], Awaitable[Any]] | Callable[[], Any]
+
+# Namespaces whose Redis keys other components also write as plain
+# "namespace:key" (tradier_stream / TickWriteBehind write quote:SYMBOL), so
+# they cannot be versioned by generation
+SHARED_NAMESPACES = frozenset({"quote"})
+
+
+@dataclass(slots=True)
+class _Entry:
+    value: Any
+    fresh_until: float
+    stale_until: float
+    tags: tuple[str, ...]
+
+
+class CacheLookup(NamedTuple):
+    value: Any
+    source: str  # "l1", "l2", "stale", "coalesced" or "loaded"
+
+    @property
+    def cached(self) -> bool:
+        return self.source != "loaded"
+
+
+class NamespaceStats:
+    """Counters for one key namespace"""
+
+    __slots__ = (
+        "coalesced",
+        "l1_hits",
+        "l2_hits",
+        "load_errors",
+        "load_ms_max",
+        "load_ms_total",
+        "loads",
+        "misses",
+        "stale_hits",
+    )
+
+    def __init__(self):
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def record_load(self, elapsed_ms: float) -> None:
+        self.loads += 1
+        self.load_ms_total += elapsed_ms
+        self.load_ms_max = max(self.load_ms_max, elapsed_ms)
+
+    def to_dict(self) -> dict[str, Any]:
+        hits = self.l1_hits + self.l2_hits + self.stale_hits + self.coalesced
+        lookups = hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(hits / lookups * 100, 2) if lookups else 0.0,
+            "loads": self.loads,
+            "load_errors": self.load_errors,
+            "avg_load_ms": round(self.load_ms_total / self.loads, 2) if self.loads else 0.0,
+            "max_load_ms": round(self.load_ms_max, 2),
+        }
+
+
+class TieredCache:
+    """Async L1 (in-process LRU + TTL) / L2 (Redis) cache with single-flight loaders"""
+
+    def __init__(
+        self,
+        l2: CacheService | None = None,
+        max_entries: int | None = None,
+        stale_ratio: float | None = None,
+        generation_sync_seconds: float | None = None,
+        shared_namespaces: Iterable[str] = SHARED_NAMESPACES,
+    ):
+        """
+        Args:
+            l2: Redis-backed cache (default: shared CacheService)
+            max_entries: L1 capacity (default: CACHE_L1_MAX_ENTRIES)
+            stale_ratio: Default stale window as a multiple of the TTL
+                (default: CACHE_STALE_RATIO)
+            generation_sync_seconds: How often namespace generations are
+                re-read from Redis (default: CACHE_GENERATION_SYNC_SECONDS)
+            shared_namespaces: Namespaces kept on unversioned Redis keys
+        """
+        self.l2 = l2 if l2 is not None else get_cache()
+        self.max_entries = max_entries or settings.CACHE_L1_MAX_ENTRIES
+        self.stale_ratio = stale_ratio if stale_ratio is not None else settings.CACHE_STALE_RATIO
+        self.generation_sync_seconds = (
+            generation_sync_seconds
+            if generation_sync_seconds is not None
+            else settings.CACHE_GENERATION_SYNC_SECONDS
+        )
+        self.shared_namespaces = frozenset(shared_namespaces)
+
+        self._l1: OrderedDict[str, _Entry] = OrderedDict()
+        self._tags: defaultdict[str, set[str]] = defaultdict(set)  # tag -> L1 keys
+        self._generations: dict[str, int] = {}
+        self._generations_synced = 0.0
+        self._sync_task: asyncio.Task | None = None
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._background: set[asyncio.Task] = set()
+        self._stats: defaultdict[str, NamespaceStats] = defaultdict(NamespaceStats)
+        self.evictions = 0
+        self.invalidations = 0
+        self.flushes = 0
+
+    async def fetch(
+        self,
+        namespace: str,
+        key: str,
+        loader: Loader,
+        ttl: float,
+        stale_ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> CacheLookup:
+        """
+        Cached value for namespace:key, loading it on a miss
+
+        Args:
+            namespace: Key namespace (also the stats bucket), e.g. "quote"
+            key: Key within the namespace, e.g. "AAPL"
+            loader: Produces the value on a miss
+            ttl: Seconds the value is fresh
+            stale_ttl: Seconds past ttl it may still be served while it is
+                refreshed (default: ttl * stale_ratio)
+            tags: Extra invalidation tags for the stored value (e.g.
+                symbol_tag("AAPL")); the namespace tag is always added
+
+        Returns:
+            CacheLookup with the value and where it came from
+        """
+        full_key = f"{namespace}:{key}"
+        stats = self._stats[namespace]
+        if stale_ttl is None:
+            stale_ttl = ttl * self.stale_ratio
+        tags = self._entry_tags(namespace, tags)
+        await self._generation(namespace)
+
+        entry = self._l1.get(full_key)
+        if entry is not None:
+            now = time.monotonic()
+            if now < entry.fresh_until:
+                self._l1.move_to_end(full_key)
+                stats.l1_hits += 1
+                health_monitor.record_cache_hit()
+                return CacheLookup(entry.value, "l1")
+            if now < entry.stale_until:
+                self._l1.move_to_end(full_key)
+                stats.stale_hits += 1
+                health_monitor.record_cache_hit()
+                if full_key not in self._inflight:
+                    self._start_load(
+                        namespace, key, loader, ttl, stale_ttl, tags, background=True
+                    )
+                return CacheLookup(entry.value, "stale")
+
+        task = self._inflight.get(full_key)
+        if task is not None:
+            stats.coalesced += 1
+            value, _ = await asyncio.shield(task)
+            return CacheLookup(value, "coalesced")
+
+        task = self._start_load(namespace, key, loader, ttl, stale_ttl, tags, background=False)
+        value, source = await asyncio.shield(task)
+        return CacheLookup(value, source)
+
+    async def get_or_load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Loader,
+        ttl: float,
+        stale_ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """Like fetch(), returning only the value"""
+        return (await self.fetch(namespace, key, loader, ttl, stale_ttl, tags)).value
+
+    async def get_many(
+        self,
+        namespace: str,
+        keys: list[str],
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Fresh values for many keys: L1 first, then one pipelined L2 round trip
+
+        Stale and missing keys are left out so the caller can load them in
+        one batch and store them with set_many(). tags maps key -> extra tags
+        for values copied from L2 into L1.
+        """
+        stats = self._stats[namespace]
+        generation = await self._generation(namespace)
+        now = time.monotonic()
+        found: dict[str, Any] = {}
+        remote: list[str] = []
+        for key in keys:
+            full_key = f"{namespace}:{key}"
+            entry = self._l1.get(full_key)
+            if entry is not None and now < entry.fresh_until:
+                self._l1.move_to_end(full_key)
+                stats.l1_hits += 1
+                found[key] = entry.value
+            else:
+                remote.append(key)
+
+        if remote and self.l2.available:
+            l2_keys = {self._l2_key(namespace, key, generation): key for key in remote}
+            replies = await asyncio.to_thread(self.l2.get_many_with_ttl, list(l2_keys))
+            for l2_key, (value, remaining) in replies.items():
+                key = l2_keys[l2_key]
+                stats.l2_hits += 1
+                found[key] = value
+                if remaining:
+                    self._store_l1(
+                        f"{namespace}:{key}",
+                        value,
+                        remaining,
+                        remaining * self.stale_ratio,
+                        self._entry_tags(namespace, (tags or {}).get(key, ())),
+                    )
+
+        stats.misses += len(keys) - len(found)
+        for _ in range(len(found)):
+            health_monitor.record_cache_hit()
+        for _ in range(len(keys) - len(found)):
+            health_monitor.record_cache_miss()
+        return found
+
+    async def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: float,
+        stale_ttl: float | None = None,
+        tags: Iterable[str] = (),
+    ) -> None:
+        """Store a value in both tiers"""
+        await self.set_many(namespace, {key: value}, ttl, stale_ttl, {key: tags})
+
+    async def set_many(
+        self,
+        namespace: str,
+        items: dict[str, Any],
+        ttl: float,
+        stale_ttl: float | None = None,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        """
+        Store many values with one TTL in both tiers (one pipelined L2 write)
+
+        tags maps key -> extra invalidation tags; the namespace tag is always added.
+        """
+        if stale_ttl is None:
+            stale_ttl = ttl * self.stale_ratio
+        generation = await self._generation(namespace)
+        l2_items: dict[str, Any] = {}
+        l2_tags: dict[str, tuple[str, ...]] = {}
+        for key, value in items.items():
+            key_tags = self._entry_tags(namespace, (tags or {}).get(key, ()))
+            self._store_l1(f"{namespace}:{key}", value, ttl, stale_ttl, key_tags)
+            l2_key = self._l2_key(namespace, key, generation)
+            l2_items[l2_key] = value
+            l2_tags[l2_key] = key_tags
+        if l2_items and self.l2.available:
+            await asyncio.to_thread(self.l2.set_many, l2_items, _l2_ttl(ttl), l2_tags)
+
+    def peek(self, namespace: str, key: str) -> Any | None:
+        """Any L1 value for the key, however old (for last-resort error fallbacks)"""
+        entry = self._l1.get(f"{namespace}:{key}")
+        return entry.value if entry is not None else None
+
+    async def delete(self, namespace: str, key: str) -> None:
+        """Remove a key from both tiers"""
+        self._drop(f"{namespace}:{key}")
+        if self.l2.available:
+            generation = await self._generation(namespace)
+            await asyncio.to_thread(self.l2.delete, self._l2_key(namespace, key, generation))
+
+    async def invalidate_tags(self, *tags: str) -> int:
+        """
+        Remove every value carrying any of the tags from both tiers
+
+        L1 uses the in-process tag index; Redis keys are unlinked from their
+        tag sets in bounded batches (CacheService.invalidate_tags).
+
+        Returns:
+            Entries removed from L1 plus keys removed from Redis
+        """
+        removed = 0
+        for tag in tags:
+            for full_key in list(self._tags.get(tag, ())):
+                self._drop(full_key)
+                removed += 1
+        if self.l2.available:
+            removed += await asyncio.to_thread(self.l2.invalidate_tags, tags)
+        self.invalidations += 1
+        return removed
+
+    async def flush_namespace(self, namespace: str) -> int:
+        """
+        Invalidate a whole namespace in every process
+
+        Versioned namespaces cost one INCR regardless of size. Shared
+        namespaces have their tagged Redis keys purged first, then the
+        generation is bumped so other workers drop their L1 entries too.
+
+        Returns:
+            Entries removed from this process's L1 plus Redis keys purged
+            (0 for versioned namespaces, whose old keys simply expire)
+        """
+        removed = 0
+        tag = namespace_tag(namespace)
+        if namespace in self.shared_namespaces and self.l2.available:
+            removed += await asyncio.to_thread(self.l2.invalidate_tags, [tag])
+
+        generation = None
+        if self.l2.available:
+            generation = await asyncio.to_thread(self.l2.bump_generation, namespace)
+        if generation is None:
+            generation = self._generations.get(namespace, 0) + 1
+        removed += len(self._tags.get(tag, ()))
+        self._apply_generation(namespace, generation, force_drop=True)
+        self.flushes += 1
+        return removed
+
+    async def clear_pattern(self, pattern: str) -> int:
+        """
+        Remove keys matching a glob pattern (e.g. "quote:*") from both tiers
+
+        Matches raw Redis keys with an incremental SCAN; prefer
+        invalidate_tags() or flush_namespace().
+
+        Returns:
+            Entries removed from L1 plus keys removed from Redis
+        """
+        matches = [key for key in self._l1 if fnmatch.fnmatchcase(key, pattern)]
+        for key in matches:
+            self._drop(key)
+        removed = len(matches)
+        if self.l2.available:
+            removed += await asyncio.to_thread(self.l2.clear_pattern, pattern)
+        return removed
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "l1_entries": len(self._l1),
+            "l1_max_entries": self.max_entries,
+            "l1_tags": len(self._tags),
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "flushes": self.flushes,
+            "inflight_loads": len(self._inflight),
+            "l2_available": bool(self.l2.available),
+            "generations": dict(sorted(self._generations.items())),
+            "namespaces": {name: stats.to_dict() for name, stats in sorted(self._stats.items())},
+        }
+
+    def _start_load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Loader,
+        ttl: float,
+        stale_ttl: float,
+        tags: tuple[str, ...],
+        background: bool,
+    ) -> asyncio.Task:
+        full_key = f"{namespace}:{key}"
+        generation = self._generations.get(namespace, 0)
+        # Background refreshes skip L2: the stale L1 entry is newer than Redis
+        task = asyncio.get_running_loop().create_task(
+            self._load(
+                namespace, key, loader, ttl, stale_ttl, tags, generation, check_l2=not background
+            )
+        )
+        self._inflight[full_key] = task
+        task.add_done_callback(lambda t: self._finish_load(full_key, t, background))
+        return task
+
+    def _finish_load(self, full_key: str, task: asyncio.Task, background: bool) -> None:
+        if self._inflight.get(full_key) is task:
+            del self._inflight[full_key]
+        exc = None if task.cancelled() else task.exception()
+        if exc is not None and background:
+            # No waiter sees a failed refresh; the stale value stays in L1
+            logger.warning(f"⚠️ Cache refresh failed for {full_key}: {exc}")
+
+    async def _load(
+        self,
+        namespace: str,
+        key: str,
+        loader: Loader,
+        ttl: float,
+        stale_ttl: float,
+        tags: tuple[str, ...],
+        generation: int,
+        check_l2: bool,
+    ) -> tuple[Any, str]:
+        stats = self._stats[namespace]
+        full_key = f"{namespace}:{key}"
+        l2_key = self._l2_key(namespace, key, generation)
+
+        if check_l2 and self.l2.available:
+            replies = await asyncio.to_thread(self.l2.get_many_with_ttl, [l2_key])
+            if l2_key in replies:
+                value, remaining = replies[l2_key]
+                stats.l2_hits += 1
+                health_monitor.record_cache_hit()
+                if self._generations.get(namespace, 0) == generation:
+                    self._store_l1(full_key, value, remaining or ttl, stale_ttl, tags)
+                return value, "l2"
+
+        if check_l2:
+            stats.misses += 1
+            health_monitor.record_cache_miss()
+
+        start = time.perf_counter()
+        try:
+            if _is_async(loader):
+                value = await loader()
+            else:
+                value = await asyncio.to_thread(loader)
+                if inspect.isawaitable(value):
+                    # e.g. a lambda wrapping an async call
+                    value = await value
+        except BaseException:
+            stats.load_errors += 1
+            raise
+        finally:
+            stats.record_load((time.perf_counter() - start) * 1000)
+
+        # A flush while the loader ran makes its result unsafe to keep
+        if value is not None and self._generations.get(namespace, 0) == generation:
+            self._store_l1(full_key, value, ttl, stale_ttl, tags)
+            if self.l2.available:
+                self._spawn(asyncio.to_thread(self.l2.set, l2_key, value, _l2_ttl(ttl), tags))
+        return value, "loaded"
+
+    def _store_l1(
+        self, full_key: str, value: Any, ttl: float, stale_ttl: float, tags: tuple[str, ...]
+    ) -> None:
+        self._drop(full_key)
+        fresh_until = time.monotonic() + ttl
+        self._l1[full_key] = _Entry(value, fresh_until, fresh_until + stale_ttl, tags)
+        for tag in tags:
+            self._tags[tag].add(full_key)
+        while len(self._l1) > self.max_entries:
+            evicted_key, evicted = self._l1.popitem(last=False)
+            self._untag(evicted_key, evicted.tags)
+            self.evictions += 1
+
+    def _drop(self, full_key: str) -> None:
+        entry = self._l1.pop(full_key, None)
+        if entry is not None:
+            self._untag(full_key, entry.tags)
+
+    def _untag(self, full_key: str, tags: tuple[str, ...]) -> None:
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(full_key)
+                if not keys:
+                    del self._tags[tag]
+
+    def _entry_tags(self, namespace: str, tags: Iterable[str]) -> tuple[str, ...]:
+        return tuple(dict.fromkeys((namespace_tag(namespace), *tags)))
+
+    def _l2_key(self, namespace: str, key: str, generation: int) -> str:
+        """Redis key for namespace:key under a generation (generation 0 is unversioned)"""
+        if generation and namespace not in self.shared_namespaces:
+            return f"{namespace}@{generation}:{key}"
+        return f"{namespace}:{key}"
+
+    async def _generation(self, namespace: str) -> int:
+        """Current generation of a namespace, re-synced from Redis when due"""
+        if self.l2.available:
+            if namespace not in self._generations:
+                # First use must not read keys of a generation already flushed
+                await self._sync_generations(namespace)
+            elif time.monotonic() - self._generations_synced >= self.generation_sync_seconds:
+                if self._sync_task is None or self._sync_task.done():
+                    self._sync_task = asyncio.get_running_loop().create_task(
+                        self._sync_generations()
+                    )
+        return self._generations.get(namespace, 0)
+
+    async def _sync_generations(self, namespace: str | None = None) -> None:
+        namespaces = set(self._generations)
+        if namespace is not None:
+            namespaces.add(namespace)
+        self._generations_synced = time.monotonic()
+        current = await asyncio.to_thread(self.l2.get_generations, sorted(namespaces))
+        for name in namespaces:
+            self._apply_generation(name, current.get(name, self._generations.get(name, 0)))
+
+    def _apply_generation(self, namespace: str, generation: int, force_drop: bool = False) -> None:
+        """Record a namespace generation, dropping its L1 entries if it moved"""
+        previous = self._generations.get(namespace)
+        if force_drop or (previous is not None and previous != generation):
+            for full_key in list(self._tags.get(namespace_tag(namespace), ())):
+                self._drop(full_key)
+        self._generations[namespace] = generation
+
+    def _spawn(self, coro: Awaitable[Any]) -> None:
+        """Fire-and-forget L2 write (kept referenced until done)"""
+        task = asyncio.ensure_future(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+
+def _is_async(loader: Loader) -> bool:
+    """Coroutine functions and objects whose __call__ is one"""
+    if inspect.iscoroutinefunction(loader):
+        return True
+    return callable(loader) and inspect.iscoroutinefunction(type(loader).__call__)
+
+
+def _l2_ttl(ttl: float) -> int:
+    """Redis SETEX takes whole seconds"""
+    return max(1, int(-(-ttl // 1)))
+
+
+_tiered_cache: TieredCache | None = None
+
+
+def get_tiered_cache() -> TieredCache:
+    """Get or create the shared two-tier cache (usable as a FastAPI dependency)"""
+    global _tiered_cache
+    if _tiered_cache is None:
+        _tiered_cache = TieredCache()
+    return _tiered_cache
@@ -1,15 +1,34 @@
 """
 Tradier API Client - Production Integration
 Handles: Account, Positions, Orders, Market Data, Options
+
+Two clients share configuration, circuit breaker and response parsing:
+- TradierClient: synchronous (requests.Session), for threads and scripts
+- AsyncTradierClient: native async (pooled httpx.AsyncClient, HTTP/2 when
+  the h2 package is installed) for use from async routes. Identical
+  in-flight GET requests are coalesced into a single upstream call.
 """
 
+import asyncio
+import copy
 import logging
 import os
 from datetime import UTC, datetime, timedelta
+from typing import Any
 
+import httpx
 import requests
 
 
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:
+    # HTTP/1.1 keep-alive pooling is used when h2 is not installed
+    HTTP2_AVAILABLE = False
+
+
 class ProviderHTTPError(Exception):
     """HTTP error from provider with status code and payload for mapping.
 
@@ -27,18 +46,13 @@ class ProviderHTTPError(Exception):
 logger = logging.getLogger(__name__)
 
 
-class TradierClient:
-    """Tradier API client for production trading"""
+class TradierClientBase:
+    """Configuration, circuit breaker and response parsing shared by both clients"""
 
     def __init__(self):
         self.api_key = os.getenv("TRADIER_API_KEY")
         self.account_id = os.getenv("TRADIER_ACCOUNT_ID")
         self.base_url = os.getenv("TRADIER_API_BASE_URL", "https://api.tradier.com/v1")
-        # Connection pooling
-        self.session = requests.Session()
-        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
 
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
@@ -51,8 +65,6 @@ class TradierClient:
                 "TRADIER_API_KEY and TRADIER_ACCOUNT_ID must be set in .env"
             )
 
-        logger.info(f"Tradier client initialized for account {self.account_id}")
-
     # Simple circuit breaker
     _state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
     _failures = 0
@@ -84,48 +96,9 @@ class TradierClient:
             self._state = "OPEN"
             logger.warning("[Tradier Circuit] OPEN (3 consecutive failures)")
 
-    def _request(self, method: str, endpoint: str, **kwargs) -> dict:
-        """Make authenticated request to Tradier API with compression and timeouts"""
-        url = f"{self.base_url}{endpoint}"
-
-        # Set default timeout if not provided
-        if "timeout" not in kwargs:
-            kwargs["timeout"] = 5  # Reduced from 10s to 5s for faster failures
-
-        try:
-            if not self._is_available():
-                raise Exception("Tradier temporarily unavailable (circuit open)")
+    # ==================== RESPONSE PARSING ====================
 
-            response = self.session.request(
-                method=method, url=url, headers=self.headers, **kwargs
-            )
-            try:
-                response.raise_for_status()
-            except requests.exceptions.HTTPError as e:
-                # Map to provider error with code/payload for upstream handling
-                self._record_failure()
-                logger.error(
-                    f"Tradier API error: {response.status_code} - {response.text}"
-                )
-                raise ProviderHTTPError(response.status_code, response.text) from e
-            data = response.json()
-            self._record_success()
-            return data
-
-        except Exception as e:
-            self._record_failure()
-            logger.error(f"Tradier request failed: {e!s}")
-            raise
-
-    # ==================== ACCOUNT ====================
-
-    def get_profile(self) -> dict:
-        """Get user profile"""
-        return self._request("GET", "/user/profile")
-
-    def get_account(self) -> dict:
-        """Get account balances"""
-        result = self._request("GET", f"/accounts/{self.account_id}/balances")
+    def _parse_account(self, result: dict) -> dict:
         if "balances" in result:
             balances = result["balances"]
             return {
@@ -140,10 +113,7 @@ class TradierClient:
             }
         return result
 
-    def get_positions(self) -> list[dict]:
-        """Get all positions"""
-        response = self._request("GET", f"/accounts/{self.account_id}/positions")
-
+    def _parse_positions(self, response: dict) -> list[dict]:
         if "positions" in response and response["positions"] != "null":
             positions = response["positions"].get("position", [])
 
@@ -174,12 +144,8 @@ class TradierClient:
             "change_today": pos.get("change"),
         }
 
-    # ==================== ORDERS ====================
-
-    def get_orders(self) -> list[dict]:
-        """Get all orders"""
-        response = self._request("GET", f"/accounts/{self.account_id}/orders")
-
+    @staticmethod
+    def _parse_orders(response: dict) -> list[dict]:
         if "orders" in response and response["orders"] != "null":
             orders = response["orders"].get("order", [])
             if isinstance(orders, dict):
@@ -188,6 +154,174 @@ class TradierClient:
 
         return []
 
+    @staticmethod
+    def _build_order(
+        symbol: str,
+        side: str,
+        quantity: int,
+        order_type: str,
+        duration: str,
+        price: float | None,
+        stop: float | None,
+    ) -> dict:
+        data = {
+            "class": "equity",
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "type": order_type,
+            "duration": duration,
+        }
+
+        if order_type in ["limit", "stop_limit"] and price:
+            data["price"] = price
+
+        if order_type in ["stop", "stop_limit"] and stop:
+            data["stop"] = stop
+
+        return data
+
+    @staticmethod
+    def _quotes_params(symbols: list[str]) -> dict:
+        return {"symbols": ",".join(symbols), "greeks": "false"}
+
+    @staticmethod
+    def _parse_single_quote(response: dict) -> dict:
+        if "quotes" in response and "quote" in response["quotes"]:
+            quotes = response["quotes"]["quote"]
+            return quotes if isinstance(quotes, dict) else quotes[0]
+        return {}
+
+    @staticmethod
+    def _parse_market_open(clock: dict) -> bool:
+        if "clock" in clock:
+            return clock["clock"].get("state") == "open"
+        return False
+
+    @staticmethod
+    def _history_params(
+        symbol: str, interval: str, start_date: str | None, end_date: str | None
+    ) -> dict:
+        params = {"symbol": symbol, "interval": interval}
+
+        if start_date:
+            params["start"] = start_date
+        if end_date:
+            params["end"] = end_date
+
+        return params
+
+    @staticmethod
+    def _parse_history(response: dict, symbol: str) -> list[dict]:
+        # Parse Tradier response
+        if "history" in response and response["history"] != "null":
+            bars = response["history"].get("day", [])
+
+            # Tradier returns single bar as dict, multiple as list
+            if isinstance(bars, dict):
+                bars = [bars]
+
+            # Convert to standard format
+            normalized_bars = []
+            for bar in bars:
+                try:
+                    normalized_bars.append(
+                        {
+                            "date": bar["date"],
+                            "open": float(bar["open"]),
+                            "high": float(bar["high"]),
+                            "low": float(bar["low"]),
+                            "close": float(bar["close"]),
+                            "volume": int(bar["volume"]),
+                        }
+                    )
+                except (KeyError, ValueError) as e:
+                    logger.warning(f"Skipping malformed bar: {bar} - {e}")
+                    continue
+
+            logger.info(f"Retrieved {len(normalized_bars)} bars for {symbol}")
+            return normalized_bars
+
+        logger.warning(f"No historical data available for {symbol}")
+        return []
+
+    @staticmethod
+    def _option_chain_params(symbol: str, expiration: str | None) -> dict:
+        params = {"symbol": symbol, "greeks": "true"}
+        if expiration:
+            params["expiration"] = expiration
+        return params
+
+
+class TradierClient(TradierClientBase):
+    """Tradier API client for production trading"""
+
+    def __init__(self):
+        super().__init__()
+        # Connection pooling
+        self.session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        logger.info(f"Tradier client initialized for account {self.account_id}")
+
+    def _request(self, method: str, endpoint: str, **kwargs) -> dict:
+        """Make authenticated request to Tradier API with compression and timeouts"""
+        url = f"{self.base_url}{endpoint}"
+
+        # Set default timeout if not provided
+        if "timeout" not in kwargs:
+            kwargs["timeout"] = 5  # Reduced from 10s to 5s for faster failures
+
+        try:
+            if not self._is_available():
+                raise Exception("Tradier temporarily unavailable (circuit open)")
+
+            response = self.session.request(
+                method=method, url=url, headers=self.headers, **kwargs
+            )
+            try:
+                response.raise_for_status()
+            except requests.exceptions.HTTPError as e:
+                # Map to provider error with code/payload for upstream handling
+                self._record_failure()
+                logger.error(
+                    f"Tradier API error: {response.status_code} - {response.text}"
+                )
+                raise ProviderHTTPError(response.status_code, response.text) from e
+            data = response.json()
+            self._record_success()
+            return data
+
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Tradier request failed: {e!s}")
+            raise
+
+    # ==================== ACCOUNT ====================
+
+    def get_profile(self) -> dict:
+        """Get user profile"""
+        return self._request("GET", "/user/profile")
+
+    def get_account(self) -> dict:
+        """Get account balances"""
+        result = self._request("GET", f"/accounts/{self.account_id}/balances")
+        return self._parse_account(result)
+
+    def get_positions(self) -> list[dict]:
+        """Get all positions"""
+        response = self._request("GET", f"/accounts/{self.account_id}/positions")
+        return self._parse_positions(response)
+
+    # ==================== ORDERS ====================
+
+    def get_orders(self) -> list[dict]:
+        """Get all orders"""
+        response = self._request("GET", f"/accounts/{self.account_id}/orders")
+        return self._parse_orders(response)
+
     def place_order(
         self,
         symbol: str,
@@ -210,20 +344,7 @@ class TradierClient:
             price: Limit price (for limit orders)
             stop: Stop price (for stop orders)
         """
-        data = {
-            "class": "equity",
-            "symbol": symbol,
-            "side": side,
-            "quantity": quantity,
-            "type": order_type,
-            "duration": duration,
-        }
-
-        if order_type in ["limit", "stop_limit"] and price:
-            data["price"] = price
-
-        if order_type in ["stop", "stop_limit"] and stop:
-            data["stop"] = stop
+        data = self._build_order(symbol, side, quantity, order_type, duration, price, stop)
 
         logger.info(f"Placing order: {data}")
         return self._request("POST", f"/accounts/{self.account_id}/orders", data=data)
@@ -236,16 +357,11 @@ class TradierClient:
 
     def get_quotes(self, symbols: list[str]) -> dict:
         """Get real-time quotes"""
-        params = {"symbols": ",".join(symbols), "greeks": "false"}
-        return self._request("GET", "/markets/quotes", params=params)
+        return self._request("GET", "/markets/quotes", params=self._quotes_params(symbols))
 
     def get_quote(self, symbol: str) -> dict:
         """Get single quote"""
-        response = self.get_quotes([symbol])
-        if "quotes" in response and "quote" in response["quotes"]:
-            quotes = response["quotes"]["quote"]
-            return quotes if isinstance(quotes, dict) else quotes[0]
-        return {}
+        return self._parse_single_quote(self.get_quotes([symbol]))
 
     def get_market_clock(self) -> dict:
         """Get market status"""
@@ -253,10 +369,7 @@ class TradierClient:
 
     def is_market_open(self) -> bool:
         """Check if market is open"""
-        clock = self.get_market_clock()
-        if "clock" in clock:
-            return clock["clock"].get("state") == "open"
-        return False
+        return self._parse_market_open(self.get_market_clock())
 
     def get_historical_bars(
         self,
@@ -290,55 +403,17 @@ class TradierClient:
                 ...
             ]
         """
-        params = {"symbol": symbol, "interval": interval}
-
-        if start_date:
-            params["start"] = start_date
-        if end_date:
-            params["end"] = end_date
+        params = self._history_params(symbol, interval, start_date, end_date)
 
         logger.info(f"Fetching historical bars for {symbol} ({interval})")
         response = self._request("GET", "/markets/history", params=params)
-
-        # Parse Tradier response
-        if "history" in response and response["history"] != "null":
-            bars = response["history"].get("day", [])
-
-            # Tradier returns single bar as dict, multiple as list
-            if isinstance(bars, dict):
-                bars = [bars]
-
-            # Convert to standard format
-            normalized_bars = []
-            for bar in bars:
-                try:
-                    normalized_bars.append(
-                        {
-                            "date": bar["date"],
-                            "open": float(bar["open"]),
-                            "high": float(bar["high"]),
-                            "low": float(bar["low"]),
-                            "close": float(bar["close"]),
-                            "volume": int(bar["volume"]),
-                        }
-                    )
-                except (KeyError, ValueError) as e:
-                    logger.warning(f"Skipping malformed bar: {bar} - {e}")
-                    continue
-
-            logger.info(f"Retrieved {len(normalized_bars)} bars for {symbol}")
-            return normalized_bars
-
-        logger.warning(f"No historical data available for {symbol}")
-        return []
+        return self._parse_history(response, symbol)
 
     # ==================== OPTIONS ====================
 
     def get_option_chains(self, symbol: str, expiration: str | None = None) -> dict:
         """Get option chains"""
-        params = {"symbol": symbol, "greeks": "true"}
-        if expiration:
-            params["expiration"] = expiration
+        params = self._option_chain_params(symbol, expiration)
         return self._request("GET", "/markets/options/chains", params=params)
 
     def get_option_expirations(self, symbol: str) -> dict:
@@ -347,6 +422,187 @@ class TradierClient:
         return self._request("GET", "/markets/options/expirations", params=params)
 
 
+class AsyncTradierClient(TradierClientBase):
+    """
+    Native async Tradier client
+
+    Same method surface as TradierClient, awaited instead of blocking the
+    event loop. Requests share one pooled httpx.AsyncClient (HTTP/2 when
+    available). Concurrent identical GETs (same endpoint and params) are
+    coalesced: the first caller issues the upstream request and later callers
+    await its result, e.g. 50 users loading the same option chain cost one call.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 32,
+        max_keepalive_connections: int = 16,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        super().__init__()
+        self.http2 = HTTP2_AVAILABLE and transport is None
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            http2=self.http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+            ),
+            timeout=5.0,  # Same default as the sync client
+            transport=transport,
+        )
+        self._inflight: dict[tuple, asyncio.Task] = {}
+
+        # Coalescing counters
+        self.upstream_requests = 0
+        self.coalesced_requests = 0
+
+        logger.info(f"Async Tradier client initialized for account {self.account_id}")
+
+    async def aclose(self) -> None:
+        await self.client.aclose()
+
+    async def _request(self, method: str, endpoint: str, **kwargs) -> dict:
+        """Make request, coalescing identical in-flight GETs"""
+        if method != "GET":
+            return await self._send(method, endpoint, **kwargs)
+
+        params = kwargs.get("params") or {}
+        key = (endpoint, tuple(sorted(params.items())))
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced_requests += 1
+            # Followers get their own copy so callers can't mutate each other's data
+            return copy.deepcopy(await asyncio.shield(inflight))
+
+        task = asyncio.get_running_loop().create_task(self._send(method, endpoint, **kwargs))
+        self._inflight[key] = task
+        task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shield so a cancelled leader doesn't cancel the call for its followers
+        return await asyncio.shield(task)
+
+    async def _send(self, method: str, endpoint: str, **kwargs) -> dict:
+        """Make authenticated request to Tradier API (mirrors TradierClient._request)"""
+        try:
+            if not self._is_available():
+                raise Exception("Tradier temporarily unavailable (circuit open)")
+
+            self.upstream_requests += 1
+            response = await self.client.request(method, endpoint, **kwargs)
+            if response.is_error:
+                # Map to provider error with code/payload for upstream handling
+                self._record_failure()
+                logger.error(f"Tradier API error: {response.status_code} - {response.text}")
+                raise ProviderHTTPError(response.status_code, response.text)
+            data = response.json()
+            self._record_success()
+            return data
+
+        except Exception as e:
+            self._record_failure()
+            logger.error(f"Tradier request failed: {e!s}")
+            raise
+
+    # ==================== ACCOUNT ====================
+
+    async def get_profile(self) -> dict:
+        """Get user profile"""
+        return await self._request("GET", "/user/profile")
+
+    async def get_account(self) -> dict:
+        """Get account balances"""
+        result = await self._request("GET", f"/accounts/{self.account_id}/balances")
+        return self._parse_account(result)
+
+    async def get_positions(self) -> list[dict]:
+        """Get all positions"""
+        response = await self._request("GET", f"/accounts/{self.account_id}/positions")
+        return self._parse_positions(response)
+
+    # ==================== ORDERS ====================
+
+    async def get_orders(self) -> list[dict]:
+        """Get all orders"""
+        response = await self._request("GET", f"/accounts/{self.account_id}/orders")
+        return self._parse_orders(response)
+
+    async def place_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: int,
+        order_type: str = "market",
+        duration: str = "day",
+        price: float | None = None,
+        stop: float | None = None,
+    ) -> dict:
+        """Place an order (see TradierClient.place_order)"""
+        data = self._build_order(symbol, side, quantity, order_type, duration, price, stop)
+
+        logger.info(f"Placing order: {data}")
+        return await self._request("POST", f"/accounts/{self.account_id}/orders", data=data)
+
+    async def cancel_order(self, order_id: str) -> dict:
+        """Cancel an order"""
+        return await self._request("DELETE", f"/accounts/{self.account_id}/orders/{order_id}")
+
+    # ==================== MARKET DATA ====================
+
+    async def get_quotes(self, symbols: list[str]) -> dict:
+        """Get real-time quotes"""
+        return await self._request("GET", "/markets/quotes", params=self._quotes_params(symbols))
+
+    async def get_quote(self, symbol: str) -> dict:
+        """Get single quote"""
+        return self._parse_single_quote(await self.get_quotes([symbol]))
+
+    async def get_market_clock(self) -> dict:
+        """Get market status"""
+        return await self._request("GET", "/markets/clock")
+
+    async def is_market_open(self) -> bool:
+        """Check if market is open"""
+        return self._parse_market_open(await self.get_market_clock())
+
+    async def get_historical_bars(
+        self,
+        symbol: str,
+        interval: str = "daily",
+        start_date: str | None = None,
+        end_date: str | None = None,
+    ) -> list[dict]:
+        """Get historical OHLCV data (see TradierClient.get_historical_bars)"""
+        params = self._history_params(symbol, interval, start_date, end_date)
+
+        logger.info(f"Fetching historical bars for {symbol} ({interval})")
+        response = await self._request("GET", "/markets/history", params=params)
+        return self._parse_history(response, symbol)
+
+    # ==================== OPTIONS ====================
+
+    async def get_option_chains(self, symbol: str, expiration: str | None = None) -> dict:
+        """Get option chains"""
+        params = self._option_chain_params(symbol, expiration)
+        return await self._request("GET", "/markets/options/chains", params=params)
+
+    async def get_option_expirations(self, symbol: str) -> dict:
+        """Get option expiration dates"""
+        return await self._request(
+            "GET", "/markets/options/expirations", params={"symbol": symbol}
+        )
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            "http2": self.http2,
+            "upstream_requests": self.upstream_requests,
+            "coalesced_requests": self.coalesced_requests,
+            "inflight": len(self._inflight),
+            "circuit_state": self._state,
+        }
+
+
 # Singleton instance
 _tradier_client = None
 _tradier_available = False
@@ -389,3 +645,34 @@ def get_tradier_client() -> TradierClient:
         raise Exception(f"Tradier client unavailable: {_tradier_unavailable_reason}")
 
     return _tradier_client
+
+
+_async_tradier_client: AsyncTradierClient | None = None
+
+
+def get_async_tradier_client() -> AsyncTradierClient:
+    """
+    Get singleton async Tradier client
+
+    Raises:
+        Exception: If Tradier credentials are not configured
+    """
+    global _async_tradier_client
+
+    if _async_tradier_client is None:
+        try:
+            _async_tradier_client = AsyncTradierClient()
+        except Exception as e:
+            logger.error(f"[FAIL] Async Tradier client initialization failed: {e}")
+            raise Exception(f"Tradier client unavailable: {e}") from e
+
+    return _async_tradier_client
+
+
+async def close_async_tradier_client() -> None:
+    """Close the pooled async client (call from main.py shutdown)"""
+    global _async_tradier_client
+
+    if _async_tradier_client is not None:
+        await _async_tradier_client.aclose()
+        _async_tradier_client = None
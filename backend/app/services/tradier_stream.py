@@ -12,7 +12,9 @@ IMPLEMENTATION:
 - Connects to WebSocket endpoint (wss://ws.tradier.com/v1/markets/events)
 - Manages symbol subscriptions dynamically
 - Auto-renews session every 4 minutes (expires at 5 minutes)
-- Caches latest quotes in Redis (5s TTL) for SSE distribution
+- Caches latest quotes in Redis (5s TTL) via a coalescing write-behind
+  (TickWriteBehind) so the WebSocket reader never blocks on Redis
+- Pushes quotes/trades to the in-process PriceHub for /stream/prices fan-out
 - Reconnects automatically on connection loss
 """
 
@@ -27,7 +29,9 @@ import httpx
 import websockets
 
 from app.core.config import settings
-from app.services.cache import get_cache
+from app.services.cache import get_cache, namespace_tag, symbol_tag
+from app.services.price_hub import get_price_hub
+from app.services.tick_writer import TickWriteBehind
 
 
 logger = logging.getLogger(__name__)
@@ -60,6 +64,8 @@ class TradierStreamService:
         self.reconnect_attempts = 0
         self.max_reconnect_attempts = 10
         self.cache = get_cache()  # CacheService with in-memory fallback
+        self.hub = get_price_hub()  # Push fan-out to SSE price subscribers
+        self.ticks = TickWriteBehind(self.cache)  # Batched Redis writes of latest ticks
 
         # Circuit breaker for "too many sessions" errors
         self.session_error_count = 0
@@ -462,8 +468,9 @@ class TradierStreamService:
                     "type": "quote",
                 }
 
-                # Cache in Redis (5s TTL)
-                self.cache.set(f"quote:{symbol}", quote_data, ttl=5)
+                # Cache in Redis (5s TTL, batched by the write-behind flusher)
+                self.ticks.record("quote", symbol, quote_data)
+                self.hub.publish("quote", quote_data)
 
             elif msg_type == "trade":
                 # Trade update (last price)
@@ -475,8 +482,9 @@ class TradierStreamService:
                     "type": "trade",
                 }
 
-                # Cache in Redis (5s TTL)
-                self.cache.set(f"price:{symbol}", trade_data, ttl=5)
+                # Cache in Redis (5s TTL, batched by the write-behind flusher)
+                self.ticks.record("trade", symbol, trade_data)
+                self.hub.publish("trade", trade_data)
 
             elif msg_type == "summary":
                 # Summary data (open, high, low, close, volume)
@@ -491,8 +499,8 @@ class TradierStreamService:
                     "type": "summary",
                 }
 
-                # Cache in Redis (5s TTL)
-                self.cache.set(f"summary:{symbol}", summary_data, ttl=5)
+                # Cache in Redis (5s TTL, batched by the write-behind flusher)
+                self.ticks.record("summary", symbol, summary_data)
 
         except json.JSONDecodeError:
             logger.warning(f"⚠️ Invalid JSON message: {message[:100]}")
@@ -549,7 +557,12 @@ class TradierStreamService:
                     }
 
                     # Use same TTL as quote endpoint (5s default)
-                    self.cache.set(f"quote:{symbol}", quote_entry, ttl=5)
+                    self.cache.set(
+                        f"quote:{symbol}",
+                        quote_entry,
+                        ttl=5,
+                        tags=(namespace_tag("quote"), symbol_tag(symbol)),
+                    )
                     warmed_count += 1
 
                 except Exception as e:
@@ -572,6 +585,12 @@ class TradierStreamService:
         # Warm cache with popular symbols on startup
         await self._warm_popular_quotes()
 
+        # Bridge hub ticks to other workers (no-op without Redis)
+        await self.hub.start_bridge()
+
+        # Start batched Redis writes of stream ticks
+        self.ticks.start()
+
         # Start WebSocket connection task
         self._connection_task = asyncio.create_task(self._connect_websocket())
 
@@ -607,6 +626,9 @@ class TradierStreamService:
             await self.websocket.close()
             self.websocket = None
 
+        await self.hub.stop_bridge()
+        await self.ticks.stop()
+
         # CRITICAL: Delete session on shutdown to free up API token
         if self.session_id:
             logger.info(f"🧹 Cleaning up session on shutdown: {self.session_id[:8]}...")
@@ -9,6 +9,7 @@ from typing import Any
 
 from sqlalchemy.orm import Session
 
+from ..core.auth_cache import get_principal_cache
 from ..core.logging_utils import format_user_for_logging, get_secure_logger
 from ..models.database import User
 
@@ -165,6 +166,9 @@ class UserManagementService:
         self.db.commit()
         self.db.refresh(user)
 
+        # In-place JSON edits may not emit an UPDATE, so invalidate explicitly
+        get_principal_cache().invalidate_user(user_id)
+
         logger.info(
             "Updated user preferences",
             user=format_user_for_logging(user),
@@ -0,0 +1,329 @@
+"""
+Vectorized Backtesting Engine
+
+Columnar counterpart to BacktestingEngine.execute_backtest. Every indicator
+referenced by the entry rules is precomputed once as a full NumPy array, the
+entry conditions are combined into a single boolean mask, and the equity /
+drawdown curves are built with array operations. Only the (rare) entry and
+exit events are walked in Python, so a multi-year daily backtest runs in
+roughly linear time instead of recomputing indicators over a growing price
+history on every bar.
+
+Results are bit-for-bit identical to the bar-by-bar loop: rolling sums are
+accumulated in the same order as Python's ``sum`` and every cash movement
+uses the same arithmetic as the loop engine.
+"""
+
+import logging
+from typing import Any
+
+import numpy as np
+
+from .backtesting_engine import BacktestingEngine, BacktestResult, StrategyRules, Trade
+
+
+logger = logging.getLogger(__name__)
+
+# Initial window used when scanning forward for an exit; doubled on each miss
+EXIT_SCAN_BLOCK = 64
+
+
+def rolling_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    Trailing sums of ``period`` values, one per full window
+
+    Accumulates the window columns left to right so each result matches
+    ``sum(values[i - period + 1 : i + 1])`` exactly (no pairwise summation).
+    """
+    windows = np.lib.stride_tricks.sliding_window_view(values, period)
+    total = windows[:, 0].copy()
+    for k in range(1, period):
+        total += windows[:, k]
+    return total
+
+
+def rsi_series(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """
+    RSI for every bar, matching BacktestingEngine.calculate_rsi
+
+    Bars without enough history (index < period) are NaN.
+    """
+    n = len(closes)
+    rsi = np.full(n, np.nan)
+    if n < period + 1:
+        return rsi
+
+    changes = np.diff(closes)
+    gains = np.where(changes > 0, changes, 0.0)
+    losses = np.where(changes < 0, -changes, 0.0)
+
+    avg_gain = rolling_sum(gains, period) / period
+    avg_loss = rolling_sum(losses, period) / period
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / avg_loss
+        values = 100 - (100 / (1 + rs))
+    rsi[period:] = np.where(avg_loss == 0, 100.0, values)
+    return rsi
+
+
+def sma_series(closes: np.ndarray, period: int) -> np.ndarray:
+    """Simple moving average for every bar (NaN until ``period`` bars exist)"""
+    n = len(closes)
+    sma = np.full(n, np.nan)
+    if period <= 0 or n < period:
+        return sma
+    sma[period - 1 :] = rolling_sum(closes, period) / period
+    return sma
+
+
+def build_entry_mask(
+    rules: list[dict[str, Any]], closes: np.ndarray, rsi_period: int = 14
+) -> np.ndarray:
+    """
+    Evaluate entry rules for every bar at once
+
+    Mirrors BacktestingEngine.check_entry_signal: all rules must hold, unknown
+    indicators/operators are ignored, and an empty rule list never enters.
+    """
+    n = len(closes)
+    if not rules:
+        return np.zeros(n, dtype=bool)
+
+    mask = np.ones(n, dtype=bool)
+    rsi: np.ndarray | None = None
+    sma_cache: dict[int, np.ndarray] = {}
+
+    for rule in rules:
+        indicator = rule.get("indicator", "").upper()
+        operator = rule.get("operator", "=")
+        value = rule.get("value", 0)
+
+        if indicator == "RSI":
+            if rsi is None:
+                rsi = rsi_series(closes, rsi_period)
+            mask &= ~np.isnan(rsi)
+            with np.errstate(invalid="ignore"):
+                if operator == "<":
+                    mask &= rsi < value
+                elif operator == ">":
+                    mask &= rsi > value
+                elif operator == "=":
+                    mask &= np.abs(rsi - value) < 1
+
+        elif indicator == "SMA":
+            period = rule.get("period", 20)
+            if period not in sma_cache:
+                sma_cache[period] = sma_series(closes, period)
+            sma = sma_cache[period]
+            mask &= ~np.isnan(sma)
+            with np.errstate(invalid="ignore"):
+                if operator == ">":
+                    mask &= closes > sma
+                elif operator == "<":
+                    mask &= closes < sma
+
+        elif indicator == "PRICE":
+            if operator == ">":
+                mask &= closes > value
+            elif operator == "<":
+                mask &= closes < value
+
+    return mask
+
+
+def find_exit_index(
+    closes: np.ndarray, entry_index: int, entry_price: float, exit_rules: list[dict[str, Any]]
+) -> int:
+    """
+    First bar after ``entry_index`` where any exit rule fires
+
+    Matches BacktestingEngine.check_exit_signal. Returns ``len(closes)`` when
+    the position is never stopped out. The forward scan works in doubling
+    blocks so short holding periods only touch a few bars.
+    """
+    n = len(closes)
+    thresholds = []
+    for rule in exit_rules:
+        rule_type = rule.get("type", "")
+        value = rule.get("value", 0)
+        if rule_type == "take_profit":
+            thresholds.append((True, value))
+        elif rule_type in ("stop_loss", "trailing_stop"):
+            thresholds.append((False, -value))
+
+    if not thresholds:
+        return n
+
+    start = entry_index + 1
+    block = EXIT_SCAN_BLOCK
+    while start < n:
+        stop = min(start + block, n)
+        pnl_percent = ((closes[start:stop] - entry_price) / entry_price) * 100
+        hit = np.zeros(stop - start, dtype=bool)
+        for is_upper, level in thresholds:
+            hit |= pnl_percent >= level if is_upper else pnl_percent <= level
+        if hit.any():
+            return start + int(np.argmax(hit))
+        start = stop
+        block *= 2
+    return n
+
+
+class VectorizedBacktestingEngine(BacktestingEngine):
+    """Columnar backtesting engine producing the same BacktestResult as the loop engine"""
+
+    def execute_backtest(
+        self,
+        symbol: str,
+        prices: list[dict[str, Any]],
+        strategy: StrategyRules,
+    ) -> BacktestResult:
+        """
+        Execute backtest on historical data using precomputed indicator arrays
+
+        Args:
+            symbol: Stock symbol
+            prices: List of OHLCV bars
+            strategy: Strategy rules
+
+        Returns:
+            BacktestResult with all metrics
+        """
+        if not prices or len(prices) < 20:
+            raise ValueError("Insufficient price data for backtesting")
+
+        self.capital = self.initial_capital
+        self.positions = []
+        self.closed_trades = []
+        self.equity_curve = []
+        self.peak_capital = self.initial_capital
+
+        dates = [bar["date"] for bar in prices]
+        close_list = [float(bar["close"]) for bar in prices]
+        closes = np.asarray(close_list, dtype=np.float64)
+        n = len(closes)
+
+        entry_mask = build_entry_mask(strategy.entry_rules, closes, strategy.rsi_period)
+        candidates = np.flatnonzero(entry_mask)
+
+        cash = np.empty(n)
+        open_value = np.zeros(n)
+        open_positions: list[tuple[Trade, int, int]] = []  # (trade, entry_index, exit_index)
+        held_positions: list[tuple[Trade, int, int]] = []  # every position, in entry order
+
+        cursor = 0
+        filled = 0
+        while True:
+            next_exit = min((exit_idx for _, _, exit_idx in open_positions), default=n)
+            next_entry = n
+            if len(open_positions) < strategy.max_positions:
+                k = int(np.searchsorted(candidates, cursor))
+                if k < len(candidates):
+                    next_entry = int(candidates[k])
+
+            i = min(next_exit, next_entry)
+            if i >= n:
+                break
+
+            cash[filled:i] = self.capital
+            filled = i
+            close_price = close_list[i]
+            date = dates[i]
+
+            # Exits first, in the same order as the loop engine's position list
+            for item in open_positions[:]:
+                position, _, exit_idx = item
+                if exit_idx != i:
+                    continue
+                position.exit_date = date
+                position.exit_price = close_price
+                position.pnl = (close_price - position.entry_price) * position.quantity
+                position.pnl_percent = (
+                    (close_price - position.entry_price) / position.entry_price
+                ) * 100
+                position.status = "closed"
+                self.capital += position.entry_price * position.quantity + position.pnl
+                self.closed_trades.append(position)
+                open_positions.remove(item)
+
+            if len(open_positions) < strategy.max_positions and entry_mask[i]:
+                position_capital = self.capital * (strategy.position_size_percent / 100)
+                quantity = int(position_capital / close_price)
+                exact_cost = quantity * close_price
+
+                if quantity > 0 and exact_cost <= self.capital:
+                    trade = Trade(
+                        entry_date=date,
+                        exit_date=None,
+                        entry_price=close_price,
+                        exit_price=None,
+                        quantity=quantity,
+                        side="long",
+                        status="open",
+                    )
+                    self.capital -= close_price * quantity
+                    exit_idx = find_exit_index(closes, i, close_price, strategy.exit_rules)
+                    open_positions.append((trade, i, exit_idx))
+                    held_positions.append((trade, i, exit_idx))
+
+            cursor = i + 1
+
+        cash[filled:] = self.capital
+
+        # Mark positions to market over the bars they were held. Summing in entry
+        # order reproduces the loop engine's per-bar ``sum`` over open positions.
+        for position, entry_idx, exit_idx in held_positions:
+            self._accumulate_open_value(open_value, closes, position, entry_idx, exit_idx)
+
+        equity = cash + open_value
+        peak = np.maximum.accumulate(np.concatenate(([self.initial_capital], equity)))[1:]
+        drawdown = peak - equity
+        with np.errstate(divide="ignore", invalid="ignore"):
+            drawdown_percent = np.where(peak > 0, (drawdown / peak) * 100, 0.0)
+        self.peak_capital = float(peak[-1])
+
+        self.equity_curve = [
+            {
+                "date": date,
+                "value": round(value, 2),
+                "drawdown": round(dd, 2),
+                "drawdown_percent": round(dd_pct, 2),
+            }
+            for date, value, dd, dd_pct in zip(
+                dates, equity.tolist(), drawdown.tolist(), drawdown_percent.tolist(), strict=True
+            )
+        ]
+
+        final_price = close_list[-1]
+        final_date = dates[-1]
+        for position, _, _ in open_positions:
+            position.exit_date = final_date
+            position.exit_price = final_price
+            position.pnl = (final_price - position.entry_price) * position.quantity
+            position.pnl_percent = (
+                (final_price - position.entry_price) / position.entry_price
+            ) * 100
+            position.status = "closed"
+            self.closed_trades.append(position)
+
+        self.positions = []
+
+        logger.debug(
+            f"Vectorized backtest {symbol}: {n} bars, {len(candidates)} entry signals, "
+            f"{len(self.closed_trades)} trades"
+        )
+
+        return self._calculate_metrics(symbol, prices[0]["date"], prices[-1]["date"])
+
+    @staticmethod
+    def _accumulate_open_value(
+        open_value: np.ndarray, closes: np.ndarray, position: Trade, entry_idx: int, exit_idx: int
+    ) -> None:
+        """Add a position's mark-to-market value for the bars it was held"""
+        if position.entry_price <= 0:
+            return
+        held = closes[entry_idx:exit_idx]
+        open_value[entry_idx:exit_idx] += (
+            held - position.entry_price
+        ) * position.quantity + position.entry_price * position.quantity
@@ -145,6 +145,19 @@ def client(test_db, mock_tradier_client, mock_cache, monkeypatch):
     monkeypatch.setattr("app.routers.stock.get_tradier_client", lambda: mock_tradier_client)
     monkeypatch.setattr("app.routers.ai.get_tradier_client", lambda: mock_tradier_client)
 
+    # Async hot paths share the same mock through an async view
+    async_tradier_client = AsyncMockTradierClient(mock_tradier_client)
+    monkeypatch.setattr(
+        "app.services.tradier_client.get_async_tradier_client", lambda: async_tradier_client
+    )
+    monkeypatch.setattr(
+        "app.routers.market_data.get_async_tradier_client", lambda: async_tradier_client
+    )
+    monkeypatch.setattr(
+        "app.routers.options.get_async_tradier_client", lambda: async_tradier_client
+    )
+    monkeypatch.setattr("app.routers.ai.get_async_tradier_client", lambda: async_tradier_client)
+
     # Import dependencies to override
     from app.services.cache import get_cache
 
@@ -222,13 +235,16 @@ class MockCacheService:
 
     def __init__(self):
         self.cache = {}
+        self.tags = {}
         self.available = True
 
     def get(self, key: str):
         return self.cache.get(key)
 
-    def set(self, key: str, value, ttl: int = 60):
+    def set(self, key: str, value, ttl: int = 60, tags=()):
         self.cache[key] = value
+        for tag in tags:
+            self.tags.setdefault(tag, set()).add(key)
         return True
 
     def delete(self, key: str):
@@ -241,6 +257,13 @@ class MockCacheService:
             del self.cache[key]
         return len(keys_to_delete)
 
+    def invalidate_tags(self, tags):
+        deleted = 0
+        for tag in tags:
+            for key in self.tags.pop(tag, ()):
+                deleted += self.cache.pop(key, None) is not None
+        return deleted
+
 
 @pytest.fixture(scope="function")
 def mock_cache():
@@ -476,6 +499,21 @@ class MockTradierClient:
         ]
 
 
+class AsyncMockTradierClient:
+    """Async view of MockTradierClient, standing in for AsyncTradierClient"""
+
+    def __init__(self, client):
+        self._client = client
+
+    def __getattr__(self, name):
+        method = getattr(self._client, name)
+
+        async def call(*args, **kwargs):
+            return method(*args, **kwargs)
+
+        return call
+
+
 class MockAlpacaClient:
     """
     Comprehensive mock for Alpaca API client with realistic responses.
@@ -570,6 +608,57 @@ class MockAnthropicClient:
         self.messages = self.Messages()
 
 
+@pytest.fixture(autouse=True)
+def isolated_bar_store(tmp_path, monkeypatch):
+    """Give each test its own on-disk bar store so fake provider data never leaks"""
+    from app.services import bar_store
+
+    store = bar_store.BarStore(root=tmp_path / "bars")
+    monkeypatch.setattr(bar_store, "_bar_store", store)
+    return store
+
+
+@pytest.fixture(autouse=True)
+def isolated_principal_cache(monkeypatch):
+    """Give each test an empty auth principal cache so cached users never leak"""
+    from app.core import auth_cache
+
+    cache = auth_cache.PrincipalCache()
+    monkeypatch.setattr(auth_cache, "_principal_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_tiered_cache(monkeypatch):
+    """Give each test an empty in-process cache tier so cached quotes never leak"""
+    from app.services import tiered_cache
+
+    cache = tiered_cache.TieredCache()
+    monkeypatch.setattr(tiered_cache, "_tiered_cache", cache)
+    return cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_scheduler_store(monkeypatch, tmp_path):
+    """Give each test its own scheduler database instead of data/scheduler"""
+    from app.services import scheduler_store
+
+    store = scheduler_store.SchedulerStore(tmp_path / "scheduler.db", retention_days=0)
+    monkeypatch.setattr(scheduler_store, "_scheduler_store", store)
+    yield store
+    store.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_sentiment_store(monkeypatch):
+    """Give each test an empty, in-process article sentiment store"""
+    from app.ml import sentiment_store
+
+    store = sentiment_store.SentimentStore(redis_factory=None)
+    monkeypatch.setattr(sentiment_store, "_sentiment_store", store)
+    return store
+
+
 @pytest.fixture
 def mock_tradier_client():
     """
@@ -0,0 +1,151 @@
+"""
+Tests for the authenticated principal cache
+Tests cache hits skipping the database, JWT jti keys, TTL/LRU bounds and
+invalidation on update, deactivation and logout
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+from sqlalchemy.orm import Session
+
+from app.core.auth_cache import PrincipalCache, _invalidate_on_write
+from app.core.unified_auth import get_current_user_unified
+from app.models.database import User
+
+
+def make_user(user_id=7, is_active=True):
+    return User(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        password_hash="",
+        full_name="Test User",
+        role="personal_only",
+        is_active=is_active,
+        preferences={"watchlist": ["AAPL"]},
+    )
+
+
+def make_db(user):
+    """Mock session whose query(User).filter(...).first() returns user"""
+    db = Mock(spec=Session)
+    db.query.return_value.filter.return_value.first.return_value = user
+    return db
+
+
+@pytest.fixture
+def jwt_payload():
+    return {"type": "access", "sub": 7, "jti": "token-1", "exp": time.time() + 900}
+
+
+class TestPrincipalCache:
+    """TTL, LRU and snapshot behaviour"""
+
+    def test_hit_returns_independent_copy(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=8)
+        cache.put(("user", 7), make_user())
+
+        first = cache.get(("user", 7))
+        first.preferences["watchlist"].append("MSFT")
+        second = cache.get(("user", 7))
+
+        assert second is not first
+        assert second.email == "user7@example.com"
+        assert second.preferences == {"watchlist": ["AAPL"]}
+        assert cache.get_stats()["hits"] == 2
+
+    def test_entries_expire_after_ttl(self):
+        cache = PrincipalCache(ttl_seconds=0.05, max_entries=8)
+        cache.put(("user", 7), make_user())
+        assert cache.get(("user", 7)) is not None
+
+        time.sleep(0.06)
+        assert cache.get(("user", 7)) is None
+        assert cache.get_stats()["entries"] == 0
+
+    def test_entry_never_outlives_token(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=8)
+        cache.put(("jti", "expired"), make_user(), expires_at=time.time() - 1)
+        assert cache.get(("jti", "expired")) is None
+
+    def test_lru_eviction(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=2)
+        cache.put(("user", 1), make_user(1))
+        cache.put(("user", 2), make_user(2))
+        cache.get(("user", 1))
+        cache.put(("user", 3), make_user(3))
+
+        assert cache.get(("user", 2)) is None
+        assert cache.get(("user", 1)) is not None
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_inactive_users_are_not_cached(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=8)
+        cache.put(("user", 7), make_user(is_active=False))
+        assert cache.get(("user", 7)) is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PrincipalCache(ttl_seconds=0, max_entries=8)
+        cache.put(("user", 7), make_user())
+        assert cache.get(("user", 7)) is None
+        assert cache.get_stats()["misses"] == 0
+
+    def test_invalidate_user_drops_all_tokens(self):
+        cache = PrincipalCache(ttl_seconds=60, max_entries=8)
+        cache.put(("jti", "a"), make_user(7))
+        cache.put(("jti", "b"), make_user(7))
+        cache.put(("jti", "c"), make_user(8))
+
+        assert cache.invalidate_user(7) == 2
+        assert cache.get(("jti", "a")) is None
+        assert cache.get(("jti", "c")) is not None
+        assert cache.get_stats()["invalidations"] == 2
+
+    def test_user_write_event_invalidates(self, isolated_principal_cache):
+        isolated_principal_cache.put(("jti", "a"), make_user(7))
+        _invalidate_on_write(None, None, make_user(7))
+        assert isolated_principal_cache.get(("jti", "a")) is None
+
+
+class TestUnifiedAuthCaching:
+    """get_current_user_unified skips the database on warm requests"""
+
+    def test_api_token_user_loaded_once(self, isolated_principal_cache):
+        db = make_db(make_user(1))
+        with patch("app.core.unified_auth.settings") as mock_settings:
+            mock_settings.API_TOKEN = "test-token-12345"
+            for _ in range(5):
+                user = get_current_user_unified(db=db, authorization="Bearer test-token-12345")
+                assert user.id == 1
+
+        assert db.query.call_count == 1
+        assert isolated_principal_cache.get_stats()["hits"] == 4
+
+    def test_jwt_user_cached_by_jti(self, isolated_principal_cache, jwt_payload):
+        db = make_db(make_user())
+        with patch("app.core.unified_auth.decode_token", return_value=jwt_payload):
+            for _ in range(3):
+                user = get_current_user_unified(db=db, authorization="Bearer some.jwt.token")
+                assert user.email == "user7@example.com"
+
+            # A new token for the same user is looked up once more
+            jwt_payload["jti"] = "token-2"
+            get_current_user_unified(db=db, authorization="Bearer other.jwt.token")
+
+        assert db.query.call_count == 2
+
+    def test_deactivated_user_rejected_after_invalidation(
+        self, isolated_principal_cache, jwt_payload
+    ):
+        user = make_user()
+        db = make_db(user)
+        with patch("app.core.unified_auth.decode_token", return_value=jwt_payload):
+            get_current_user_unified(db=db, authorization="Bearer some.jwt.token")
+
+            user.is_active = False
+            _invalidate_on_write(None, None, user)
+
+            with pytest.raises(Exception) as exc:
+                get_current_user_unified(db=db, authorization="Bearer some.jwt.token")
+        assert exc.value.status_code == 403
@@ -0,0 +1,137 @@
+"""
+Parity tests for the vectorized backtesting engine
+Pins VectorizedBacktestingEngine against the bar-by-bar BacktestingEngine loop
+"""
+
+from dataclasses import asdict
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.backtesting_engine import BacktestingEngine, StrategyRules
+from app.services.vectorized_backtest import (
+    VectorizedBacktestingEngine,
+    build_entry_mask,
+    rsi_series,
+    sma_series,
+)
+
+
+def make_bars(n: int, seed: int = 7, start_price: float = 100.0, vol: float = 0.02):
+    """Generate a random-walk OHLCV series"""
+    rng = np.random.default_rng(seed)
+    closes = start_price * np.exp(np.cumsum(rng.normal(0, vol, n)))
+    start = date(2019, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "open": float(c),
+            "high": float(c) * 1.01,
+            "low": float(c) * 0.99,
+            "close": round(float(c), 2),
+            "volume": 1_000_000,
+        }
+        for i, c in enumerate(closes)
+    ]
+
+
+STRATEGIES = {
+    "rsi_oversold": StrategyRules(
+        entry_rules=[{"indicator": "RSI", "operator": "<", "value": 30}],
+        exit_rules=[{"type": "take_profit", "value": 5}, {"type": "stop_loss", "value": 2}],
+    ),
+    "rsi_overbought": StrategyRules(
+        entry_rules=[{"indicator": "RSI", "operator": ">", "value": 70}],
+        exit_rules=[{"type": "take_profit", "value": 3}, {"type": "trailing_stop", "value": 3}],
+        position_size_percent=25,
+    ),
+    "rsi_equals": StrategyRules(
+        entry_rules=[{"indicator": "RSI", "operator": "=", "value": 50}],
+        exit_rules=[{"type": "take_profit", "value": 2}],
+        rsi_period=9,
+    ),
+    "sma_cross": StrategyRules(
+        entry_rules=[{"indicator": "SMA", "operator": ">", "period": 20}],
+        exit_rules=[{"type": "take_profit", "value": 10}, {"type": "stop_loss", "value": 5}],
+        position_size_percent=15,
+    ),
+    "combined_multi_position": StrategyRules(
+        entry_rules=[
+            {"indicator": "SMA", "operator": "<", "period": 50},
+            {"indicator": "RSI", "operator": "<", "value": 45},
+            {"indicator": "PRICE", "operator": ">", "value": 50},
+        ],
+        exit_rules=[{"type": "take_profit", "value": 4}, {"type": "stop_loss", "value": 3}],
+        position_size_percent=20,
+        max_positions=3,
+    ),
+    "no_exit_rules": StrategyRules(
+        entry_rules=[{"indicator": "PRICE", "operator": ">", "value": 0}],
+        exit_rules=[],
+        max_positions=2,
+    ),
+    "no_entry_rules": StrategyRules(entry_rules=[], exit_rules=[{"type": "stop_loss", "value": 1}]),
+}
+
+
+@pytest.mark.parametrize("name", sorted(STRATEGIES))
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_vectorized_matches_loop(name, seed):
+    """Vectorized engine returns an identical BacktestResult"""
+    bars = make_bars(750, seed=seed)
+    strategy = STRATEGIES[name]
+
+    expected = BacktestingEngine(initial_capital=25000).execute_backtest("TEST", bars, strategy)
+    actual = VectorizedBacktestingEngine(initial_capital=25000).execute_backtest(
+        "TEST", bars, strategy
+    )
+
+    assert asdict(actual) == asdict(expected)
+
+
+def test_vectorized_matches_loop_on_flat_prices():
+    """Flat prices (zero RSI losses, price == SMA) behave the same"""
+    bars = make_bars(60, vol=0.0)
+    for strategy in STRATEGIES.values():
+        expected = BacktestingEngine().execute_backtest("FLAT", bars, strategy)
+        actual = VectorizedBacktestingEngine().execute_backtest("FLAT", bars, strategy)
+        assert asdict(actual) == asdict(expected)
+
+
+def test_indicator_arrays_match_scalar_helpers():
+    """Precomputed RSI/SMA arrays equal the engine's per-bar helpers"""
+    closes = [bar["close"] for bar in make_bars(120)]
+    rsi = rsi_series(np.asarray(closes), 14)
+    sma = sma_series(np.asarray(closes), 20)
+
+    for i in range(len(closes)):
+        history = closes[: i + 1]
+        if i < 14:
+            assert np.isnan(rsi[i])
+        else:
+            assert rsi[i] == BacktestingEngine.calculate_rsi(history, 14)
+        expected_sma = BacktestingEngine.calculate_sma(history, 20)
+        if expected_sma is None:
+            assert np.isnan(sma[i])
+        else:
+            assert sma[i] == expected_sma
+
+
+def test_entry_mask_matches_check_entry_signal():
+    """Entry mask agrees with check_entry_signal bar by bar"""
+    closes = [bar["close"] for bar in make_bars(200, seed=3)]
+    rules = STRATEGIES["combined_multi_position"].entry_rules
+    mask = build_entry_mask(rules, np.asarray(closes), 14)
+    engine = BacktestingEngine()
+
+    for i in range(len(closes)):
+        assert bool(mask[i]) == engine.check_entry_signal(rules, closes[: i + 1], closes[i])
+
+
+def test_vectorized_rejects_insufficient_data():
+    """Fewer than 20 bars raises ValueError like the loop engine"""
+    with pytest.raises(ValueError, match="Insufficient price data"):
+        VectorizedBacktestingEngine().execute_backtest(
+            "TEST", make_bars(10), STRATEGIES["rsi_oversold"]
+        )
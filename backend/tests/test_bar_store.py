@@ -0,0 +1,218 @@
+"""
+Tests for the columnar OHLCV bar store
+Tests gap-only fetching, zero-copy sub-ranges, persistence, LRU eviction and
+the get_historical_bars drop-in used by the routers and services
+"""
+
+import threading
+import time
+from datetime import UTC, date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.bar_store import BarStore, get_historical_bars
+
+
+class FakeHistoryClient:
+    """Tradier-like client returning one bar per weekday, recording each range asked for"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.calls = []
+        self._lock = threading.Lock()
+
+    def get_historical_bars(self, symbol, interval="daily", start_date=None, end_date=None):
+        with self._lock:
+            self.calls.append((symbol, interval, start_date, end_date))
+        time.sleep(self.latency)
+        days = np.arange(
+            np.datetime64(start_date, "D"), np.datetime64(end_date, "D") + 1, dtype="datetime64[D]"
+        )
+        days = days[np.is_busday(days)]
+        ordinal = days.astype(np.int64).astype(float)
+        return [
+            {
+                "date": str(d),
+                "open": o,
+                "high": o + 1,
+                "low": o - 1,
+                "close": o + 0.5,
+                "volume": int(o) * 10,
+            }
+            for d, o in zip(days, ordinal, strict=True)
+        ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(root=tmp_path, max_series=4)
+
+
+class TestGapFilling:
+    """Only uncovered date ranges reach the provider"""
+
+    def test_fetches_only_missing_gaps(self, store):
+        client = FakeHistoryClient()
+        first = store.get_series(client, "aapl", "daily", "2024-03-01", "2024-03-31")
+        assert client.calls == [("AAPL", "daily", "2024-03-01", "2024-03-31")]
+        assert len(first) == 21
+
+        # Overlapping wider range: only the head and tail gaps are fetched
+        wider = store.get_series(client, "AAPL", "daily", "2024-02-15", "2024-04-10")
+        assert client.calls[1:] == [
+            ("AAPL", "daily", "2024-02-15", "2024-02-29"),
+            ("AAPL", "daily", "2024-04-01", "2024-04-10"),
+        ]
+        assert np.all(np.diff(wider.date.astype(np.int64)) > 0)
+        assert wider.date[0] == np.datetime64("2024-02-15")
+
+        # Any sub-range is now served without the provider
+        inner = store.get_series(client, "AAPL", "daily", "2024-03-02", "2024-03-03")
+        assert len(client.calls) == 3
+        assert len(inner) == 0  # weekend: covered, no bars
+        assert store.get_stats()["full_hits"] == 1
+
+    def test_today_is_never_marked_covered(self, store):
+        client = FakeHistoryClient()
+        today = datetime.now(UTC).date()
+        start = today - timedelta(days=10)
+        store.get_series(client, "SPY", "daily", start, today + timedelta(days=5))
+        assert client.calls[0][3] == today.isoformat()
+
+        store.get_series(client, "SPY", "daily", start, today)
+        assert client.calls[1][2:] == (today.isoformat(), today.isoformat())
+
+    def test_refetched_dates_replace_stored_bars(self, store):
+        client = FakeHistoryClient()
+        store.get_series(client, "SPY", "daily", "2024-01-01", "2024-01-05")
+
+        class RevisedClient(FakeHistoryClient):
+            def get_historical_bars(self, **kwargs):
+                return [{"date": "2024-01-08", "open": 1, "high": 2, "low": 0.5, "close": 1.5,
+                         "volume": 7}]
+
+        series = store.get_series(RevisedClient(), "SPY", "daily", "2024-01-04", "2024-01-08")
+        assert series.date.tolist() == [
+            date(2024, 1, 4), date(2024, 1, 5), date(2024, 1, 8)
+        ]
+        assert series.volume[-1] == 7
+
+    def test_concurrent_requests_share_one_fetch(self, store):
+        client = FakeHistoryClient(latency=0.05)
+        threads = [
+            threading.Thread(
+                target=store.get_series, args=(client, "MSFT", "daily", "2024-01-01", "2024-06-30")
+            )
+            for _ in range(8)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(client.calls) == 1
+
+
+class TestColumnarStorage:
+    """Memory-mapped columns, zero-copy slices and persistence"""
+
+    def test_sub_ranges_are_views_of_the_mapped_columns(self, store):
+        client = FakeHistoryClient()
+        full = store.get_series(client, "AAPL", "daily", "2024-01-01", "2024-12-31")
+        part = store.get_series(client, "AAPL", "daily", "2024-06-01", "2024-06-30")
+
+        assert isinstance(full.close.base, np.memmap) or isinstance(full.close, np.memmap)
+        assert np.shares_memory(part.close, full.close)
+        assert not part.close.flags.writeable
+
+    def test_persists_across_store_instances(self, tmp_path):
+        client = FakeHistoryClient()
+        BarStore(root=tmp_path).get_series(client, "QQQ", "daily", "2024-01-01", "2024-03-31")
+
+        reopened = BarStore(root=tmp_path)
+        series = reopened.get_series(client, "QQQ", "daily", "2024-02-01", "2024-02-29")
+        assert len(client.calls) == 1
+        assert len(series) == 21
+
+        # Only the current column version is left on disk
+        files = sorted(p.name for p in (tmp_path / "daily" / "QQQ").iterdir())
+        assert len([name for name in files if name.endswith(".npy")]) == 6
+        assert "meta.json" in files
+
+    def test_concurrent_writers_merge_and_leave_one_version(self, tmp_path):
+        client = FakeHistoryClient()
+        worker_a = BarStore(root=tmp_path)
+        worker_b = BarStore(root=tmp_path)
+
+        # Both workers load the series before either writes it
+        worker_a.get_series(client, "IWM", "daily", "2023-12-01", "2023-12-31")
+        worker_b.get_series(client, "IWM", "daily", "2023-12-01", "2023-12-31")
+        worker_a.get_series(client, "IWM", "daily", "2024-01-01", "2024-01-31")
+        worker_b.get_series(client, "IWM", "daily", "2024-03-01", "2024-03-31")
+
+        files = [p.name for p in (tmp_path / "daily" / "IWM").glob("*.npy")]
+        assert len(files) == 6
+
+        calls = len(client.calls)
+        reopened = BarStore(root=tmp_path)
+        assert len(reopened.get_series(client, "IWM", "daily", "2024-01-01", "2024-01-31")) == 23
+        assert len(reopened.get_series(client, "IWM", "daily", "2024-03-01", "2024-03-31")) == 21
+        assert len(client.calls) == calls
+
+    def test_lru_eviction_and_invalidate(self, store, tmp_path):
+        client = FakeHistoryClient()
+        for symbol in ["A", "B", "C", "D", "E"]:
+            store.get_series(client, symbol, "daily", "2024-01-01", "2024-01-31")
+        stats = store.get_stats()
+        assert stats["series_in_memory"] == 4
+        assert stats["evictions"] == 1
+
+        # Evicted series reloads from disk without refetching
+        store.get_series(client, "A", "daily", "2024-01-10", "2024-01-20")
+        assert len(client.calls) == 5
+
+        assert store.invalidate("a") == 1
+        assert not (tmp_path / "daily" / "A").exists()
+        store.get_series(client, "A", "daily", "2024-01-10", "2024-01-20")
+        assert len(client.calls) == 6
+
+    def test_records_and_frame_match_provider_format(self, store):
+        client = FakeHistoryClient()
+        series = store.get_series(client, "AAPL", "daily", "2024-01-01", "2024-01-10")
+
+        expected = client.get_historical_bars("AAPL", "daily", "2024-01-01", "2024-01-10")
+        assert series.to_records() == expected
+
+        frame = series.to_frame()
+        assert list(frame.columns) == ["open", "high", "low", "close", "volume"]
+        assert str(frame.index[0].date()) == "2024-01-01"
+
+
+class TestDropIn:
+    """get_historical_bars routes stored intervals through the shared store"""
+
+    def test_daily_uses_store_and_other_intervals_pass_through(self, isolated_bar_store):
+        client = FakeHistoryClient()
+        first = get_historical_bars(client, "AAPL", "daily", "2024-01-01", "2024-02-29")
+        second = get_historical_bars(client, "AAPL", "daily", "2024-01-15", "2024-01-31")
+        assert len(client.calls) == 1
+        assert second == [bar for bar in first if "2024-01-15" <= bar["date"] <= "2024-01-31"]
+        assert isolated_bar_store.get_stats()["full_hits"] == 1
+
+        get_historical_bars(client, "AAPL", "weekly", "2024-01-01", "2024-02-29")
+        assert client.calls[-1] == ("AAPL", "weekly", "2024-01-01", "2024-02-29")
+
+    def test_bars_without_dates_pass_through_uncached(self, isolated_bar_store):
+        class DatelessClient(FakeHistoryClient):
+            def get_historical_bars(self, **kwargs):
+                self.calls.append(tuple(kwargs.values()))
+                return [{"close": 170.0, "high": 172.0, "low": 168.0} for _ in range(3)]
+
+        client = DatelessClient()
+        bars = get_historical_bars(client, "AAPL", "daily", "2024-01-01", "2024-02-29")
+        assert bars == [{"close": 170.0, "high": 172.0, "low": 168.0}] * 3
+        assert isolated_bar_store.get_stats()["series_in_memory"] == 1
+
+        # Nothing was marked covered, so the next request asks the provider again
+        get_historical_bars(client, "AAPL", "daily", "2024-01-01", "2024-02-29")
+        assert isolated_bar_store.get_stats()["full_hits"] == 0
@@ -0,0 +1,158 @@
+"""
+Tests for tag-set and generation-counter invalidation in CacheService
+Tests that writes register tags, invalidation unlinks in bounded batches and
+no code path issues a Redis KEYS command
+"""
+
+import fnmatch
+
+import pytest
+
+from app.services.cache import CacheService
+
+
+class FakePipeline:
+    """Queues commands and runs them on the client at execute()"""
+
+    def __init__(self, client):
+        self.client = client
+        self.queued = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.queued.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self):
+        self.client.round_trips += 1
+        return [getattr(self.client, name)(*a, **kw) for name, a, kw in self.queued]
+
+
+class FakeRedisClient:
+    """Strings, sets and counters in memory; records UNLINK batch sizes"""
+
+    def __init__(self):
+        self.data = {}
+        self.sets = {}
+        self.expiries = {}
+        self.unlinks = []
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+        self.expiries[key] = ttl
+        return True
+
+    def sadd(self, key, *members):
+        self.sets.setdefault(key, set()).update(members)
+        return len(members)
+
+    def expire(self, key, ttl, nx=False, gt=False):
+        current = self.expiries.get(key)
+        if nx and current is not None:
+            return False
+        if gt and (current is None or ttl <= current):
+            return False
+        self.expiries[key] = ttl
+        return True
+
+    def sscan_iter(self, key, count=10):
+        yield from sorted(self.sets.get(key, ()))
+
+    def scan_iter(self, match=None, count=10):
+        yield from [k for k in sorted(self.data) if fnmatch.fnmatchcase(k, match)]
+
+    def unlink(self, *keys):
+        self.round_trips += 1
+        self.unlinks.append(len(keys))
+        removed = 0
+        for key in keys:
+            removed += self.data.pop(key, None) is not None
+            removed += self.sets.pop(key, None) is not None
+        return removed
+
+    def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    def keys(self, pattern):
+        raise AssertionError("KEYS walks the whole keyspace")
+
+
+@pytest.fixture
+def cache():
+    service = CacheService()
+    service.client = FakeRedisClient()
+    service.available = True
+    return service
+
+
+class TestTagRegistration:
+    """Writes index their keys in tag sets"""
+
+    def test_set_registers_tags_in_one_round_trip(self, cache):
+        assert cache.set("quote:AAPL", {"last": 1}, ttl=5, tags=("ns:quote", "symbol:AAPL"))
+        client = cache.client
+        assert client.round_trips == 1
+        assert client.sets["tag:symbol:AAPL"] == {"quote:AAPL"}
+        assert client.expiries["tag:symbol:AAPL"] == 5
+
+    def test_tag_set_expires_with_its_longest_lived_key(self, cache):
+        cache.set("quote:AAPL", 1, ttl=5, tags=("symbol:AAPL",))
+        cache.set("bars:AAPL", 2, ttl=3600, tags=("symbol:AAPL",))
+        cache.set("quote:AAPL", 3, ttl=5, tags=("symbol:AAPL",))
+        assert cache.client.expiries["tag:symbol:AAPL"] == 3600
+
+    def test_set_many_groups_keys_per_tag(self, cache):
+        items = {f"quote:S{i}": i for i in range(10)}
+        tags = dict.fromkeys(items, ("ns:quote",))
+        cache.set_many(items, ttl=5, tags=tags)
+        assert cache.client.round_trips == 1
+        assert cache.client.sets["tag:ns:quote"] == set(items)
+
+
+class TestInvalidation:
+    """Bounded batches instead of KEYS"""
+
+    def test_invalidate_tags_in_bounded_batches(self, cache):
+        items = {f"bars:S{i}": i for i in range(1203)}
+        cache.set_many(items, ttl=60, tags=dict.fromkeys(items, ("ns:bars",)))
+        cache.set("options:SPY", [1], ttl=60, tags=("ns:options",))
+
+        deleted = cache.invalidate_tags(["ns:bars"], batch_size=500)
+
+        assert deleted == 1203
+        assert cache.client.unlinks == [500, 500, 203, 1]  # last UNLINK drops the tag set
+        assert "tag:ns:bars" not in cache.client.sets
+        assert set(cache.client.data) == {"options:SPY"}
+
+    def test_clear_pattern_scans_instead_of_keys(self, cache):
+        cache.set_many({f"historical:S{i}": i for i in range(7)}, ttl=60)
+        cache.set("quote:AAPL", 1, ttl=5)
+        assert cache.clear_pattern("historical:*", batch_size=3) == 7
+        assert cache.client.unlinks == [3, 3, 1]
+        assert set(cache.client.data) == {"quote:AAPL"}
+
+    def test_generations(self, cache):
+        cache.set("bars:SPY", 1, ttl=60, tags=("ns:bars",))
+        assert cache.get_generations(["bars", "options"]) == {"bars": 0, "options": 0}
+        assert cache.bump_generation("bars") == 1
+        assert cache.get_generations(["bars"]) == {"bars": 1}
+        assert "tag:ns:bars" not in cache.client.sets
+        assert "bars:SPY" in cache.client.data  # left to expire by TTL
+
+    def test_unavailable_redis_is_a_no_op(self):
+        service = CacheService()
+        service.client, service.available = None, False
+        assert service.invalidate_tags(["ns:bars"]) == 0
+        assert service.bump_generation("bars") is None
+        assert service.get_generations(["bars"]) == {}
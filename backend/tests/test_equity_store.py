@@ -0,0 +1,154 @@
+"""
+Tests for the append-only equity snapshot store
+Tests time-indexed range queries, incremental aggregates, crash recovery and
+the one-shot JSON migration
+"""
+
+import itertools
+import json
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.services.equity_store import SNAPSHOT_DTYPE, EquitySnapshotStore
+from app.services.equity_tracker import EquityTracker
+
+
+def make_history(n, step=timedelta(days=1), end=None, seed=4):
+    end = end or datetime.now(UTC) - timedelta(minutes=1)
+    rng = np.random.default_rng(seed)
+    equity = 100_000 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return [
+        {
+            "timestamp": (end - step * (n - 1 - i)).isoformat(),
+            "equity": round(float(e), 2),
+            "cash": 25_000.0,
+            "positions_value": round(float(e) - 25_000.0, 2),
+            "num_positions": i % 5,
+        }
+        for i, e in enumerate(equity)
+    ]
+
+
+def legacy_metrics(history, period_days):
+    """The JSON-era EquityTracker.calculate_metrics loop"""
+    cutoff = datetime.now(UTC).timestamp() - period_days * 86400
+    recent = [s for s in history if datetime.fromisoformat(s["timestamp"]).timestamp() >= cutoff]
+    start, end = recent[0]["equity"], recent[-1]["equity"]
+    peak, max_dd = start, 0
+    for s in recent:
+        peak = max(peak, s["equity"])
+        max_dd = max(max_dd, (peak - s["equity"]) / peak)
+    returns = [(b["equity"] - a["equity"]) / a["equity"] for a, b in itertools.pairwise(recent)]
+    mean = sum(returns) / len(returns)
+    std = (sum((r - mean) ** 2 for r in returns) / len(returns)) ** 0.5
+    return {
+        "total_return": round(end - start, 2),
+        "total_return_percent": round((end - start) / start * 100, 2),
+        "max_drawdown": round(max_dd * 100, 2),
+        "sharpe_ratio": round(mean / std * 252**0.5, 2),
+        "win_days": sum(b["equity"] > a["equity"] for a, b in itertools.pairwise(recent)),
+        "loss_days": sum(b["equity"] < a["equity"] for a, b in itertools.pairwise(recent)),
+        "num_snapshots": len(recent),
+    }
+
+
+class TestRangeQueries:
+    """Binary search on the time index"""
+
+    def test_range_returns_inclusive_slice(self, tmp_path):
+        store = EquitySnapshotStore(tmp_path)
+        history = make_history(200, step=timedelta(minutes=1))
+        for snapshot in history:
+            store.append(snapshot)
+
+        start = datetime.fromisoformat(history[50]["timestamp"])
+        end = datetime.fromisoformat(history[59]["timestamp"])
+        assert store.range(start, end) == history[50:60]
+        assert store.range() == history
+        assert store.range(start=end + timedelta(days=1)) == []
+
+    def test_naive_bounds_are_local_time(self, tmp_path):
+        store = EquitySnapshotStore(tmp_path)
+        store.extend(make_history(10))
+        naive_start = datetime.now() - timedelta(days=3)
+        assert len(store.range(naive_start)) == 3
+
+    def test_out_of_order_append_is_rejected(self, tmp_path):
+        store = EquitySnapshotStore(tmp_path)
+        history = make_history(3)
+        store.extend(history[1:])
+        with pytest.raises(ValueError):
+            store.append(history[0])
+        assert len(store) == 2
+
+
+class TestAggregates:
+    """Running aggregates and metrics parity"""
+
+    def test_metrics_match_legacy_loop(self, tmp_path):
+        history = make_history(60)
+        tracker = EquityTracker(store=EquitySnapshotStore(tmp_path))
+        for snapshot in history:
+            tracker.store.append(snapshot)
+
+        # Whole curve (served from the running aggregates) and a trailing window
+        for period_days in (90, 30):
+            assert tracker.calculate_metrics(period_days) == pytest.approx(
+                legacy_metrics(history, period_days)
+            )
+
+    def test_aggregates_survive_reopen_and_track_peak(self, tmp_path):
+        store = EquitySnapshotStore(tmp_path)
+        store.extend(make_history(30))
+        before = store.get_aggregates()
+
+        reopened = EquitySnapshotStore(tmp_path)
+        assert reopened.get_aggregates() == before
+        equity = reopened.slice()["equity"]
+        assert before["peak_equity"] == equity.max()
+        assert before["last_equity"] == equity[-1]
+
+
+class TestRecovery:
+    """Crash mid-append and missing aggregates"""
+
+    def test_torn_record_is_truncated(self, tmp_path):
+        store = EquitySnapshotStore(tmp_path)
+        store.extend(make_history(5))
+        with open(store.records_path, "ab") as f:
+            f.write(b"\x00" * (SNAPSHOT_DTYPE.itemsize // 2))
+
+        reopened = EquitySnapshotStore(tmp_path)
+        assert len(reopened) == 5
+        assert store.records_path.stat().st_size == 5 * SNAPSHOT_DTYPE.itemsize
+
+    def test_missing_aggregates_are_rebuilt(self, tmp_path):
+        store = EquitySnapshotStore(tmp_path)
+        store.extend(make_history(20))
+        expected = store.get_aggregates()
+        store.aggregates_path.unlink()
+
+        assert EquitySnapshotStore(tmp_path).get_aggregates() == pytest.approx(expected)
+
+
+class TestMigration:
+    """One-shot import of equity_history.json"""
+
+    def test_legacy_json_is_imported_once(self, tmp_path):
+        history = make_history(15)
+        legacy = tmp_path / "equity_history.json"
+        legacy.write_text(json.dumps(list(reversed(history)), indent=2))
+
+        tracker = EquityTracker(store=EquitySnapshotStore(tmp_path / "store"))
+        assert len(tracker.store) == 0  # constructing a tracker never migrates
+        assert tracker.migrate_legacy_history(legacy) == 15
+
+        assert tracker.load_history() == history
+        assert not legacy.exists()
+        assert (tmp_path / "equity_history.json.migrated").exists()
+
+        again = EquityTracker(store=EquitySnapshotStore(tmp_path / "store"))
+        assert again.migrate_legacy_history(legacy) == 0
+        assert len(again.store) == 15
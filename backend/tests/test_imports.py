@@ -5,9 +5,10 @@ import pytest
 from app import middleware, services
 from app.core.config import settings
 from app.main import app
-from app.middleware.cache_control import CacheControlMiddleware
+from app.middleware.cache_control import CacheControlStage
+from app.middleware.pipeline import MiddlewarePipeline
 from app.middleware.rate_limit import custom_rate_limit_exceeded_handler, limiter
-from app.middleware.sentry import SentryContextMiddleware
+from app.middleware.sentry import SentryContextStage
 from app.services.cache import init_cache
 from app.services.tradier_stream import start_tradier_stream, stop_tradier_stream
 
@@ -83,8 +84,9 @@ class TestCriticalImports:
             # Verify objects exist
             assert limiter is not None
             assert custom_rate_limit_exceeded_handler is not None
-            assert CacheControlMiddleware is not None
-            assert SentryContextMiddleware is not None
+            assert MiddlewarePipeline is not None
+            assert CacheControlStage is not None
+            assert SentryContextStage is not None
         except ImportError as e:
             pytest.fail(f"Failed to import middleware: {e}")
 
@@ -181,8 +183,9 @@ class TestExportLists:
         expected_exports = [
             "limiter",
             "custom_rate_limit_exceeded_handler",
-            "CacheControlMiddleware",
-            "SentryContextMiddleware",
+            "MiddlewarePipeline",
+            "CacheControlStage",
+            "SentryContextStage",
         ]
 
         for export in expected_exports:
@@ -0,0 +1,310 @@
+"""
+Tests for the single ASGI middleware pipeline
+Tests stage ordering and short-circuits, header parity with the old stack,
+SSE pass-through, gzip and benchmarks the pipeline against stacked
+BaseHTTPMiddleware layers
+"""
+
+import asyncio
+import itertools
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.middleware.gzip import GZipMiddleware
+
+from app.core import kill_switch
+from app.middleware.cache_control import CacheControlStage
+from app.middleware.kill_switch import KillSwitchStage
+from app.middleware.metrics import MetricsStage
+from app.middleware.pipeline import HTTPStage, MiddlewarePipeline, RequestContext
+from app.middleware.request_id import RequestIDStage
+from app.middleware.security import CSRFProtectionStage
+from app.middleware.security_headers import SecurityHeadersStage
+
+
+def make_app():
+    app = FastAPI()
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/market/quote/{symbol}")
+    async def quote(symbol: str):
+        return {"symbol": symbol, "last": 189.5, "bid": 189.4, "ask": 189.6, "volume": 1_000_000}
+
+    @app.get("/api/news/market")
+    async def news():
+        return {"articles": [{"title": f"Headline {i}", "summary": "x" * 80} for i in range(40)]}
+
+    @app.post("/api/orders")
+    async def orders():
+        return {"ok": True}
+
+    @app.get("/api/stream/prices")
+    async def stream():
+        async def events():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+                await asyncio.sleep(0.01)
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/api/boom")
+    async def boom():
+        raise RuntimeError("boom")
+
+    return app
+
+
+def make_stages(testing_mode=True):
+    # Same order as main.py (Sentry omitted: no DSN in tests)
+    return [
+        SecurityHeadersStage(),
+        MetricsStage(),
+        CacheControlStage(),
+        CSRFProtectionStage(exempt_paths=["/api/health"], testing_mode=testing_mode),
+        KillSwitchStage(),
+        RequestIDStage(),
+    ]
+
+
+def pipelined_app(stages=None):
+    app = make_app()
+    app.add_middleware(
+        MiddlewarePipeline, stages=stages or make_stages(), gzip_minimum_size=1000
+    )
+    return app
+
+
+def stacked_app():
+    """The old topology: one BaseHTTPMiddleware per stage plus GZip"""
+
+    class StageMiddleware(BaseHTTPMiddleware):
+        def __init__(self, app, stage):
+            super().__init__(app)
+            self.stage = stage
+
+        async def dispatch(self, request, call_next):
+            ctx = RequestContext(request.scope)
+            response = self.stage.on_request(ctx) or await call_next(request)
+            ctx.status_code = response.status_code
+            self.stage.on_response(ctx, response.headers)
+            return response
+
+    app = make_app()
+    stages = make_stages()
+    for stage in reversed(stages[3:]):
+        app.add_middleware(StageMiddleware, stage=stage)
+    app.add_middleware(GZipMiddleware, minimum_size=1000)
+    for stage in reversed(stages[:3]):
+        app.add_middleware(StageMiddleware, stage=stage)
+    return app
+
+
+async def request(app, method, path, **kwargs):
+    transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.request(method, path, **kwargs)
+
+
+class Recorder(HTTPStage):
+    def __init__(self, name, log, block=False):
+        self.name, self.log, self.block = name, log, block
+
+    def on_request(self, ctx):
+        self.log.append(("request", self.name))
+        if self.block:
+            return PlainTextResponse("blocked", status_code=409)
+        return None
+
+    def on_response(self, ctx, headers):
+        self.log.append(("response", self.name))
+
+    def on_error(self, ctx, exc):
+        self.log.append(("error", self.name))
+
+    def on_complete(self, ctx):
+        self.log.append(("complete", self.name))
+
+
+class TestStageOrdering:
+    """Nesting semantics of the old stack"""
+
+    def test_hooks_run_outermost_first_and_unwind(self):
+        log = []
+        app = pipelined_app([Recorder("outer", log), Recorder("inner", log)])
+        asyncio.run(request(app, "GET", "/api/health"))
+        assert log == [
+            ("request", "outer"),
+            ("request", "inner"),
+            ("response", "inner"),
+            ("response", "outer"),
+            ("complete", "inner"),
+            ("complete", "outer"),
+        ]
+
+    def test_short_circuit_skips_inner_stages(self):
+        log = []
+        stages = [Recorder("outer", log), Recorder("gate", log, block=True), Recorder("inner", log)]
+        response = asyncio.run(request(pipelined_app(stages), "GET", "/api/health"))
+        assert response.status_code == 409
+        assert ("request", "inner") not in log
+        assert ("response", "gate") not in log
+        assert ("response", "outer") in log
+        assert ("complete", "gate") in log
+
+    def test_errors_reach_every_stage(self):
+        log = []
+        app = pipelined_app([Recorder("outer", log), Recorder("inner", log)])
+        response = asyncio.run(request(app, "GET", "/api/boom"))
+        assert response.status_code == 500
+        assert [e for e in log if e[0] == "error"] == [("error", "inner"), ("error", "outer")]
+        completed = [e for e in log if e[0] == "complete"]
+        assert completed == [("complete", "inner"), ("complete", "outer")]
+
+
+class TestStageBehaviour:
+    """Same headers and decisions as the stacked middleware"""
+
+    def test_headers_match_stacked_middleware(self):
+        headers = {"X-Request-ID": "r1", "Accept-Encoding": "gzip"}
+        for path in ("/api/health", "/api/market/quote/AAPL", "/api/news/market"):
+            new = asyncio.run(request(pipelined_app(), "GET", path, headers=headers))
+            old = asyncio.run(request(stacked_app(), "GET", path, headers=headers))
+            assert new.json() == old.json()
+            for header in (
+                "X-Request-ID",
+                "Cache-Control",
+                "Content-Security-Policy",
+                "Strict-Transport-Security",
+                "X-Frame-Options",
+            ):
+                assert new.headers.get(header) == old.headers.get(header), (path, header)
+            assert new.headers["X-Response-Time"].endswith("s")
+
+            # Compression follows the minimum-size rule, not the old stack's
+            # streaming artifacts (BaseHTTPMiddleware gzipped even tiny bodies)
+            compressed = len(new.content) >= 1000
+            assert (new.headers.get("Content-Encoding") == "gzip") is compressed, path
+            if compressed:
+                assert "Accept-Encoding" in new.headers["Vary"]
+                assert int(new.headers["Content-Length"]) < len(new.content)
+            else:
+                assert int(new.headers["Content-Length"]) == len(new.content)
+
+    def test_kill_switch_blocks_mutations(self, monkeypatch):
+        monkeypatch.setattr(kill_switch, "is_killed", lambda: True)
+        response = asyncio.run(request(pipelined_app(), "POST", "/api/orders"))
+        assert response.status_code == 423
+        assert response.headers["X-Frame-Options"] == "DENY"
+        assert asyncio.run(request(pipelined_app(), "GET", "/api/health")).status_code == 200
+
+    def test_csrf_validates_tokens_it_issued(self):
+        csrf = CSRFProtectionStage(exempt_paths=["/api/health"])
+        app = pipelined_app([csrf])
+        assert asyncio.run(request(app, "POST", "/api/orders")).status_code == 403
+
+        token = csrf.generate_csrf_token()
+        response = asyncio.run(request(app, "POST", "/api/orders", headers={"X-CSRF-Token": token}))
+        assert response.status_code == 200
+        assert "script-src 'self';" in response.headers["Content-Security-Policy"]
+
+    def test_gzip_only_above_minimum_size(self):
+        small = asyncio.run(request(pipelined_app(), "GET", "/api/health"))
+        assert "Content-Encoding" not in small.headers
+
+        large = asyncio.run(
+            request(pipelined_app(), "GET", "/api/news/market", headers={"Accept-Encoding": "gzip"})
+        )
+        assert large.headers["Content-Encoding"] == "gzip"
+        assert "Accept-Encoding" in large.headers["Vary"]
+        assert len(large.json()["articles"]) == 40
+        assert int(large.headers["Content-Length"]) < len(large.content)
+
+
+class TestServerSentEvents:
+    """SSE passes through untouched"""
+
+    def test_event_stream_is_not_compressed_or_cached(self):
+        response = asyncio.run(
+            request(
+                pipelined_app(), "GET", "/api/stream/prices", headers={"Accept-Encoding": "gzip"}
+            )
+        )
+        assert response.text == "data: 0\n\ndata: 1\n\ndata: 2\n\n"
+        assert "Content-Encoding" not in response.headers
+        assert "Cache-Control" not in response.headers
+        assert response.headers["X-Frame-Options"] == "DENY"
+
+    def test_events_are_forwarded_as_they_are_produced(self):
+        # Drive the app directly: httpx.ASGITransport buffers the whole body
+        async def record_messages():
+            scope = {
+                "type": "http",
+                "asgi": {"version": "3.0"},
+                "http_version": "1.1",
+                "method": "GET",
+                "scheme": "http",
+                "path": "/api/stream/prices",
+                "raw_path": b"/api/stream/prices",
+                "root_path": "",
+                "query_string": b"",
+                "headers": [(b"host", b"test"), (b"accept-encoding", b"gzip")],
+                "client": ("127.0.0.1", 1234),
+                "server": ("test", 80),
+            }
+            done = asyncio.Event()
+            request_sent = False
+            messages = []
+
+            async def receive():
+                nonlocal request_sent
+                if not request_sent:
+                    request_sent = True
+                    return {"type": "http.request", "body": b"", "more_body": False}
+                await done.wait()
+                return {"type": "http.disconnect"}
+
+            async def send(message):
+                messages.append((time.perf_counter(), message))
+
+            await pipelined_app()(scope, receive, send)
+            done.set()
+            return messages
+
+        messages = asyncio.run(record_messages())
+        events = [
+            (at, message["body"])
+            for at, message in messages
+            if message["type"] == "http.response.body" and message.get("body")
+        ]
+        # One body message per event, each sent before the next was produced
+        expected = [b"data: 0\n\n", b"data: 1\n\n", b"data: 2\n\n"]
+        assert [body for _, body in events] == expected
+        gaps = [later - earlier for (earlier, _), (later, _) in itertools.pairwise(events)]
+        assert all(gap >= 0.005 for gap in gaps)
+
+
+@pytest.mark.parametrize("path", ["/api/health", "/api/market/quote/AAPL"])
+@pytest.mark.parametrize("topology", ["stacked", "pipeline"])
+def test_benchmark_request_throughput(benchmark, topology, path):
+    """Benchmark only: compare the groups in the pytest-benchmark report"""
+    app = stacked_app() if topology == "stacked" else pipelined_app()
+
+    def serve(n=50):
+        async def run():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                for _ in range(n):
+                    response = await client.get(path)
+                    assert response.status_code == 200
+
+        asyncio.run(run())
+
+    benchmark.group = f"middleware {path}"
+    benchmark.pedantic(serve, rounds=5, warmup_rounds=1)
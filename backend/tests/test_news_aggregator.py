@@ -0,0 +1,227 @@
+"""
+Tests for concurrent news aggregation
+Runs the real providers against local stub HTTP servers to check concurrent
+fan-out, per-provider deadlines, the global budget and circuit breakers
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.news.base_provider import NewsArticle
+from app.services.news.news_aggregator import NewsAggregator
+
+
+FINNHUB_ARTICLES = [
+    {
+        "id": 101,
+        "headline": "Apple unveils new chip lineup",
+        "summary": "Finnhub summary",
+        "source": "Reuters",
+        "url": "https://example.com/finnhub/1",
+        "datetime": 1718000000,
+        "category": "company",
+        "image": "",
+    }
+]
+
+ALPHA_VANTAGE_FEED = {
+    "feed": [
+        {
+            "title": "Treasury yields climb ahead of Fed meeting",
+            "url": "https://example.com/av/1",
+            "time_published": "20240610T120000",
+            "summary": "Alpha Vantage summary",
+            "source": "Bloomberg",
+            "overall_sentiment_score": 0.25,
+        }
+    ]
+}
+
+POLYGON_RESULTS = {
+    "status": "OK",
+    "results": [
+        {
+            "id": "p1",
+            "title": "Semiconductor stocks rally into the close",
+            "article_url": "https://example.com/polygon/1",
+            "published_utc": "2024-06-10T15:00:00Z",
+            "description": "Polygon summary",
+            "publisher": {"name": "MarketWatch"},
+            "tickers": ["AAPL"],
+        }
+    ],
+}
+
+
+class StubProvider:
+    """Local HTTP server returning a fixed JSON body after an optional delay"""
+
+    def __init__(self, body):
+        self.body = body
+        self.delay = 0.0
+        self.status = 200
+        self.hits = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.hits += 1
+                time.sleep(stub.delay)
+                payload = json.dumps(stub.body).encode()
+                self.send_response(stub.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stubs(monkeypatch):
+    monkeypatch.setenv("FINNHUB_API_KEY", "test-finnhub")
+    monkeypatch.setenv("ALPHA_VANTAGE_API_KEY", "test-av")
+    monkeypatch.setenv("POLYGON_API_KEY", "test-polygon")
+
+    servers = {
+        "finnhub": StubProvider(FINNHUB_ARTICLES),
+        "alpha_vantage": StubProvider(ALPHA_VANTAGE_FEED),
+        "polygon": StubProvider(POLYGON_RESULTS),
+    }
+    yield servers
+    for server in servers.values():
+        server.close()
+
+
+@pytest.fixture
+def aggregator(stubs):
+    aggregator = NewsAggregator()
+    for provider in aggregator.providers:
+        provider.base_url = stubs[provider.get_provider_name()].url
+    return aggregator
+
+
+def run(aggregator, coro):
+    async def main():
+        try:
+            return await coro
+        finally:
+            await aggregator.aclose()
+
+    return asyncio.run(main())
+
+
+class TestConcurrentAggregation:
+    """All providers are queried at once"""
+
+    def test_merges_all_providers_concurrently(self, aggregator, stubs):
+        for server in stubs.values():
+            server.delay = 0.3
+
+        start = time.perf_counter()
+        result = run(aggregator, aggregator.aget_company_news("AAPL", budget=5.0))
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.8  # ~one provider's latency, not three
+        assert result.partial is False
+        assert result.provider_status == {
+            "finnhub": "ok",
+            "alpha_vantage": "ok",
+            "polygon": "ok",
+        }
+        assert {a["provider"] for a in result.articles} == {
+            "finnhub",
+            "alpha_vantage",
+            "polygon",
+        }
+
+    def test_market_news_respects_limit(self, aggregator):
+        result = run(aggregator, aggregator.aget_market_news("general", limit=2, budget=5.0))
+        assert len(result.articles) == 2
+        assert result.partial is False
+
+    def test_prioritize_treats_offsetless_stamps_as_utc(self, aggregator):
+        now = datetime.now(UTC)
+        older = NewsArticle(
+            title="older", published_at=(now - timedelta(hours=50)).isoformat(), provider="x"
+        )
+        newer = NewsArticle(title="newer", published_at=now.strftime("%Y%m%dT%H%M%S"), provider="x")
+        ranked = aggregator._prioritize([older, newer])
+        assert [a.title for a in ranked] == ["newer", "older"]
+
+
+class TestDeadlines:
+    """Per-provider deadlines and the global budget"""
+
+    def test_provider_deadline_returns_partial_results(self, aggregator, stubs):
+        stubs["polygon"].delay = 1.0
+        aggregator.provider_timeouts["polygon"] = 0.2
+
+        start = time.perf_counter()
+        result = run(aggregator, aggregator.aget_company_news("AAPL", budget=5.0))
+
+        assert time.perf_counter() - start < 0.8
+        assert result.partial is True
+        assert result.provider_status["polygon"] == "timeout"
+        assert {a["provider"] for a in result.articles} == {"finnhub", "alpha_vantage"}
+        assert aggregator.circuit_breakers["polygon"].failure_count == 1
+
+    def test_global_budget_cuts_off_stragglers(self, aggregator, stubs):
+        stubs["finnhub"].delay = 1.0
+        aggregator.provider_timeouts["finnhub"] = 10.0
+
+        start = time.perf_counter()
+        result = run(aggregator, aggregator.aget_company_news("AAPL", budget=0.3))
+
+        assert time.perf_counter() - start < 0.8
+        assert result.partial is True
+        assert result.provider_status["finnhub"] == "timeout"
+        assert len(result.articles) == 2
+        # Budget cut-offs are not the provider's failure
+        assert aggregator.circuit_breakers["finnhub"].failure_count == 0
+
+
+class TestCircuitBreaker:
+    """Breaker state carries over from the sync aggregation path"""
+
+    def test_errors_open_circuit_and_skip_provider(self, aggregator, stubs):
+        stubs["alpha_vantage"].status = 500
+
+        async def main():
+            for _ in range(3):
+                result = await aggregator.aget_company_news("AAPL", budget=5.0)
+                assert result.provider_status["alpha_vantage"] == "error"
+            return await aggregator.aget_company_news("AAPL", budget=5.0)
+
+        result = run(aggregator, main())
+
+        assert aggregator.circuit_breakers["alpha_vantage"].state == "OPEN"
+        assert result.provider_status["alpha_vantage"] == "circuit_open"
+        assert result.partial is True
+        assert stubs["alpha_vantage"].hits == 3  # the open circuit was not called
+
+    def test_success_resets_failures(self, aggregator):
+        breaker = aggregator.circuit_breakers["polygon"]
+        breaker.record_failure()
+        breaker.record_failure()
+
+        run(aggregator, aggregator.aget_company_news("AAPL", budget=5.0))
+
+        assert breaker.failure_count == 0
+        assert breaker.state == "CLOSED"
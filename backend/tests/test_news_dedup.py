@@ -0,0 +1,159 @@
+"""
+Tests for news title deduplication
+Tests parity with the pairwise SequenceMatcher loop, best-article selection
+and near-linear scaling on a synthetic 5,000-article feed
+"""
+
+import random
+import time
+from difflib import SequenceMatcher
+
+from app.services.news.base_provider import NewsArticle
+from app.services.news.deduplication import (
+    deduplicate_articles,
+    find_duplicate_groups,
+    minhash_signatures,
+    shingles,
+)
+from app.services.news.news_aggregator import NewsAggregator
+
+
+TICKERS = ["AAPL", "MSFT", "NVDA", "TSLA", "AMZN", "META", "GOOGL", "JPM", "XOM", "SPY"]
+SUBJECTS = ["shares", "stock", "revenue", "guidance", "margins", "buyback", "outlook"]
+VERBS = ["jump", "slide", "beat estimates", "miss forecasts", "surge", "stall", "rebound"]
+TAILS = [
+    "after earnings call",
+    "as analysts weigh AI spending",
+    "amid rate cut bets",
+    "ahead of Fed decision",
+    "on supply chain worries",
+    "following regulatory probe",
+]
+SUFFIXES = [" - Reuters", " | Bloomberg", " (Updated)", "", ""]
+
+
+def make_headline(rng):
+    return (
+        f"{rng.choice(TICKERS)} {rng.choice(SUBJECTS)} {rng.choice(VERBS)} "
+        f"{rng.choice(TAILS)} in week {rng.randint(1, 52)}"
+    )
+
+
+def syndicate(rng, headline):
+    """A provider's rewrite of a headline: case, punctuation, suffix or typo"""
+    variant = headline
+    roll = rng.random()
+    if roll < 0.25:
+        variant = variant.upper()
+    elif roll < 0.5:
+        variant = variant.replace(" in ", ", in ")
+    elif roll < 0.75:
+        i = rng.randrange(len(variant))
+        variant = variant[:i] + rng.choice("aeiou") + variant[i + 1 :]
+    return variant + rng.choice(SUFFIXES)
+
+
+def synthetic_feed(n, seed=7):
+    rng = random.Random(seed)
+    articles = []
+    while len(articles) < n:
+        headline = make_headline(rng)
+        for _ in range(rng.choice([1, 1, 2, 3, 4])):
+            articles.append(
+                NewsArticle(
+                    title=syndicate(rng, headline),
+                    summary="x" * rng.randint(0, 200),
+                    sentiment_score=round(rng.uniform(-1, 1), 2),
+                    published_at=f"2024-06-{rng.randint(1, 28):02d}T12:00:00Z",
+                    url=f"https://example.com/{len(articles)}",
+                )
+            )
+    rng.shuffle(articles)
+    return articles[:n]
+
+
+def pairwise_groups(titles, threshold=0.85):
+    """The original greedy all-pairs loop"""
+    groups, used = [], set()
+    for i, title in enumerate(titles):
+        if i in used:
+            continue
+        group = [i]
+        used.add(i)
+        for j in range(i + 1, len(titles)):
+            if j in used:
+                continue
+            if SequenceMatcher(None, title.lower(), titles[j].lower()).ratio() > threshold:
+                group.append(j)
+                used.add(j)
+        groups.append(group)
+    return groups
+
+
+class TestParity:
+    """Same groups and winners as the pairwise loop"""
+
+    def test_groups_match_pairwise_loop(self):
+        titles = [a.title for a in synthetic_feed(600, seed=11)]
+        assert find_duplicate_groups(titles) == pairwise_groups(titles)
+
+    def test_keeps_strongest_article_per_group(self):
+        articles = [
+            NewsArticle(title="Apple beats earnings estimates", sentiment_score=0.2, summary="a"),
+            NewsArticle(title="APPLE BEATS EARNINGS ESTIMATES!", sentiment_score=-0.7, summary=""),
+            NewsArticle(title="Oil prices slide on demand fears", sentiment_score=0.1, summary=""),
+        ]
+        result = deduplicate_articles(articles)
+        assert [a.sentiment_score for a in result] == [-0.7, 0.1]
+
+    def test_aggregator_delegates(self, monkeypatch):
+        monkeypatch.setenv("FINNHUB_API_KEY", "test-finnhub")
+        articles = synthetic_feed(300, seed=3)
+        titles = [a.title for a in articles]
+        expected = [
+            max(
+                (articles[i] for i in group),
+                key=lambda x: (abs(x.sentiment_score), len(x.summary), x.published_at),
+            )
+            for group in pairwise_groups(titles)
+        ]
+        assert NewsAggregator()._deduplicate(articles) == expected
+
+    def test_signature_agreement_tracks_jaccard(self):
+        pairs = [
+            ("Fed holds rates steady, signals two cuts", "Fed holds rates steady and signals cuts"),
+            ("NVDA shares surge after earnings call", "NVDA stock slides ahead of Fed decision"),
+        ]
+        for title, other in pairs:
+            a, b = shingles(title), shingles(other)
+            jaccard = len(a & b) / len(a | b)
+            signatures = minhash_signatures([title, other])
+            agreement = (signatures[0] == signatures[1]).mean()
+            assert abs(agreement - jaccard) < 0.2
+
+    def test_edge_titles(self):
+        assert find_duplicate_groups([]) == []
+        assert find_duplicate_groups(["", "", "Q"]) == [[0, 1], [2]]
+        assert shingles("A!") == {"a"}
+
+
+class TestBenchmark:
+    """Synthetic 5,000-article feed"""
+
+    def test_5000_article_feed_scales_near_linearly(self):
+        small = synthetic_feed(1000, seed=21)
+        large = synthetic_feed(5000, seed=21)
+
+        start = time.perf_counter()
+        deduplicate_articles(small)
+        small_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = deduplicate_articles(large)
+        large_elapsed = time.perf_counter() - start
+
+        # The pairwise loop needs ~12.5M SequenceMatcher calls for this feed
+        assert large_elapsed < 5.0
+        # 5x the articles should cost nowhere near the 25x of a quadratic scan
+        assert large_elapsed < small_elapsed * 12 + 0.5
+        assert len(result) < len(large)
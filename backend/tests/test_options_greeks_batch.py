@@ -0,0 +1,230 @@
+"""
+Tests for the vectorized Black-Scholes Greeks batch API and IV solver
+Pins GreeksCalculator.calculate_greeks_batch against the scalar calculate_greeks
+path, round-trips implied_volatility_batch, and benchmarks a 2,000-contract chain
+"""
+
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.routers.options import OptionContract, _fill_missing_greeks, _fill_missing_iv
+from app.services.options_greeks import GREEKS_DTYPE, IV_DTYPE, GreeksCalculator
+
+
+CHAIN_SIZE = 2000
+
+
+@pytest.fixture
+def calculator():
+    return GreeksCalculator(risk_free_rate=0.05)
+
+
+@pytest.fixture
+def chain():
+    """Random 2,000-contract chain including expired contracts and dividends"""
+    rng = np.random.default_rng(5)
+    return {
+        "spot_prices": rng.uniform(50, 150, CHAIN_SIZE),
+        "strike_prices": rng.uniform(40, 160, CHAIN_SIZE),
+        "times_to_expiry": rng.uniform(-0.05, 2.0, CHAIN_SIZE),
+        "volatilities": rng.uniform(0.05, 1.0, CHAIN_SIZE),
+        "option_types": rng.choice(["call", "put"], CHAIN_SIZE),
+        "dividend_yields": rng.uniform(0, 0.03, CHAIN_SIZE),
+    }
+
+
+def scalar_chain(calculator, chain):
+    """Price a chain one contract at a time (the pre-batch path)"""
+    return [
+        calculator.calculate_greeks(
+            spot_price=chain["spot_prices"][i],
+            strike_price=chain["strike_prices"][i],
+            time_to_expiry=chain["times_to_expiry"][i],
+            volatility=chain["volatilities"][i],
+            option_type=chain["option_types"][i],
+            dividend_yield=chain["dividend_yields"][i],
+        )
+        for i in range(CHAIN_SIZE)
+    ]
+
+
+class TestBatchParity:
+    """Batch results match the scalar calculator contract by contract"""
+
+    def test_matches_scalar_path(self, calculator, chain):
+        batch = calculator.calculate_greeks_batch(**chain)
+        assert batch.dtype == GREEKS_DTYPE
+        assert batch.shape == (CHAIN_SIZE,)
+
+        for i, expected in enumerate(scalar_chain(calculator, chain)):
+            for field in GREEKS_DTYPE.names:
+                assert batch[field][i] == pytest.approx(
+                    getattr(expected, field), rel=1e-9, abs=1e-12
+                ), (i, field)
+
+    def test_expired_contracts(self, calculator):
+        batch = calculator.calculate_greeks_batch(
+            spot_prices=100.0,
+            strike_prices=[90.0, 110.0, 110.0, 90.0],
+            times_to_expiry=0.0,
+            volatilities=0.3,
+            option_types=["call", "call", "put", "put"],
+        )
+        assert batch["theoretical_price"].tolist() == [10.0, 0.0, 10.0, 0.0]
+        assert batch["delta"].tolist() == [1.0, 0.0, -1.0, 0.0]
+        assert batch["probability_itm"].tolist() == [1.0, 0.0, 1.0, 0.0]
+        assert not batch["gamma"].any()
+        assert not batch["theta"].any()
+
+    def test_broadcasting_and_boolean_types(self, calculator):
+        strikes = np.array([95.0, 100.0, 105.0])
+        by_name = calculator.calculate_greeks_batch(100.0, strikes, 0.25, 0.2, ["call"] * 3)
+        by_mask = calculator.calculate_greeks_batch(100.0, strikes, 0.25, 0.2, True)
+        np.testing.assert_array_equal(by_name, by_mask)
+
+    def test_put_call_parity(self, calculator):
+        strikes = np.linspace(50, 150, 21)
+        calls = calculator.calculate_greeks_batch(100.0, strikes, 0.5, 0.3, "call")
+        puts = calculator.calculate_greeks_batch(100.0, strikes, 0.5, 0.3, "put")
+        forward = 100.0 - strikes * np.exp(-0.05 * 0.5)
+        np.testing.assert_allclose(
+            calls["theoretical_price"] - puts["theoretical_price"], forward, atol=1e-10
+        )
+
+    def test_invalid_inputs_are_nan(self, calculator):
+        batch = calculator.calculate_greeks_batch(100.0, 100.0, 0.5, [0.0, 0.2], "call")
+        assert np.isnan(batch["delta"][0])
+        assert np.isfinite(batch["delta"][1])
+
+
+class TestImpliedVolatilityBatch:
+    """Vectorized Newton/bisection IV solver"""
+
+    def test_round_trips_model_prices(self, calculator, chain):
+        live = {**chain, "times_to_expiry": np.abs(chain["times_to_expiry"]) + 1 / 365}
+        prices = calculator.calculate_greeks_batch(**live)["theoretical_price"]
+        vols = live.pop("volatilities")
+
+        solved = calculator.implied_volatility_batch(prices, **live)
+        assert solved.dtype == IV_DTYPE
+        converged = solved["converged"]
+        assert converged.mean() > 0.95
+
+        # Every converged IV reproduces the market price
+        repriced = calculator.calculate_greeks_batch(
+            **{**live, "volatilities": solved["implied_volatility"]}
+        )["theoretical_price"]
+        np.testing.assert_allclose(repriced[converged], prices[converged], atol=1e-7)
+
+        # Where the price is sensitive to vol, the IV itself is recovered
+        vega = calculator.calculate_greeks_batch(**live, volatilities=vols)["vega"]
+        identifiable = converged & (vega > 1e-3)
+        np.testing.assert_allclose(
+            solved["implied_volatility"][identifiable], vols[identifiable], atol=1e-6
+        )
+
+    def test_deep_otm_uses_bisection_fallback(self, calculator):
+        price = calculator.calculate_greeks_batch(100.0, 180.0, 0.1, 0.9, "call")
+        solved = calculator.implied_volatility_batch(
+            price["theoretical_price"], 100.0, 180.0, 0.1, "call"
+        )
+        assert solved["converged"]
+        assert solved["implied_volatility"] == pytest.approx(0.9, abs=1e-6)
+
+    def test_unsolvable_contracts_are_flagged(self, calculator):
+        solved = calculator.implied_volatility_batch(
+            option_prices=[5.0, 0.5, 150.0, 2.0],
+            spot_prices=100.0,
+            strike_prices=[90.0, 90.0, 90.0, 100.0],
+            times_to_expiry=[0.5, 0.5, 0.5, 0.0],
+            option_types="call",
+        )
+        # Below intrinsic, above spot, expired: no IV
+        assert solved["converged"].tolist() == [False, False, False, False]
+        assert np.isnan(solved["implied_volatility"]).all()
+
+
+class TestChainGreeksFill:
+    """/options/chain fills provider-missing Greeks from IV"""
+
+    def test_fills_only_missing_greeks(self):
+        provided = OptionContract(
+            symbol="SPY251219C00500000",
+            underlying_symbol="SPY",
+            option_type="call",
+            strike_price=500.0,
+            expiration_date="2099-12-19",
+            delta=0.42,
+            implied_volatility=0.2,
+        )
+        missing = OptionContract(
+            symbol="SPY251219P00500000",
+            underlying_symbol="SPY",
+            option_type="put",
+            strike_price=500.0,
+            expiration_date="2099-12-19",
+            implied_volatility=0.2,
+        )
+        no_iv = OptionContract(
+            symbol="SPY251219P00400000",
+            underlying_symbol="SPY",
+            option_type="put",
+            strike_price=400.0,
+            expiration_date="2099-12-19",
+        )
+
+        assert _fill_missing_greeks([provided, missing, no_iv], 500.0) == 1
+        assert provided.delta == 0.42 and provided.gamma is None
+        assert -1.0 < missing.delta < 0.0
+        assert missing.gamma > 0 and missing.rho < 0
+        assert no_iv.delta is None
+
+    def test_solves_iv_then_greeks_from_mid(self):
+        expiration = (datetime.now(UTC).date() + timedelta(days=60)).isoformat()
+        contract = OptionContract(
+            symbol="SPY-C500",
+            underlying_symbol="SPY",
+            option_type="call",
+            strike_price=500.0,
+            expiration_date=expiration,
+            bid=20.0,
+            ask=22.0,
+        )
+        no_quote = OptionContract(
+            symbol="SPY-C600",
+            underlying_symbol="SPY",
+            option_type="call",
+            strike_price=600.0,
+            expiration_date=expiration,
+        )
+
+        assert _fill_missing_iv([contract, no_quote], 500.0) == 1
+        assert 0 < contract.implied_volatility < 1
+        assert no_quote.implied_volatility is None
+
+        _fill_missing_greeks([contract, no_quote], 500.0)
+        assert 0 < contract.delta < 1
+        assert no_quote.delta is None
+
+
+class TestChainBenchmark:
+    """Micro-benchmark: 2,000-contract chain, batch vs scalar"""
+
+    def test_batch_chain(self, benchmark, calculator, chain):
+        result = benchmark(calculator.calculate_greeks_batch, **chain)
+        assert result.shape == (CHAIN_SIZE,)
+
+    def test_batch_implied_volatility(self, benchmark, calculator, chain):
+        live = {**chain, "times_to_expiry": np.abs(chain["times_to_expiry"]) + 1 / 365}
+        prices = calculator.calculate_greeks_batch(**live)["theoretical_price"]
+        live.pop("volatilities")
+        result = benchmark(calculator.implied_volatility_batch, prices, **live)
+        assert result["converged"].mean() > 0.95
+
+    def test_scalar_chain(self, benchmark, calculator, chain):
+        result = benchmark.pedantic(
+            scalar_chain, args=(calculator, chain), rounds=3, iterations=1
+        )
+        assert len(result) == CHAIN_SIZE
@@ -0,0 +1,277 @@
+"""
+Tests for the bulk portfolio Greeks engine
+Tests one bulk quote call per refresh, parity with the per-leg scalar Greeks,
+the snapshot shared by positions / greeks / P&L and single-flight refreshes
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import positions
+from app.services.greeks import GreeksCalculator
+from app.services.options_greeks import GreeksCalculator as BSCalculator
+from app.services.position_tracker import (
+    DEFAULT_IV,
+    PortfolioRiskEngine,
+    PositionTrackerService,
+    parse_occ_symbol,
+)
+
+
+ROOTS = ["SPY", "QQQ", "AAPL", "MSFT", "CSCO", "NVDA"]
+
+
+def occ(root, expiration, option_type, strike):
+    return f"{root}{expiration:%y%m%d}{option_type[0].upper()}{int(strike * 1000):08d}"
+
+
+def make_book(n, seed=3):
+    """n option legs, their underlyings' spots and the vol used to price them"""
+    rng = np.random.default_rng(seed)
+    spots = {root: float(rng.uniform(50, 500)) for root in ROOTS}
+    legs = []
+    for i in range(n):
+        root = ROOTS[i % len(ROOTS)]
+        expiration = datetime.now() + timedelta(days=int(rng.integers(10, 200)))
+        option_type = "call" if i % 2 else "put"
+        strike = round(spots[root] * float(rng.uniform(0.85, 1.15)))
+        legs.append(
+            {
+                "symbol": occ(root, expiration, option_type, strike),
+                "root": root,
+                "expiration": expiration,
+                "option_type": option_type,
+                "strike": float(strike),
+                "qty": int(rng.choice([-3, -1, 1, 2, 5])),
+                "vol": float(rng.uniform(0.15, 0.6)),
+            }
+        )
+    return legs, spots
+
+
+class FakeAlpaca:
+    def __init__(self, positions):
+        self.positions = positions
+        self.calls = 0
+
+    def get_positions(self):
+        self.calls += 1
+        return list(self.positions)
+
+
+class FakeTradier:
+    def __init__(self, quotes):
+        self.quotes = quotes
+        self.calls = []
+
+    async def get_quotes(self, symbols):
+        self.calls.append(list(symbols))
+        await asyncio.sleep(0.01)
+        found = [self.quotes[s] for s in symbols if s in self.quotes]
+        return {"quotes": {"quote": found}}
+
+
+def make_engine(n=150, ttl_seconds=60, stock_position=True):
+    legs, spots = make_book(n)
+    bs = BSCalculator(risk_free_rate=0.05)
+    quotes = {root: {"symbol": root, "last": spot} for root, spot in spots.items()}
+    positions = []
+    for i, leg in enumerate(legs):
+        days = (leg["expiration"] - datetime.now()).days
+        price = bs.calculate_greeks(
+            spot_price=spots[leg["root"]],
+            strike_price=leg["strike"],
+            time_to_expiry=days / 365,
+            volatility=leg["vol"],
+            option_type=leg["option_type"],
+        ).theoretical_price
+        quotes[leg["symbol"]] = {
+            "symbol": leg["symbol"],
+            "bid": price - 0.01,
+            "ask": price + 0.01,
+            "last": price,
+        }
+        positions.append(
+            {
+                "asset_id": f"asset-{i}",
+                "symbol": leg["symbol"],
+                "asset_class": "us_option",
+                "qty": str(leg["qty"]),
+                "avg_entry_price": "2.50",
+                "current_price": "0",
+                "market_value": str(price * leg["qty"] * 100),
+            }
+        )
+    if stock_position:
+        positions.append({"asset_id": "stock", "symbol": "AAPL", "asset_class": "us_equity"})
+
+    engine = PortfolioRiskEngine(
+        alpaca=FakeAlpaca(positions),
+        tradier=FakeTradier(quotes),
+        greeks_calc=GreeksCalculator(risk_free_rate=0.05),
+        ttl_seconds=ttl_seconds,
+    )
+    return engine, legs, spots
+
+
+class TestOccSymbols:
+    """OCC symbol parsing"""
+
+    def test_parses_root_date_type_and_strike(self):
+        contract = parse_occ_symbol("SPY250117C00590000")
+        assert contract == ("SPY", "2025-01-17", "call", 590.0)
+
+    def test_root_containing_c_is_still_a_put(self):
+        contract = parse_occ_symbol("CSCO250117P00052500")
+        assert contract.underlying == "CSCO"
+        assert contract.option_type == "put"
+        assert contract.strike == 52.5
+
+    def test_rejects_equity_symbols(self):
+        with pytest.raises(ValueError):
+            parse_occ_symbol("AAPL")
+
+
+class TestBulkPricing:
+    """One quote round-trip and vectorized Greeks for the whole book"""
+
+    def test_one_quote_call_for_all_legs(self):
+        engine, legs, _ = make_engine(150)
+        snapshot = asyncio.run(engine.get_snapshot())
+
+        assert len(engine.tradier.calls) == 1
+        assert set(engine.tradier.calls[0]) == {leg["symbol"] for leg in legs} | set(ROOTS)
+        assert snapshot.greeks.position_count == 150
+        assert len(snapshot.positions) == 150
+
+    def test_greeks_match_scalar_path(self):
+        engine, legs, spots = make_engine(60)
+        snapshot = asyncio.run(engine.get_snapshot())
+        calc = GreeksCalculator(risk_free_rate=0.05)
+
+        totals = dict.fromkeys(("delta", "gamma", "theta", "vega"), 0.0)
+        for leg, position in zip(legs, snapshot.positions, strict=True):
+            expected = calc.calculate_greeks(
+                leg["option_type"],
+                spots[leg["root"]],
+                leg["strike"],
+                position.days_to_expiry,
+                leg["vol"],
+            )
+            for name, value in expected.items():
+                assert getattr(position.greeks, name) == pytest.approx(value, rel=1e-4, abs=1e-6)
+                totals[name] += value * leg["qty"]
+
+        assert snapshot.greeks.total_delta == pytest.approx(totals["delta"], rel=1e-4)
+        assert snapshot.greeks.total_vega == pytest.approx(totals["vega"], rel=1e-4)
+
+    def test_pnl_uses_option_price_not_underlying(self):
+        engine, legs, _ = make_engine(20)
+        snapshot = asyncio.run(engine.get_snapshot())
+
+        for leg, position in zip(legs, snapshot.positions, strict=True):
+            assert position.symbol == leg["root"]
+            expected = (position.current_price - 2.5) * leg["qty"] * 100
+            assert position.unrealized_pl == pytest.approx(expected)
+        assert snapshot.pnl.total_unrealized_pl == pytest.approx(
+            sum(p.unrealized_pl for p in snapshot.positions)
+        )
+
+    def test_unpriceable_legs_fall_back_to_default_iv(self):
+        engine, legs, spots = make_engine(4)
+        engine.tradier.quotes[legs[0]["symbol"]] = {"symbol": legs[0]["symbol"], "last": 0}
+        snapshot = asyncio.run(engine.get_snapshot())
+
+        expected = GreeksCalculator().calculate_greeks(
+            legs[0]["option_type"],
+            spots[legs[0]["root"]],
+            legs[0]["strike"],
+            snapshot.positions[0].days_to_expiry,
+            DEFAULT_IV,
+        )
+        assert snapshot.positions[0].greeks.delta == pytest.approx(expected["delta"], rel=1e-6)
+
+
+class TestSharedSnapshot:
+    """Positions, Greeks and P&L endpoints share one refresh"""
+
+    def test_three_reads_one_quote_call(self):
+        engine, _, _ = make_engine(30)
+        service = PositionTrackerService(risk_engine=engine)
+
+        async def read_all():
+            positions = await service.get_open_positions()
+            greeks = await service.get_portfolio_greeks()
+            pnl = await service.get_portfolio_pnl()
+            return positions, greeks, pnl
+
+        positions, greeks, pnl = asyncio.run(read_all())
+        assert len(positions) == greeks.position_count == pnl.position_count == 30
+        assert len(engine.tradier.calls) == 1
+        assert engine.get_stats()["hits"] == 2
+
+    def test_position_change_rebuilds(self):
+        engine, _, _ = make_engine(10)
+        first = asyncio.run(engine.get_snapshot())
+        engine.alpaca.positions = engine.alpaca.positions[1:]
+        second = asyncio.run(engine.get_snapshot())
+
+        assert second.version != first.version
+        assert second.greeks.position_count == 9
+        assert len(engine.tradier.calls) == 2
+
+    def test_expired_snapshot_rebuilds(self):
+        engine, _, _ = make_engine(10, ttl_seconds=0)
+        asyncio.run(engine.get_snapshot())
+        asyncio.run(engine.get_snapshot())
+        assert len(engine.tradier.calls) == 2
+
+    def test_concurrent_callers_share_one_refresh(self):
+        engine, _, _ = make_engine(50)
+
+        async def burst():
+            return await asyncio.gather(*(engine.get_snapshot() for _ in range(20)))
+
+        snapshots = asyncio.run(burst())
+        assert all(s is snapshots[0] for s in snapshots)
+        assert engine.alpaca.calls == 1
+        assert len(engine.tradier.calls) == 1
+        assert engine.get_stats()["shared_refreshes"] == 19
+
+    def test_empty_book_makes_no_quote_call(self):
+        engine = PortfolioRiskEngine(
+            alpaca=FakeAlpaca([]), tradier=FakeTradier({}), ttl_seconds=60
+        )
+        snapshot = asyncio.run(engine.get_snapshot())
+        assert snapshot.positions == []
+        assert snapshot.greeks.total_delta == 0
+        assert snapshot.pnl.total_unrealized_pl_percent == 0
+        assert engine.tradier.calls == []
+
+
+class TestEndpoints:
+    """Greeks and P&L routes return the snapshot in the usual envelope"""
+
+    def test_greeks_and_pnl_envelopes(self, monkeypatch):
+        engine, _, _ = make_engine(12)
+        monkeypatch.setattr("app.services.position_tracker._portfolio_risk_engine", engine)
+        app = FastAPI()
+        app.include_router(positions.router)
+        app.dependency_overrides[get_current_user_unified] = lambda: None
+        client = TestClient(app)
+
+        greeks = client.get("/api/positions/greeks")
+        pnl = client.get("/api/positions/pnl")
+
+        assert greeks.status_code == 200
+        assert pnl.status_code == 200
+        assert greeks.json()["data"]["position_count"] == 12
+        assert pnl.json()["data"]["position_count"] == 12
+        assert "timestamp" in pnl.json()
+        assert len(engine.tradier.calls) == 1
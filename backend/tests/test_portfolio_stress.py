@@ -0,0 +1,189 @@
+"""
+Tests for the portfolio stress grid
+Tests grid construction, parity with scalar repricing, expiry handling and
+benchmarks a 200-leg book on the default grid
+"""
+
+import numpy as np
+import pytest
+
+from app.services.greeks import GreeksCalculator
+from app.services.options_greeks import GreeksCalculator as BSCalculator
+from app.services.portfolio_stress import (
+    MAX_SCENARIOS,
+    StressGrid,
+    stress_pnl,
+    stress_portfolio,
+)
+from app.services.position_tracker import (
+    LEG_DTYPE,
+    PortfolioGreeks,
+    PortfolioPnL,
+    PortfolioSnapshot,
+    Position,
+    PositionGreeks,
+)
+
+
+def make_legs(n, seed=11):
+    rng = np.random.default_rng(seed)
+    legs = np.zeros(n, dtype=LEG_DTYPE)
+    legs["spot"] = rng.uniform(50, 500, n)
+    legs["strike"] = np.round(legs["spot"] * rng.uniform(0.8, 1.2, n))
+    legs["days_to_expiry"] = rng.integers(2, 120, n)
+    legs["implied_volatility"] = rng.uniform(0.15, 0.7, n)
+    legs["is_call"] = rng.random(n) < 0.5
+    legs["qty"] = rng.choice([-5, -2, -1, 1, 3, 10], n)
+    return legs
+
+
+def make_snapshot(legs):
+    zero = PositionGreeks(delta=0, gamma=0, theta=0, vega=0)
+    positions = [
+        Position(
+            id=f"asset-{i}",
+            symbol="SPY",
+            option_symbol=f"SPY-{i}",
+            qty=int(leg["qty"]),
+            avg_entry_price=1.0,
+            current_price=1.0,
+            unrealized_pl=0,
+            unrealized_pl_percent=0,
+            market_value=0,
+            cost_basis=0,
+            greeks=zero,
+            expiration="2030-01-01",
+            days_to_expiry=int(leg["days_to_expiry"]),
+            status="open",
+        )
+        for i, leg in enumerate(legs)
+    ]
+    return PortfolioSnapshot(
+        version="v1",
+        positions=positions,
+        greeks=PortfolioGreeks(
+            total_delta=0, total_gamma=0, total_theta=0, total_vega=0, position_count=len(legs)
+        ),
+        pnl=PortfolioPnL(
+            total_unrealized_pl=0,
+            total_unrealized_pl_percent=0,
+            total_cost_basis=0,
+            total_market_value=0,
+            position_count=len(legs),
+        ),
+        legs=legs,
+    )
+
+
+def scalar_price(bs, leg, spot_move, iv_shock, days_forward):
+    days = max(0.0, leg["days_to_expiry"] - days_forward)
+    return bs.calculate_greeks(
+        spot_price=leg["spot"] * (1 + spot_move),
+        strike_price=leg["strike"],
+        time_to_expiry=days / 365,
+        volatility=max(leg["implied_volatility"] + iv_shock, 0.01),
+        option_type="call" if leg["is_call"] else "put",
+    ).theoretical_price
+
+
+class TestStressGrid:
+    """Grid construction and validation"""
+
+    def test_default_grid(self):
+        grid = StressGrid.build()
+        assert len(grid.spot_moves) == 41
+        assert grid.spot_moves[0] == -0.2 and grid.spot_moves[-1] == 0.2
+        assert 0.0 in grid.spot_moves
+        assert grid.shape == (4, 5, 41)
+
+    def test_rejects_invalid_axes(self):
+        with pytest.raises(ValueError):
+            StressGrid.build(spot_range=0.2, spot_step=0)
+        with pytest.raises(ValueError):
+            StressGrid.build(iv_shocks=[])
+        with pytest.raises(ValueError):
+            StressGrid.build(days_forward=[-1])
+        with pytest.raises(ValueError):
+            StressGrid.build(spot_range=0.5, spot_step=MAX_SCENARIOS**-1)
+
+
+class TestRepricing:
+    """Broadcast repricing matches scalar Black-Scholes"""
+
+    def test_matches_scalar_repricing(self):
+        legs = make_legs(8)
+        grid = StressGrid.build(
+            spot_range=0.1, spot_step=0.05, iv_shocks=[-0.05, 0, 0.1], days_forward=[0, 5, 500]
+        )
+        pnl = stress_pnl(legs, grid)
+        assert pnl.shape == (8, 3, 3, 5)
+
+        bs = BSCalculator(risk_free_rate=0.05)
+        for i, leg in enumerate(legs):
+            today = scalar_price(bs, leg, 0, 0, 0)
+            for d, days in enumerate(grid.days_forward):
+                for v, shock in enumerate(grid.iv_shocks):
+                    for s, move in enumerate(grid.spot_moves):
+                        price = scalar_price(bs, leg, move, shock, days)
+                        expected = (price - today) * leg["qty"] * 100
+                        assert pnl[i, d, v, s] == pytest.approx(expected, rel=1e-6, abs=1e-6)
+
+    def test_unshocked_cell_is_zero(self):
+        legs = make_legs(20)
+        grid = StressGrid.build()
+        pnl = stress_pnl(legs, grid)
+        center = len(grid.spot_moves) // 2
+        assert np.allclose(pnl[:, 0, 2, center], 0)
+
+    def test_past_expiry_prices_at_intrinsic(self):
+        legs = make_legs(1)
+        legs["is_call"] = True
+        legs["strike"] = legs["spot"]
+        grid = StressGrid.build(spot_range=0.1, spot_step=0.1, iv_shocks=[0], days_forward=[1000])
+        pnl = stress_pnl(legs, grid)[0, 0, 0]
+        today = GreeksCalculator().price_batch(
+            [True], legs["spot"], legs["strike"], legs["days_to_expiry"], legs["implied_volatility"]
+        )[0]
+        intrinsic = np.maximum(0, legs["spot"][0] * (1 + grid.spot_moves) - legs["strike"][0])
+        assert np.allclose(pnl, (intrinsic - today) * legs["qty"][0] * 100)
+
+    def test_legs_without_quotes_contribute_zero(self):
+        legs = make_legs(3)
+        legs["spot"][1] = np.nan
+        pnl = stress_pnl(legs, StressGrid.build())
+        assert np.isfinite(pnl).all()
+        assert (pnl[1] == 0).all()
+
+
+class TestStressPortfolio:
+    """Aggregate and per-position matrices"""
+
+    def test_aggregate_is_sum_of_positions(self):
+        result = stress_portfolio(make_snapshot(make_legs(25)), StressGrid.build())
+        aggregate = np.array(result.aggregate)
+        per_position = np.array([p.pnl for p in result.positions])
+        assert aggregate.shape == (4, 5, 41)
+        assert np.allclose(per_position.sum(axis=0), aggregate)
+        assert result.worst_case.pnl == pytest.approx(aggregate.min())
+        assert result.best_case.pnl == pytest.approx(aggregate.max())
+
+    def test_empty_book(self):
+        result = stress_portfolio(make_snapshot(make_legs(0)), StressGrid.build())
+        assert result.position_count == 0
+        assert np.array(result.aggregate).shape == (4, 5, 41)
+        assert result.worst_case is None
+
+    def test_200_leg_book_on_default_grid(self):
+        pnl = stress_pnl(make_legs(200), StressGrid.build())
+        assert pnl.shape == (200, 4, 5, 41)
+        assert np.isfinite(pnl).all()
+
+
+def test_benchmark_200_leg_stress(benchmark):
+    """Benchmark only: 200 legs on the default grid (budget ~100 ms)"""
+    legs = make_legs(200)
+    grid = StressGrid.build()
+
+    benchmark.group = "portfolio stress"
+    pnl = benchmark.pedantic(stress_pnl, args=(legs, grid), rounds=10, warmup_rounds=1)
+    assert pnl.shape == (200, 4, 5, 41)
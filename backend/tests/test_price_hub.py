@@ -0,0 +1,172 @@
+"""
+Tests for the in-process price fan-out hub
+Tests per-symbol routing, coalescing, change detection and trade/quote precedence
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+from app.services.price_hub import PriceHub
+
+
+def quote(symbol, bid, ask, ts="2024-10-13T10:00:00"):
+    return {"symbol": symbol, "bid": bid, "ask": ask, "mid": (bid + ask) / 2, "timestamp": ts}
+
+
+def trade(symbol, price, size=100, ts="2024-10-13T10:00:01"):
+    return {"symbol": symbol, "price": price, "size": size, "timestamp": ts}
+
+
+class TestPriceHub:
+    """PriceHub publish/subscribe behaviour"""
+
+    def test_routes_only_subscribed_symbols(self):
+        async def scenario():
+            hub = PriceHub()
+            aapl = hub.subscribe(["AAPL"])
+            msft = hub.subscribe(["MSFT"])
+
+            hub.publish("quote", quote("AAPL", 100.0, 100.2))
+
+            assert (await aapl.next_update(timeout=0.1))["AAPL"]["price"] == 100.1
+            assert await msft.next_update(timeout=0.01) == {}
+
+        asyncio.run(scenario())
+
+    def test_coalesces_to_latest_value(self):
+        async def scenario():
+            hub = PriceHub()
+            sub = hub.subscribe(["AAPL", "MSFT"])
+            for i in range(50):
+                hub.publish("quote", quote("AAPL", 100.0 + i, 100.2 + i))
+            hub.publish("quote", quote("MSFT", 300.0, 300.2))
+
+            update = await sub.next_update(timeout=0.1)
+            assert set(update) == {"AAPL", "MSFT"}
+            assert update["AAPL"]["bid"] == 149.0
+            assert await sub.next_update(timeout=0.01) == {}
+
+        asyncio.run(scenario())
+
+    def test_unchanged_ticks_are_not_pushed(self):
+        async def scenario():
+            hub = PriceHub()
+            sub = hub.subscribe(["AAPL"])
+            assert hub.publish("quote", quote("AAPL", 100.0, 100.2)) is True
+            await sub.next_update(timeout=0.1)
+
+            assert hub.publish("quote", quote("AAPL", 100.0, 100.2)) is False
+            assert await sub.next_update(timeout=0.01) == {}
+            assert hub.unchanged == 1
+
+        asyncio.run(scenario())
+
+    def test_fresh_trade_takes_precedence_over_quote(self):
+        hub = PriceHub()
+        hub.publish("trade", trade("AAPL", 101.5))
+        hub.publish("quote", quote("AAPL", 100.0, 100.2))
+        assert hub.get_latest("AAPL")["type"] == "trade"
+
+        with patch("app.services.price_hub.time.monotonic", return_value=1e12):
+            hub.publish("quote", quote("AAPL", 100.4, 100.6))
+        assert hub.get_latest("AAPL") == {
+            "price": 100.5,
+            "bid": 100.4,
+            "ask": 100.6,
+            "timestamp": "2024-10-13T10:00:00",
+            "type": "quote",
+        }
+
+    def test_new_subscriber_is_primed_and_unsubscribe_cleans_up(self):
+        async def scenario():
+            hub = PriceHub()
+            hub.publish("quote", quote("TSLA", 200.0, 200.4))
+
+            sub = hub.subscribe(["TSLA"])
+            assert (await sub.next_update(timeout=0.1))["TSLA"]["price"] == 200.2
+            assert hub.subscriber_count("TSLA") == 1
+
+            sub.close()
+            assert hub.subscriber_count() == 0
+            assert hub.get_stats()["symbols"] == 0
+
+        asyncio.run(scenario())
+
+    def test_bridge_messages_are_applied_without_echo(self):
+        async def scenario():
+            hub = PriceHub()
+            sub = hub.subscribe(["AAPL"])
+
+            class FakePubSub:
+                async def subscribe(self, channel):
+                    pass
+
+                async def listen(self):
+                    yield {"type": "subscribe", "data": 1}
+                    yield {
+                        "type": "message",
+                        "data": json.dumps(
+                            {"origin": hub.worker_id, "kind": "quote", "data": quote("AAPL", 1, 1)}
+                        ),
+                    }
+                    yield {
+                        "type": "message",
+                        "data": json.dumps(
+                            {"origin": "other", "kind": "trade", "data": trade("AAPL", 99.0)}
+                        ),
+                    }
+
+                async def aclose(self):
+                    pass
+
+            class FakeRedis:
+                def pubsub(self):
+                    return FakePubSub()
+
+            await hub._bridge_listen(FakeRedis())
+            update = await sub.next_update(timeout=0.1)
+            assert update["AAPL"]["price"] == 99.0
+            assert hub.published == 1
+
+        asyncio.run(scenario())
+
+    def test_ticks_every_worker_received_are_relayed_once(self):
+        async def scenario():
+            hub = PriceHub()
+            sent = []
+
+            class FakeRedis:
+                async def publish(self, channel, message):
+                    sent.append(json.loads(message))
+
+                def pubsub(self):
+                    return FakePubSub()
+
+            def relay(kind, data):
+                envelope = {"origin": "other", "kind": kind, "data": data}
+                return {"type": "message", "data": json.dumps(envelope)}
+
+            class FakePubSub:
+                async def subscribe(self, channel):
+                    pass
+
+                async def listen(self):
+                    # Another worker relays a trade first, then the quote this worker relayed
+                    yield relay("trade", trade("AAPL", 99.0, ts="other-clock"))
+                    hub.publish("trade", trade("AAPL", 99.0))
+                    hub.publish("quote", quote("AAPL", 100.0, 100.2))
+                    await asyncio.sleep(0)
+                    yield relay("quote", quote("AAPL", 100.0, 100.2, ts="other-clock"))
+
+                async def aclose(self):
+                    pass
+
+            hub._redis = FakeRedis()
+            await hub._bridge_listen(hub._redis)
+
+            assert [(m["origin"], m["kind"]) for m in sent] == [(hub.worker_id, "quote")]
+            assert hub.published == 2
+            assert hub.get_stats()["duplicates"] == 2
+
+        asyncio.run(scenario())
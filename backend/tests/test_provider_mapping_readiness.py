@@ -23,10 +23,11 @@ def test_market_quote_maps_provider_404(monkeypatch, client):
     from app.services.tradier_client import ProviderHTTPError
 
     class FakeClient:
-        def get_quotes(self, symbols):
+        async def get_quotes(self, symbols):
             raise ProviderHTTPError(404, "not found")
 
     monkeypatch.setattr(market_data_module, "get_tradier_client", lambda: FakeClient())
+    monkeypatch.setattr(market_data_module, "get_async_tradier_client", lambda: FakeClient())
 
     resp = client.get("/api/market/quote/UNKNOWN")
     assert resp.status_code == 404
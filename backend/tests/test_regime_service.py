@@ -0,0 +1,244 @@
+"""
+Tests for the market regime service
+Tests model warm-loading through ModelPersistence, the per-(symbol, lookback)
+feature cache and its last-bar invalidation, and predictions during a retrain
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml import market_regime
+from app.ml.market_regime import MarketRegimeDetector
+from app.ml.regime_service import MODEL_ID, RegimeService
+
+
+def make_frame(n=400, end="2024-06-28", seed=5):
+    index = pd.bdate_range(end=end, periods=n, name="date")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n)))
+    return pd.DataFrame(
+        {
+            "open": close * 0.998,
+            "high": close * (1 + rng.uniform(0.002, 0.03, n)),
+            "low": close * (1 - rng.uniform(0.002, 0.03, n)),
+            "close": close,
+            "volume": rng.uniform(0.5e6, 2e6, n),
+        },
+        index=index,
+    )
+
+
+class FakePipeline:
+    """Serves fixed frames; counts bar reads and feature builds"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.fetches = []
+        self.builds = []
+
+    def fetch_lookback(self, symbol, lookback_days):
+        self.fetches.append((symbol, lookback_days))
+        return self.frames.get(symbol, pd.DataFrame())
+
+    def prepare_features(self, symbol, lookback_days=730, bars=None):
+        self.builds.append((symbol, lookback_days))
+        frame = bars if bars is not None else self.frames.get(symbol)
+        return None if frame is None or frame.empty else frame.copy()
+
+
+class FakePersistence:
+    """In-memory ModelPersistence"""
+
+    def __init__(self):
+        self.bundles = {}
+        self.saves = 0
+
+    def save_model(self, model, model_id, version="1.0.0", metadata=None):
+        self.saves += 1
+        self.bundles[model_id] = {"model": model, "metadata": metadata, "saved_at": "now"}
+        return f"models/{model_id}.joblib"
+
+    def list_models(self, model_id=None):
+        return [{"model_id": model_id}] if model_id in self.bundles else []
+
+    def load_model(self, model_id, version=None):
+        return self.bundles[model_id]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = FakePipeline({"SPY": make_frame(seed=1), "AAPL": make_frame(seed=2)})
+    # MarketRegimeDetector.train reads the shared pipeline
+    monkeypatch.setattr(market_regime, "get_data_pipeline", lambda: pipeline)
+    return pipeline
+
+
+def make_service(pipeline, persistence=None, **kwargs):
+    return RegimeService(
+        detector=MarketRegimeDetector(),
+        pipeline=pipeline,
+        persistence=persistence or FakePersistence(),
+        **kwargs,
+    )
+
+
+class TestWarmStart:
+    """Models are loaded from persistence and trained at most once"""
+
+    def test_trains_and_persists_when_nothing_is_stored(self, pipeline):
+        persistence = FakePersistence()
+        service = make_service(pipeline, persistence)
+
+        assert service.ensure_model()
+        assert service.model_source == "trained"
+        assert persistence.saves == 1
+        assert persistence.bundles[MODEL_ID]["metadata"]["symbol"] == "SPY"
+
+    def test_restart_loads_instead_of_training(self, pipeline):
+        persistence = FakePersistence()
+        first = make_service(pipeline, persistence)
+        first.ensure_model()
+        expected = first.predict("AAPL", 90)
+        builds = len(pipeline.builds)
+
+        restarted = make_service(pipeline, persistence)
+        assert restarted.ensure_model()
+        assert restarted.model_source == "persisted"
+        assert persistence.saves == 1
+        assert len(pipeline.builds) == builds  # no training fetch
+
+        result = restarted.predict("AAPL", 90)
+        assert result["regime"] == expected["regime"]
+        assert result["cluster_id"] == expected["cluster_id"]
+
+    def test_predict_during_warmup_waits_for_it(self, pipeline, monkeypatch):
+        service = make_service(pipeline)
+        trained = threading.Event()
+        train = MarketRegimeDetector.train
+
+        def slow_train(detector, *args):
+            time.sleep(0.05)
+            ok = train(detector, *args)
+            trained.set()
+            return ok
+
+        monkeypatch.setattr(MarketRegimeDetector, "train", slow_train)
+        assert service.start_warmup()
+        result = service.predict("AAPL", 90)
+
+        assert trained.is_set()
+        assert result["regime"] != "unknown"
+        assert service.persistence.saves == 1
+        assert not service.start_warmup()  # already fitted
+
+    def test_predict_during_retrain_uses_the_current_model(self, pipeline, monkeypatch):
+        service = make_service(pipeline, refresh_seconds=60)
+        service.ensure_model()
+        before = service.predict("AAPL", 90)
+
+        fitting = threading.Event()
+        release = threading.Event()
+        train = MarketRegimeDetector.train
+
+        def blocked_train(detector, *args):
+            ok = train(detector, *args)
+            fitting.set()
+            release.wait(5)
+            return ok
+
+        monkeypatch.setattr(MarketRegimeDetector, "train", blocked_train)
+        pipeline.frames["SPY"] = make_frame(seed=9)  # the retrain fits a different model
+        retrain = threading.Thread(target=service.train, args=("SPY", 730))
+        retrain.start()
+        try:
+            assert fitting.wait(5)
+            assert service.predict("AAPL", 90) == before
+            assert service.get_stats()["model_ready"]
+        finally:
+            release.set()
+            retrain.join(5)
+
+        assert service.persistence.saves == 2
+        assert service.predict("AAPL", 90)["confidence"] != before["confidence"]
+
+
+class TestFeatureCache:
+    """Feature frames are reused until the last bar changes"""
+
+    @pytest.fixture
+    def service(self, pipeline):
+        service = make_service(pipeline, refresh_seconds=60)
+        service.ensure_model()
+        pipeline.fetches.clear()
+        pipeline.builds.clear()
+        return service
+
+    def test_matches_detector_predict(self, service, pipeline):
+        result = service.predict("AAPL", 90)
+        direct = service.detector.predict("AAPL", 90)
+        assert result["regime"] == direct["regime"]
+        assert result["confidence"] == pytest.approx(direct["confidence"])
+        assert result["features"] == pytest.approx(direct["features"])
+
+    def test_hits_skip_bars_and_features(self, service, pipeline):
+        first = service.predict("AAPL", 90)
+        for _ in range(20):
+            assert service.predict("aapl", 90) == first
+        assert pipeline.fetches == [("AAPL", 90)]
+        assert pipeline.builds == [("AAPL", 90)]
+        assert service.get_stats()["hits"] == 20
+
+    def test_lookbacks_are_cached_separately(self, service, pipeline):
+        service.predict("AAPL", 90)
+        service.predict("AAPL", 180)
+        assert pipeline.builds == [("AAPL", 90), ("AAPL", 180)]
+
+    def test_recheck_rebuilds_only_when_last_bar_changes(self, service, pipeline):
+        service.refresh_seconds = 0
+        service.predict("AAPL", 90)
+        service.predict("AAPL", 90)
+        assert len(pipeline.fetches) == 2 and len(pipeline.builds) == 1
+
+        # Today's bar moved
+        frame = pipeline.frames["AAPL"].copy()
+        frame.iloc[-1, frame.columns.get_loc("close")] *= 1.02
+        pipeline.frames["AAPL"] = frame
+        service.predict("AAPL", 90)
+        assert len(pipeline.builds) == 2
+
+        # A new bar arrived
+        nxt = frame.iloc[-1:].copy()
+        nxt.index = nxt.index + pd.offsets.BDay(1)
+        pipeline.frames["AAPL"] = pd.concat([frame, nxt])
+        service.predict("AAPL", 90)
+        assert len(pipeline.builds) == 3
+        assert service.get_stats()["rechecks"] == 1
+
+    def test_missing_data_is_not_cached(self, service, pipeline):
+        result = service.predict("ZZZZ", 90)
+        assert result["regime"] == "unknown" and result["error"] == "No data available"
+        assert service.get_stats()["feature_entries"] == 0
+
+    def test_lru_eviction(self, pipeline):
+        service = make_service(pipeline, max_entries=2, refresh_seconds=60)
+        service.ensure_model()
+        for lookback in (60, 90, 120):
+            service.predict("AAPL", lookback)
+        assert service.get_stats()["feature_entries"] == 2
+        service.predict("AAPL", 60)
+        assert pipeline.builds[-1] == ("AAPL", 60)
+        assert service.invalidate("AAPL") == 2
+
+
+def test_benchmark_cached_prediction(benchmark, pipeline):
+    """Benchmark only: a prediction answered from the feature cache"""
+    service = make_service(pipeline, refresh_seconds=3600)
+    service.ensure_model()
+    service.predict("AAPL", 90)
+
+    benchmark.group = "regime service"
+    benchmark.pedantic(service.predict, args=("AAPL", 90), rounds=200, warmup_rounds=1)
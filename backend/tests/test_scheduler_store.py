@@ -0,0 +1,251 @@
+"""
+Tests for the scheduler execution and approval store
+Tests paginated history queries, the pending-approval queue, one-time
+approval decisions, retention pruning and the migration from JSON files
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import scheduler
+from app.services.scheduler_store import EXECUTION_COLUMNS, SchedulerStore, get_scheduler_store
+
+
+T0 = datetime(2026, 3, 2, 14, 30, tzinfo=UTC)
+
+
+def execution(i, schedule_id="sched-a", status="completed", started=None):
+    return {
+        "id": f"exec-{i:06d}",
+        "schedule_id": schedule_id,
+        "schedule_name": "Morning",
+        "execution_type": "morning_routine",
+        "status": status,
+        "started_at": (started or T0 + timedelta(minutes=i)).isoformat(),
+        "completed_at": None,
+        "result": None,
+        "error": None,
+    }
+
+
+def approval(i, status="pending", created=None, expires_in=timedelta(hours=4)):
+    created = created or T0 + timedelta(minutes=i)
+    return {
+        "id": f"appr-{i:04d}",
+        "execution_id": f"exec-{i:06d}",
+        "schedule_id": "sched-a",
+        "schedule_name": "Morning",
+        "trade_type": "buy",
+        "symbol": "AAPL",
+        "quantity": 10,
+        "estimated_price": 150.0,
+        "estimated_value": 1500.0,
+        "reason": "breakout",
+        "risk_score": 3,
+        "ai_confidence": 85.0,
+        "supporting_data": {"technical_signals": ["RSI oversold"]},
+        "status": status,
+        "created_at": created.isoformat(),
+        "expires_at": (created + expires_in).isoformat(),
+        "approved_at": None,
+        "approved_by": None,
+        "rejection_reason": None,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SchedulerStore(tmp_path / "scheduler.db", retention_days=0)
+    yield store
+    store.close()
+
+
+class TestExecutions:
+    """Execution records and history queries"""
+
+    def test_create_and_complete(self, store):
+        store.create_execution(execution(1, status="running"))
+        assert store.complete_execution("exec-000001", "failed", None, "broker down")
+        record = store.get_execution("exec-000001")
+        assert record["status"] == "failed"
+        assert record["error"] == "broker down"
+        assert record["completed_at"] is not None
+        assert not store.complete_execution("missing", "completed", "ok")
+
+    def test_pagination_newest_first(self, store):
+        for i in range(25):
+            store.create_execution(execution(i))
+        page, total = store.list_executions(limit=10, offset=10)
+        assert total == 25
+        assert [e["id"] for e in page] == [f"exec-{i:06d}" for i in range(14, 4, -1)]
+
+    def test_filters_by_schedule_and_status(self, store):
+        for i in range(30):
+            store.create_execution(
+                execution(
+                    i,
+                    schedule_id="sched-a" if i % 3 else "sched-b",
+                    status="failed" if i % 5 == 0 else "completed",
+                )
+            )
+        page, total = store.list_executions(schedule_id="sched-b", limit=100)
+        assert total == 10 and all(e["schedule_id"] == "sched-b" for e in page)
+        page, total = store.list_executions(schedule_id="sched-b", status="failed", limit=100)
+        assert [e["id"] for e in page] == ["exec-000015", "exec-000000"]
+        assert total == 2
+
+    def test_history_page_uses_schedule_index(self, store):
+        for chunk in range(5):
+            store._insert(
+                "executions",
+                EXECUTION_COLUMNS,
+                [execution(chunk * 10_000 + i) for i in range(10_000)],
+            )
+
+        page, total = store.list_executions(schedule_id="sched-a", limit=20, offset=100)
+        assert total == 50_000
+        assert len(page) == 20 and page[0]["id"] == "exec-049899"
+
+        plan = store._query(
+            "EXPLAIN QUERY PLAN SELECT * FROM executions WHERE schedule_id = ? "
+            "ORDER BY started_at DESC LIMIT 20",
+            ("sched-a",),
+        )
+        details = " ".join(row["detail"] for row in plan)
+        assert "ix_executions_schedule" in details
+        assert "TEMP B-TREE" not in details
+
+
+class TestApprovals:
+    """Pending queue and decisions"""
+
+    def test_pending_excludes_decided_and_expired(self, store):
+        now = datetime.now(UTC)
+        store.create_approvals(
+            [
+                approval(1, created=now - timedelta(minutes=5)),
+                approval(2, created=now - timedelta(minutes=1)),
+                approval(3, status="approved", created=now),
+                approval(4, created=now - timedelta(hours=5)),  # expired
+            ]
+        )
+        pending, total = store.list_pending_approvals()
+        assert [a["id"] for a in pending] == ["appr-0002", "appr-0001"]
+        assert total == 2
+        assert pending[0]["supporting_data"] == {"technical_signals": ["RSI oversold"]}
+
+        page, total = store.list_pending_approvals(limit=1, offset=1)
+        assert [a["id"] for a in page] == ["appr-0001"] and total == 2
+
+    def test_decision_applies_once(self, store):
+        store.create_approvals([approval(1, created=datetime.now(UTC))])
+        decided = {"status": "approved", "approved_at": datetime.now(UTC).isoformat()}
+        assert store.decide_approval("appr-0001", decided)
+        assert not store.decide_approval("appr-0001", {"status": "rejected"})
+        assert store.get_approval("appr-0001")["status"] == "approved"
+        assert not store.decide_approval("missing", decided)
+
+    def test_decision_rejects_other_fields(self, store):
+        store.create_approvals([approval(1)])
+        with pytest.raises(ValueError):
+            store.decide_approval("appr-0001", {"quantity": 1000})
+
+
+class TestMaintenance:
+    """Retention pruning and the JSON file migration"""
+
+    def test_prune_keeps_recent_and_pending(self, store):
+        now = datetime.now(UTC)
+        store.create_execution(execution(1, started=now - timedelta(days=100)))
+        store.create_execution(execution(2, started=now))
+        store.create_approvals(
+            [
+                approval(1, status="approved", created=now - timedelta(days=100)),
+                approval(2, created=now - timedelta(days=100), expires_in=timedelta(days=200)),
+            ]
+        )
+        assert store.prune(now - timedelta(days=90)) == 2
+        assert store.get_execution("exec-000001") is None
+        assert store.get_execution("exec-000002") is not None
+        assert store.get_approval("appr-0002") is not None
+
+    def test_migrates_files_once(self, store, tmp_path):
+        executions_dir = tmp_path / "executions"
+        approvals_dir = tmp_path / "approvals"
+        executions_dir.mkdir()
+        approvals_dir.mkdir()
+        for i in range(5):
+            record = execution(i)
+            (executions_dir / f"{record['id']}.json").write_text(json.dumps(record))
+        (executions_dir / "exec-000000.strategy.json").write_text(json.dumps({"orders": []}))
+        (executions_dir / "broken.json").write_text("{not json")
+        record = approval(1, created=datetime.now(UTC))
+        (approvals_dir / f"{record['id']}.json").write_text(json.dumps(record))
+
+        counts = store.migrate_files(executions_dir, approvals_dir, batch_size=2)
+        assert counts == {"executions": 5, "approvals": 1, "skipped": 1}
+        assert store.list_executions()[1] == 5
+        assert store.get_approval("appr-0001")["supporting_data"] == record["supporting_data"]
+
+        (executions_dir / "exec-000099.json").write_text(json.dumps(execution(99)))
+        assert store.migrate_files(executions_dir, approvals_dir) == {
+            "executions": 0,
+            "approvals": 0,
+            "skipped": 0,
+        }
+        assert (executions_dir / "exec-000001.json").exists()
+
+    def test_reopen_keeps_data(self, tmp_path):
+        path = tmp_path / "scheduler.db"
+        first = SchedulerStore(path, retention_days=0)
+        first.create_execution(execution(1))
+        first.close()
+        second = SchedulerStore(path, retention_days=0)
+        assert second.get_execution("exec-000001")["schedule_name"] == "Morning"
+        assert second.get_stats()["executions"] == {"completed": 1}
+        second.close()
+
+
+class TestEndpoints:
+    """History and approval routes return the paginated envelope"""
+
+    @pytest.fixture
+    def client(self, store):
+        app = FastAPI()
+        app.include_router(scheduler.router)
+        app.dependency_overrides[get_current_user_unified] = lambda: None
+        app.dependency_overrides[get_scheduler_store] = lambda: store
+        return TestClient(app)
+
+    def test_executions_page(self, client, store):
+        for i in range(5):
+            store.create_execution(execution(i))
+
+        response = client.get("/scheduler/executions", params={"limit": 2, "offset": 1})
+
+        assert response.status_code == 200
+        body = response.json()
+        assert [e["id"] for e in body["data"]] == ["exec-000003", "exec-000002"]
+        assert (body["count"], body["total"], body["limit"], body["offset"]) == (2, 5, 2, 1)
+
+    def test_pending_approvals_and_decisions(self, client, store):
+        now = datetime.now(UTC)
+        store.create_approvals([approval(1, created=now), approval(2, created=now)])
+
+        pending = client.get("/scheduler/pending-approvals")
+        assert pending.status_code == 200
+        assert pending.json()["total"] == 2
+        assert pending.json()["data"][0]["supporting_data"] == {
+            "technical_signals": ["RSI oversold"]
+        }
+
+        assert client.post("/scheduler/approvals/appr-0001/approve").status_code == 200
+        rejected = client.post("/scheduler/approvals/appr-0002/reject", json={"reason": "no"})
+        assert rejected.status_code == 200
+        assert client.post("/scheduler/approvals/appr-0002/approve").status_code == 400
+        assert client.get("/scheduler/pending-approvals").json()["total"] == 0
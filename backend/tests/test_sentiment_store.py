@@ -0,0 +1,204 @@
+"""
+Tests for per-article sentiment caching and batching
+Runs SentimentAnalyzer against a local fake Anthropic Messages server to check
+content-hash reuse, cross-request batching and non-blocking model calls
+"""
+
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import anthropic
+import pytest
+
+from app.ml.sentiment_analyzer import SentimentAnalyzer
+from app.ml.sentiment_store import SentimentBatcher, SentimentStore, article_key
+
+
+ARTICLE_HEADER = re.compile(r"^\[(\d+)\] \((.*?)\) Title: (.*)$", re.MULTILINE)
+
+
+class FakeModelServer:
+    """Local Messages API scoring articles by keyword, recording each call's titles"""
+
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.delay = 0.0
+        self.status = 200
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                prompt = body["messages"][0]["content"]
+                titles = [m.group(3) for m in ARTICLE_HEADER.finditer(prompt)]
+                server.calls.append(titles)
+                time.sleep(server.delay)
+
+                lines = [server.score_line(i, title) for i, title in enumerate(titles, 1)]
+                payload = json.dumps(
+                    {
+                        "id": f"msg_{len(server.calls)}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": body["model"],
+                        "content": [{"type": "text", "text": "\n".join(lines)}],
+                        "stop_reason": "end_turn",
+                        "stop_sequence": None,
+                        "usage": {"input_tokens": 10, "output_tokens": 10},
+                    }
+                ).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @staticmethod
+    def score_line(number, title):
+        if "beats" in title:
+            return f"ARTICLE {number} | BULLISH | 0.8 | 0.9 | Earnings beat"
+        if "misses" in title:
+            return f"ARTICLE {number} | BEARISH | -0.6 | 0.8 | Earnings miss"
+        return f"ARTICLE {number} | NEUTRAL | 0.0 | 0.5 | No clear catalyst"
+
+    @property
+    def articles_scored(self):
+        return [title for call in self.calls for title in call]
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def article(title, source="Reuters"):
+    return {"title": title, "summary": f"{title} (summary)", "source": source}
+
+
+@pytest.fixture
+def model_server():
+    server = FakeModelServer()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def analyzer(model_server):
+    client = anthropic.AsyncAnthropic(
+        api_key="test-key", base_url=model_server.url, max_retries=0
+    )
+    store = SentimentStore(redis_factory=None)
+    analyzer = SentimentAnalyzer(client=client, store=store)
+    analyzer.batcher = SentimentBatcher(
+        analyzer._score_article_batch, max_batch=20, max_wait_ms=50
+    )
+    return analyzer
+
+
+class TestArticleStore:
+    """Each article is scored at most once"""
+
+    def test_shared_article_is_scored_once_across_symbols(self, analyzer, model_server):
+        shared = article("Chipmakers beats estimates on AI demand")
+
+        async def main():
+            first = await analyzer.analyze_news_batch(
+                "NVDA", [shared, article("NVDA misses on margins")]
+            )
+            second = await analyzer.analyze_news_batch("AMD", [shared])
+            return first, second
+
+        first, second = asyncio.run(main())
+
+        assert sorted(model_server.articles_scored) == [
+            "Chipmakers beats estimates on AI demand",
+            "NVDA misses on margins",
+        ]
+        assert second.sentiment == "bullish"
+        assert second.score == pytest.approx(0.8)
+        assert first.reasoning.startswith("2 articles: 1 bullish, 1 bearish, 0 neutral.")
+
+    def test_key_ignores_source_and_metadata(self):
+        a = {"title": "Fed holds rates", "summary": "Unchanged", "source": "Reuters"}
+        b = {"title": "Fed holds rates ", "content": "Unchanged", "source": "AP", "id": 7}
+        assert article_key(a) == article_key(b)
+        assert article_key(a) != article_key({"title": "Fed cuts rates", "summary": "Unchanged"})
+
+    def test_failed_batch_is_not_stored(self, analyzer, model_server):
+        model_server.status = 500
+
+        async def main():
+            failed = await analyzer.analyze_news_batch("AAPL", [article("Apple beats")])
+            model_server.status = 200
+            retried = await analyzer.analyze_news_batch("AAPL", [article("Apple beats")])
+            return failed, retried
+
+        failed, retried = asyncio.run(main())
+
+        assert failed.confidence == 0.0
+        assert failed.reasoning.startswith("Batch analysis failed")
+        assert retried.sentiment == "bullish"
+        assert len(model_server.calls) == 2
+
+
+class TestMicroBatching:
+    """Concurrent requests share model calls"""
+
+    def test_concurrent_symbols_share_one_model_call(self, analyzer, model_server):
+        async def main():
+            return await asyncio.gather(
+                analyzer.analyze_news_batch("AAPL", [article("Apple beats")]),
+                analyzer.analyze_news_batch("MSFT", [article("Microsoft misses")]),
+                analyzer.analyze_news_batch("XOM", [article("Oil flat"), article("Apple beats")]),
+            )
+
+        aapl, msft, xom = asyncio.run(main())
+
+        assert len(model_server.calls) == 1
+        assert sorted(model_server.calls[0]) == ["Apple beats", "Microsoft misses", "Oil flat"]
+        assert analyzer.batcher.coalesced == 1
+        assert (aapl.sentiment, msft.sentiment) == ("bullish", "bearish")
+        assert xom.score == pytest.approx((0.8 * 0.9 + 0.0 * 0.5) / 1.4)
+
+    def test_full_batch_flushes_without_waiting(self, analyzer, model_server):
+        analyzer.batcher.max_batch = 3
+        analyzer.batcher.max_wait = 10.0
+        articles = [article(f"Story {i}") for i in range(6)]
+
+        start = time.perf_counter()
+        asyncio.run(analyzer.score_articles(articles))
+
+        assert time.perf_counter() - start < 2.0
+        assert [len(call) for call in model_server.calls] == [3, 3]
+
+    def test_model_call_does_not_block_event_loop(self, analyzer, model_server):
+        model_server.delay = 0.3
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.05)
+
+        async def main():
+            await asyncio.gather(
+                analyzer.analyze_news_batch("AAPL", [article("Apple beats")]),
+                ticker(),
+            )
+
+        asyncio.run(main())
+
+        assert len(ticks) == 5
+        assert max(b - a for a, b in itertools.pairwise(ticks)) < 0.2
@@ -0,0 +1,183 @@
+"""
+Tests for the batched ML trade signal pipeline
+Tests bulk price fetch, bounded concurrent news, the single sentiment pass
+and per-stage timings
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from app.ml import signal_generator as signal_generator_module
+from app.ml.sentiment_analyzer import SentimentScore
+from app.ml.signal_batch import BatchSignalPipeline
+from app.ml.signal_generator import SignalGenerator
+
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "META", "NVDA", "AMZN", "TSLA", "JPM", "V", "JNJ"]
+
+
+def make_bars(n=120, seed=3):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    today = datetime.now(UTC).date()
+    dates = [today - timedelta(days=n - 1 - i) for i in range(n)]
+    return [
+        {
+            "date": d.isoformat(),
+            "open": float(c),
+            "high": float(c) * 1.01,
+            "low": float(c) * 0.99,
+            "close": float(c),
+            "volume": 1_000_000,
+        }
+        for d, c in zip(dates, closes, strict=True)
+    ]
+
+
+class SlowClient:
+    """Sync Tradier-like client with fixed latency per history request"""
+
+    def __init__(self, latency=0.1, missing=()):
+        self.latency = latency
+        self.missing = set(missing)
+        self.quote_calls = 0
+        self.history_calls = 0
+
+    def get_quotes(self, symbols):
+        self.quote_calls += 1
+        return {"quotes": {"quote": [{"symbol": s, "last": 123.45} for s in symbols]}}
+
+    def get_historical_bars(self, symbol, interval, start_date, end_date):
+        self.history_calls += 1
+        time.sleep(self.latency)
+        return [] if symbol in self.missing else make_bars()
+
+
+@dataclass
+class News:
+    articles: list
+
+
+class SlowNews:
+    """Async news source tracking concurrent fetches"""
+
+    def __init__(self, latency=0.1, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def aget_company_news(self, symbol, days_back=7):
+        self.calls.append(symbol)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            if symbol in self.failing:
+                raise RuntimeError("provider down")
+            return News([{"title": f"{symbol} beats", "summary": "", "source": "Wire"}])
+        finally:
+            self.in_flight -= 1
+
+
+class RecordingSentiment:
+    """Sentiment analyzer stand-in recording each batched pass"""
+
+    def __init__(self):
+        self.calls = []
+
+    async def analyze_news_for_symbols(self, news_by_symbol):
+        self.calls.append(news_by_symbol)
+        return {
+            symbol: SentimentScore(
+                symbol=symbol,
+                sentiment="bullish",
+                score=0.6,
+                confidence=0.9,
+                reasoning="Upbeat coverage",
+                timestamp=datetime.now(UTC),
+                source="news",
+            )
+            for symbol, articles in news_by_symbol.items()
+            if articles
+        }
+
+
+def make_pipeline(monkeypatch, client=None, news=None, **kwargs):
+    monkeypatch.setattr(signal_generator_module, "get_sentiment_analyzer", lambda: None)
+    sentiment = RecordingSentiment()
+    pipeline = BatchSignalPipeline(
+        client=client or SlowClient(),
+        news_source=news or SlowNews(),
+        sentiment_analyzer=sentiment,
+        signal_generator=SignalGenerator(),
+        **kwargs,
+    )
+    return pipeline, sentiment
+
+
+class TestBatchSignalPipeline:
+    """Watchlist signals cost about one symbol's latency"""
+
+    def test_watchlist_runs_concurrently_with_one_sentiment_pass(self, monkeypatch):
+        client = SlowClient(latency=0.1)
+        news = SlowNews(latency=0.1)
+        pipeline, sentiment = make_pipeline(monkeypatch, client, news)
+
+        start = time.perf_counter()
+        signals = asyncio.run(pipeline.run(SYMBOLS, lookback_days=120))
+        elapsed = time.perf_counter() - start
+
+        assert list(signals) == SYMBOLS
+        assert elapsed < 1.0  # serial would be >= 2.0s
+        assert client.quote_calls == 1
+        assert client.history_calls == len(SYMBOLS)
+        assert len(sentiment.calls) == 1
+        assert set(sentiment.calls[0]) == set(SYMBOLS)
+        for signal in signals.values():
+            assert signal.price == 123.45  # bulk quote, not the last close
+            assert signal.sentiment_score == 0.6
+
+    def test_news_concurrency_is_bounded(self, monkeypatch):
+        news = SlowNews(latency=0.05)
+        pipeline, _ = make_pipeline(
+            monkeypatch, SlowClient(latency=0.0), news, news_concurrency=3
+        )
+        asyncio.run(pipeline.run(SYMBOLS))
+        assert sorted(news.calls) == sorted(SYMBOLS)
+        assert news.max_in_flight <= 3
+
+    def test_missing_prices_and_failed_news(self, monkeypatch):
+        client = SlowClient(latency=0.0, missing={"MSFT"})
+        news = SlowNews(latency=0.0, failing={"AAPL"})
+        pipeline, sentiment = make_pipeline(monkeypatch, client, news)
+
+        signals = asyncio.run(pipeline.run(["AAPL", "MSFT", "NVDA"]))
+
+        assert list(signals) == ["AAPL", "NVDA"]
+        assert sentiment.calls[0]["AAPL"] == []
+        assert signals["AAPL"].sentiment_score == 0.0  # technical-only
+        assert signals["NVDA"].sentiment_score == 0.6
+
+    def test_without_sentiment_skips_news(self, monkeypatch):
+        news = SlowNews()
+        pipeline, _ = make_pipeline(monkeypatch, SlowClient(latency=0.0), news)
+        signals = asyncio.run(pipeline.run(["AAPL"], include_sentiment=False))
+        assert news.calls == []
+        assert signals["AAPL"].sentiment_score == 0.0
+
+    def test_stage_and_symbol_timings(self, monkeypatch):
+        pipeline, _ = make_pipeline(monkeypatch, SlowClient(latency=0.01), SlowNews(0.01))
+        asyncio.run(pipeline.run(["AAPL", "MSFT"]))
+
+        timings = pipeline.get_timings()
+        for stage in ("quotes_ms", "prices_ms", "news_ms", "sentiment_ms", "signals_ms"):
+            assert timings[stage] >= 0
+        assert timings["total_ms"] >= timings["signals_ms"]
+        assert set(timings["symbols"]["AAPL"]) == {"bars_ms", "news_ms", "signal_ms"}
+
@@ -0,0 +1,187 @@
+"""
+Tests for the batched multi-symbol signal pipeline
+Tests concurrent history fetches, bounded concurrency, bulk quotes and timings
+"""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import numpy as np
+
+from app.routers.ai import (
+    _calculate_momentum_analysis,
+    _calculate_volatility_analysis,
+    _generate_technical_signal,
+)
+from app.services.signal_pipeline import SignalPipeline
+
+
+def make_bars(n=210, seed=3):
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    today = datetime.now(UTC).date()
+    dates = [today - timedelta(days=n - 1 - i) for i in range(n)]
+    return [
+        {
+            "date": d.isoformat(),
+            "open": float(c),
+            "high": float(c) * 1.01,
+            "low": float(c) * 0.99,
+            "close": float(c),
+            "volume": 1_000_000,
+        }
+        for d, c in zip(dates, closes, strict=True)
+    ]
+
+
+class SlowClient:
+    """Sync Tradier-like client with fixed latency per history request"""
+
+    def __init__(self, latency=0.1, failing=()):
+        self.latency = latency
+        self.failing = set(failing)
+        self.quote_calls = 0
+        self.history_calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def get_quotes(self, symbols):
+        self.quote_calls += 1
+        quotes = [{"symbol": s, "last": 100.0} for s in symbols]
+        return {"quotes": {"quote": quotes[0] if len(quotes) == 1 else quotes}}
+
+    def get_historical_bars(self, symbol, interval, start_date, end_date):
+        with self._lock:
+            self.history_calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.latency)
+            if symbol in self.failing:
+                raise RuntimeError("upstream error")
+            return make_bars()
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+class AsyncQuoteClient:
+    """AsyncTradierClient-like quote source backed by a SlowClient"""
+
+    def __init__(self, client):
+        self.client = client
+        self.calls = 0
+
+    async def get_quotes(self, symbols):
+        self.calls += 1
+        return self.client.get_quotes(symbols)
+
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "META", "NVDA", "AMZN", "TSLA", "JPM", "V", "JNJ"]
+
+
+class TestSignalPipeline:
+    """Concurrent fetch + compute"""
+
+    def test_ten_symbols_cost_about_the_slowest_one(self):
+        client = SlowClient(latency=0.1)
+        pipeline = SignalPipeline(client, max_concurrency=10)
+
+        start = time.perf_counter()
+        results = asyncio.run(
+            pipeline.run(SYMBOLS, history_days=250, compute=lambda s, bars: len(bars))
+        )
+        elapsed = time.perf_counter() - start
+
+        assert list(results) == SYMBOLS
+        assert all(count == 210 for count in results.values())
+        assert client.history_calls == 10
+        assert elapsed < 0.5  # serial would be >= 1.0s
+
+    def test_concurrency_is_bounded(self):
+        client = SlowClient(latency=0.05)
+        pipeline = SignalPipeline(client, max_concurrency=3)
+        asyncio.run(pipeline.run(SYMBOLS, history_days=250, compute=lambda s, bars: None))
+        assert client.max_in_flight <= 3
+
+    def test_bulk_quotes_single_call(self):
+        client = SlowClient()
+        pipeline = SignalPipeline(client)
+        quotes = asyncio.run(pipeline.fetch_quotes(["AAPL", "MSFT"]))
+        assert set(quotes) == {"AAPL", "MSFT"}
+        assert client.quote_calls == 1
+
+        single = asyncio.run(pipeline.fetch_quotes(["AAPL"]))
+        assert single["AAPL"]["last"] == 100.0
+
+    def test_async_quote_client_is_awaited(self):
+        client = SlowClient()
+        quote_client = AsyncQuoteClient(client)
+        pipeline = SignalPipeline(client, quote_client=quote_client)
+        quotes = asyncio.run(pipeline.fetch_quotes(["AAPL", "MSFT"]))
+        assert set(quotes) == {"AAPL", "MSFT"}
+        assert quote_client.calls == 1
+        assert client.quote_calls == 1
+
+    def test_malformed_quote_responses_are_empty(self):
+        client = SlowClient()
+        pipeline = SignalPipeline(client)
+        malformed = [
+            None,
+            [],
+            "error",
+            {"quotes": []},
+            {"quotes": "null"},
+            {"quotes": {"quote": "n/a"}},
+            {"quotes": {"quote": ["AAPL"]}},
+        ]
+        for response in malformed:
+            client.get_quotes = lambda symbols, response=response: response
+            assert asyncio.run(pipeline.fetch_quotes(["AAPL"])) == {}
+
+    def test_failures_and_timings(self):
+        client = SlowClient(latency=0.01, failing={"MSFT"})
+        pipeline = SignalPipeline(client)
+
+        def compute(symbol, bars):
+            if symbol == "TSLA":
+                raise ValueError("bad data")
+            return len(bars)
+
+        results = asyncio.run(
+            pipeline.run(["AAPL", "MSFT", "TSLA"], history_days=250, compute=compute)
+        )
+        # Fetch failure reaches compute as empty history; compute failure drops the symbol
+        assert results == {"AAPL": 210, "MSFT": 0}
+
+        timings = pipeline.get_timings()["symbols"]
+        assert set(timings) == {"AAPL", "MSFT", "TSLA"}
+        assert set(timings["AAPL"]) == {"bars_ms", "compute_ms", "total_ms"}
+        assert timings["AAPL"]["total_ms"] >= timings["AAPL"]["bars_ms"]
+
+
+class TestComputeFunctions:
+    """/ai compute functions work from pre-fetched bars"""
+
+    def test_technical_signal_from_bars(self):
+        signal = _generate_technical_signal("AAPL", make_bars())
+        assert signal is not None
+        assert signal.symbol == "AAPL"
+        assert _generate_technical_signal("AAPL", make_bars(30)) is None
+
+    def test_momentum_and_volatility_share_history(self):
+        bars = make_bars(210)
+        momentum = _calculate_momentum_analysis("AAPL", 105.0, 1_200_000, bars)
+        volatility = _calculate_volatility_analysis("AAPL", 105.0, bars)
+
+        closes = [bar["close"] for bar in bars[-200:]]
+        assert momentum["sma_20"] == round(sum(closes[-20:]) / 20, 2)
+        assert momentum["volume_ratio"] == 1.2
+        assert volatility["atr"] > 0
+
+        # Short history falls back to neutral defaults
+        assert _calculate_momentum_analysis("AAPL", 105.0, 1, [])["trend_alignment"] == "Unknown"
+        assert _calculate_volatility_analysis("AAPL", 105.0, [])["volatility_class"] == "Medium"
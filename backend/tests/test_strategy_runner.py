@@ -0,0 +1,189 @@
+"""
+Tests for the in-process strategy runner
+Tests dry/live dispatch, coalescing of identical runs, per-market pool
+isolation, the queue bound and the stats reported on /scheduler/status
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.scheduler import TradingScheduler
+from app.services.scheduler_store import SchedulerStore
+from app.services.strategy_runner import StrategyRunner, StrategyRunRejectedError
+
+
+MARKETS = {"under4-multileg": "stocks_options", "dex-meme-scout": "dex_meme_coins"}
+
+
+class FakeStrategyService:
+    """Counts calls; runs block until their strategy's gate is opened"""
+
+    def __init__(self):
+        self.calls = []
+        self.gates: dict[str, threading.Event] = {}
+        self.fail = False
+
+    def hold(self, strategy_type):
+        self.gates[strategy_type] = threading.Event()
+        return self.gates[strategy_type]
+
+    def _run(self, mode, user_id, strategy_type):
+        self.calls.append((mode, user_id, strategy_type))
+        gate = self.gates.get(strategy_type)
+        if gate is not None:
+            assert gate.wait(5)
+        if self.fail:
+            raise RuntimeError("broker unavailable")
+        return {"success": True, "dry_run": mode == "dry", "user_id": user_id}
+
+    def execute_strategy_dry_run(self, user_id, strategy_type):
+        return self._run("dry", user_id, strategy_type)
+
+    def execute_strategy_live(self, user_id, strategy_type):
+        return self._run("live", user_id, strategy_type)
+
+
+async def wait_until(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+@pytest.fixture
+def service():
+    return FakeStrategyService()
+
+
+@pytest.fixture
+def runner(service):
+    runner = StrategyRunner(service, MARKETS, workers_per_market=1, max_queue=4)
+    yield runner
+    runner.shutdown(wait=True)
+
+
+class TestRuns:
+    """Dispatch, results and failures"""
+
+    def test_dry_and_live_runs_call_the_service(self, runner, service):
+        async def scenario():
+            dry = await runner.run(7, "under4-multileg", dry_run=True)
+            live = await runner.run(7, "under4-multileg", dry_run=False)
+            return dry, live
+
+        dry, live = asyncio.run(scenario())
+        assert service.calls == [("dry", 7, "under4-multileg"), ("live", 7, "under4-multileg")]
+        assert dry.payload["dry_run"] is True and live.payload["dry_run"] is False
+        assert dry.market == "stocks_options" and not dry.coalesced
+
+        stats = runner.get_stats()["markets"]["stocks_options"]
+        assert stats["completed"] == 2 and stats["queue_depth"] == 0 and stats["active"] == 0
+        assert stats["run_ms"]["max"] >= stats["run_ms"]["p50"] >= 0
+
+    def test_unknown_strategy_is_rejected(self, runner, service):
+        with pytest.raises(StrategyRunRejectedError):
+            asyncio.run(runner.run(1, "martingale"))
+        assert service.calls == []
+
+    def test_failures_propagate_and_are_counted(self, runner, service):
+        service.fail = True
+        with pytest.raises(RuntimeError, match="broker unavailable"):
+            asyncio.run(runner.run(1, "under4-multileg"))
+        stats = runner.get_stats()
+        assert stats["markets"]["stocks_options"]["failed"] == 1
+        assert stats["inflight"] == 0
+
+
+class TestConcurrency:
+    """Coalescing, market isolation and the queue bound"""
+
+    def test_identical_runs_share_one_execution(self, runner, service):
+        gate = service.hold("under4-multileg")
+
+        async def scenario():
+            first = asyncio.create_task(runner.run(1, "under4-multileg", dry_run=False))
+            await wait_until(lambda: len(service.calls) == 1)
+            second = asyncio.create_task(runner.run(1, "under4-multileg", dry_run=False))
+            other_user = asyncio.create_task(runner.run(2, "under4-multileg", dry_run=False))
+            await asyncio.sleep(0.02)
+            gate.set()
+            return await asyncio.gather(first, second, other_user)
+
+        first, second, other_user = asyncio.run(scenario())
+        assert service.calls == [
+            ("live", 1, "under4-multileg"),
+            ("live", 2, "under4-multileg"),
+        ]
+        assert not first.coalesced and second.coalesced
+        assert second.payload is first.payload
+        assert not other_user.coalesced
+        assert runner.get_stats()["markets"]["stocks_options"]["coalesced"] == 1
+
+    def test_slow_market_does_not_block_another(self, runner, service):
+        gate = service.hold("under4-multileg")
+
+        async def scenario():
+            stuck = asyncio.create_task(runner.run(1, "under4-multileg"))
+            await wait_until(lambda: len(service.calls) == 1)
+            dex = await asyncio.wait_for(runner.run(1, "dex-meme-scout"), timeout=2)
+            gate.set()
+            await stuck
+            return dex
+
+        dex = asyncio.run(scenario())
+        assert dex.market == "dex_meme_coins"
+
+    def test_queue_depth_is_bounded(self, service):
+        runner = StrategyRunner(service, MARKETS, workers_per_market=1, max_queue=2)
+        gate = service.hold("under4-multileg")
+
+        async def scenario():
+            running = asyncio.create_task(runner.run(1, "under4-multileg"))
+            await wait_until(lambda: len(service.calls) == 1)
+            queued = [asyncio.create_task(runner.run(u, "under4-multileg")) for u in (2, 3)]
+            await asyncio.sleep(0)
+            with pytest.raises(StrategyRunRejectedError):
+                await runner.run(4, "under4-multileg")
+            stats = runner.get_stats()["markets"]["stocks_options"]
+            gate.set()
+            await asyncio.gather(running, *queued)
+            return stats
+
+        try:
+            stats = asyncio.run(scenario())
+        finally:
+            runner.shutdown(wait=True)
+        assert stats["queue_depth"] == 2 and stats["active"] == 1
+        assert stats["rejected"] == 1
+        assert [call[1] for call in service.calls] == [1, 2, 3]
+
+
+class TestScheduledRuns:
+    """The scheduler resolves the user a strategy schedule runs as"""
+
+    @pytest.fixture
+    def scheduler(self, runner, tmp_path, monkeypatch):
+        monkeypatch.setattr("app.scheduler.EXECUTIONS_DIR", tmp_path)
+        store = SchedulerStore(tmp_path / "scheduler.db")
+        return TradingScheduler(store=store, strategy_runner=runner)
+
+    def test_schedule_user_is_used(self, scheduler, service):
+        metadata = {"user_id": 7, "strategy_type": "under4-multileg", "dry_run": False}
+        asyncio.run(scheduler._execute_strategy_run("s1", False, metadata))
+
+        assert service.calls == [("live", 7, "under4-multileg")]
+        executions, _ = scheduler.store.list_executions(schedule_id="s1")
+        assert executions[0]["status"] == "completed"
+
+    def test_schedule_without_credentials_fails_closed(self, scheduler, service, monkeypatch):
+        monkeypatch.delenv("PAIID_API_TOKEN", raising=False)
+        metadata = {"strategy_type": "under4-multileg", "dry_run": False}
+        asyncio.run(scheduler._execute_strategy_run("s1", False, metadata))
+
+        assert service.calls == []
+        executions, _ = scheduler.store.list_executions(schedule_id="s1")
+        assert executions[0]["status"] == "failed"
+        assert executions[0]["error"] == "Missing API token for strategy execution"
@@ -0,0 +1,149 @@
+"""
+Tests for streaming technical indicator kernels
+Tests incremental updates, seeding, and parity with the TechnicalIndicators batch API
+"""
+
+import random
+
+import pytest
+
+from app.services.streaming_indicators import ATR, EMA, MACD, OBV, RSI, BollingerBands
+from app.services.technical_indicators import TechnicalIndicators
+
+
+@pytest.fixture
+def bars():
+    """Deterministic random-walk OHLCV bars"""
+    rng = random.Random(11)
+    closes = [100.0]
+    for _ in range(299):
+        closes.append(round(closes[-1] * (1 + rng.gauss(0, 0.015)), 2))
+    highs = [c * 1.01 for c in closes]
+    lows = [c * 0.99 for c in closes]
+    volumes = [rng.randint(100_000, 2_000_000) for _ in closes]
+    return {"close": closes, "high": highs, "low": lows, "volume": volumes}
+
+
+class TestIncrementalMatchesBatch:
+    """Streaming one bar at a time reproduces the batch function on each prefix"""
+
+    def test_rsi_simple(self, bars):
+        closes = bars["close"]
+        rsi = RSI(14, smoothing="simple")
+        for i, price in enumerate(closes):
+            value = rsi.update(price)
+            if i >= 14:
+                assert round(value, 2) == TechnicalIndicators.calculate_rsi(closes[: i + 1])
+            else:
+                assert value is None
+
+    def test_macd(self, bars):
+        closes = bars["close"]
+        macd = MACD()
+        for i, price in enumerate(closes):
+            value = macd.update(price)
+            if i + 1 >= 35:
+                expected = TechnicalIndicators.calculate_macd(closes[: i + 1])
+                assert {k: round(v, 4) for k, v in value.items()} == expected
+            else:
+                assert value is None
+
+    def test_bollinger(self, bars):
+        closes = bars["close"]
+        bands = BollingerBands(20, 2.0)
+        for i, price in enumerate(closes):
+            value = bands.update(price)
+            if i + 1 >= 20:
+                expected = TechnicalIndicators.calculate_bollinger_bands(closes[: i + 1])
+                assert {k: round(v, 2) for k, v in value.items()} == expected
+
+    def test_atr_simple(self, bars):
+        atr = ATR(14, smoothing="simple")
+        for i in range(len(bars["close"])):
+            value = atr.update(bars["high"][i], bars["low"][i], bars["close"][i])
+            if i >= 14:
+                expected = TechnicalIndicators.calculate_atr(
+                    bars["high"][: i + 1], bars["low"][: i + 1], bars["close"][: i + 1]
+                )
+                assert round(value, 2) == expected
+
+    def test_ema(self, bars):
+        closes = bars["close"]
+        ema = EMA(12)
+        for i, price in enumerate(closes):
+            assert ema.update(price) == TechnicalIndicators._calculate_ema(closes[: i + 1], 12)
+
+
+class TestSeeding:
+    """Seeding from history then streaming equals streaming everything"""
+
+    @pytest.mark.parametrize(
+        "factory",
+        [
+            lambda: RSI(14),
+            lambda: RSI(14, smoothing="simple"),
+            lambda: EMA(20),
+            lambda: MACD(),
+            lambda: BollingerBands(),
+        ],
+    )
+    def test_close_only_kernels(self, bars, factory):
+        closes = bars["close"]
+        streamed = factory()
+        for price in closes:
+            streamed.update(price)
+
+        seeded = factory().seed(closes[:200])
+        for price in closes[200:]:
+            seeded.update(price)
+
+        assert seeded.value == streamed.value
+
+    def test_atr_and_obv(self, bars):
+        atr = ATR(14).seed(bars["high"][:150], bars["low"][:150], bars["close"][:150])
+        obv = OBV().seed(bars["close"][:150], bars["volume"][:150])
+        for i in range(150, len(bars["close"])):
+            atr.update(bars["high"][i], bars["low"][i], bars["close"][i])
+            obv.update(bars["close"][i], bars["volume"][i])
+
+        full_atr = ATR(14).seed(bars["high"], bars["low"], bars["close"])
+        assert atr.value == full_atr.value
+        assert obv.value == TechnicalIndicators.calculate_obv(bars["close"], bars["volume"])
+
+
+class TestWilderSmoothing:
+    """Wilder kernels follow the textbook recursion"""
+
+    def test_wilder_rsi(self, bars):
+        closes = bars["close"]
+        period = 14
+        changes = [closes[i] - closes[i - 1] for i in range(1, len(closes))]
+        avg_gain = sum(max(c, 0) for c in changes[:period]) / period
+        avg_loss = sum(-min(c, 0) for c in changes[:period]) / period
+        for c in changes[period:]:
+            avg_gain = (avg_gain * (period - 1) + max(c, 0)) / period
+            avg_loss = (avg_loss * (period - 1) - min(c, 0)) / period
+        expected = 100 - 100 / (1 + avg_gain / avg_loss)
+
+        assert RSI(period).seed(closes).value == pytest.approx(expected, rel=1e-12)
+
+    def test_wilder_atr_warmup_is_mean(self):
+        atr = ATR(3)
+        atr.seed([10, 12, 11], [9, 10, 9], [9.5, 11, 10])
+        # True ranges: max(2, 2.5, 0.5)=2.5, max(2, 1, 2)=2
+        assert atr.value == pytest.approx(2.25)
+        assert not atr.ready
+
+    def test_rsi_all_gains(self):
+        assert RSI(5).seed([1, 2, 3, 4, 5, 6, 7]).value == 100.0
+
+
+class TestOBV:
+    """On-balance volume accumulation"""
+
+    def test_obv_direction(self):
+        obv = OBV()
+        assert obv.update(10, 100) == 0
+        assert obv.update(11, 200) == 200
+        assert obv.update(10.5, 50) == 150
+        assert obv.update(10.5, 75) == 150
@@ -0,0 +1,154 @@
+"""
+Tests for batched telemetry ingestion
+Tests the bounded ring buffer, indexed queries, incremental statistics and the
+background JSONL segment writer
+"""
+
+import json
+import random
+import time
+
+from app.services.telemetry_service import (
+    TelemetryEvent,
+    TelemetrySegmentWriter,
+    TelemetryService,
+)
+
+
+FILTER_FIELDS = {"user_id": "userId", "component": "component", "action": "action"}
+
+
+def make_events(n, seed=7, offset=0):
+    rng = random.Random(seed)
+    return [
+        TelemetryEvent(
+            userId=f"user-{rng.randint(0, 20)}",
+            sessionId=f"session-{rng.randint(0, 50)}",
+            component=rng.choice(["Dashboard", "OrderForm", "Chart", "Settings"]),
+            action=rng.choice(["click", "view", "submit"]),
+            timestamp=f"2026-01-01T00:00:{(offset + i) % 60:02d}",
+            metadata={"i": offset + i},
+            userRole=rng.choice(["owner", "beta"]),
+        )
+        for i in range(n)
+    ]
+
+
+def make_service(tmp_path, max_events=1000, **writer_kwargs):
+    writer = TelemetrySegmentWriter(
+        tmp_path / "telemetry_events.jsonl", flush_interval_ms=10, **writer_kwargs
+    )
+    return TelemetryService(str(writer.path), max_events=max_events, writer=writer)
+
+
+def read_lines(tmp_path):
+    return [
+        json.loads(line)
+        for path in sorted(tmp_path.glob("telemetry_events*.jsonl"))
+        for line in path.read_text().splitlines()
+    ]
+
+
+class TestRingBuffer:
+    """Bounded buffer with indexed queries"""
+
+    def test_keeps_only_newest_events(self, tmp_path):
+        service = make_service(tmp_path, max_events=100)
+        for batch in range(5):
+            service.log_events(make_events(50, seed=batch, offset=batch * 50))
+
+        stats = service.get_stats()
+        assert stats["buffered"] == 100
+        assert stats["received"] == 250
+        assert stats["evicted"] == 150
+        assert [e["metadata"]["i"] for e in service.get_events(limit=3)] == [249, 248, 247]
+        assert service.export_events()["total"] == 100
+
+    def test_filters_match_linear_scan(self, tmp_path):
+        service = make_service(tmp_path, max_events=300)
+        events = []
+        for batch in range(4):
+            chunk = make_events(100, seed=batch, offset=batch * 100)
+            service.log_events(chunk)
+            events += [e.model_dump() for e in chunk]
+        buffered = events[-300:]
+
+        for filters in (
+            {},
+            {"user_id": "user-3"},
+            {"component": "Chart", "action": "click"},
+            {"user_id": "user-5", "component": "Dashboard", "action": "view"},
+            {"user_id": "nobody"},
+        ):
+            expected = [
+                e
+                for e in reversed(buffered)
+                if all(e[FILTER_FIELDS[k]] == v for k, v in filters.items())
+            ][:25]
+            assert service.get_events(limit=25, **filters) == expected
+
+    def test_statistics_track_evictions(self, tmp_path):
+        service = make_service(tmp_path, max_events=200)
+        events = []
+        for batch in range(3):
+            chunk = make_events(150, seed=batch)
+            service.log_events(chunk)
+            events += [e.model_dump() for e in chunk]
+        buffered = events[-200:]
+
+        stats = service.get_statistics().to_dict()
+        assert stats["total_events"] == 200
+        assert stats["unique_users"] == len({e["userId"] for e in buffered})
+        assert stats["unique_sessions"] == len({e["sessionId"] for e in buffered})
+        assert sum(stats["users_by_role"].values()) == 200
+        chart = sum(e["component"] == "Chart" for e in buffered)
+        assert {"component": "Chart", "count": chart} in stats["top_components"]
+
+    def test_clear_keeps_file(self, tmp_path):
+        service = make_service(tmp_path)
+        service.log_events(make_events(10))
+        service.writer.flush()
+
+        assert service.clear_events() == 10
+        assert service.get_events() == []
+        assert service.get_statistics().total_events == 0
+        assert len(read_lines(tmp_path)) == 10
+
+
+class TestSegmentWriter:
+    """Batched background persistence"""
+
+    def test_batches_are_coalesced_into_few_writes(self, tmp_path):
+        service = make_service(tmp_path)
+        for batch in range(50):
+            service.log_events(make_events(4, seed=batch, offset=batch * 4))
+        service.close()
+
+        lines = read_lines(tmp_path)
+        assert [e["metadata"]["i"] for e in lines] == list(range(200))
+        assert service.writer.get_stats()["writes"] < 50
+
+    def test_rotates_and_prunes_segments(self, tmp_path):
+        service = make_service(tmp_path, segment_max_bytes=4096, keep_segments=2)
+        for batch in range(20):
+            service.log_events(make_events(20, seed=batch))
+            service.writer.flush()
+        service.close()
+
+        assert service.writer.get_stats()["rotations"] > 2
+        assert len(service.writer.segments()) == 2
+        for segment in service.writer.segments():
+            assert segment.stat().st_size >= 4096
+
+    def test_log_events_does_not_wait_for_disk(self, tmp_path):
+        service = make_service(tmp_path)
+        events = make_events(500)
+
+        start = time.perf_counter()
+        for _ in range(200):
+            service.log_events(events[:5])
+        elapsed = time.perf_counter() - start
+        service.close()
+
+        assert elapsed < 0.5
+        assert len(read_lines(tmp_path)) == 1000
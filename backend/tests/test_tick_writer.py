@@ -0,0 +1,151 @@
+"""
+Tests for the coalesced write-behind of stream ticks
+Tests latest-value coalescing, batched flushes and TradierStreamService wiring
+"""
+
+import asyncio
+import json
+
+from app.services.tick_writer import TickWriteBehind
+from app.services.tradier_stream import TradierStreamService
+
+
+class FakeCache:
+    """Records set_many batches instead of talking to Redis"""
+
+    def __init__(self, ok=True, available=True):
+        self.ok = ok
+        self.available = available
+        self.batches = []
+        self.tags = []
+        self.set_calls = 0
+
+    def set_many(self, items, ttl=60, tags=None):
+        self.batches.append((dict(items), ttl))
+        self.tags.append(dict(tags or {}))
+        return self.ok
+
+    def set(self, key, value, ttl=60, tags=()):
+        self.set_calls += 1
+        return True
+
+
+class TestTickWriteBehind:
+    """Latest-tick table and batched flushing"""
+
+    def test_coalesces_to_latest_per_symbol_and_type(self):
+        cache = FakeCache()
+        writer = TickWriteBehind(cache, flush_interval_ms=50)
+        for i in range(100):
+            writer.record("quote", "AAPL", {"bid": i})
+        writer.record("trade", "AAPL", {"price": 101})
+        writer.record("summary", "MSFT", {"close": 300})
+
+        assert asyncio.run(writer.flush()) == 3
+        batch, ttl = cache.batches[0]
+        assert ttl == 5
+        assert batch == {
+            "quote:AAPL": {"bid": 99},
+            "price:AAPL": {"price": 101},
+            "summary:MSFT": {"close": 300},
+        }
+        assert cache.tags[0]["quote:AAPL"] == ("ns:quote", "symbol:AAPL")
+        assert cache.tags[0]["summary:MSFT"] == ("ns:summary", "symbol:MSFT")
+        assert writer.get_stats()["received"] == 102
+        assert writer.get_stats()["coalesced"] == 99
+        assert writer.get_stats()["flushed"] == 3
+
+    def test_flush_only_writes_changed_entries(self):
+        cache = FakeCache()
+        writer = TickWriteBehind(cache, flush_interval_ms=50)
+        writer.record("quote", "AAPL", {"bid": 1})
+        writer.record("quote", "MSFT", {"bid": 2})
+        asyncio.run(writer.flush())
+
+        writer.record("quote", "MSFT", {"bid": 3})
+        asyncio.run(writer.flush())
+        assert asyncio.run(writer.flush()) == 0
+
+        assert len(cache.batches) == 2
+        assert cache.batches[1][0] == {"quote:MSFT": {"bid": 3}}
+        assert writer.get_latest("AAPL", "quote") == {"bid": 1}
+
+    def test_failed_flush_is_counted(self):
+        writer = TickWriteBehind(FakeCache(ok=False), flush_interval_ms=50)
+        writer.record("trade", "TSLA", {"price": 200})
+        assert asyncio.run(writer.flush()) == 0
+        stats = writer.get_stats()
+        assert stats["flush_errors"] == 1
+        assert stats["flushed"] == 0
+
+    def test_failed_batch_is_retried_with_latest_values(self):
+        cache = FakeCache(ok=False)
+        writer = TickWriteBehind(cache, flush_interval_ms=50)
+        writer.record("trade", "TSLA", {"price": 200})
+        writer.record("quote", "AAPL", {"bid": 1})
+        asyncio.run(writer.flush())
+        assert writer.get_stats()["pending"] == 2
+        assert writer._flush_delay() == 0.1
+
+        writer.record("trade", "TSLA", {"price": 201})
+        cache.ok = True
+        assert asyncio.run(writer.flush()) == 2
+        assert cache.batches[-1][0] == {"price:TSLA": {"price": 201}, "quote:AAPL": {"bid": 1}}
+        assert writer.get_stats()["consecutive_failures"] == 0
+        assert writer._flush_delay() == 0.05
+
+    def test_unavailable_cache_keeps_ticks_pending(self):
+        cache = FakeCache(available=False)
+        writer = TickWriteBehind(cache, flush_interval_ms=50)
+        writer.record("quote", "SPY", {"bid": 1})
+        assert asyncio.run(writer.flush()) == 0
+        assert cache.batches == []
+        assert writer.get_stats()["pending"] == 1
+        assert writer.get_stats()["flush_errors"] == 0
+
+        cache.available = True
+        assert asyncio.run(writer.flush()) == 1
+
+    def test_background_flusher_and_final_flush_on_stop(self):
+        async def scenario():
+            cache = FakeCache()
+            writer = TickWriteBehind(cache, flush_interval_ms=10)
+            writer.start()
+            writer.record("quote", "SPY", {"bid": 1})
+            await asyncio.sleep(0.05)
+            assert cache.batches and cache.batches[0][0] == {"quote:SPY": {"bid": 1}}
+
+            writer.record("quote", "SPY", {"bid": 2})
+            await writer.stop()
+            assert cache.batches[-1][0] == {"quote:SPY": {"bid": 2}}
+            assert writer.get_stats()["pending"] == 0
+
+        asyncio.run(scenario())
+
+
+class TestStreamServiceWiring:
+    """TradierStreamService records ticks instead of per-message Redis SETs"""
+
+    def test_handle_message_records_without_blocking_writes(self):
+        async def scenario():
+            service = TradierStreamService()
+            cache = FakeCache()
+            service.cache = cache
+            service.ticks = TickWriteBehind(cache, flush_interval_ms=50)
+
+            for bid in ("100.0", "100.5"):
+                await service._handle_message(
+                    json.dumps({"type": "quote", "symbol": "AAPL", "bid": bid, "ask": "101.0"})
+                )
+            await service._handle_message(
+                json.dumps({"type": "trade", "symbol": "AAPL", "price": "100.7", "size": "10"})
+            )
+
+            assert cache.set_calls == 0
+            assert service.ticks.get_latest("AAPL", "quote")["bid"] == 100.5
+            assert service.ticks.get_stats()["coalesced"] == 1
+
+            await service.ticks.flush()
+            assert set(cache.batches[0][0]) == {"quote:AAPL", "price:AAPL"}
+
+        asyncio.run(scenario())
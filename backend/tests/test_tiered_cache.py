@@ -0,0 +1,455 @@
+"""
+Tests for the two-tier (in-process L1 + Redis L2) cache
+Tests tier lookups, single-flight loaders, stale-while-revalidate, LRU bounds,
+batch access, tag/generation invalidation and the quote endpoint sharing one
+Tradier call across requests
+"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.routers import market_data
+from app.services.cache import symbol_tag
+from app.services.tiered_cache import TieredCache
+
+
+class FakeRedisCache:
+    """In-memory stand-in for CacheService that counts round trips"""
+
+    def __init__(self, available=True):
+        self.available = available
+        self.store = {}
+        self.tag_sets = {}
+        self.generations = {}
+        self.round_trips = 0
+
+    def get_many_with_ttl(self, keys):
+        self.round_trips += 1
+        now = time.monotonic()
+        return {
+            key: (value, int(expires - now))
+            for key, (value, expires) in self.store.items()
+            if key in keys and expires > now
+        }
+
+    def set(self, key, value, ttl=60, tags=()):
+        return self.set_many({key: value}, ttl, {key: tags})
+
+    def set_many(self, items, ttl=60, tags=None):
+        self.round_trips += 1
+        for key, value in items.items():
+            self.store[key] = (value, time.monotonic() + ttl)
+            for tag in (tags or {}).get(key, ()):
+                self.tag_sets.setdefault(tag, set()).add(key)
+        return True
+
+    def delete(self, key):
+        self.store.pop(key, None)
+        return True
+
+    def clear_pattern(self, pattern):
+        prefix = pattern.rstrip("*")
+        keys = [k for k in self.store if k.startswith(prefix)]
+        for key in keys:
+            del self.store[key]
+        return len(keys)
+
+    def invalidate_tags(self, tags):
+        self.round_trips += 1
+        deleted = 0
+        for tag in tags:
+            for key in self.tag_sets.pop(tag, ()):
+                deleted += self.store.pop(key, None) is not None
+        return deleted
+
+    def get_generations(self, namespaces):
+        return {ns: self.generations.get(ns, 0) for ns in namespaces}
+
+    def bump_generation(self, namespace):
+        self.round_trips += 1
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        self.tag_sets.pop(f"ns:{namespace}", None)
+        return self.generations[namespace]
+
+
+class CountingLoader:
+    def __init__(self, value="v", delay=0.02, fail=False):
+        self.value, self.delay, self.fail = value, delay, fail
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("upstream down")
+        return self.value
+
+
+async def settle():
+    """Let fire-and-forget L2 writes and background refreshes finish"""
+    for _ in range(5):
+        await asyncio.sleep(0.01)
+
+
+class TestTiers:
+    """L1 -> L2 -> loader lookup order"""
+
+    def test_miss_then_l1_hit(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            load = CountingLoader({"last": 1.0})
+            first = await cache.fetch("quote", "AAPL", load, ttl=5)
+            second = await cache.fetch("quote", "AAPL", load, ttl=5)
+            return cache, load, first, second
+
+        cache, load, first, second = asyncio.run(run())
+        assert (first.source, second.source) == ("loaded", "l1")
+        assert second.value == {"last": 1.0}
+        assert load.calls == 1
+        stats = cache.get_stats()["namespaces"]["quote"]
+        assert (stats["l1_hits"], stats["misses"], stats["loads"]) == (1, 1, 1)
+
+    def test_l2_hit_fills_l1_of_another_process(self):
+        async def run():
+            redis = FakeRedisCache()
+            writer, reader = TieredCache(l2=redis), TieredCache(l2=redis)
+            await writer.fetch("bars", "SPY:daily:100", CountingLoader([1, 2, 3]), ttl=60)
+            await settle()
+            load = CountingLoader()
+            first = await reader.fetch("bars", "SPY:daily:100", load, ttl=60)
+            second = await reader.fetch("bars", "SPY:daily:100", load, ttl=60)
+            return redis, load, first, second
+
+        redis, load, first, second = asyncio.run(run())
+        assert "bars:SPY:daily:100" in redis.store
+        assert (first.source, second.source) == ("l2", "l1")
+        assert first.value == [1, 2, 3]
+        assert load.calls == 0
+
+    def test_l1_serves_when_redis_is_down(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache(available=False))
+            load = CountingLoader()
+            await cache.fetch("quote", "AAPL", load, ttl=5)
+            hit = await cache.fetch("quote", "AAPL", load, ttl=5)
+            return cache, load, hit
+
+        cache, load, hit = asyncio.run(run())
+        assert hit.source == "l1"
+        assert load.calls == 1
+        assert cache.l2.round_trips == 0
+        assert cache.get_stats()["l2_available"] is False
+
+    def test_none_and_errors_are_not_cached(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            empty = CountingLoader(value=None)
+            await cache.fetch("quote", "X", empty, ttl=5)
+            await cache.fetch("quote", "X", empty, ttl=5)
+
+            failing = CountingLoader(fail=True)
+            for _ in range(2):
+                with pytest.raises(RuntimeError):
+                    await cache.fetch("quote", "Y", failing, ttl=5)
+            return cache, empty, failing
+
+        cache, empty, failing = asyncio.run(run())
+        assert empty.calls == 2
+        assert failing.calls == 2
+        assert cache.get_stats()["namespaces"]["quote"]["load_errors"] == 2
+
+
+class TestSingleFlight:
+    """Concurrent misses share one upstream call"""
+
+    def test_concurrent_misses_coalesce(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            load = CountingLoader({"chain": []}, delay=0.05)
+            lookups = await asyncio.gather(
+                *(cache.fetch("options", "SPY:2026-01-16", load, ttl=60) for _ in range(50))
+            )
+            return cache, load, lookups
+
+        cache, load, lookups = asyncio.run(run())
+        assert load.calls == 1
+        assert sum(lookup.source == "coalesced" for lookup in lookups) == 49
+        assert all(lookup.value is lookups[0].value for lookup in lookups)
+        assert cache.get_stats()["inflight_loads"] == 0
+
+    def test_failure_reaches_every_waiter(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            load = CountingLoader(fail=True)
+            return load, await asyncio.gather(
+                *(cache.fetch("quote", "AAPL", load, ttl=5) for _ in range(10)),
+                return_exceptions=True,
+            )
+
+        load, results = asyncio.run(run())
+        assert load.calls == 1
+        assert all(isinstance(r, RuntimeError) for r in results)
+
+    def test_blocking_loaders_run_off_the_event_loop(self):
+        loop_thread = threading.get_ident()
+        calls = []
+
+        def blocking_loader():
+            calls.append(threading.get_ident())
+            time.sleep(0.05)
+            return "v"
+
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0.005)
+
+            task = asyncio.create_task(ticker())
+            await asyncio.gather(
+                *(cache.fetch("scanner", "under4", blocking_loader, ttl=60) for _ in range(5))
+            )
+            task.cancel()
+            return ticks
+
+        ticks = asyncio.run(run())
+        assert len(calls) == 1
+        assert calls[0] != loop_thread
+        assert ticks > 3
+
+
+class TestStaleWhileRevalidate:
+    """Expired entries are served while one background load refreshes them"""
+
+    def test_stale_value_served_then_refreshed(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            await cache.fetch("quote", "AAPL", CountingLoader("old"), ttl=0.05, stale_ttl=5)
+            await asyncio.sleep(0.06)
+
+            refresh = CountingLoader("new", delay=0.02)
+            start = time.perf_counter()
+            stale = await asyncio.gather(
+                *(cache.fetch("quote", "AAPL", refresh, ttl=0.05, stale_ttl=5) for _ in range(10))
+            )
+            elapsed = time.perf_counter() - start
+            await settle()
+            fresh = await cache.fetch("quote", "AAPL", refresh, ttl=0.05, stale_ttl=5)
+            return stale, elapsed, fresh, refresh
+
+        stale, elapsed, fresh, refresh = asyncio.run(run())
+        assert all(lookup.value == "old" and lookup.source == "stale" for lookup in stale)
+        assert elapsed < 0.02
+        assert refresh.calls == 1
+        assert fresh.value == "new"
+
+    def test_past_stale_window_loads_synchronously(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache(available=False))
+            await cache.fetch("quote", "AAPL", CountingLoader("old"), ttl=0.01, stale_ttl=0.01)
+            await asyncio.sleep(0.03)
+            return await cache.fetch("quote", "AAPL", CountingLoader("new"), ttl=5)
+
+        lookup = asyncio.run(run())
+        assert (lookup.value, lookup.source) == ("new", "loaded")
+
+    def test_failed_refresh_keeps_stale_value(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache())
+            await cache.fetch("quote", "AAPL", CountingLoader("old"), ttl=0.02, stale_ttl=5)
+            await asyncio.sleep(0.03)
+            await cache.fetch("quote", "AAPL", CountingLoader(fail=True), ttl=0.02, stale_ttl=5)
+            await settle()
+            return await cache.fetch("quote", "AAPL", CountingLoader("new"), ttl=0.02, stale_ttl=5)
+
+        lookup = asyncio.run(run())
+        assert lookup.value == "old"
+
+
+class TestBoundsAndBatches:
+    """LRU capacity, batch access and invalidation"""
+
+    def test_lru_eviction(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache(available=False), max_entries=3)
+            for symbol in ("A", "B", "C"):
+                await cache.fetch("quote", symbol, CountingLoader(symbol), ttl=60)
+            await cache.fetch("quote", "A", CountingLoader(), ttl=60)  # A is now most recent
+            await cache.fetch("quote", "D", CountingLoader("D"), ttl=60)
+            return cache
+
+        cache = asyncio.run(run())
+        assert cache.peek("quote", "B") is None
+        assert cache.peek("quote", "A") == "A"
+        assert cache.get_stats()["l1_entries"] == 3
+        assert cache.evictions == 1
+
+    def test_get_many_uses_one_redis_round_trip(self):
+        async def run():
+            redis = FakeRedisCache()
+            await TieredCache(l2=redis).set_many("quote", {"A": 1, "B": 2, "C": 3}, ttl=60)
+            cache = TieredCache(l2=redis)
+            await cache.set("quote", "D", 4, ttl=60)
+            redis.round_trips = 0
+            found = await cache.get_many("quote", ["A", "B", "C", "D", "E"])
+            again = await cache.get_many("quote", ["A", "B", "C", "D"])
+            return redis, found, again
+
+        redis, found, again = asyncio.run(run())
+        assert found == {"A": 1, "B": 2, "C": 3, "D": 4}
+        assert again == {"A": 1, "B": 2, "C": 3, "D": 4}
+        assert redis.round_trips == 1  # the second call is served entirely from L1
+
+    def test_clear_pattern_clears_both_tiers(self):
+        async def run():
+            redis = FakeRedisCache()
+            cache = TieredCache(l2=redis)
+            await cache.set_many("quote", {"A": 1, "B": 2}, ttl=60)
+            await cache.set("bars", "A", [1], ttl=60)
+            removed = await cache.clear_pattern("quote:*")
+            return redis, cache, removed
+
+        redis, cache, removed = asyncio.run(run())
+        assert removed == 4  # two L1 entries + two Redis keys
+        assert cache.peek("quote", "A") is None
+        assert cache.peek("bars", "A") == [1]
+        assert set(redis.store) == {"bars:A"}
+
+
+class TestInvalidation:
+    """Tag invalidation and generation-based namespace flushes"""
+
+    def test_invalidate_tags_spans_namespaces(self):
+        async def run():
+            redis = FakeRedisCache()
+            cache = TieredCache(l2=redis)
+            for namespace in ("quote", "bars"):
+                for symbol in ("AAPL", "MSFT"):
+                    await cache.set(namespace, symbol, symbol, ttl=60, tags=(symbol_tag(symbol),))
+            removed = await cache.invalidate_tags(symbol_tag("AAPL"))
+            return redis, cache, removed
+
+        redis, cache, removed = asyncio.run(run())
+        assert removed == 4  # two L1 entries + two Redis keys
+        assert cache.peek("quote", "AAPL") is None and cache.peek("bars", "AAPL") is None
+        assert cache.peek("quote", "MSFT") == "MSFT"
+        assert set(redis.store) == {"quote:MSFT", "bars:MSFT"}
+        assert cache.get_stats()["l1_tags"] == 3  # ns:quote, ns:bars, symbol:MSFT
+
+    def test_flush_namespace_is_one_generation_bump(self):
+        async def run():
+            redis = FakeRedisCache()
+            cache = TieredCache(l2=redis)
+            await cache.set_many("bars", {f"S{i}": i for i in range(500)}, ttl=60)
+            await cache.set("options", "SPY", [1], ttl=60)
+            redis.round_trips = 0
+            removed = await cache.flush_namespace("bars")
+            flush_trips = redis.round_trips
+
+            load = CountingLoader("fresh")
+            lookup = await cache.fetch("bars", "S1", load, ttl=60)
+            await settle()
+            return redis, cache, removed, flush_trips, lookup
+
+        redis, cache, removed, flush_trips, lookup = asyncio.run(run())
+        assert flush_trips == 1
+        assert removed == 500  # L1 entries only; old Redis keys just expire
+        assert "bars:S1" in redis.store
+        assert (lookup.source, lookup.value) == ("loaded", "fresh")
+        assert redis.store["bars@1:S1"][0] == "fresh"
+        assert cache.peek("options", "SPY") == [1]
+
+    def test_flush_reaches_other_processes(self):
+        async def run():
+            redis = FakeRedisCache()
+            a = TieredCache(l2=redis, generation_sync_seconds=0)
+            b = TieredCache(l2=redis, generation_sync_seconds=0)
+            await b.fetch("scanner", "under4", CountingLoader("old"), ttl=60)
+            await a.flush_namespace("scanner")
+            await b.fetch("scanner", "under4", CountingLoader(), ttl=60)  # schedules a sync
+            await settle()
+            return await b.fetch("scanner", "under4", CountingLoader("new"), ttl=60)
+
+        lookup = asyncio.run(run())
+        assert (lookup.source, lookup.value) == ("loaded", "new")
+
+    def test_shared_namespace_purges_by_tag(self):
+        async def run():
+            redis = FakeRedisCache()
+            cache = TieredCache(l2=redis)
+            # Written raw by the stream writer, tagged like TickWriteBehind does
+            redis.set("quote:SPY", {"last": 1}, 5, ("ns:quote", "symbol:SPY"))
+            await cache.set("quote", "AAPL", {"last": 2}, ttl=5)
+            removed = await cache.flush_namespace("quote")
+            await cache.set("quote", "AAPL", {"last": 3}, ttl=5)
+            return redis, removed
+
+        redis, removed = asyncio.run(run())
+        assert removed == 3  # two Redis keys + one L1 entry
+        assert set(redis.store) == {"quote:AAPL"}  # still unversioned after the bump
+
+    def test_flush_during_load_is_not_cached(self):
+        async def run():
+            redis = FakeRedisCache()
+            cache = TieredCache(l2=redis)
+            load = CountingLoader("pre-flush", delay=0.05)
+            pending = asyncio.create_task(cache.fetch("options", "SPY", load, ttl=60))
+            await asyncio.sleep(0.01)
+            await cache.flush_namespace("options")
+            lookup = await pending
+            await settle()
+            return redis, cache, lookup
+
+        redis, cache, lookup = asyncio.run(run())
+        assert lookup.value == "pre-flush"
+        assert cache.peek("options", "SPY") is None
+        assert redis.store == {}
+
+    def test_eviction_keeps_tag_index_bounded(self):
+        async def run():
+            cache = TieredCache(l2=FakeRedisCache(available=False), max_entries=2)
+            for symbol in ("A", "B", "C", "D"):
+                await cache.set("quote", symbol, symbol, ttl=60, tags=(symbol_tag(symbol),))
+            return cache
+
+        cache = asyncio.run(run())
+        assert cache.get_stats()["l1_tags"] == 3  # ns:quote, symbol:C, symbol:D
+
+
+class SlowTradier:
+    def __init__(self):
+        self.calls = 0
+
+    async def get_quotes(self, symbols):
+        self.calls += 1
+        await asyncio.sleep(0.05)
+        return {s: {"last": 189.5, "bid": 189.4, "ask": 189.6, "volume": 100} for s in symbols}
+
+
+class TestQuoteEndpoint:
+    """Concurrent quote requests share one Tradier call"""
+
+    def test_concurrent_requests_one_upstream_call(self, monkeypatch):
+        tradier = SlowTradier()
+        monkeypatch.setattr(market_data, "get_async_tradier_client", lambda: tradier)
+        cache = TieredCache(l2=FakeRedisCache())
+
+        async def run():
+            return await asyncio.gather(
+                *(
+                    market_data.get_quote(symbol="AAPL", current_user=None, cache=cache)
+                    for _ in range(20)
+                )
+            )
+
+        responses = asyncio.run(run())
+        assert tradier.calls == 1
+        assert all(r["last"] == 189.5 for r in responses)
+        assert sum(not r["cached"] for r in responses) == 1
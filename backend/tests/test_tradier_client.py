@@ -3,12 +3,15 @@ Tests for Tradier API client service
 Tests circuit breaker, caching, error handling, and market data fetching
 """
 
+import asyncio
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+import httpx
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from datetime import datetime, timedelta, UTC
 import requests
 
-from app.services.tradier_client import TradierClient
+from app.services.tradier_client import AsyncTradierClient, ProviderHTTPError, TradierClient
 
 
 @pytest.fixture
@@ -344,3 +347,125 @@ class TestTradierSessionManagement:
         """Test that compression is enabled in headers"""
         assert "Accept-Encoding" in tradier_client.headers
         assert "gzip" in tradier_client.headers["Accept-Encoding"]
+
+
+def make_async_client(handler):
+    """Async client backed by a local stub transport"""
+    return AsyncTradierClient(transport=httpx.MockTransport(handler))
+
+
+class TestAsyncTradierClient:
+    """Test the native async client"""
+
+    def test_get_historical_bars_parses_like_sync(self, mock_env):
+        """Async client shares response parsing with the sync client"""
+
+        def handler(request):
+            assert request.url.path == "/v1/markets/history"
+            assert request.url.params["symbol"] == "AAPL"
+            assert request.headers["Authorization"] == "Bearer test_api_key_12345"
+            return httpx.Response(
+                200,
+                json={
+                    "history": {
+                        "day": {
+                            "date": "2024-01-15",
+                            "open": "185.5",
+                            "high": "187.2",
+                            "low": "184.3",
+                            "close": "186.75",
+                            "volume": "45623100",
+                        }
+                    }
+                },
+            )
+
+        async def scenario():
+            client = make_async_client(handler)
+            try:
+                return await client.get_historical_bars("AAPL", start_date="2024-01-01")
+            finally:
+                await client.aclose()
+
+        bars = asyncio.run(scenario())
+        assert bars == [
+            {
+                "date": "2024-01-15",
+                "open": 185.5,
+                "high": 187.2,
+                "low": 184.3,
+                "close": 186.75,
+                "volume": 45623100,
+            }
+        ]
+
+    def test_identical_inflight_requests_are_coalesced(self, mock_env):
+        """50 concurrent requests for the same chain make one upstream call"""
+        calls = []
+
+        async def handler(request):
+            calls.append(str(request.url))
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"options": {"option": [{"strike": 100}]}})
+
+        async def scenario():
+            client = make_async_client(handler)
+            try:
+                results = await asyncio.gather(
+                    *[client.get_option_chains("SPY", "2024-12-20") for _ in range(50)]
+                )
+                other = await client.get_option_chains("SPY", "2025-01-17")
+                return client, results, other
+            finally:
+                await client.aclose()
+
+        client, results, other = asyncio.run(scenario())
+        assert len(calls) == 2
+        assert client.coalesced_requests == 49
+        assert all(r == results[0] for r in results)
+        assert results[0] is not results[1]  # followers get their own copy
+        assert other["options"]["option"][0]["strike"] == 100
+
+    def test_http_errors_map_and_open_circuit(self, mock_env):
+        """Provider errors raise ProviderHTTPError and trip the circuit breaker"""
+
+        def handler(request):
+            return httpx.Response(503, text="Service Unavailable")
+
+        async def scenario():
+            client = make_async_client(handler)
+            try:
+                with pytest.raises(ProviderHTTPError) as exc_info:
+                    await client.get_quotes(["AAPL"])
+                assert exc_info.value.status_code == 503
+
+                with pytest.raises(ProviderHTTPError):
+                    await client.get_quotes(["MSFT"])
+                assert client._state == "OPEN"
+
+                with pytest.raises(Exception, match="circuit open"):
+                    await client.get_quotes(["TSLA"])
+            finally:
+                await client.aclose()
+
+        asyncio.run(scenario())
+
+    def test_post_requests_are_not_coalesced(self, mock_env):
+        """Order placement always reaches the provider"""
+        calls = []
+
+        def handler(request):
+            calls.append(request.method)
+            return httpx.Response(200, json={"order": {"id": len(calls), "status": "ok"}})
+
+        async def scenario():
+            client = make_async_client(handler)
+            try:
+                await asyncio.gather(
+                    client.place_order("AAPL", "buy", 1), client.place_order("AAPL", "buy", 1)
+                )
+            finally:
+                await client.aclose()
+
+        asyncio.run(scenario())
+        assert calls == ["POST", "POST"]
@@ -0,0 +1,148 @@
+"""
+Tests for the strategy selector training dataset builder
+Tests stable window anchoring, one fetch per symbol, batched regime labels,
+progress reporting and the on-disk backtest memo
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.ml import training_dataset
+from app.ml.training_dataset import BacktestMemo, TrainingDatasetBuilder, window_starts
+
+
+def make_frame(n=260, end="2024-06-28", seed=5):
+    index = pd.bdate_range(end=end, periods=n, name="date")
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0005, 0.015, n)))
+    return pd.DataFrame(
+        {
+            "open": close * 0.998,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": np.full(n, 1_000_000.0),
+        },
+        index=index,
+    )
+
+
+class FakePipeline:
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def prepare_features(self, symbol, lookback_days=730):
+        self.calls.append(symbol)
+        return self.frames.get(symbol)
+
+
+class FakeRegimeDetector:
+    def __init__(self):
+        self.calls = 0
+
+    def predict_at(self, features_df, timestamps):
+        self.calls += 1
+        return ["ranging"] * len(timestamps)
+
+
+@pytest.fixture
+def wired(monkeypatch):
+    pipeline = FakePipeline({"SPY": make_frame(seed=1), "QQQ": make_frame(seed=2)})
+    detector = FakeRegimeDetector()
+    monkeypatch.setattr(training_dataset, "get_data_pipeline", lambda: pipeline)
+    monkeypatch.setattr(training_dataset, "get_regime_detector", lambda: detector)
+    return pipeline, detector
+
+
+class TestWindowStarts:
+    """Windows are anchored to fixed business-day buckets"""
+
+    def test_windows_survive_extended_history(self):
+        short = make_frame(n=200, end="2024-03-29")
+        longer = make_frame(n=260, end="2024-05-24")
+
+        short_dates = set(short.index[window_starts(short.index, 60, 20)])
+        longer_dates = set(longer.index[window_starts(longer.index, 60, 20)])
+
+        assert short_dates
+        assert short_dates <= longer_dates
+
+    def test_every_window_fits(self):
+        frame = make_frame(n=130)
+        starts = window_starts(frame.index, 60, 20)
+        assert np.all(starts + 60 <= len(frame))
+        assert np.all(np.diff(starts) == 20)
+
+
+class TestTrainingDatasetBuilder:
+    """Fetch once, fan out backtests, reuse the memo"""
+
+    def test_builds_samples_with_one_fetch_and_one_regime_pass_per_symbol(
+        self, wired, tmp_path
+    ):
+        pipeline, detector = wired
+        progress = []
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            builder = TrainingDatasetBuilder(memo=BacktestMemo(tmp_path), executor=pool)
+            samples = builder.build(
+                ["SPY", "QQQ"],
+                extract_features=lambda w: {"price_trend": float(w["close"].iloc[-1])},
+                progress=lambda done, total: progress.append((done, total)),
+            )
+
+        assert sorted(pipeline.calls) == ["QQQ", "SPY"]
+        assert detector.calls == 2
+        assert builder.stats["backtests_run"] == progress[-1][1]
+        assert progress[-1][0] == progress[-1][1]
+        for sample in samples:
+            assert sample["regime"] == "ranging"
+            assert sample["symbol"] in {"SPY", "QQQ"}
+            assert "best_strategy" in sample
+            assert "price_trend" in sample
+
+    def test_retrain_reuses_memoized_backtests(self, wired, tmp_path):
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            first = TrainingDatasetBuilder(memo=BacktestMemo(tmp_path), executor=pool)
+            first_samples = first.build(["SPY", "QQQ"])
+
+            second = TrainingDatasetBuilder(memo=BacktestMemo(tmp_path), executor=pool)
+            second_samples = second.build(["SPY", "QQQ"])
+
+        assert first.stats["backtests_run"] > 0
+        assert second.stats["backtests_run"] == 0
+        assert second.stats["backtests_cached"] == first.stats["backtests_run"]
+        assert second_samples == first_samples
+
+    def test_skips_symbols_with_insufficient_data(self, wired, tmp_path):
+        pipeline, _ = wired
+        pipeline.frames["TINY"] = make_frame(n=50)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            builder = TrainingDatasetBuilder(memo=BacktestMemo(tmp_path), executor=pool)
+            samples = builder.build(["TINY"])
+
+        assert samples == []
+        assert builder.stats["windows"] == 0
+
+    def test_failed_backtests_are_retried_on_retrain(self, wired, tmp_path, monkeypatch):
+        engine = training_dataset.VectorizedBacktestingEngine
+
+        class BrokenEngine:
+            def execute_backtest(self, *args):
+                raise RuntimeError("worker crashed")
+
+        monkeypatch.setattr(training_dataset, "VectorizedBacktestingEngine", BrokenEngine)
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            failed = TrainingDatasetBuilder(memo=BacktestMemo(tmp_path), executor=pool)
+            assert failed.build(["SPY"]) == []
+
+            monkeypatch.setattr(training_dataset, "VectorizedBacktestingEngine", engine)
+            retry = TrainingDatasetBuilder(memo=BacktestMemo(tmp_path), executor=pool)
+            samples = retry.build(["SPY"])
+
+        assert retry.stats["backtests_cached"] == 0
+        assert retry.stats["backtests_run"] == failed.stats["backtests_run"]
+        assert samples
@@ -11,7 +11,7 @@ These endpoints return 403 Forbidden in tests, which is expected behavior.
 
 import json
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch
 
 from app.models.database import User
 
@@ -72,6 +72,11 @@ class TestAIRecommendations:
         }
         monkeypatch.setattr("app.routers.ai.get_tradier_client", lambda: mock_client)
 
+        # Bulk quotes go through the async client
+        mock_async_client = Mock()
+        mock_async_client.get_quotes = AsyncMock(return_value=mock_client.get_quotes.return_value)
+        monkeypatch.setattr("app.routers.ai.get_async_tradier_client", lambda: mock_async_client)
+
         # Mock portfolio fetch
         async def mock_fetch_portfolio():
             return {"total_value": 100000.0, "cash": 50000.0, "positions": [], "num_positions": 0}
@@ -85,7 +90,7 @@ class TestAIRecommendations:
         monkeypatch.setattr("app.routers.ai._fetch_sector_performance", mock_sector_perf)
 
         # Mock momentum analysis
-        async def mock_momentum(symbol, price, volume):
+        def mock_momentum(symbol, price, volume, bars):
             return {
                 "sma_20": 170.0,
                 "sma_50": 165.0,
@@ -102,7 +107,7 @@ class TestAIRecommendations:
         monkeypatch.setattr("app.routers.ai._calculate_momentum_analysis", mock_momentum)
 
         # Mock volatility analysis
-        async def mock_volatility(symbol, price):
+        def mock_volatility(symbol, price, bars):
             return {
                 "atr": 3.5,
                 "atr_percent": 2.0,
@@ -183,7 +188,7 @@ class TestAIRecommendations:
     def test_get_ml_signals_success(self, client, auth_headers, monkeypatch):
         """Test ML signals generation with technical analysis"""
         # Mock technical signal generation
-        async def mock_tech_signal(symbol):
+        def mock_tech_signal(symbol, bars):
             from app.routers.ai import Recommendation
 
             return Recommendation(
@@ -210,7 +215,7 @@ class TestAIRecommendations:
 
     def test_get_ml_signals_no_symbols(self, client, auth_headers, monkeypatch):
         """Test ML signals with default watchlist"""
-        async def mock_tech_signal(symbol):
+        def mock_tech_signal(symbol, bars):
             return None  # No signals meet criteria
 
         monkeypatch.setattr("app.routers.ai._generate_technical_signal", mock_tech_signal)
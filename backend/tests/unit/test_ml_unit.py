@@ -11,16 +11,16 @@ from unittest.mock import Mock
 class TestML:
     def test_get_market_regime_success(self, client, monkeypatch):
         """Test successful market regime detection"""
-        # Mock regime detector
-        mock_detector = Mock()
-        mock_detector.predict.return_value = {
+        # Mock regime service (predictions) and its detector (strategy mapping)
+        mock_service = Mock()
+        mock_service.predict.return_value = {
             "regime": "trending_bullish",
             "confidence": 0.85,
             "features": {"volatility": 0.2, "trend": 0.8},
             "cluster_id": 1,
         }
-        mock_detector.get_recommended_strategies.return_value = ["momentum", "breakout"]
-        monkeypatch.setattr("app.routers.ml.get_regime_detector", lambda: mock_detector)
+        mock_service.detector.get_recommended_strategies.return_value = ["momentum", "breakout"]
+        monkeypatch.setattr("app.routers.ml.get_regime_service", lambda: mock_service)
 
         response = client.get("/api/api/ml/market-regime?symbol=AAPL&lookback_days=90")
 
@@ -29,16 +29,17 @@ class TestML:
         assert data["symbol"] == "AAPL"
         assert data["regime"] == "trending_bullish"
         assert data["confidence"] == 0.85
-        assert "recommended_strategies" in data
+        assert data["recommended_strategies"] == ["momentum", "breakout"]
+        mock_service.predict.assert_called_once_with("AAPL", 90)
 
     def test_get_market_regime_failure(self, client, monkeypatch):
         """Test market regime detection when model fails"""
-        mock_detector = Mock()
-        mock_detector.predict.return_value = {
+        mock_service = Mock()
+        mock_service.predict.return_value = {
             "regime": "unknown",
             "error": "Insufficient data",
         }
-        monkeypatch.setattr("app.routers.ml.get_regime_detector", lambda: mock_detector)
+        monkeypatch.setattr("app.routers.ml.get_regime_service", lambda: mock_service)
 
         response = client.get("/api/api/ml/market-regime?symbol=AAPL")
 
@@ -72,13 +73,13 @@ class TestML:
         ]
         monkeypatch.setattr("app.routers.ml.get_strategy_selector", lambda: mock_selector)
 
-        # Mock regime detector for context
-        mock_detector = Mock()
-        mock_detector.predict.return_value = {
+        # Mock regime service for context
+        mock_service = Mock()
+        mock_service.predict.return_value = {
             "regime": "trending_bullish",
             "confidence": 0.85,
         }
-        monkeypatch.setattr("app.routers.ml.get_regime_detector", lambda: mock_detector)
+        monkeypatch.setattr("app.routers.ml.get_regime_service", lambda: mock_service)
 
         response = client.get("/api/api/ml/recommend-strategy?symbol=AAPL&top_n=2")
 